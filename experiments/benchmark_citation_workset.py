@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Benchmark author-year mention resolution in the citation workset builder.
+
+Usage:
+  # Default sweep up to a survey-sized paper (10k mentions x 1k references):
+  python experiments/benchmark_citation_workset.py
+
+  # Custom sizes, also timing the former per-mention linear scan:
+  python experiments/benchmark_citation_workset.py --sizes 1000x100 10000x1000 --compare-linear
+
+Each size runs ``_build_citation_workset`` on synthetic author-year references
+(with 2020a/2020b-style collisions and misspelled surnames) and prints one JSON
+line per size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "literature-analysis" / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from analysis_runtime import deterministic_core  # noqa: E402
+
+DEFAULT_SIZES = ["100x10", "1000x100", "10000x1000"]
+SYLLABLES = ["al", "ber", "chen", "dor", "ek", "fan", "gu", "hart", "in", "jo", "kow", "lin", "mar", "no", "pet", "qi", "ros", "son", "tan", "wu"]
+
+
+def _surname(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def _misspell(surname: str, rng: random.Random) -> str:
+    position = rng.randrange(1, len(surname))
+    return surname[:position] + surname[position:].replace(surname[position], "x", 1)
+
+
+def synthetic_corpus(mention_count: int, reference_count: int, *, seed: int = 0) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    rng = random.Random(seed)
+    references: list[dict[str, Any]] = []
+    while len(references) < reference_count:
+        surname = _surname(rng)
+        year = rng.randint(1990, 2024)
+        suffixes = ["a", "b"] if rng.random() < 0.1 else [""]
+        for suffix in suffixes[: reference_count - len(references)]:
+            raw = f"{surname}, A. ({year}{suffix}). Paper {len(references)}."
+            references.append(
+                {"ref_index": len(references), "author": [f"{surname}, A."], "title": raw, "year": year, "raw": raw, "confidence": 0.9}
+            )
+    mentions: list[dict[str, Any]] = []
+    for index in range(mention_count):
+        reference = rng.choice(references)
+        surname = reference["author"][0].split(",", 1)[0]
+        if rng.random() < 0.05:
+            surname = _misspell(surname, rng)
+        suffix = deterministic_core._year_suffix(reference["raw"], reference["year"]) or ""
+        mentions.append(
+            {
+                "mention_id": f"m{index + 1:05d}",
+                "marker": f"({surname}, {reference['year']}{suffix})",
+                "style": "author-year",
+                "line_start": 2 + index // 10,
+                "line_end": 2 + index // 10,
+                "snippet": "",
+                "year_hint": reference["year"],
+                "surname_hint": surname,
+            }
+        )
+    return mentions, references
+
+
+def _linear_author_year_scan(mentions: list[dict[str, Any]], references: list[dict[str, Any]]) -> int:
+    by_author_year = [
+        {**reference, "surname_aliases": sorted(deterministic_core._first_author_aliases(reference["author"]))}
+        for reference in references
+    ]
+    resolved = 0
+    for mention in mentions:
+        surname = str(mention["surname_hint"]).lower()
+        year = int(mention["year_hint"])
+        for candidate in by_author_year:
+            if surname in candidate["surname_aliases"] and candidate.get("year") == year:
+                resolved += 1
+                break
+    return resolved
+
+
+def run_size(mention_count: int, reference_count: int, *, compare_linear: bool) -> dict[str, Any]:
+    mentions, references = synthetic_corpus(mention_count, reference_count)
+    scope = deterministic_core.Scope("Body", 1, 1 + mention_count, "benchmark")
+    started = time.perf_counter()
+    workset = deterministic_core._build_citation_workset(scope=scope, mentions=mentions, reference_items=references)
+    elapsed = time.perf_counter() - started
+    methods: dict[str, int] = {}
+    for link in workset["mention_links"]:
+        methods[link["resolution_method"]] = methods.get(link["resolution_method"], 0) + 1
+    result: dict[str, Any] = {
+        "mentions": mention_count,
+        "references": reference_count,
+        "workset_seconds": round(elapsed, 4),
+        "mentions_per_second": round(mention_count / elapsed) if elapsed else None,
+        "resolution_methods": dict(sorted(methods.items())),
+    }
+    if compare_linear:
+        started = time.perf_counter()
+        result["linear_scan_resolved"] = _linear_author_year_scan(mentions, references)
+        result["linear_scan_seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def _parse_size(value: str) -> tuple[int, int]:
+    mentions, _, references = value.lower().partition("x")
+    return int(mentions), int(references)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark citation workset author-year resolution")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="MENTIONSxREFERENCES pairs")
+    parser.add_argument("--compare-linear", action="store_true", help="Also time the per-mention linear scan")
+    args = parser.parse_args()
+    for size in args.sizes:
+        mention_count, reference_count = _parse_size(size)
+        print(json.dumps(run_size(mention_count, reference_count, compare_linear=args.compare_linear)))
+
+
+if __name__ == "__main__":
+    main()
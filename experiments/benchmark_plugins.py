@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""Benchmark the runtime cost of reference preprocessing plugins.
+
+Usage:
+  # Benchmark one plugin over tests/fixtures/reference_samples:
+  python experiments/benchmark_plugins.py --plugin line-first-v171
+
+  # Several plugins, more repeats, and fail on regression versus the stored
+  # experiments/benchmark_results_<plugin>.json of each plugin:
+  python experiments/benchmark_plugins.py --plugin line-first-v17 line-first-v171 \\
+      --repeat 5 --check-regression
+
+  # Compare against an explicit baseline without overwriting the stored file:
+  python experiments/benchmark_plugins.py --plugin line-first-v171 \\
+      --baseline experiments/benchmark_results_line-first-v17.json --output-suffix candidate
+
+For every sample, ``ReferencePreprocessor.process`` is timed ``--repeat``
+times (median and min wall time), run once under tracemalloc for peak
+memory, and run once with the preprocessing helpers instrumented to split
+exclusive time into stages:
+
+  - splitting:  block/entry splitting and fragment merging
+  - candidates: per-entry pattern candidate generation
+  - suspicion:  numbering/style/grouping suspicion detection
+  - other:      everything else (filtering, export, warnings)
+
+Produces experiments/benchmark_results_<plugin>[_<suffix>].json.  With
+``--check-regression`` or ``--baseline`` the exit status is 1 when total
+time (fastest repeat) or peak memory grows past the allowed ratios
+(``--strict-samples`` applies the same ratios to every sample); a run that
+fails the check is written to benchmark_results_<plugin>[_<suffix>]-candidate.json
+so the stored baseline is never replaced by a regressed result.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import experiments.ref_preprocess.plugins  # noqa: E402,F401 — trigger registration
+from experiments.ref_preprocess.plugin_base import get_plugin, list_plugins  # noqa: E402
+
+REF_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "reference_samples"
+_OUTPUT_DIR = Path(__file__).resolve().parent
+SCHEMA = "plugin_benchmark.v1"
+STAGES = ("splitting", "candidates", "suspicion", "other")
+
+# First matching prefix wins; helpers not listed here count as "other".
+STAGE_PREFIXES: tuple[tuple[str, str], ...] = (
+    ("_split_author_candidates", "candidates"),
+    ("_split_at_venue", "candidates"),
+    ("_split", "splitting"),
+    ("_merge", "splitting"),
+    ("_build_reference_entries", "splitting"),
+    ("_extract_scope_lines", "splitting"),
+    ("_generate", "candidates"),
+    ("_candidate", "candidates"),
+    ("_make_reference_candidate", "candidates"),
+    ("_detect", "suspicion"),
+)
+# Absolute slack so sub-millisecond samples do not trip the ratio checks.
+MIN_TIME_DELTA_SECONDS = 0.005
+MIN_MEMORY_DELTA_BYTES = 256 * 1024
+
+
+def _output_path(plugin_name: str, suffix: str | None) -> Path:
+    if not suffix:
+        return _OUTPUT_DIR / f"benchmark_results_{plugin_name}.json"
+    return _OUTPUT_DIR / f"benchmark_results_{plugin_name}_{suffix}.json"
+
+
+def _candidate_path(out_path: Path) -> Path:
+    return out_path.with_name(f"{out_path.stem}-candidate{out_path.suffix}")
+
+
+def _stage_for(name: str) -> str | None:
+    for prefix, stage in STAGE_PREFIXES:
+        if name.startswith(prefix):
+            return stage
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Stage instrumentation
+# ---------------------------------------------------------------------------
+
+
+class StageTimer:
+    """Exclusive wall time per stage; nested helpers are charged to the innermost stage."""
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self._child_seconds: list[float] = []
+
+    def wrap(self, stage: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            self._child_seconds.append(0.0)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                children = self._child_seconds.pop()
+                self.seconds[stage] += elapsed - children
+                if self._child_seconds:
+                    self._child_seconds[-1] += elapsed
+
+        return timed
+
+
+def _instrument(timer: StageTimer) -> list[tuple[Any, str, Any]]:
+    """Swap stage helpers in every loaded ref_preprocess module; returns the undo list."""
+    patched: list[tuple[Any, str, Any]] = []
+    wrapped: dict[int, Callable[..., Any]] = {}
+    for module_name, module in sorted(sys.modules.items()):
+        if module is None or not module_name.startswith("experiments.ref_preprocess"):
+            continue
+        for name, value in list(vars(module).items()):
+            stage = _stage_for(name)
+            if stage is None or not callable(value) or isinstance(value, type):
+                continue
+            if id(value) not in wrapped:
+                wrapped[id(value)] = timer.wrap(stage, value)
+            patched.append((module, name, value))
+            setattr(module, name, wrapped[id(value)])
+    return patched
+
+
+def _restore(patched: list[tuple[Any, str, Any]]) -> None:
+    for module, name, value in reversed(patched):
+        setattr(module, name, value)
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------------------------
+
+
+def _entry_count(output: dict[str, Any]) -> int:
+    return int(output.get("meta", {}).get("entry_count", len(output.get("entries", []))))
+
+
+def benchmark_sample(plugin: Any, raw: str, *, repeat: int) -> dict[str, Any]:
+    timings: list[float] = []
+    output: dict[str, Any] = {}
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        output = plugin.process(raw)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        plugin.process(raw)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timer = StageTimer()
+    patched = _instrument(timer)
+    try:
+        started = time.perf_counter()
+        plugin.process(raw)
+        instrumented = time.perf_counter() - started
+    finally:
+        _restore(patched)
+    timer.seconds["other"] += max(0.0, instrumented - sum(timer.seconds.values()))
+
+    median = statistics.median(timings)
+    entries = _entry_count(output)
+    return {
+        "bytes": len(raw.encode("utf-8")),
+        "entries": entries,
+        "seconds_median": median,
+        "seconds_min": min(timings),
+        "entries_per_second": entries / median if median > 0 else None,
+        "peak_memory_bytes": peak_bytes,
+        "stage_seconds": {stage: round(seconds, 6) for stage, seconds in timer.seconds.items()},
+    }
+
+
+def benchmark_plugin(plugin_name: str, samples: list[Path], *, repeat: int) -> dict[str, Any]:
+    plugin = get_plugin(plugin_name)
+    per_sample: list[dict[str, Any]] = []
+    for i, path in enumerate(samples):
+        result = benchmark_sample(plugin, path.read_text(encoding="utf-8"), repeat=repeat)
+        result["sample"] = path.stem[:8]
+        per_sample.append(result)
+        print(f"  [{i+1:2d}] {result['sample']:8s}  "
+              f"entries={result['entries']:3d}  "
+              f"median={result['seconds_median'] * 1000:8.2f}ms  "
+              f"peak={result['peak_memory_bytes'] / 1024:8.1f}KiB")
+
+    total_seconds = sum(r["seconds_median"] for r in per_sample)
+    total_seconds_min = sum(r["seconds_min"] for r in per_sample)
+    total_entries = sum(r["entries"] for r in per_sample)
+    stage_totals = {stage: sum(r["stage_seconds"][stage] for r in per_sample) for stage in STAGES}
+    stage_sum = sum(stage_totals.values()) or 1.0
+    return {
+        "schema": SCHEMA,
+        "plugin": plugin_name,
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "summary": {
+            "samples": len(per_sample),
+            "entries": total_entries,
+            "total_seconds": total_seconds,
+            "total_seconds_min": total_seconds_min,
+            "entries_per_second": total_entries / total_seconds if total_seconds > 0 else None,
+            "max_peak_memory_bytes": max((r["peak_memory_bytes"] for r in per_sample), default=0),
+            "stage_seconds": {stage: round(seconds, 6) for stage, seconds in stage_totals.items()},
+            "stage_share": {stage: round(seconds / stage_sum, 4) for stage, seconds in stage_totals.items()},
+        },
+        "per_sample": per_sample,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Regression check
+# ---------------------------------------------------------------------------
+
+
+def find_regressions(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    max_time_ratio: float,
+    max_memory_ratio: float,
+) -> dict[str, list[str]]:
+    """Human-readable regressions of ``current`` versus ``baseline``.
+
+    Returns ``{"total": [...], "samples": [...]}`` over the samples present
+    in both runs.  Time is compared on the fastest repeat, which is far less
+    sensitive to scheduler noise than the median; per-sample timings stay
+    noisy on shared machines, so only ``total`` fails the run unless
+    ``--strict-samples`` is given.
+    """
+    regressions: dict[str, list[str]] = {"total": [], "samples": []}
+
+    def _check(scope: str, label: str, now: float, before: float, ratio: float, slack: float, unit: str) -> None:
+        if before > 0 and now > before * ratio and now - before > slack:
+            regressions[scope].append(
+                f"{label}: {before:.4g}{unit} -> {now:.4g}{unit} (x{now / before:.2f} > x{ratio:.2f})"
+            )
+
+    previous = {r["sample"]: r for r in baseline.get("per_sample", [])}
+    shared = [(sample, previous[sample["sample"]]) for sample in current["per_sample"] if sample["sample"] in previous]
+    _check("total", "total_seconds_min",
+           sum(now["seconds_min"] for now, _ in shared), sum(before["seconds_min"] for _, before in shared),
+           max_time_ratio, MIN_TIME_DELTA_SECONDS, "s")
+    _check("total", "max_peak_memory_bytes",
+           max((now["peak_memory_bytes"] for now, _ in shared), default=0),
+           max((before["peak_memory_bytes"] for _, before in shared), default=0),
+           max_memory_ratio, MIN_MEMORY_DELTA_BYTES, "B")
+    for now, before in shared:
+        _check("samples", f"{now['sample']} seconds_min", now["seconds_min"], before["seconds_min"],
+               max_time_ratio, MIN_TIME_DELTA_SECONDS, "s")
+        _check("samples", f"{now['sample']} peak_memory_bytes", now["peak_memory_bytes"], before["peak_memory_bytes"],
+               max_memory_ratio, MIN_MEMORY_DELTA_BYTES, "B")
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark reference preprocessing plugins")
+    parser.add_argument("--plugin", nargs="+", default=None, help="Plugin name(s); default: all registered")
+    parser.add_argument("--samples", nargs="*", default=None, help="Citekey prefixes to restrict the sample set")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per sample (median is reported)")
+    parser.add_argument("--output-suffix", type=str, default=None,
+                        help="Suffix for output files (e.g. 'ci' → benchmark_results_<plugin>_ci.json)")
+    parser.add_argument("--baseline", type=Path, default=None,
+                        help="Baseline benchmark JSON to compare against (single plugin only)")
+    parser.add_argument("--check-regression", action="store_true",
+                        help="Compare against the stored benchmark_results_<plugin>.json before overwriting it "
+                             "(a regressed run is written to *-candidate.json instead)")
+    parser.add_argument("--max-time-ratio", type=float, default=1.25)
+    parser.add_argument("--max-memory-ratio", type=float, default=1.25)
+    parser.add_argument("--strict-samples", action="store_true",
+                        help="Also fail on per-sample regressions (default: report only)")
+    args = parser.parse_args()
+
+    plugin_names = args.plugin or list_plugins()
+    if args.baseline is not None and len(plugin_names) != 1:
+        parser.error("--baseline needs exactly one --plugin")
+    samples = sorted(REF_DIR.glob("*.txt"))
+    if args.samples:
+        samples = [path for path in samples if any(path.name.startswith(prefix) for prefix in args.samples)]
+    if not samples:
+        print("No reference samples found.", file=sys.stderr)
+        sys.exit(1)
+
+    failed = False
+    for plugin_name in plugin_names:
+        out_path = _output_path(plugin_name, args.output_suffix)
+        baseline_path = args.baseline
+        if baseline_path is None and args.check_regression:
+            stored = _output_path(plugin_name, None)
+            baseline_path = stored if stored.exists() else None
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path else None
+
+        print(f"Benchmarking {plugin_name} on {len(samples)} samples (repeat={args.repeat})...\n")
+        result = benchmark_plugin(plugin_name, samples, repeat=args.repeat)
+        summary = result["summary"]
+        print(f"\n  total={summary['total_seconds']:.3f}s  "
+              f"throughput={summary['entries_per_second'] or 0:.0f} entries/s  "
+              f"max_peak={summary['max_peak_memory_bytes'] / 1024:.1f}KiB")
+        print("  stages: " + "  ".join(f"{stage}={share:.0%}" for stage, share in summary["stage_share"].items()))
+
+        regressed = False
+        if baseline is not None:
+            regressions = find_regressions(
+                result, baseline,
+                max_time_ratio=args.max_time_ratio,
+                max_memory_ratio=args.max_memory_ratio,
+            )
+            result["baseline"] = {"path": str(baseline_path), "regressions": regressions}
+            gating = regressions["total"] + (regressions["samples"] if args.strict_samples else [])
+            if gating:
+                failed = regressed = True
+                print(f"\n  REGRESSION vs {baseline_path}:")
+                for line in gating:
+                    print(f"    - {line}")
+            else:
+                print(f"\n  No regression vs {baseline_path}")
+            if regressions["samples"] and not args.strict_samples:
+                print(f"  ({len(regressions['samples'])} per-sample slowdowns above threshold; "
+                      f"see baseline.regressions.samples)")
+
+        if regressed:
+            out_path = _candidate_path(out_path)
+        out_path.write_text(json.dumps(result, ensure_ascii=False, indent=2))
+        print(f"\n  Results: {out_path}\n")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""Benchmark the references stage against recorded provider responses, offline.
+
+Usage:
+  # Default sweep: 100 and 1000 references, 20 ms latency, no faults:
+  python experiments/benchmark_reference_api.py
+
+  # Rate-limit bursts with Retry-After, both providers in parallel:
+  python experiments/benchmark_reference_api.py --sizes 500 --latency-ms 50 \\
+      --burst-length 1 --burst-status 429 --retry-after 0.2 --concurrent
+
+  # Fail (exit 1) when slower than an earlier --output run:
+  python experiments/benchmark_reference_api.py --output /tmp/now.json \\
+      --baseline /tmp/before.json --max-time-ratio 1.25
+
+For each size a synthetic survey bibliography is generated, and Crossref and
+Semantic Scholar responses for it are recorded into a fixture directory
+through ``reference_replay.RecordingHttpGet``. Crossref only knows the first
+half of the references, so Semantic Scholar pagination is always exercised.
+Every repeat initializes a fresh runtime whose ``--reference-api-replay``
+points at a local ``reference_replay`` server with the requested latency and
+fault plan. The timed call is ``references.prepare_reference_workset``: local
+candidate preparation, API fetch with retries, and resolution.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "literature-analysis" / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from analysis_runtime import deterministic_core  # noqa: E402
+from analysis_runtime import reference_api  # noqa: E402
+from analysis_runtime import reference_replay  # noqa: E402
+from analysis_runtime import references  # noqa: E402
+from analysis_runtime import stages  # noqa: E402
+
+SOURCE_DOI = "10.1000/benchmark-source"
+DEFAULT_SIZES = [100, 1000]
+MIN_TIME_DELTA_SECONDS = 0.05
+SURNAMES = ["Anders", "Brandt", "Chen", "Dubois", "Eriksen", "Fischer", "Garcia", "Huang", "Ivanova", "Jensen", "Kim", "Lopez"]
+TITLE_WORDS = [
+    "adaptive", "bayesian", "contrastive", "diffusion", "efficient", "federated", "graph", "hierarchical", "implicit",
+    "kernel", "latent", "multimodal", "neural", "online", "probabilistic", "robust", "sparse", "temporal", "unsupervised",
+    "variational", "attention", "clustering", "detection", "embedding", "filtering", "generation", "inference", "learning",
+    "matching", "navigation", "optimization", "parsing", "retrieval", "segmentation", "tracking", "translation",
+]
+
+
+def _work(index: int) -> dict[str, Any]:
+    rng = random.Random(index)
+    return {
+        "surname": SURNAMES[index % len(SURNAMES)],
+        "title": " ".join(rng.sample(TITLE_WORDS, 6)).capitalize(),
+        "year": 1990 + index % 35,
+    }
+
+
+def synthetic_live_get(size: int) -> reference_api.HttpGet:
+    def http_get(url: str, _headers: dict[str, str], _timeout: float) -> reference_api.HttpResponse:
+        parsed = urlparse(url)
+        if parsed.netloc == "api.crossref.org":
+            rows = [
+                {"key": f"ref-{index}", "article-title": work["title"], "author": work["surname"], "year": str(work["year"])}
+                for index, work in ((index, _work(index)) for index in range(size // 2))
+            ]
+            payload: dict[str, Any] = {"reference": rows}
+        else:
+            query = parse_qs(parsed.query)
+            offset = int(query["offset"][0])
+            limit = int(query["limit"][0])
+            data = [
+                {
+                    "citedPaper": {
+                        "paperId": f"s2-{index}",
+                        "title": _work(index)["title"],
+                        "authors": [{"name": _work(index)["surname"]}],
+                        "year": _work(index)["year"],
+                    }
+                }
+                for index in range(offset, min(offset + limit, size))
+            ]
+            payload = {"data": data, **({"next": offset + limit} if offset + limit < size else {})}
+        return reference_api.HttpResponse(200, {"content-type": "application/json"}, json.dumps(payload).encode("utf-8"))
+
+    return http_get
+
+
+def record_fixtures(fixtures: Path, size: int) -> None:
+    recorder = reference_replay.RecordingHttpGet(fixtures, synthetic_live_get(size))
+    identifier = reference_api.normalize_identifier(SOURCE_DOI)
+    assert identifier is not None
+    reference_api.fetch_crossref(identifier, http_get=recorder)
+    reference_api.fetch_semantic_scholar(identifier, http_get=recorder)
+
+
+def source_lines(size: int) -> list[str]:
+    lines = ["# Introduction", "The bibliography below is synthetic.", "# References"]
+    for index in range(size):
+        work = _work(index)
+        lines.append(f"[{index + 1}] A. {work['surname']}. {work['title']}. In Proc. Workshop, {work['year']}.")
+    return lines
+
+
+def plan_payload(lines: list[str]) -> dict[str, Any]:
+    references_line = lines.index("# References") + 1
+    return {
+        "outline_nodes": [
+            {"node_id": "n1", "heading_level": 1, "title": "Introduction", "line_start": 1, "line_end": references_line - 1, "parent_node_id": None, "metadata": {}},
+            {"node_id": "n2", "heading_level": 1, "title": "References", "line_start": references_line, "line_end": len(lines), "parent_node_id": None, "metadata": {}},
+        ],
+        "references_scope": {"section_title": "References", "line_start": references_line, "line_end": len(lines), "metadata": {}},
+        "citation_scope": {
+            "section_title": "Introduction",
+            "line_start": 1,
+            "line_end": references_line - 1,
+            "metadata": {"selection_reason": "benchmark", "covered_sections": ["Introduction"]},
+        },
+        "source_identity": None,
+        "literature_matching_metadata": {
+            "schema": "literature_matching_metadata.v1",
+            "key_terms": ["reference resolution"],
+            "methods": ["replay benchmark"],
+            "problems": ["bibliography matching"],
+            "datasets": [],
+            "exclude_terms": [],
+        },
+    }
+
+
+def run_once(root: Path, lines: list[str], replay_url: str, *, concurrent: bool) -> dict[str, Any]:
+    source = root / "paper.md"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    db_path = root / ".literature_analysis_tmp" / "literature_analysis.db"
+    _, code = stages.init_runtime(
+        working_dir=root,
+        db_path=db_path,
+        output_dir=root,
+        source_path=source,
+        language="en-US",
+        model="",
+        identifier=SOURCE_DOI,
+        reference_api_concurrent=concurrent,
+        reference_api_replay=replay_url,
+        reference_candidate_cache=False,
+    )
+    if code != 0:
+        raise RuntimeError("init_runtime failed")
+    if deterministic_core.persist_outline_and_scopes(db_path, plan_payload(lines))[1] != 0:
+        raise RuntimeError("persist_outline_and_scopes failed")
+    started = time.perf_counter()
+    prepared, code = references.prepare_reference_workset(db_path)
+    seconds = time.perf_counter() - started
+    if code != 0:
+        raise RuntimeError(f"prepare_reference_workset failed: {prepared.get('error')}")
+    summary = prepared["reference_api"]
+    requests = [request for provider in summary["provider_summaries"] for request in provider.get("http_requests", [])]
+    return {
+        "seconds": seconds,
+        "accepted_count": summary["accepted_count"],
+        "unresolved_count": summary["unresolved_count"],
+        "http_requests": len(requests),
+        "http_seconds": sum(request["elapsed_ms"] for request in requests) / 1000.0,
+    }
+
+
+def benchmark_size(size: int, args: argparse.Namespace) -> dict[str, Any]:
+    lines = source_lines(size)
+    faults = reference_replay.FaultPlan(
+        latency_seconds=args.latency_ms / 1000.0,
+        burst_length=args.burst_length,
+        burst_status=args.burst_status,
+        retry_after=args.retry_after,
+    )
+    runs: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as td:
+        fixtures = Path(td) / "fixtures"
+        record_fixtures(fixtures, size)
+        for repeat in range(args.repeat):
+            replay = reference_replay.ReplayHttpGet(fixtures, faults=faults)
+            server = reference_replay.replay_server(replay)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                root = Path(td) / f"run-{repeat}"
+                root.mkdir()
+                run = run_once(root, lines, f"http://127.0.0.1:{server.server_address[1]}", concurrent=args.concurrent)
+            finally:
+                server.shutdown()
+                server.server_close()
+            runs.append({**run, **{f"server_{key}": value for key, value in replay.stats.items()}})
+    return {
+        "size": size,
+        "latency_ms": args.latency_ms,
+        "burst_length": args.burst_length,
+        "burst_status": args.burst_status,
+        "retry_after": args.retry_after,
+        "concurrent": args.concurrent,
+        "seconds_median": round(statistics.median(run["seconds"] for run in runs), 4),
+        "seconds_min": round(min(run["seconds"] for run in runs), 4),
+        "http_seconds_median": round(statistics.median(run["http_seconds"] for run in runs), 4),
+        "http_requests": runs[-1]["http_requests"],
+        "server_requests": runs[-1]["server_requests"],
+        "server_injected_faults": runs[-1]["server_injected_faults"],
+        "accepted_count": runs[-1]["accepted_count"],
+        "unresolved_count": runs[-1]["unresolved_count"],
+    }
+
+
+def find_regressions(current: list[dict[str, Any]], baseline: list[dict[str, Any]], *, max_time_ratio: float) -> list[str]:
+    previous = {row["size"]: row for row in baseline}
+    regressions: list[str] = []
+    for row in current:
+        before = previous.get(row["size"])
+        if before is None:
+            continue
+        now, then = row["seconds_min"], before["seconds_min"]
+        if then > 0 and now > then * max_time_ratio and now - then > MIN_TIME_DELTA_SECONDS:
+            regressions.append(f"size={row['size']} seconds_min: {then:.4g}s -> {now:.4g}s (x{now / then:.2f} > x{max_time_ratio:.2f})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the references stage against a local provider replay server")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="Bibliography sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh runtimes per size (median and min are reported)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Injected latency per provider request")
+    parser.add_argument("--burst-length", type=int, default=0, help="Injected failures before each URL is served")
+    parser.add_argument("--burst-status", type=int, default=429, choices=[429, 503])
+    parser.add_argument("--retry-after", default="0", help="Retry-After header sent with injected failures")
+    parser.add_argument("--concurrent", action="store_true", help="Fetch Crossref and Semantic Scholar in parallel")
+    parser.add_argument("--output", type=Path, default=None, help="Write the result rows to this JSON file")
+    parser.add_argument("--baseline", type=Path, default=None, help="Result JSON to compare seconds_min against")
+    parser.add_argument("--max-time-ratio", type=float, default=1.25)
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        row = benchmark_size(size, args)
+        rows.append(row)
+        print(json.dumps(row, ensure_ascii=False), flush=True)
+    if args.output is not None:
+        args.output.write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.baseline is not None:
+        regressions = find_regressions(rows, json.loads(args.baseline.read_text(encoding="utf-8")), max_time_ratio=args.max_time_ratio)
+        for line in regressions:
+            print(f"REGRESSION vs {args.baseline}: {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
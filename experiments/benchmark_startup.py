@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark run_analysis.py startup import cost per subcommand.
+
+Usage:
+  # Import time for every subcommand, compared with the former eager imports:
+  python experiments/benchmark_startup.py
+
+  # Enforce the startup budget (non-zero exit when status is over budget):
+  python experiments/benchmark_startup.py --check-budget --max-status-fraction 0.25
+
+Each row imports ``run_analysis`` plus the modules its handler loads, in a fresh
+interpreter with ``-X importtime`` and a warm bytecode cache, and prints one JSON
+line with the median import time (interpreter startup imports subtracted) and
+the number of modules loaded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "literature-analysis" / "scripts"
+
+COMMAND_MODULES = {
+    "status": ["analysis_runtime.gate_contract"],
+    "init_runtime": ["analysis_runtime.runtime", "analysis_runtime.stages"],
+    "persist_digest": ["analysis_runtime.stages"],
+    "persist_references": ["analysis_runtime.references"],
+    "persist_citation_analysis": ["analysis_runtime.citations"],
+    "batch": ["analysis_runtime.batch"],
+    "profile": ["analysis_runtime.profiling"],
+}
+# Everything run_analysis.py loaded at startup before imports became subcommand-scoped.
+EAGER_MODULES = sorted(
+    {module for modules in COMMAND_MODULES.values() for module in modules}
+    | {"concurrent.futures.process", "importlib.metadata", "jinja2", "jsonschema", "urllib.request"}
+)
+STATUS_FORBIDDEN_MODULES = ["analysis_runtime.deterministic_core", "analysis_runtime.batch", "jinja2", "jsonschema"]
+
+
+def _probe(modules: list[str]) -> str:
+    imports = "".join(f"import {module}\n" for module in ["run_analysis", *modules])
+    return f"import sys\nsys.path.insert(0, {str(SCRIPTS_DIR)!r})\n{imports}"
+
+
+def _import_profile(code: str, env: dict[str, str]) -> tuple[float, list[str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=True,
+        env=env,
+    )
+    total_us = 0
+    modules: list[str] = []
+    for line in result.stderr.decode("utf-8").splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        modules.append(name.strip())
+        if len(name) - len(name.lstrip()) == 1:
+            total_us += int(cumulative)
+    return total_us / 1000.0, modules
+
+
+def measure(code: str, env: dict[str, str], repeat: int) -> tuple[float, list[str]]:
+    _import_profile(code, env)
+    samples = [_import_profile(code, env) for _ in range(repeat)]
+    return statistics.median(total for total, _ in samples), samples[-1][1]
+
+
+def run(repeat: int) -> list[dict[str, Any]]:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+        env["PYTHONPYCACHEPREFIX"] = cache_dir
+        bare_ms, _ = measure("pass\n", env, repeat)
+        rows: list[dict[str, Any]] = []
+        for command, modules in [*COMMAND_MODULES.items(), ("eager_baseline", EAGER_MODULES)]:
+            total_ms, loaded = measure(_probe(modules), env, repeat)
+            rows.append(
+                {
+                    "command": command,
+                    "import_ms": round(max(total_ms - bare_ms, 0.0), 2),
+                    "module_count": len(loaded),
+                    "heavy_modules": [module for module in STATUS_FORBIDDEN_MODULES if module in loaded],
+                }
+            )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark run_analysis.py startup import cost")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed interpreter launches per command (median is reported)")
+    parser.add_argument("--check-budget", action="store_true", help="Exit 1 when status exceeds the startup budget")
+    parser.add_argument("--max-status-fraction", type=float, default=0.25, help="Allowed status import time relative to the eager baseline")
+    args = parser.parse_args()
+
+    rows = run(max(args.repeat, 1))
+    for row in rows:
+        print(json.dumps(row, ensure_ascii=False))
+    if not args.check_budget:
+        return
+    by_command = {row["command"]: row for row in rows}
+    status, eager = by_command["status"], by_command["eager_baseline"]
+    fraction = status["import_ms"] / eager["import_ms"] if eager["import_ms"] else 0.0
+    failures = [f"status loads {module}" for module in status["heavy_modules"]]
+    if fraction > args.max_status_fraction:
+        failures.append(f"status import time is {fraction:.2f} of eager baseline (budget {args.max_status_fraction:.2f})")
+    print(json.dumps({"status_fraction": round(fraction, 3), "budget_failures": failures}, ensure_ascii=False))
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,14 @@ Usage:
   # List available plugins:
   python experiments/evaluate_all.py --list-plugins
 
+  # Optimal (Hungarian) GT/PP alignment, 8 worker processes, and a
+  # composite comparison against every evaluation_results_v*.json:
+  python experiments/evaluate_all.py --plugin line-first --assignment hungarian \
+      --workers 8 --compare-history
+
+Files are scored in a process pool (``--workers``, default: CPU count);
+results and printed lines keep ground-truth file order.
+
 Produces:
   - experiments/evaluation_results.json    (detailed per-file scores)
   - experiments/deviation_report.json      (agent-readable deviation analysis)
@@ -20,7 +28,9 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -28,6 +38,7 @@ from typing import Any
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from experiments.ref_preprocess.evaluation import (
+    ASSIGNMENT_METHODS,
     aggregate_results,
     assess_negative_case,
     evaluate_file,
@@ -76,89 +87,115 @@ def _resolve_style(gt_data: dict) -> str:
     return "garbled_ocr" if s == "garbled_ocr_negative_case" else s
 
 
-def evaluate_from_precomputed(
-    gt_files: list[Path],
-) -> tuple[list[dict], dict | None]:
-    """Evaluate using precomputed JSON in experiments/preprocessed/."""
-    results: list[dict] = []
-    negative_case_result = None
+def _map_ordered(func: Any, gt_files: list[Path], workers: int, *args: Any) -> list[Any]:
+    """Apply ``func(gt_path, *args)`` to every file, in a process pool when workers > 1."""
+    if workers <= 1 or len(gt_files) <= 1:
+        return [func(gt_path, *args) for gt_path in gt_files]
+    with ProcessPoolExecutor(max_workers=min(workers, len(gt_files))) as executor:
+        return list(executor.map(func, gt_files, *([arg] * len(gt_files) for arg in args)))
 
-    for i, gt_path in enumerate(gt_files):
-        gt_data = json.loads(gt_path.read_text(encoding="utf-8"))
-        gt_stem = gt_path.stem
-        citekey = gt_stem[:8]
 
-        pp_path = _find_pp_file(gt_stem, PP_DIR)
-        if pp_path is None:
-            print(f"  [{i+1:2d}] {citekey:8s}  SKIP (no preprocessed file)")
-            continue
+def _evaluate_precomputed_one(gt_path: Path, assignment: str) -> tuple[dict | None, str]:
+    gt_data = json.loads(gt_path.read_text(encoding="utf-8"))
+    citekey = gt_path.stem[:8]
+    pp_path = _find_pp_file(gt_path.stem, PP_DIR)
+    if pp_path is None:
+        return None, f"{citekey:8s}  SKIP (no preprocessed file)"
+    pp_data = json.loads(pp_path.read_text(encoding="utf-8"))
+    result, _ = _score_one(gt_data, pp_data, citekey, assignment=assignment)
+    return result, ""
+
+
+_PLUGINS: dict[str, Any] = {}
+
 
-        pp_data = json.loads(pp_path.read_text(encoding="utf-8"))
-        result, neg = _score_one(gt_data, pp_data, citekey)
-        if neg:
+def _plugin_instance(plugin_name: str) -> Any:
+    """One plugin instance per process, shared by every file that process scores."""
+    if plugin_name not in _PLUGINS:
+        import experiments.ref_preprocess.plugins  # noqa: F401 — trigger registration
+        from experiments.ref_preprocess.plugin_base import get_plugin
+
+        _PLUGINS[plugin_name] = get_plugin(plugin_name)
+    return _PLUGINS[plugin_name]
+
+
+def _evaluate_plugin_one(gt_path: Path, plugin_name: str, assignment: str) -> tuple[dict | None, str]:
+    gt_data = json.loads(gt_path.read_text(encoding="utf-8"))
+    citekey = gt_path.stem[:8]
+    ref_path = _find_ref_file(gt_data, REF_DIR)
+    if ref_path is None:
+        return None, f"{citekey:8s}  SKIP (no ref file)"
+    raw = ref_path.read_text(encoding="utf-8")
+    pp_data = _plugin_instance(plugin_name).process(raw)
+    result, is_negative = _score_one(gt_data, pp_data, citekey, assignment=assignment)
+    if is_negative:
+        neg = result["negative_assessment"]
+        return result, (f"{citekey:8s}  ⚠ NEGATIVE CASE  "
+                        f"pp_entries={neg['pp_entry_count']:3d}  warnings={neg['warning_count']:3d}")
+    return result, ""
+
+
+def _collect(outcomes: list[tuple[dict | None, str]]) -> tuple[list[dict], dict | None]:
+    """Print per-file lines in ground-truth order and split off the negative case."""
+    results: list[dict] = []
+    negative_case_result = None
+    for i, (result, line) in enumerate(outcomes):
+        if line:
+            print(f"  [{i+1:2d}] {line}")
+        if result is None:
+            continue
+        if result.get("is_negative_case"):
             negative_case_result = result
         results.append(result)
+        _print_one(i + 1, result)
+    return results, negative_case_result
 
-        _print_one(i + 1, result, pp_data)
 
-    return results, negative_case_result
+def evaluate_from_precomputed(
+    gt_files: list[Path],
+    workers: int = 1,
+    assignment: str = "greedy",
+) -> tuple[list[dict], dict | None]:
+    """Evaluate using precomputed JSON in experiments/preprocessed/."""
+    return _collect(_map_ordered(_evaluate_precomputed_one, gt_files, workers, assignment))
 
 
 def evaluate_with_plugin(
     gt_files: list[Path],
     plugin_name: str,
+    workers: int = 1,
+    assignment: str = "greedy",
 ) -> tuple[list[dict], dict | None]:
     """Evaluate by running a plugin on each reference sample directly."""
-    import experiments.ref_preprocess.plugins  # noqa: F401 — trigger registration
-    from experiments.ref_preprocess.plugin_base import get_plugin
-
-    plugin = get_plugin(plugin_name)
-    results: list[dict] = []
-    negative_case_result = None
-
-    print(f"  Using plugin: {plugin.name}\n")
-
-    for i, gt_path in enumerate(gt_files):
-        gt_data = json.loads(gt_path.read_text(encoding="utf-8"))
-        citekey = gt_path.stem[:8]
-        is_negative = gt_data.get("is_negative_case", False)
-
-        if is_negative:
-            # Negative case: run plugin anyway
-            ref_path = _find_ref_file(gt_data, REF_DIR)
-            if ref_path is None:
-                print(f"  [{i+1:2d}] {citekey:8s}  SKIP (no ref file)")
-                continue
-            raw = ref_path.read_text(encoding="utf-8")
-            pp_data = plugin.process(raw)
-            neg = assess_negative_case(pp_data)
-            result: dict[str, Any] = {
-                "_file_id": citekey,
-                "is_negative_case": True,
-                "entry_counts": {
-                    "gt": len(gt_data.get("items", [])),
-                    "pp": pp_data.get("meta", {}).get("entry_count", 0),
-                },
-                "negative_assessment": neg,
-            }
-            negative_case_result = result
-            results.append(result)
-            print(f"  [{i+1:2d}] {citekey:8s}  ⚠ NEGATIVE CASE  "
-                  f"pp_entries={neg['pp_entry_count']:3d}  warnings={neg['warning_count']:3d}")
-            continue
-
-        ref_path = _find_ref_file(gt_data, REF_DIR)
-        if ref_path is None:
-            print(f"  [{i+1:2d}] {citekey:8s}  SKIP (no ref file)")
+    print(f"  Using plugin: {_plugin_instance(plugin_name).name}\n")
+    return _collect(_map_ordered(_evaluate_plugin_one, gt_files, workers, plugin_name, assignment))
+
+
+def compare_with_history(
+    aggregate: dict[str, Any],
+    history_paths: list[Path],
+) -> list[dict[str, Any]]:
+    """Composite deltas of this run against earlier evaluation_results_*.json files."""
+    current = {r["_file_id"]: r["composite_score"] for r in aggregate.get("per_file", [])}
+    rows: list[dict[str, Any]] = []
+    for path in history_paths:
+        try:
+            previous = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
             continue
-
-        raw = ref_path.read_text(encoding="utf-8")
-        pp_data = plugin.process(raw)
-        result, _ = _score_one(gt_data, pp_data, citekey)
-        results.append(result)
-        _print_one(i + 1, result, pp_data)
-
-    return results, negative_case_result
+        per_file = {r.get("_file_id"): r.get("composite_score", 0.0) for r in previous.get("per_file", [])}
+        shared = sorted(set(current) & set(per_file))
+        deltas = [current[fid] - per_file[fid] for fid in shared]
+        rows.append({
+            "results": path.name,
+            "plugin": previous.get("plugin", ""),
+            "composite_mean": previous.get("composite", {}).get("mean", 0.0),
+            "delta_mean": aggregate["composite"]["mean"] - previous.get("composite", {}).get("mean", 0.0),
+            "shared_files": len(shared),
+            "improved": sum(1 for d in deltas if d > 1e-9),
+            "regressed": sum(1 for d in deltas if d < -1e-9),
+        })
+    return rows
 
 
 # ---------------------------------------------------------------------------
@@ -167,7 +204,7 @@ def evaluate_with_plugin(
 
 
 def _score_one(
-    gt_data: dict, pp_data: dict, citekey: str
+    gt_data: dict, pp_data: dict, citekey: str, assignment: str = "greedy"
 ) -> tuple[dict, bool]:
     """Score one GT/PP pair. Returns (result_dict, is_negative)."""
     is_negative = gt_data.get("is_negative_case", False)
@@ -186,12 +223,12 @@ def _score_one(
         return result, True
 
     gt_data["entry_style"] = _resolve_style(gt_data)
-    result = evaluate_file(gt_data, pp_data)
+    result = evaluate_file(gt_data, pp_data, assignment=assignment)
     result["_file_id"] = citekey
     return result, False
 
 
-def _print_one(idx: int, result: dict, pp_data: dict | None = None) -> None:
+def _print_one(idx: int, result: dict) -> None:
     if result.get("is_negative_case"):
         return
     comp = result["composite_score"]
@@ -231,6 +268,18 @@ def main() -> None:
         "--output-suffix", type=str, default=None,
         help="Suffix for output files (e.g. 'v11' → evaluation_results_v11.json)",
     )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Worker processes for per-file evaluation (default: CPU count; 1 = serial)",
+    )
+    parser.add_argument(
+        "--assignment", choices=ASSIGNMENT_METHODS, default="greedy",
+        help="GT/PP alignment: greedy in GT order (historical default) or optimal Hungarian",
+    )
+    parser.add_argument(
+        "--compare-history", action="store_true",
+        help="Print composite deltas against every experiments/evaluation_results_v*.json",
+    )
     args = parser.parse_args()
 
     if args.list_plugins:
@@ -248,10 +297,11 @@ def main() -> None:
 
     print(f"Evaluating {len(gt_files)} ground truth files...\n")
 
+    workers = args.workers if args.workers is not None else (os.cpu_count() or 1)
     if args.plugin:
-        results, neg_result = evaluate_with_plugin(gt_files, args.plugin)
+        results, neg_result = evaluate_with_plugin(gt_files, args.plugin, workers, args.assignment)
     else:
-        results, neg_result = evaluate_from_precomputed(gt_files)
+        results, neg_result = evaluate_from_precomputed(gt_files, workers, args.assignment)
 
     # Compute output paths
     res_path, rep_path = _output_paths(args.output_suffix)
@@ -278,6 +328,8 @@ def main() -> None:
 
     if args.plugin:
         aggregate["plugin"] = args.plugin
+    if args.assignment != "greedy":
+        aggregate["assignment"] = args.assignment
 
     if neg_result:
         aggregate["negative_case"] = neg_result
@@ -330,6 +382,15 @@ def main() -> None:
         neg = neg_result["negative_assessment"]
         print(f"\nNegative case (M68XPFA9): self_awareness={neg['self_awareness_score']:.3f}")
 
+    if args.compare_history:
+        history = [p for p in sorted(_OUTPUT_DIR.glob("evaluation_results_v*.json")) if p != res_path]
+        print(f"\nHistory ({len(history)} runs, delta = this run - previous):")
+        for row in compare_with_history(aggregate, history):
+            print(f"  {row['results']:40s}  composite={row['composite_mean']:.3f}  "
+                  f"delta={row['delta_mean']:+.3f}  "
+                  f"improved={row['improved']:2d}  regressed={row['regressed']:2d}  "
+                  f"(of {row['shared_files']})")
+
     print(f"\nResults:  {res_path}")
     print(f"Report:   {rep_path}")
 
@@ -13,10 +13,15 @@ Provides scoring dimensions:
 from __future__ import annotations
 
 import json
+import re
 import statistics
 from pathlib import Path
 from typing import Any
 
+CJK_CHAR_RE = re.compile(r'[一-鿿㐀-䶿豈-﫿]')
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+ASSIGNMENT_METHODS = ("greedy", "hungarian")
+
 
 # ---------------------------------------------------------------------------
 # Utility: text tokenization and similarity
@@ -29,11 +34,10 @@ def tokenize(text: str) -> set[str]:
     Preserves CJK characters as individual unigrams so that Chinese titles
     get meaningful similarity scores (not zeroed out by the Latin filter).
     """
-    import re
-    cjk_tokens = set(re.findall(r'[一-鿿㐀-䶿豈-﫿]', text))
-    latin = re.sub(r'[一-鿿㐀-䶿豈-﫿]', ' ', text)
+    cjk_tokens = set(CJK_CHAR_RE.findall(text))
+    latin = CJK_CHAR_RE.sub(' ', text)
     latin_tokens = set(
-        t for t in re.sub(r"[^a-z0-9]+", " ", latin.lower()).split()
+        t for t in NON_ALNUM_RE.sub(" ", latin.lower()).split()
         if len(t) >= 2
     )
     return cjk_tokens | latin_tokens
@@ -54,43 +58,189 @@ def jaccard_similarity(a: str, b: str) -> float:
 # ---------------------------------------------------------------------------
 
 
-def match_entries(
-    gt_items: list[dict[str, Any]],
-    pp_entries: list[dict[str, Any]],
-    threshold: float = 0.25,
-) -> dict[int, dict[str, Any]]:
-    """Greedy 1:1 matching of GT items to PP entries by raw text Jaccard.
+def _pp_raw(pp_entry: dict[str, Any]) -> str:
+    return pp_entry.get("raw", "") or pp_entry.get("source_text", "") or ""
 
-    Returns {gt_index: {"pp_index": int, "similarity": float}}.
+
+def similarity_matrix(
+    gt_raws: list[str],
+    pp_raws: list[str],
+    *,
+    include_zero: bool = False,
+) -> list[dict[int, float]]:
+    """Sparse GT x PP Jaccard matrix: one ``{pp_index: similarity}`` row per GT raw.
+
+    Each string is tokenized once into interned token ids; intersections are
+    counted through an inverted index over the PP side, so pairs sharing no
+    token cost nothing.  Values equal ``jaccard_similarity`` exactly.  Empty PP
+    strings never appear; zero-similarity pairs only with ``include_zero``.
     """
+    vocabulary: dict[str, int] = {}
+
+    def _ids(text: str) -> frozenset[int]:
+        return frozenset(vocabulary.setdefault(token, len(vocabulary)) for token in tokenize(text))
+
+    pp_tokens = [_ids(raw) if raw else frozenset() for raw in pp_raws]
+    postings: dict[int, list[int]] = {}
+    for pi, tokens in enumerate(pp_tokens):
+        for token in tokens:
+            postings.setdefault(token, []).append(pi)
+    non_empty_pp = [pi for pi, raw in enumerate(pp_raws) if raw]
+
+    rows: list[dict[int, float]] = []
+    for gt_raw in gt_raws:
+        gt_tokens = _ids(gt_raw)
+        counts: dict[int, int] = {}
+        for token in gt_tokens:
+            for pi in postings.get(token, ()):
+                counts[pi] = counts.get(pi, 0) + 1
+        row = {
+            pi: count / (len(gt_tokens) + len(pp_tokens[pi]) - count)
+            for pi, count in counts.items()
+        }
+        if include_zero:
+            row = {pi: row.get(pi, 0.0) for pi in non_empty_pp}
+        rows.append(row)
+    return rows
+
+
+def _greedy_assignment(rows: list[dict[int, float]], threshold: float) -> dict[int, dict[str, Any]]:
     matches: dict[int, dict[str, Any]] = {}
     used_pp: set[int] = set()
-
-    for gi, gt_item in enumerate(gt_items):
-        gt_raw = gt_item.get("raw", "")
+    for gi, row in enumerate(rows):
         best_score = threshold
         best_pi = None
-
-        for pi, pp_entry in enumerate(pp_entries):
-            if pi in used_pp:
-                continue
-            pp_raw = (pp_entry.get("raw", "")
-                      or pp_entry.get("source_text", "")
-                      or "")
-            if not pp_raw:
-                continue
-            score = jaccard_similarity(gt_raw, pp_raw)
-            if score > best_score:
-                best_score = score
+        for pi in sorted(row):
+            if pi not in used_pp and row[pi] > best_score:
+                best_score = row[pi]
                 best_pi = pi
-
         if best_pi is not None:
             used_pp.add(best_pi)
             matches[gi] = {"pp_index": best_pi, "similarity": best_score}
-
     return matches
 
 
+def _hungarian(weights: list[list[float]]) -> list[int]:
+    """Max-weight assignment for an n x m matrix with n <= m; returns the column per row."""
+    n, m = len(weights), len(weights[0])
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    owner = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            row = weights[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = -row[j - 1] - u[i0] - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+    columns = [0] * n
+    for j in range(1, m + 1):
+        if owner[j]:
+            columns[owner[j] - 1] = j - 1
+    return columns
+
+
+def _optimal_assignment(rows: list[dict[int, float]], threshold: float) -> dict[int, dict[str, Any]]:
+    """Maximize total similarity over pairs above ``threshold``.
+
+    The bipartite graph of admissible pairs is split into connected
+    components first, so the cubic solver only sees small blocks.
+    """
+    edges = [{pi: score for pi, score in row.items() if score > threshold} for row in rows]
+    pp_to_gt: dict[int, list[int]] = {}
+    for gi, row in enumerate(edges):
+        for pi in row:
+            pp_to_gt.setdefault(pi, []).append(gi)
+
+    matches: dict[int, dict[str, Any]] = {}
+    seen_gt: set[int] = set()
+    for start in range(len(edges)):
+        if start in seen_gt or not edges[start]:
+            continue
+        component_gt: list[int] = []
+        component_pp: set[int] = set()
+        stack = [start]
+        seen_gt.add(start)
+        while stack:
+            gi = stack.pop()
+            component_gt.append(gi)
+            for pi in edges[gi]:
+                if pi in component_pp:
+                    continue
+                component_pp.add(pi)
+                for other in pp_to_gt[pi]:
+                    if other not in seen_gt:
+                        seen_gt.add(other)
+                        stack.append(other)
+        gts = sorted(component_gt)
+        pps = sorted(component_pp)
+        weights = [[edges[gi].get(pi, 0.0) for pi in pps] for gi in gts]
+        if len(gts) <= len(pps):
+            pairs = zip(gts, (pps[column] for column in _hungarian(weights)))
+        else:
+            transposed = [list(column) for column in zip(*weights)]
+            pairs = zip((gts[row] for row in _hungarian(transposed)), pps)
+        for gi, pi in pairs:
+            if pi in edges[gi]:
+                matches[gi] = {"pp_index": pi, "similarity": edges[gi][pi]}
+    return dict(sorted(matches.items()))
+
+
+def match_entries(
+    gt_items: list[dict[str, Any]],
+    pp_entries: list[dict[str, Any]],
+    threshold: float = 0.25,
+    assignment: str = "greedy",
+) -> dict[int, dict[str, Any]]:
+    """1:1 matching of GT items to PP entries by raw text Jaccard.
+
+    ``assignment="greedy"`` gives each GT item, in order, its best unused PP
+    entry (ties go to the lowest PP index); ``"hungarian"`` maximizes the total
+    similarity of the matching instead.
+
+    Returns {gt_index: {"pp_index": int, "similarity": float}}.
+    """
+    if assignment not in ASSIGNMENT_METHODS:
+        raise ValueError(f"Unknown assignment {assignment!r}. Available: {', '.join(ASSIGNMENT_METHODS)}")
+    rows = similarity_matrix(
+        [gt_item.get("raw", "") or "" for gt_item in gt_items],
+        [_pp_raw(pp_entry) for pp_entry in pp_entries],
+        include_zero=threshold < 0,
+    )
+    if assignment == "hungarian":
+        return _optimal_assignment(rows, threshold)
+    return _greedy_assignment(rows, threshold)
+
+
 # ---------------------------------------------------------------------------
 # Best candidate extraction
 # ---------------------------------------------------------------------------
@@ -181,17 +331,8 @@ def _word_f1(pred_text: str, gt_text: str) -> float:
 
     CJK characters are preserved as individual unigrams (same as tokenize).
     """
-    import re
-    def _tok(s: str) -> set[str]:
-        cjk = set(re.findall(r'[一-鿿㐀-䶿豈-﫿]', s))
-        latin = re.sub(r'[一-鿿㐀-䶿豈-﫿]', ' ', s)
-        words = set(
-            t for t in re.sub(r"[^a-z0-9]+", " ", latin.lower()).split()
-            if len(t) >= 2
-        )
-        return cjk | words
-    pred_tokens = _tok(pred_text)
-    gt_tokens = _tok(gt_text)
+    pred_tokens = tokenize(pred_text)
+    gt_tokens = tokenize(gt_text)
     if not gt_tokens and not pred_tokens:
         return 1.0
     if not gt_tokens or not pred_tokens:
@@ -340,6 +481,7 @@ def compute_composite(scores: dict[str, dict[str, Any]]) -> float:
 def evaluate_file(
     gt_data: dict[str, Any],
     pp_data: dict[str, Any],
+    assignment: str = "greedy",
 ) -> dict[str, Any]:
     """Run all scoring dimensions on a single GT/PP pair."""
     gt_items = gt_data.get("items", [])
@@ -349,7 +491,7 @@ def evaluate_file(
     pp_count = pp_meta.get("entry_count", len(pp_entries))
 
     # Alignment
-    matches = match_entries(gt_items, pp_entries)
+    matches = match_entries(gt_items, pp_entries, assignment=assignment)
 
     # Dimensions
     scores: dict[str, dict[str, Any]] = {}
@@ -1,27 +1,16 @@
 from __future__ import annotations
 
-import argparse
-import contextlib
-import io
-import json
-import tempfile
 from pathlib import Path
 from typing import Any
 
 from . import deterministic_core
+from . import profiling
 
 
 def reference_hard_quality_reason_codes(item: dict[str, Any]) -> list[str]:
     return deterministic_core.reference_hard_quality_reason_codes(item)
 
 
-def _temp_payload(payload: dict[str, Any]) -> Path:
-    tmp = tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".json", delete=False)
-    with tmp:
-        json.dump(payload, tmp, ensure_ascii=False)
-    return Path(tmp.name)
-
-
 def call_algorithm_handler(
     handler_name: str,
     db_path: Path,
@@ -30,35 +19,10 @@ def call_algorithm_handler(
     **extra: Any,
 ) -> tuple[dict[str, Any], int]:
     handler = getattr(deterministic_core, handler_name)
-    temp_path: Path | None = None
-    payload_file = ""
-    if payload is not None:
-        temp_path = _temp_payload(payload)
-        payload_file = str(temp_path)
-    namespace_values = {
-        "db_path": str(db_path.resolve()),
-        "payload_file": payload_file,
-        "out_path": "",
-        "persist_db_only": False,
-        "mode": "",
-        "source_path": "",
-        "preprocess_artifact": "",
-        "in_path": "",
-        "out_dir": "",
-        **extra,
-    }
-    args = argparse.Namespace(**namespace_values)
-    stream = io.StringIO()
-    try:
-        with contextlib.redirect_stdout(stream):
-            code = handler(args)
-    finally:
-        if temp_path is not None:
-            temp_path.unlink(missing_ok=True)
-    stdout = stream.getvalue().strip()
-    try:
-        result = json.loads(stdout) if stdout else {}
-    except json.JSONDecodeError:
-        result = {"error": {"code": "algorithm_handler_invalid_json", "message": stdout or "algorithm handler produced no JSON"}}
-        code = 1
+    with profiling.stage_timer(f"deterministic_core.{handler_name}", db_path=db_path.resolve(), category="deterministic_core") as detail:
+        if payload is not None:
+            result, code = handler(db_path.resolve(), payload, **extra)
+        else:
+            result, code = handler(db_path.resolve(), **extra)
+        detail["exit_code"] = int(code)
     return result, int(code)
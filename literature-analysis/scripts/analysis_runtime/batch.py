@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from . import citations
+from . import gate_contract
+from . import references
+from . import runtime
+from . import runtime_db
+from . import stages
+
+
+BATCH_SUMMARY_FILENAME = "batch_summary.json"
+MAX_STEPS_PER_PAPER = 8
+INIT_RAW_ACTIONS = {"", "confirm_runtime_paths", "bootstrap_runtime_db", "persist_render_templates", "normalize_source"}
+RENDER_RAW_ACTIONS = {"render_and_validate", "render_score_only"}
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    source_path: str
+    working_dir: str
+    language: str = "zh-CN"
+    identifier: str = ""
+    score_only: bool = False
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    model: str = ""
+    reference_api_cache_dir: str = ""
+    reference_api_cache_ttl_seconds: float | None = None
+    reference_api_cache_max_bytes: int | None = None
+    reference_api_concurrent: bool = False
+    reference_api_deadline_seconds: float | None = None
+    reference_api_replay: str = ""
+    reference_api_record_dir: str = ""
+    sqlite_profile: str = "default"
+    db_write_strategy: str = "replace"
+    citation_full_document: bool = False
+    conversion_cache: bool = True
+    conversion_cache_dir: str = ""
+    conversion_cache_max_bytes: int | None = None
+    pdf_extract_workers: int = 1
+    template_bytecode_cache_dir: str = ""
+    reference_candidate_cache: bool = True
+    reference_candidate_cache_dir: str = ""
+    reference_store_path: str = ""
+    stage_timings: bool = False
+
+
+def _working_dir_name(source_path: Path) -> str:
+    stem = re.sub(r"[^A-Za-z0-9._-]+", "-", source_path.stem).strip("-") or "paper"
+    digest = hashlib.sha256(str(source_path).encode("utf-8")).hexdigest()[:8]
+    return f"{stem[:48]}-{digest}"
+
+
+def _item_for_source(
+    source_path: Path,
+    output_root: Path,
+    *,
+    language: str,
+    identifier: str = "",
+    score_only: bool = False,
+    working_dir: str = "",
+) -> BatchItem:
+    resolved = source_path.expanduser().resolve()
+    return BatchItem(
+        source_path=str(resolved),
+        working_dir=str(Path(working_dir).expanduser().resolve() if working_dir else output_root / _working_dir_name(resolved)),
+        language=language,
+        identifier=identifier,
+        score_only=score_only,
+    )
+
+
+def discover_sources(manifest: str, output_root: Path, *, language: str = "zh-CN") -> list[BatchItem]:
+    manifest_path = Path(manifest).expanduser()
+    items: list[BatchItem] = []
+    if manifest_path.suffix == ".jsonl" and manifest_path.is_file():
+        for line_number, line in enumerate(manifest_path.read_text(encoding="utf-8").splitlines(), start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict) or not str(record.get("source_path") or "").strip():
+                raise ValueError(f"manifest line {line_number} must be an object with source_path")
+            source_path = Path(str(record["source_path"])).expanduser()
+            if not source_path.is_absolute():
+                source_path = manifest_path.parent / source_path
+            items.append(
+                _item_for_source(
+                    source_path,
+                    output_root,
+                    language=str(record.get("language") or language),
+                    identifier=str(record.get("identifier") or ""),
+                    score_only=bool(record.get("score_only", False)),
+                    working_dir=str(record.get("working_dir") or ""),
+                )
+            )
+    elif manifest_path.is_dir():
+        for pattern in ("*.md", "*.pdf", "*.tex"):
+            items.extend(
+                _item_for_source(path, output_root, language=language)
+                for path in sorted(manifest_path.glob(pattern))
+            )
+    else:
+        items.extend(
+            _item_for_source(Path(path), output_root, language=language)
+            for path in sorted(glob.glob(os.path.expanduser(manifest), recursive=True))
+            if Path(path).is_file()
+        )
+    seen: set[str] = set()
+    unique: list[BatchItem] = []
+    for item in items:
+        if item.working_dir in seen:
+            continue
+        seen.add(item.working_dir)
+        unique.append(item)
+    return unique
+
+
+def _raw_next_action(db_path: Path) -> str:
+    if not db_path.exists():
+        return ""
+    try:
+        with runtime_db.connect_db(db_path) as connection:
+            state = runtime_db.fetch_workflow_state(connection) or {}
+    except sqlite3.Error:
+        return ""
+    return str(state.get("next_action") or "")
+
+
+def _run_step(item: BatchItem, options: BatchOptions, db_path: Path, raw_next_action: str) -> tuple[str, dict[str, Any], int] | None:
+    if raw_next_action in INIT_RAW_ACTIONS:
+        working_dir = Path(item.working_dir)
+        result, code = stages.init_runtime(
+            working_dir=working_dir,
+            db_path=db_path,
+            output_dir=working_dir,
+            source_path=Path(item.source_path),
+            language=item.language,
+            model=options.model,
+            score_only=item.score_only,
+            identifier=item.identifier,
+            reference_api_cache_dir=options.reference_api_cache_dir,
+            reference_api_cache_ttl_seconds=options.reference_api_cache_ttl_seconds,
+            reference_api_cache_max_bytes=options.reference_api_cache_max_bytes,
+            reference_api_concurrent=options.reference_api_concurrent,
+            reference_api_deadline_seconds=options.reference_api_deadline_seconds,
+            reference_api_replay=options.reference_api_replay,
+            reference_api_record_dir=options.reference_api_record_dir,
+            sqlite_profile=options.sqlite_profile,
+            db_write_strategy=options.db_write_strategy,
+            citation_full_document=options.citation_full_document,
+            conversion_cache=options.conversion_cache,
+            conversion_cache_dir=options.conversion_cache_dir,
+            conversion_cache_max_bytes=options.conversion_cache_max_bytes,
+            pdf_extract_workers=options.pdf_extract_workers,
+            template_bytecode_cache_dir=options.template_bytecode_cache_dir,
+            reference_candidate_cache=options.reference_candidate_cache,
+            reference_candidate_cache_dir=options.reference_candidate_cache_dir,
+            reference_store_path=options.reference_store_path,
+            stage_timings=options.stage_timings,
+        )
+        return "init_runtime", result, code
+    if raw_next_action == "prepare_references_workset":
+        result, code = references.prepare_reference_workset(db_path)
+        return "prepare_references_workset", result, code
+    if raw_next_action == "prepare_citation_workset":
+        result, code = citations.prepare_citation_workset(db_path)
+        return "prepare_citation_workset", result, code
+    if raw_next_action in RENDER_RAW_ACTIONS:
+        result, code = stages.render_public_outputs(db_path)
+        return "finalize_outputs", result, code
+    return None
+
+
+def run_paper(item: BatchItem, options: BatchOptions) -> dict[str, Any]:
+    started = time.perf_counter()
+    working_dir = Path(item.working_dir)
+    db_path = runtime.default_db_path(working_dir)
+    working_dir.mkdir(parents=True, exist_ok=True)
+    steps: list[str] = []
+    error: dict[str, Any] | None = None
+    db_stats: dict[str, int] = {}
+    raw_next_action = _raw_next_action(db_path)
+    resumed = raw_next_action not in INIT_RAW_ACTIONS
+    try:
+        with runtime_db.connection_scope() as db_stats:
+            for _ in range(MAX_STEPS_PER_PAPER):
+                step = _run_step(item, options, db_path, raw_next_action)
+                if step is None:
+                    break
+                action, result, code = step
+                steps.append(action)
+                if code != 0:
+                    error = result.get("error") or {"code": f"{action}_failed", "message": f"{action} exited with {code}"}
+                    break
+                next_raw_action = _raw_next_action(db_path)
+                if next_raw_action == raw_next_action:
+                    break
+                raw_next_action = next_raw_action
+    except Exception as exc:  # noqa: BLE001 - one paper must not abort the batch
+        error = {"code": "batch_step_exception", "message": f"{type(exc).__name__}: {exc}"}
+    status = "failed" if error else ("completed" if raw_next_action == "completed" else "waiting_for_agent")
+    return {
+        "source_path": item.source_path,
+        "working_dir": item.working_dir,
+        "db_path": str(db_path),
+        "status": status,
+        "steps": steps,
+        "resumed": resumed,
+        "next_action": gate_contract.local_next_action(raw_next_action),
+        "raw_next_action": raw_next_action,
+        "error": error,
+        "db_stats": dict(db_stats),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def run_batch(items: list[BatchItem], options: BatchOptions, *, output_root: Path, workers: int = 1) -> dict[str, Any]:
+    started = time.perf_counter()
+    output_root.mkdir(parents=True, exist_ok=True)
+    if workers <= 1 or len(items) <= 1:
+        papers = [run_paper(item, options) for item in items]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(items))) as executor:
+            papers = list(executor.map(run_paper, items, [options] * len(items)))
+    status_counts: dict[str, int] = {}
+    next_action_counts: dict[str, int] = {}
+    for paper in papers:
+        status_counts[paper["status"]] = status_counts.get(paper["status"], 0) + 1
+        next_action_counts[paper["next_action"]] = next_action_counts.get(paper["next_action"], 0) + 1
+    summary = {
+        "kind": "literature_analysis_batch",
+        "output_root": str(output_root),
+        "paper_count": len(papers),
+        "workers": max(1, min(workers, len(items))) if items else 1,
+        "status_counts": dict(sorted(status_counts.items())),
+        "next_action_counts": dict(sorted(next_action_counts.items())),
+        "options": asdict(options),
+        "papers": papers,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+    summary_path = output_root / BATCH_SUMMARY_FILENAME
+    summary_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    summary["summary_path"] = str(summary_path)
+    return summary
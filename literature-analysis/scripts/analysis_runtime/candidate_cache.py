@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+CACHE_INDEX_FILENAME = "candidates.db"
+CACHE_FORMAT_VERSION = "2"
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+DEFAULT_MEMORY_ENTRIES = 4096
+SQLITE_TIMEOUT_SECONDS = 30.0
+
+_MEMORY: OrderedDict[str, str] = OrderedDict()
+
+
+@dataclass(frozen=True)
+class CandidateCache:
+    root: Path | None
+    max_bytes: int = DEFAULT_MAX_BYTES
+    memory_entries: int = DEFAULT_MEMORY_ENTRIES
+
+
+def cache_from_runtime_inputs(inputs: dict[str, str]) -> CandidateCache | None:
+    if inputs.get("reference_candidate_cache", "").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    root = inputs.get("reference_candidate_cache_dir", "").strip()
+    return CandidateCache(root=Path(root).expanduser().resolve() if root else None)
+
+
+@functools.lru_cache(maxsize=8)
+def code_fingerprint(*paths: Path) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(
+    *,
+    raw: str,
+    source_format: str,
+    label_metadata: dict[str, Any],
+    algorithm_version: str,
+    code_version: str = "",
+) -> str:
+    material = json.dumps(
+        [CACHE_FORMAT_VERSION, algorithm_version, code_version, source_format, label_metadata, raw],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _connect(root: Path) -> sqlite3.Connection:
+    root.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(root / CACHE_INDEX_FILENAME, timeout=SQLITE_TIMEOUT_SECONDS)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS candidates (
+            cache_key TEXT PRIMARY KEY,
+            payload TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            stored_at REAL NOT NULL,
+            last_access_at REAL NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS candidates_last_access
+            ON candidates(last_access_at);
+        """
+    )
+    return connection
+
+
+def _remember(cache: CandidateCache, key: str, payload: str) -> None:
+    _MEMORY[key] = payload
+    _MEMORY.move_to_end(key)
+    while len(_MEMORY) > cache.memory_entries:
+        _MEMORY.popitem(last=False)
+
+
+class CandidateCacheSession:
+    def __init__(self, cache: CandidateCache) -> None:
+        self.cache = cache
+        self.stats = {"memory_hits": 0, "persistent_hits": 0, "misses": 0}
+        self._connection: sqlite3.Connection | None = None
+        self._touched: list[str] = []
+        self._stored: list[tuple[str, str]] = []
+        if cache.root is not None:
+            try:
+                self._connection = _connect(cache.root)
+            except (OSError, sqlite3.Error):
+                self._connection = None
+
+    def lookup(self, key: str) -> list[dict[str, Any]] | None:
+        payload = _MEMORY.get(key)
+        if payload is not None:
+            _MEMORY.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            self._touched.append(key)
+            return json.loads(payload)
+        if self._connection is not None:
+            try:
+                row = self._connection.execute("SELECT payload FROM candidates WHERE cache_key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is not None:
+                payload = str(row["payload"])
+                _remember(self.cache, key, payload)
+                self.stats["persistent_hits"] += 1
+                self._touched.append(key)
+                return json.loads(payload)
+        self.stats["misses"] += 1
+        return None
+
+    def store(self, key: str, candidates: list[dict[str, Any]]) -> None:
+        payload = json.dumps(candidates, ensure_ascii=False, sort_keys=True)
+        _remember(self.cache, key, payload)
+        self._stored.append((key, payload))
+
+    def close(self, *, now: float | None = None) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        current = time.time() if now is None else now
+        try:
+            connection.executemany(
+                """
+                INSERT INTO candidates (cache_key, payload, size_bytes, stored_at, last_access_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    payload = excluded.payload,
+                    size_bytes = excluded.size_bytes,
+                    last_access_at = excluded.last_access_at
+                """,
+                [(key, payload, len(payload.encode("utf-8")), current, current) for key, payload in self._stored],
+            )
+            connection.executemany(
+                "UPDATE candidates SET last_access_at = ? WHERE cache_key = ?",
+                [(current, key) for key in self._touched],
+            )
+            _evict(connection, self.cache)
+            connection.commit()
+        except sqlite3.Error:
+            connection.rollback()
+        finally:
+            connection.close()
+
+    def __enter__(self) -> CandidateCacheSession:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _evict(connection: sqlite3.Connection, cache: CandidateCache) -> int:
+    row = connection.execute("SELECT COALESCE(SUM(size_bytes), 0) AS total FROM candidates").fetchone()
+    excess = int(row["total"]) - cache.max_bytes
+    if excess <= 0:
+        return 0
+    evicted: list[str] = []
+    for row in connection.execute("SELECT cache_key, size_bytes FROM candidates ORDER BY last_access_at ASC, stored_at ASC"):
+        if excess <= 0:
+            break
+        evicted.append(str(row["cache_key"]))
+        excess -= int(row["size_bytes"])
+    connection.executemany("DELETE FROM candidates WHERE cache_key = ?", [(key,) for key in evicted])
+    return len(evicted)
+
+
+def clear_memory() -> None:
+    _MEMORY.clear()
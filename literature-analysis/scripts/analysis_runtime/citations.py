@@ -6,6 +6,7 @@ from typing import Any
 
 from .algorithm_adapter import call_algorithm_handler
 from . import agent_work
+from . import profiling
 from . import runtime_db
 
 
@@ -400,8 +401,9 @@ def _summary_basis_from_reviews(reviews: list[dict[str, Any]]) -> dict[str, Any]
     }
 
 
+@profiling.timed("citations.prepare_citation_workset", category="citations")
 def prepare_citation_workset(db_path: Path) -> tuple[dict[str, Any], int]:
-    payload, code = call_algorithm_handler("_handle_prepare_citation_workset", db_path, payload={})
+    payload, code = call_algorithm_handler("prepare_citation_workset", db_path, payload={})
     return payload, int(code)
 
 
@@ -438,6 +440,7 @@ def enrich_citation_workset_payload(payload: dict[str, Any]) -> dict[str, Any]:
     return payload
 
 
+@profiling.timed("citations.persist_citation_analysis", category="citations")
 def persist_citation_analysis(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
     workset_items = _load_citation_workset_items(db_path)
     errors, normalized_reviews, timeline_summaries, summary_text, warnings = _citation_payload_errors(payload, workset_items)
@@ -455,21 +458,21 @@ def persist_citation_analysis(db_path: Path, payload: dict[str, Any]) -> tuple[d
             runtime_db.add_runtime_warning_once(connection, warning)
         connection.commit()
     semantics, code = call_algorithm_handler(
-        "_handle_persist_citation_semantics",
+        "persist_citation_semantics",
         db_path,
         payload={"items": normalized_reviews},
     )
     if code != 0:
         return semantics, code
     timeline, code = call_algorithm_handler(
-        "_handle_persist_citation_timeline",
+        "persist_citation_timeline",
         db_path,
         payload=_derive_timeline_payload(workset_items, timeline_summaries, normalized_reviews),
     )
     if code != 0:
         return {"citation_semantics": semantics, "citation_timeline": timeline, "error": timeline.get("error")}, code
     summary, code = call_algorithm_handler(
-        "_handle_persist_citation_summary",
+        "persist_citation_summary",
         db_path,
         payload={"summary": summary_text, "basis": _summary_basis_from_reviews(normalized_reviews)},
     )
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+CACHE_INDEX_FILENAME = "index.db"
+CACHE_OBJECTS_DIRNAME = "objects"
+CACHE_FORMAT_VERSION = "1"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+SQLITE_TIMEOUT_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class ConversionCache:
+    root: Path
+    max_bytes: int = DEFAULT_MAX_BYTES
+
+
+def cache_from_runtime_inputs(inputs: dict[str, str]) -> ConversionCache | None:
+    if inputs.get("conversion_cache", "").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    root = inputs.get("conversion_cache_dir", "").strip()
+    if not root:
+        return None
+    try:
+        max_bytes = int(inputs.get("conversion_cache_max_bytes", "") or DEFAULT_MAX_BYTES)
+    except ValueError:
+        max_bytes = DEFAULT_MAX_BYTES
+    return ConversionCache(root=Path(root).expanduser().resolve(), max_bytes=max_bytes)
+
+
+def cache_key(*, input_hash: str, source_type: str, backend: str, backend_version: str, disable_pymupdf4llm: bool) -> str:
+    parts = [CACHE_FORMAT_VERSION, input_hash, source_type, backend, backend_version, "1" if disable_pymupdf4llm else "0"]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def file_sha256(path: Path) -> str:
+    sha = hashlib.sha256()
+    try:
+        with path.open("rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                sha.update(chunk)
+    except OSError:
+        return ""
+    return sha.hexdigest()
+
+
+def _connect(cache: ConversionCache) -> sqlite3.Connection:
+    cache.root.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(cache.root / CACHE_INDEX_FILENAME, timeout=SQLITE_TIMEOUT_SECONDS)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS conversions (
+            cache_key TEXT PRIMARY KEY,
+            object_sha256 TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            stored_at REAL NOT NULL,
+            last_access_at REAL NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS conversions_last_access
+            ON conversions(last_access_at);
+        """
+    )
+    return connection
+
+
+def _object_path(cache: ConversionCache, sha256: str) -> Path:
+    return cache.root / CACHE_OBJECTS_DIRNAME / sha256[:2] / f"{sha256}.json"
+
+
+def _drop_entry(connection: sqlite3.Connection, cache: ConversionCache, key: str, sha256: str) -> None:
+    connection.execute("DELETE FROM conversions WHERE cache_key = ?", (key,))
+    row = connection.execute("SELECT COUNT(*) AS refs FROM conversions WHERE object_sha256 = ?", (sha256,)).fetchone()
+    if int(row["refs"]) == 0:
+        _object_path(cache, sha256).unlink(missing_ok=True)
+
+
+def _dependencies_match(dependencies: object) -> bool:
+    if not isinstance(dependencies, dict):
+        return False
+    return all(file_sha256(Path(str(path))) == str(sha256) for path, sha256 in dependencies.items())
+
+
+def lookup(cache: ConversionCache, key: str, *, now: float | None = None) -> dict[str, Any] | None:
+    current = time.time() if now is None else now
+    try:
+        with closing(_connect(cache)) as connection:
+            row = connection.execute("SELECT object_sha256 FROM conversions WHERE cache_key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            sha256 = str(row["object_sha256"])
+            try:
+                data = _object_path(cache, sha256).read_bytes()
+            except FileNotFoundError:
+                data = b""
+            entry = json.loads(data.decode("utf-8")) if hashlib.sha256(data).hexdigest() == sha256 else None
+            if not isinstance(entry, dict) or not _dependencies_match(entry.get("dependencies")):
+                _drop_entry(connection, cache, key, sha256)
+                connection.commit()
+                return None
+            connection.execute("UPDATE conversions SET last_access_at = ? WHERE cache_key = ?", (current, key))
+            connection.commit()
+    except (OSError, sqlite3.Error, ValueError):
+        return None
+    return entry
+
+
+def store(
+    cache: ConversionCache,
+    key: str,
+    *,
+    markdown: str,
+    meta: dict[str, Any],
+    warnings: list[str],
+    dependencies: list[Path],
+    now: float | None = None,
+) -> str | None:
+    current = time.time() if now is None else now
+    entry = {
+        "markdown": markdown,
+        "meta": meta,
+        "warnings": warnings,
+        "dependencies": {str(path): file_sha256(path) for path in dependencies},
+    }
+    data = json.dumps(entry, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    if len(data) > cache.max_bytes:
+        return None
+    sha256 = hashlib.sha256(data).hexdigest()
+    try:
+        path = _object_path(cache, sha256)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        with closing(_connect(cache)) as connection:
+            previous = connection.execute("SELECT object_sha256 FROM conversions WHERE cache_key = ?", (key,)).fetchone()
+            if previous is not None and str(previous["object_sha256"]) != sha256:
+                _drop_entry(connection, cache, key, str(previous["object_sha256"]))
+            connection.execute(
+                """
+                INSERT INTO conversions (cache_key, object_sha256, size_bytes, stored_at, last_access_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    object_sha256 = excluded.object_sha256,
+                    size_bytes = excluded.size_bytes,
+                    stored_at = excluded.stored_at,
+                    last_access_at = excluded.last_access_at
+                """,
+                (key, sha256, len(data), current, current),
+            )
+            _evict(connection, cache)
+            connection.commit()
+    except (OSError, sqlite3.Error):
+        return None
+    return sha256
+
+
+def _evict(connection: sqlite3.Connection, cache: ConversionCache) -> int:
+    evicted = 0
+    while True:
+        row = connection.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) AS total FROM (SELECT DISTINCT object_sha256, size_bytes FROM conversions)"
+        ).fetchone()
+        if int(row["total"]) <= cache.max_bytes:
+            return evicted
+        oldest = connection.execute(
+            "SELECT cache_key, object_sha256 FROM conversions ORDER BY last_access_at ASC, stored_at ASC LIMIT 1"
+        ).fetchone()
+        if oldest is None:
+            return evicted
+        _drop_entry(connection, cache, str(oldest["cache_key"]), str(oldest["object_sha256"]))
+        evicted += 1
@@ -1,23 +1,32 @@
 from __future__ import annotations
 
 import argparse
+import copy
+import difflib
 import hashlib
 import json
 import math
+import mmap
 import os
 import re
 import sys
 import unicodedata
 import zlib
+from collections import deque
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
-
-from jinja2 import Environment, FileSystemLoader, StrictUndefined
-from jsonschema import validate  # type: ignore[import-untyped]
+from typing import TYPE_CHECKING, Any
 
+from . import candidate_cache
+from . import conversion_cache
+from . import profiling
 from . import reference_api
+from . import render_engine
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
 
 if hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(encoding="utf-8")
@@ -63,7 +72,8 @@ from .runtime_db import (  # noqa: E402
     fetch_runtime_inputs,
     fetch_section_scope,
     fetch_source_identity,
-    fetch_source_document,
+    fetch_source_document_metadata,
+    fetch_source_lines,
     fetch_workflow_state,
     initialize_database,
     is_score_only,
@@ -91,7 +101,7 @@ from .runtime_db import (  # noqa: E402
     store_representative_image,
     store_outline_nodes,
     store_reference_extraction_decision,
-    store_reference_batch,
+    store_reference_batches,
     store_reference_entries,
     store_reference_items,
     store_reference_metadata_enrichment_workset,
@@ -100,6 +110,7 @@ from .runtime_db import (  # noqa: E402
     store_section_scope,
     store_source_identity,
     store_source_document,
+    update_source_document_metadata,
     update_reference_metadata_enrichment_statuses,
     is_reference_extraction_abandoned,
 )
@@ -120,6 +131,8 @@ REFERENCE_PARSE_AUDIT_FILENAME = "reference_parse_audit.json"
 REFERENCE_SPLIT_REVIEW_AUDIT_FILENAME = "reference_split_review_audit.json"
 RESULT_JSON_FILENAME = "literature-analysis.result.json"
 PDF_SIGNATURE = b"%PDF-"
+NORMALIZED_SOURCE_CONVERTER_VERSION = "2"
+CONVERSION_CACHE_META_KEYS = {"conversion_backend", "fallback_reason", "main_tex_path", "included_tex_files", "bib_files"}
 LATEX_INCLUDE_RE = re.compile(r"\\(?:input|include)\{([^}]+)\}")
 LATEX_BIBLIOGRAPHY_RE = re.compile(r"\\bibliography\{([^}]+)\}")
 LATEX_ADDBIBRESOURCE_RE = re.compile(r"\\addbibresource(?:\[[^\]]*\])?\{([^}]+)\}")
@@ -138,6 +151,8 @@ YEAR_RE = re.compile(r"\b((?:19|20)\d{2})[a-z]?\b")
 RANGE_RE = re.compile(r"^(\d+)\s*[-–—]\s*(\d+)$")
 NUMBER_RE = re.compile(r"^\d+$")
 SURNAME_RE = re.compile(r"[A-Za-z][A-Za-z'`-]+")
+AUTHOR_YEAR_SUFFIX_RE = re.compile(r"\b((?:19|20)\d{2})([a-z])\b")
+AUTHOR_YEAR_FUZZY_MIN_RATIO = 0.85
 REFERENCES_RE = re.compile(r"\b(references|bibliography)\b|参考文献", re.IGNORECASE)
 MARKDOWN_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)\n]+\)")
 URL_RE = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
@@ -154,6 +169,11 @@ DATE_LIKE_RE = re.compile(
     r"\s+\d{1,2},?\s+\d{4})\b",
     re.IGNORECASE,
 )
+CITATION_CANDIDATE_RE = re.compile(
+    r"\[|\([^\n]*?(?:19|20)\d{2}|\\cite|https?://|www\.|\.(?:png|jpe?g|gif|svg|pdf)\b|\d[-/]\d|"
+    r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*[^\S\n]+\d",
+    re.IGNORECASE,
+)
 TERMINAL_PUBLICATION_YEAR_RE = re.compile(r"\b((?:19|20)\d{2})[a-z]?\b(?!\.\d)")
 REFERENCE_TAIL_RE = re.compile(r"(?:\((?:19|20)\d{2}[a-z]?\)|(?:19|20)\d{2}[a-z]?)(?:\.)?(?=\s|$)")
 REFERENCE_TAIL_AT_END_RE = re.compile(r"(?:\((?:19|20)\d{2}[a-z]?\)|(?:19|20)\d{2}[a-z]?)(?:\.)?\s*$")
@@ -348,6 +368,10 @@ REFERENCE_IDENTIFIER_TITLE_RE = re.compile(
 LITERAL_STRING_RE = re.compile(r"\((?:\\.|[^\\)])*\)")
 TJ_ARRAY_RE = re.compile(r"\[(.*?)\]\s*TJ", re.DOTALL)
 TJ_SINGLE_RE = re.compile(r"(\((?:\\.|[^\\)])*\))\s*Tj")
+PDF_LITERAL_ESCAPE_RE = re.compile(r"\\([0-7]{1,3}|.)|\\\Z", re.DOTALL)
+PDF_LITERAL_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", "b": "\b", "f": "\f"}
+PDF_STREAM_MAX_INFLATED_BYTES = 256 * 1024 * 1024
+PDF_EXTRACT_WINDOW_PER_WORKER = 4
 
 ACTION_RECEIPT_INVALIDATIONS: dict[str, list[str]] = {
     "confirm_runtime_paths": [
@@ -643,6 +667,16 @@ def _resolve_cli_path(path_value: str) -> Path | None:
     return Path(path_value).expanduser().resolve()
 
 
+def _cli_db_path(args: argparse.Namespace) -> Path:
+    return Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
+
+
+def _emit(result: tuple[dict[str, Any], int]) -> int:
+    payload, code = result
+    print(json.dumps(payload, ensure_ascii=False))
+    return code
+
+
 def _normalized_output_dir(path_value: str) -> Path:
     if path_value:
         return Path(path_value).expanduser().resolve()
@@ -732,8 +766,25 @@ def _missing_required_receipts(connection, actions: tuple[str, ...]) -> list[str
     return [action for action in actions if not has_action_receipt(connection, action)]
 
 
-def _scope_contains_citation_signals(lines: list[str], scope: Scope) -> bool:
-    for line_no in range(scope.line_start, scope.line_end + 1):
+def _citation_candidate_lines(lines: Sequence[str], scope: Scope) -> list[int]:
+    text = "\n".join(lines[scope.line_start - 1 : scope.line_end])
+    candidates: list[int] = []
+    line_no = scope.line_start
+    position = 0
+    while True:
+        match = CITATION_CANDIDATE_RE.search(text, position)
+        if match is None:
+            return candidates
+        line_no += text.count("\n", position, match.start())
+        candidates.append(line_no)
+        position = text.find("\n", match.start()) + 1
+        if position == 0:
+            return candidates
+        line_no += 1
+
+
+def _scope_contains_citation_signals(lines: Sequence[str], scope: Scope) -> bool:
+    for line_no in _citation_candidate_lines(lines, scope):
         raw = lines[line_no - 1]
         sanitized = _sanitize_citation_line(raw)
         if BRACKET_NUMERIC_RE.search(sanitized):
@@ -1084,6 +1135,36 @@ def _normalize_latex_source(source_path: Path) -> tuple[str, dict[str, Any]]:
     }
 
 
+def _pymupdf4llm_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version as package_version  # noqa: PLC0415
+
+    try:
+        return package_version("pymupdf4llm")
+    except PackageNotFoundError:
+        return "unavailable"
+
+
+def _conversion_cache_key(*, input_hash: str, source_type: str, disable_pymupdf4llm: bool) -> str:
+    if source_type == "pdf":
+        backend = "stdlib" if disable_pymupdf4llm else "pymupdf4llm"
+        backend_version = f"{'' if disable_pymupdf4llm else _pymupdf4llm_version()};converter={NORMALIZED_SOURCE_CONVERTER_VERSION}"
+    else:
+        backend = "fenced_raw_latex"
+        backend_version = f"converter={NORMALIZED_SOURCE_CONVERTER_VERSION}"
+    return conversion_cache.cache_key(
+        input_hash=input_hash,
+        source_type=source_type,
+        backend=backend,
+        backend_version=backend_version,
+        disable_pymupdf4llm=disable_pymupdf4llm,
+    )
+
+
+def _conversion_dependencies(meta: dict[str, Any]) -> list[Path]:
+    paths = [str(meta.get("main_tex_path") or ""), *meta.get("included_tex_files", []), *meta.get("bib_files", [])]
+    return [Path(path) for path in paths if path]
+
+
 def _convert_pdf_with_pymupdf4llm(source_path: Path) -> str:
     try:
         import pymupdf4llm  # type: ignore[import-not-found, import-untyped]
@@ -1106,72 +1187,43 @@ def _convert_pdf_with_pymupdf4llm(source_path: Path) -> str:
     return normalized + "\n"
 
 
+def _decode_pdf_escape(match: re.Match[str]) -> str:
+    escaped = match.group(1)
+    if escaped is None:
+        return ""
+    if escaped[0] in "01234567":
+        return chr(int(escaped, 8))
+    return PDF_LITERAL_ESCAPES.get(escaped, escaped)
+
+
 def _decode_pdf_literal(token: str) -> str:
     body = token[1:-1]
-    chars: list[str] = []
-    index = 0
-    while index < len(body):
-        char = body[index]
-        if char != "\\":
-            chars.append(char)
-            index += 1
-            continue
-        if index + 1 >= len(body):
-            break
-        nxt = body[index + 1]
-        if nxt in "()\\":
-            chars.append(nxt)
-            index += 2
-            continue
-        if nxt == "n":
-            chars.append("\n")
-            index += 2
-            continue
-        if nxt == "r":
-            chars.append("\r")
-            index += 2
-            continue
-        if nxt == "t":
-            chars.append("\t")
-            index += 2
-            continue
-        if nxt == "b":
-            chars.append("\b")
-            index += 2
-            continue
-        if nxt == "f":
-            chars.append("\f")
-            index += 2
-            continue
-        if nxt.isdigit():
-            octal = nxt
-            step = 2
-            while index + step < len(body) and len(octal) < 3 and body[index + step].isdigit():
-                octal += body[index + step]
-                step += 1
-            chars.append(chr(int(octal, 8)))
-            index += step
-            continue
-        chars.append(nxt)
-        index += 2
-    return "".join(chars)
+    if "\\" not in body:
+        return body
+    return PDF_LITERAL_ESCAPE_RE.sub(_decode_pdf_escape, body)
+
+
+def _inflate_pdf_stream(data: bytes, *, max_bytes: int = PDF_STREAM_MAX_INFLATED_BYTES) -> bytes | None:
+    decompressor = zlib.decompressobj()
+    try:
+        inflated = decompressor.decompress(data, max_bytes)
+    except zlib.error:
+        return None
+    if not decompressor.eof or decompressor.unconsumed_tail:
+        return None
+    return inflated
 
 
 def _extract_text_from_pdf_stream(stream_bytes: bytes) -> str:
     stripped = stream_bytes.strip(b"\r\n")
     decoded_candidates: list[bytes] = [stripped]
-    try:
-        decoded_candidates.insert(0, zlib.decompress(stripped))
-    except Exception:  # noqa: BLE001
-        pass
+    inflated = _inflate_pdf_stream(stripped)
+    if inflated is not None:
+        decoded_candidates.insert(0, inflated)
 
     extracted_blocks: list[str] = []
     for candidate in decoded_candidates:
-        try:
-            text = candidate.decode("latin-1", errors="ignore")
-        except Exception:  # noqa: BLE001
-            continue
-
+        text = candidate.decode("latin-1", errors="ignore")
         text_blocks = TEXT_BLOCK_RE.findall(text) or [text]
         for block in text_blocks:
             fragments: list[str] = []
@@ -1190,14 +1242,65 @@ def _extract_text_from_pdf_stream(stream_bytes: bytes) -> str:
     return "\n\n".join(extracted_blocks)
 
 
-def _convert_pdf_with_stdlib(source_path: Path) -> str:
-    pdf_bytes = source_path.read_bytes()
-    stream_pattern = re.compile(rb"stream\r?\n(.*?)\r?\nendstream", re.DOTALL)
+def _iter_pdf_streams(buffer: bytes | mmap.mmap) -> Iterator[bytes]:
+    position = 0
+    while True:
+        keyword = buffer.find(b"stream", position)
+        if keyword < 0:
+            return
+        if buffer[keyword + 6 : keyword + 8] == b"\r\n":
+            content_start = keyword + 8
+        elif buffer[keyword + 6 : keyword + 7] == b"\n":
+            content_start = keyword + 7
+        else:
+            position = keyword + 1
+            continue
+        terminator = buffer.find(b"\nendstream", content_start)
+        if terminator < 0:
+            return
+        content_end = terminator - 1 if terminator > content_start and buffer[terminator - 1 : terminator] == b"\r" else terminator
+        yield buffer[content_start:content_end]
+        position = terminator + len(b"\nendstream")
+
+
+def _extract_pdf_stream_texts(streams: Iterator[bytes], *, workers: int) -> Iterator[str]:
+    if workers <= 1:
+        yield from (_extract_text_from_pdf_stream(stream) for stream in streams)
+        return
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    window = workers * PDF_EXTRACT_WINDOW_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[str]] = deque()
+        for stream in streams:
+            pending.append(executor.submit(_extract_text_from_pdf_stream, stream))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _pdf_extract_workers(inputs: dict[str, str]) -> int:
+    try:
+        return max(1, int(inputs.get("pdf_extract_workers", "") or 1))
+    except ValueError:
+        return 1
+
+
+def _convert_pdf_with_stdlib(source_path: Path, *, workers: int = 1) -> str:
     text_parts: list[str] = []
-    for match in stream_pattern.finditer(pdf_bytes):
-        extracted = _extract_text_from_pdf_stream(match.group(1))
-        if extracted:
-            text_parts.append(extracted)
+    with source_path.open("rb") as file:
+        try:
+            buffer: bytes | mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            buffer = file.read()
+        try:
+            for extracted in _extract_pdf_stream_texts(_iter_pdf_streams(buffer), workers=workers):
+                if extracted:
+                    text_parts.append(extracted)
+        finally:
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
 
     if not text_parts:
         raise RuntimeError("stdlib fallback could not recover any text from PDF streams")
@@ -1369,6 +1472,25 @@ def _resolve_db_citation_scope(
     return fallback, fallback_metadata, None
 
 
+def _full_document_citation_scope(
+    lines: Sequence[str],
+    scope: Scope,
+    *,
+    references_scope_row: dict[str, Any] | None,
+) -> tuple[Scope, dict[str, Any]]:
+    line_end = len(lines)
+    if references_scope_row is not None and 1 < int(references_scope_row["line_start"]) <= len(lines):
+        line_end = int(references_scope_row["line_start"]) - 1
+    full_scope = Scope(section_title="Full Document", line_start=1, line_end=max(1, line_end), source="full_document")
+    metadata = _coerce_scope_metadata(
+        {"selection_reason": "full-document citation scan requested at init_runtime"},
+        section_title=full_scope.section_title,
+        source=full_scope.source,
+        fallback_from={"section_title": scope.section_title, "line_start": scope.line_start, "line_end": scope.line_end},
+    )
+    return full_scope, metadata
+
+
 def _resolve_scope_from_args(args: argparse.Namespace, lines: list[str], payload_scope: object = None) -> tuple[Scope | None, str | None]:
     payload_candidate = _scope_from_obj(payload_scope)
     if payload_candidate is not None:
@@ -1479,7 +1601,7 @@ def _validate_scope_payload(scope_obj: object, scope_name: str) -> tuple[dict[st
 def _validate_source_identity_payload(
     identity_obj: object,
     *,
-    source_content: str,
+    source_lines: Sequence[str],
     references_scope: dict[str, Any],
 ) -> tuple[dict[str, Any] | None, str | None]:
     if identity_obj is None:
@@ -1501,14 +1623,13 @@ def _validate_source_identity_payload(
         line_end = int(identity_obj["line_end"])
     except (TypeError, ValueError):
         return None, "source_identity.line_start/line_end must be integers"
-    lines = source_content.splitlines()
-    if line_start < 1 or line_end < line_start or line_end > len(lines):
+    if line_start < 1 or line_end < line_start or line_end > len(source_lines):
         return None, "source_identity line range is outside normalized_source"
     references_start = int(references_scope["line_start"])
     references_end = int(references_scope["line_end"])
     if line_start <= references_end and line_end >= references_start:
         return None, "source_identity evidence must be outside references_scope"
-    evidence_text = "\n".join(lines[line_start - 1 : line_end])
+    evidence_text = "\n".join(source_lines[line_start - 1 : line_end])
     if unicodedata.normalize("NFKC", evidence_quote).casefold() not in unicodedata.normalize("NFKC", evidence_text).casefold():
         return None, "source_identity.evidence_quote must occur in the submitted line range"
     if not reference_api.identifier_in_text(identifier, evidence_quote):
@@ -1560,16 +1681,21 @@ def _sanitize_citation_line(line: str) -> str:
     return sanitized
 
 
+def _citation_line_noise(line: str) -> tuple[int, bool, bool]:
+    images = len(MARKDOWN_IMAGE_RE.findall(line))
+    urls = len(URL_RE.findall(line))
+    resources = len(RESOURCE_PATH_RE.findall(line))
+    dates = len(DATE_LIKE_RE.findall(line))
+    needs_sanitize = bool(images or urls or resources)
+    snippet_noisy = bool(images or urls or dates) or RESOURCE_SUFFIX_RE.search(line) is not None
+    return images + urls + resources + dates, needs_sanitize, snippet_noisy
+
+
 def _count_false_positive_noise(line: str) -> int:
-    count = 0
-    count += len(MARKDOWN_IMAGE_RE.findall(line))
-    count += len(URL_RE.findall(line))
-    count += len(RESOURCE_PATH_RE.findall(line))
-    count += len(DATE_LIKE_RE.findall(line))
-    return count
+    return _citation_line_noise(line)[0]
 
 
-def _is_false_positive_mention(mention: dict[str, Any]) -> bool:
+def _is_false_positive_mention(mention: dict[str, Any], *, snippet_noisy: bool | None = None) -> bool:
     marker = str(mention.get("marker", "")).strip()
     snippet = str(mention.get("snippet", "")).strip()
     style = str(mention.get("style", "")).lower()
@@ -1577,13 +1703,16 @@ def _is_false_positive_mention(mention: dict[str, Any]) -> bool:
         return True
     if style == "latex-cite":
         return False
-    if DATE_LIKE_RE.search(marker) or DATE_LIKE_RE.search(snippet):
-        return True
-    if RESOURCE_SUFFIX_RE.search(marker) or RESOURCE_SUFFIX_RE.search(snippet):
-        return True
-    if URL_RE.search(marker) or URL_RE.search(snippet):
+    if snippet_noisy is None:
+        snippet_noisy = (
+            DATE_LIKE_RE.search(snippet) is not None
+            or RESOURCE_SUFFIX_RE.search(snippet) is not None
+            or URL_RE.search(snippet) is not None
+            or MARKDOWN_IMAGE_RE.search(snippet) is not None
+        )
+    if snippet_noisy:
         return True
-    if MARKDOWN_IMAGE_RE.search(snippet):
+    if DATE_LIKE_RE.search(marker) or RESOURCE_SUFFIX_RE.search(marker) or URL_RE.search(marker):
         return True
     if style == "author-year":
         surname_hint = str(mention.get("surname_hint", "")).strip()
@@ -2614,6 +2743,37 @@ def _generate_reference_candidates_v171(entry: dict[str, Any]) -> list[dict[str,
     return _generate_reference_candidates_v16(entry)
 
 
+REFERENCE_CANDIDATE_LABEL_KEYS = ("detected_ref_label", "normalized_ref_label", "citation_label_aliases")
+
+
+def _reference_candidate_key(entry: dict[str, Any]) -> str:
+    metadata = dict(entry.get("metadata", {}))
+    return candidate_cache.cache_key(
+        raw=str(entry.get("raw", "")),
+        source_format="bibtex" if metadata.get("source_format") == "bibtex" else "",
+        label_metadata={key: metadata[key] for key in REFERENCE_CANDIDATE_LABEL_KEYS if key in metadata},
+        algorithm_version=REFERENCE_PREPROCESS_VERSION,
+        code_version=candidate_cache.code_fingerprint(Path(__file__).resolve()),
+    )
+
+
+def _cached_reference_candidates(
+    entry: dict[str, Any],
+    session: candidate_cache.CandidateCacheSession | None,
+) -> list[dict[str, Any]]:
+    if session is None:
+        return _generate_reference_candidates_v171(entry)
+    key = _reference_candidate_key(entry)
+    cached = session.lookup(key)
+    if cached is None:
+        cached = _generate_reference_candidates_v171(entry)
+        session.store(key, cached)
+        return cached
+    for candidate in cached:
+        candidate["entry_index"] = int(entry["entry_index"])
+    return cached
+
+
 def _detect_reference_entry_style(entries: list[dict[str, Any]]) -> str:
     numeric_count = 0
     author_year_count = 0
@@ -2761,23 +2921,14 @@ def _replace_reference_workset(
     entries: list[dict[str, Any]],
     candidates: list[dict[str, Any]],
     batches: list[dict[str, Any]],
+    strategy: str | None = None,
 ) -> None:  # type: ignore[no-untyped-def]
     clear_reference_api_resolutions(connection)
     store_reference_items(connection, [])
     connection.execute("DELETE FROM reference_metadata_enrichment_workset")
-    store_reference_entries(connection, entries)
-    connection.execute("DELETE FROM reference_batches")
-    for batch in batches:
-        store_reference_batch(
-            connection,
-            batch_kind=str(batch["batch_kind"]),
-            batch_index=int(batch["batch_index"]),
-            status=str(batch["status"]),
-            entry_start=int(batch["entry_start"]),
-            entry_end=int(batch["entry_end"]),
-            metadata=dict(batch.get("metadata", {})),
-        )
-    store_reference_parse_candidates(connection, candidates)
+    store_reference_entries(connection, entries, strategy=strategy)
+    store_reference_batches(connection, batches, strategy=strategy)
+    store_reference_parse_candidates(connection, candidates, strategy=strategy)
 
 
 def _validate_reference_candidate_years(candidates: list[dict[str, Any]]) -> None:
@@ -2863,6 +3014,8 @@ def _prepare_reference_workset_state(
     lines: list[str],
     scope: Scope,
     reviewed_raw_entries: list[str] | None = None,
+    candidate_memo: candidate_cache.CandidateCache | None = None,
+    previous: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     if reviewed_raw_entries is None:
         blocks = _split_reference_blocks(lines, scope)
@@ -2885,8 +3038,30 @@ def _prepare_reference_workset_state(
     candidates: list[dict[str, Any]] = []
     ambiguity_warnings: list[str] = []
     boundary_warnings: list[str] = []
-    for entry in normalized_entries:
-        entry_candidates = _generate_reference_candidates_v171(entry)
+    reusable: dict[str, list[dict[str, Any]]] = {}
+    if previous is not None:
+        previous_candidates: dict[int, list[dict[str, Any]]] = {}
+        for candidate in previous["candidates"]:
+            previous_candidates.setdefault(int(candidate["entry_index"]), []).append(candidate)
+        for entry in previous["entries"]:
+            reusable.setdefault(_reference_candidate_key(entry), previous_candidates.get(int(entry["entry_index"]), []))
+    session = candidate_cache.CandidateCacheSession(candidate_memo) if candidate_memo is not None else None
+    entry_candidate_lists: list[list[dict[str, Any]]] = []
+    reused_entry_count = 0
+    try:
+        for entry in normalized_entries:
+            reused = reusable.get(_reference_candidate_key(entry)) if reusable else None
+            if reused:
+                entry_candidate_lists.append(
+                    [{**copy.deepcopy(candidate), "entry_index": int(entry["entry_index"])} for candidate in reused]
+                )
+                reused_entry_count += 1
+            else:
+                entry_candidate_lists.append(_cached_reference_candidates(entry, session))
+    finally:
+        if session is not None:
+            session.close()
+    for entry, entry_candidates in zip(normalized_entries, entry_candidate_lists):
         _validate_reference_candidate_years(entry_candidates)
         if len(entry_candidates) > 1:
             ambiguity_warnings.append(f"{WARNING_REFERENCE_PATTERN_AMBIGUOUS}: entry_index={entry['entry_index']}")
@@ -2930,6 +3105,8 @@ def _prepare_reference_workset_state(
         "warnings": warnings,
         "file_quality": file_quality,
         "file_quality_low": bool(file_quality["file_quality_low"]),
+        "candidate_cache": dict(session.stats) if session is not None else {"status": "disabled"},
+        "reused_candidate_entries": reused_entry_count,
     }
 
 
@@ -2943,6 +3120,7 @@ def _build_reference_workset_export(
     suspect_blocks: list[dict[str, Any]],
     requires_split_review: bool,
     file_quality: dict[str, Any] | None = None,
+    candidate_cache_stats: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     candidates_by_entry: dict[int, list[dict[str, Any]]] = {}
     for candidate in candidates:
@@ -2971,6 +3149,7 @@ def _build_reference_workset_export(
             "grouping_suspect_count": len(suspect_blocks),
             "requires_split_review": requires_split_review,
             "review_generation_id": _reference_review_generation_id(suspect_blocks) if suspect_blocks else "",
+            "candidate_cache": dict(candidate_cache_stats or {"status": "disabled"}),
         },
         "file_quality": _public_reference_preprocess_quality(file_quality),
         "file_quality_low": bool((file_quality or {}).get("file_quality_low")),
@@ -3228,21 +3407,22 @@ def _extract_latex_cite_mentions(line: str, line_no: int, mention_seed: int) ->
     return mentions, current
 
 
-def _extract_mentions(lines: list[str], scope: Scope) -> tuple[list[dict[str, Any]], int]:
+def _extract_mentions(lines: Sequence[str], scope: Scope) -> tuple[list[dict[str, Any]], int]:
     mentions: list[dict[str, Any]] = []
     filtered_count = 0
     counter = 1
-    for line_no in range(scope.line_start, scope.line_end + 1):
+    for line_no in _citation_candidate_lines(lines, scope):
         original_line = lines[line_no - 1]
-        filtered_count += _count_false_positive_noise(original_line)
-        line = _sanitize_citation_line(original_line)
+        noise_count, needs_sanitize, snippet_noisy = _citation_line_noise(original_line)
+        filtered_count += noise_count
+        line = _sanitize_citation_line(original_line) if needs_sanitize else original_line
         numeric_mentions, counter = _extract_numeric_mentions(line, line_no, counter)
         label_mentions, counter = _extract_citation_label_mentions(line, line_no, counter)
         author_year_mentions, counter = _extract_author_year_mentions(line, line_no, counter)
         latex_mentions, counter = _extract_latex_cite_mentions(line, line_no, counter)
         for mention in [*numeric_mentions, *label_mentions, *author_year_mentions, *latex_mentions]:
             mention["snippet"] = original_line.strip()
-            if _is_false_positive_mention(mention):
+            if _is_false_positive_mention(mention, snippet_noisy=snippet_noisy):
                 filtered_count += 1
                 continue
             mentions.append(mention)
@@ -3271,6 +3451,68 @@ def _citation_label_aliases_from_metadata(metadata: dict[str, Any]) -> tuple[str
     return display, aliases
 
 
+@dataclass
+class AuthorYearIndex:
+    exact: dict[tuple[str, int], list[tuple[str | None, dict[str, Any]]]]
+    by_year: dict[int, list[tuple[str, dict[str, Any]]]]
+
+
+def _fold_surname(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _year_suffix(text: str, year: int) -> str | None:
+    for match in AUTHOR_YEAR_SUFFIX_RE.finditer(text):
+        if int(match.group(1)) == year:
+            return match.group(2)
+    return None
+
+
+def _build_author_year_index(candidates: list[tuple[dict[str, Any], str]]) -> AuthorYearIndex:
+    index = AuthorYearIndex(exact={}, by_year={})
+    for candidate, raw in candidates:
+        year = candidate["year"]
+        if not isinstance(year, int):
+            continue
+        suffix = _year_suffix(raw, year)
+        for alias in candidate.get("surname_aliases", []):
+            index.exact.setdefault((alias, year), []).append((suffix, candidate))
+            index.by_year.setdefault(year, []).append((_fold_surname(alias), candidate))
+    return index
+
+
+def _resolve_author_year_mention(
+    index: AuthorYearIndex,
+    mention: dict[str, Any],
+) -> tuple[dict[str, Any] | None, str, float]:
+    surname = str(mention["surname_hint"]).lower()
+    year = int(mention["year_hint"])
+    exact = index.exact.get((surname, year), [])
+    if exact:
+        mention_suffix = _year_suffix(str(mention.get("marker", "")), year)
+        if mention_suffix is not None and len(exact) > 1:
+            for suffix, candidate in exact:
+                if suffix == mention_suffix:
+                    return candidate, "author_year_suffix_hint", 0.85
+        return exact[0][1], "author_year_hint", 0.85
+    folded = _fold_surname(surname)
+    best_ratio = 0.0
+    best: list[dict[str, Any]] = []
+    for alias, candidate in index.by_year.get(year, []):
+        matcher = difflib.SequenceMatcher(None, folded, alias)
+        if matcher.real_quick_ratio() < AUTHOR_YEAR_FUZZY_MIN_RATIO or matcher.quick_ratio() < AUTHOR_YEAR_FUZZY_MIN_RATIO:
+            continue
+        ratio = matcher.ratio()
+        if ratio > best_ratio:
+            best_ratio, best = ratio, [candidate]
+        elif ratio == best_ratio and all(existing is not candidate for existing in best):
+            best.append(candidate)
+    if best_ratio >= AUTHOR_YEAR_FUZZY_MIN_RATIO and len(best) == 1:
+        return best[0], "author_year_fuzzy_hint", 0.7
+    return None, "unresolved", 0.0
+
+
 def _build_citation_workset(
     *,
     scope: Scope,
@@ -3279,7 +3521,7 @@ def _build_citation_workset(
 ) -> dict[str, Any]:
     reference_index: list[dict[str, Any]] = []
     by_ref_number: dict[int, dict[str, Any]] = {}
-    by_author_year: list[dict[str, Any]] = []
+    by_author_year: list[tuple[dict[str, Any], str]] = []
     by_citekey: dict[str, dict[str, Any]] = {}
     by_citation_label: dict[str, dict[str, Any]] = {}
     ambiguous_citation_labels: set[str] = set()
@@ -3331,7 +3573,9 @@ def _build_citation_workset(
             by_ref_number[ref_number] = entry
         authors = entry.get("author", [])
         if isinstance(authors, list) and authors and entry.get("year") is not None:
-            by_author_year.append({**entry, "surname_aliases": sorted(_first_author_aliases(authors))})
+            by_author_year.append(
+                ({**entry, "surname_aliases": sorted(_first_author_aliases(authors))}, str(item.get("raw", "")))
+            )
         for alias in entry["citekey_aliases"]:
             by_citekey[alias] = entry
         for alias in entry["citation_label_aliases"]:
@@ -3342,6 +3586,7 @@ def _build_citation_workset(
                 by_citation_label[alias] = entry
     for alias in sorted(ambiguous_citation_labels):
         warnings.append(f"{WARNING_CITATION_LABEL_AMBIGUOUS}: {alias}")
+    author_year_index = _build_author_year_index(by_author_year)
 
     grouped: dict[int, dict[str, Any]] = {}
     mention_links: list[dict[str, Any]] = []
@@ -3367,15 +3612,10 @@ def _build_citation_workset(
             resolution_method = "ref_number_hint"
             resolution_confidence = 1.0
         elif mention.get("surname_hint") and mention.get("year_hint") is not None:
-            surname = str(mention["surname_hint"]).lower()
-            year = int(mention["year_hint"])
-            for candidate in by_author_year:
-                surname_aliases = candidate.get("surname_aliases", [])
-                if surname in surname_aliases and candidate.get("year") == year:
-                    candidate_reference = candidate
-                    resolution_method = "author_year_hint"
-                    resolution_confidence = 0.85
-                    break
+            candidate_reference, resolution_method, resolution_confidence = _resolve_author_year_mention(
+                author_year_index,
+                mention,
+            )
         if candidate_reference is None:
             mention_links.append(
                 {
@@ -3495,34 +3735,23 @@ def _build_citation_workset(
     }
 
 
-def _schema(schema_name: str) -> dict[str, Any]:
-    return json.loads((RENDER_SCHEMAS_DIR / schema_name).read_text(encoding="utf-8"))
-
-
-def _template_env(template_root: Path | None = None) -> Environment:
-    env = Environment(
-        loader=FileSystemLoader(str((template_root or TEMPLATES_DIR).resolve())),
-        autoescape=False,
-        trim_blocks=False,
-        lstrip_blocks=False,
-        keep_trailing_newline=False,
-        undefined=StrictUndefined,
-    )
-    env.filters["to_pretty_json"] = lambda value: json.dumps(value, ensure_ascii=False, indent=2)
-    return env
-
-
-def _render_template(template_name: str, context: dict[str, Any], *, template_root: Path | None = None) -> str:
-    return _template_env(template_root).get_template(template_name).render(**context)
+def _render_template(
+    template_name: str,
+    context: dict[str, Any],
+    *,
+    template_root: Path | None = None,
+    bytecode_cache_dir: str = "",
+) -> str:
+    return render_engine.render((template_root or TEMPLATES_DIR) / template_name, context, bytecode_cache_dir=bytecode_cache_dir)
 
 
 def _validate_context(context: dict[str, Any], schema_name: str) -> None:
-    validate(instance=context, schema=_schema(schema_name))
+    render_engine.validate(context, RENDER_SCHEMAS_DIR / schema_name)
 
 
-def _render_json(template_name: str, context: dict[str, Any], schema_name: str) -> str:
+def _render_json(template_name: str, context: dict[str, Any], schema_name: str, *, bytecode_cache_dir: str = "") -> str:
     _validate_context(context, schema_name)
-    rendered = _render_template(template_name, context)
+    rendered = _render_template(template_name, context, bytecode_cache_dir=bytecode_cache_dir)
     json.loads(rendered)
     return rendered + ("" if rendered.endswith("\n") else "\n")
 
@@ -3534,9 +3763,10 @@ def _render_markdown(
     *,
     ensure_trailing_newline: bool,
     template_root: Path | None = None,
+    bytecode_cache_dir: str = "",
 ) -> str:
     _validate_context(context, schema_name)
-    rendered = _render_template(template_name, context, template_root=template_root)
+    rendered = _render_template(template_name, context, template_root=template_root, bytecode_cache_dir=bytecode_cache_dir)
     if ensure_trailing_newline:
         rendered = rendered.rstrip("\n")
         if rendered:
@@ -5350,8 +5580,29 @@ def _dispatch_source(
     warnings.extend(_extension_warning(source_path, source_type))
     meta["source_type"] = source_type
     meta["detection_method"] = detection_method
+    cache = None
+    cache_key = ""
+    cached = None
+    if source_type != "markdown":
+        with connect_db(db_path) as connection:
+            inputs = fetch_runtime_inputs(connection)
+        cache = conversion_cache.cache_from_runtime_inputs(inputs)
+        meta["conversion_cache"] = "disabled" if cache is None else "miss"
+    if cache is not None:
+        cache_key = _conversion_cache_key(
+            input_hash=inputs.get("input_hash") or sha256_path(source_path),
+            source_type=source_type,
+            disable_pymupdf4llm=disable_pymupdf4llm,
+        )
+        cached = conversion_cache.lookup(cache, cache_key)
+    conversion_warnings_start = len(warnings)
     try:
-        if source_type == "markdown":
+        if cached is not None:
+            markdown = str(cached["markdown"])
+            meta.update({key: value for key, value in dict(cached["meta"]).items() if key in CONVERSION_CACHE_META_KEYS})
+            warnings.extend(str(warning) for warning in cached["warnings"])
+            meta["conversion_cache"] = "hit"
+        elif source_type == "markdown":
             markdown = _convert_markdown_source(source_path)
             meta["conversion_backend"] = "direct_copy"
         elif source_type in {"latex_tex", "latex_project"}:
@@ -5372,7 +5623,7 @@ def _dispatch_source(
             if not markdown:
                 warnings.append("PDF conversion fell back to stdlib text extraction")
                 warnings.append("fallback markdown quality may be low for multi-column/layout-heavy PDFs")
-                markdown = _convert_pdf_with_stdlib(source_path)
+                markdown = _convert_pdf_with_stdlib(source_path, workers=_pdf_extract_workers(inputs))
                 meta["conversion_backend"] = "stdlib_fallback"
                 meta["fallback_reason"] = fallback_reason
     except Exception as exc:  # noqa: BLE001
@@ -5386,6 +5637,15 @@ def _dispatch_source(
             connection.commit()
         return payload, 2
 
+    if cache is not None and cached is None:
+        conversion_cache.store(
+            cache,
+            cache_key,
+            markdown=markdown,
+            meta={key: meta[key] for key in CONVERSION_CACHE_META_KEYS if key in meta},
+            warnings=warnings[conversion_warnings_start:],
+            dependencies=_conversion_dependencies(meta),
+        )
     if not persist_db_only:
         _write_text(output_paths.source_md_path, markdown)
     meta["quality"] = _quality_metrics(markdown)
@@ -5416,9 +5676,7 @@ def _dispatch_source(
     return payload, 0
 
 
-def _handle_persist_outline_and_scopes(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
-    payload = _read_json_payload(args.payload_file)
+def persist_outline_and_scopes(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
     outline_nodes, outline_error = _validate_outline_nodes_payload(payload.get("outline_nodes", []))
     references_scope, references_scope_error = _validate_scope_payload(payload.get("references_scope"), "references_scope")
     citation_scope, citation_scope_error = _validate_scope_payload(payload.get("citation_scope"), "citation_scope")
@@ -5427,15 +5685,15 @@ def _handle_persist_outline_and_scopes(args: argparse.Namespace) -> int:
     )
 
     with connect_db(db_path) as connection:
-        source_doc = fetch_source_document(connection, "normalized_source")
+        source_lines = fetch_source_lines(connection, "normalized_source")
         if "source_identity" not in payload:
             source_identity, source_identity_error = None, "source_identity must be explicitly present as object or null"
-        elif source_doc is None or references_scope is None:
+        elif source_lines is None or references_scope is None:
             source_identity, source_identity_error = None, "source_identity validation requires normalized_source and references_scope"
         else:
             source_identity, source_identity_error = _validate_source_identity_payload(
                 payload.get("source_identity"),
-                source_content=str(source_doc["content"]),
+                source_lines=source_lines,
                 references_scope=references_scope,
             )
         first_error = (
@@ -5454,8 +5712,7 @@ def _handle_persist_outline_and_scopes(args: argparse.Namespace) -> int:
         ):
             set_runtime_error(connection, "citation_scope_failed", first_error or "invalid outline/scope payload", "stage_2_outline_and_scopes")
             connection.commit()
-            print(json.dumps({"error": {"code": "citation_scope_failed", "message": first_error or "invalid outline/scope payload"}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "citation_scope_failed", "message": first_error or "invalid outline/scope payload"}}, 2
         existing_identity = fetch_source_identity(connection)
         existing_canonical = str(existing_identity.get("canonical_identifier", "")) if existing_identity else ""
         new_canonical = str(source_identity.get("canonical_identifier", "")) if source_identity else ""
@@ -5492,38 +5749,32 @@ def _handle_persist_outline_and_scopes(args: argparse.Namespace) -> int:
         _set_success_state(connection, stage="stage_3_digest", substep="persist_digest", next_action="persist_digest", status="outline and scopes persisted")
         _record_action_receipt(connection, action_name="persist_outline_and_scopes", stage="stage_2_outline_and_scopes")
         connection.commit()
-    print(
-        json.dumps(
-            {
-                "stored_outline_nodes": len(outline_nodes),
-                "references_scope": references_scope,
-                "citation_scope": citation_scope,
-                "source_identity": source_identity,
-                "literature_matching_metadata": literature_matching_metadata,
-                "error": None,
-            },
-            ensure_ascii=False,
-        )
-    )
-    return 0
+    return {
+        "stored_outline_nodes": len(outline_nodes),
+        "references_scope": references_scope,
+        "citation_scope": citation_scope,
+        "source_identity": source_identity,
+        "literature_matching_metadata": literature_matching_metadata,
+        "error": None,
+    }, 0
 
 
-def _handle_persist_digest(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
-    payload = _read_json_payload(args.payload_file)
+def _handle_persist_outline_and_scopes(args: argparse.Namespace) -> int:
+    return _emit(persist_outline_and_scopes(_cli_db_path(args), _read_json_payload(args.payload_file)))
+
+
+def persist_digest(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
     digest_slots, section_summaries, representative_image, error = _validate_digest_payload(payload)
     with connect_db(db_path) as connection:
         if error is not None or digest_slots is None or section_summaries is None:
             set_runtime_error(connection, "digest_stage_failed", error or "invalid digest payload", "stage_3_digest")
             connection.commit()
-            print(json.dumps({"error": {"code": "digest_stage_failed", "message": error or "invalid digest payload"}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "digest_stage_failed", "message": error or "invalid digest payload"}}, 2
         coverage_warnings, coverage_error = _validate_digest_coverage(connection, digest_slots, section_summaries)
         if coverage_error is not None:
             set_runtime_error(connection, "digest_stage_failed", coverage_error, "stage_3_digest")
             connection.commit()
-            print(json.dumps({"error": {"code": "digest_stage_failed", "message": coverage_error}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "digest_stage_failed", "message": coverage_error}}, 2
         store_digest_slots(connection, digest_slots)
         store_digest_section_summaries(connection, section_summaries)
         if representative_image is not None:
@@ -5539,50 +5790,48 @@ def _handle_persist_digest(args: argparse.Namespace) -> int:
         )
         _record_action_receipt(connection, action_name="persist_digest", stage="stage_3_digest")
         connection.commit()
-    print(
-        json.dumps(
-            {
-                "stored_digest_slots": len(digest_slots),
-                "stored_section_summaries": len(section_summaries),
-                "representative_image": representative_image,
-                "error": None,
-            },
-            ensure_ascii=False,
-        )
-    )
-    return 0
+    return {
+        "stored_digest_slots": len(digest_slots),
+        "stored_section_summaries": len(section_summaries),
+        "representative_image": representative_image,
+        "error": None,
+    }, 0
 
 
-def _handle_prepare_references_workset(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
+def _handle_persist_digest(args: argparse.Namespace) -> int:
+    return _emit(persist_digest(_cli_db_path(args), _read_json_payload(args.payload_file)))
+
+
+def prepare_references_workset(db_path: Path, *, out_path: Path | None = None, persist_db_only: bool = False) -> tuple[dict[str, Any], int]:
     with connect_db(db_path) as connection:
         inputs = fetch_runtime_inputs(connection)
         runtime_paths = _runtime_paths_from_inputs(inputs, fallback_db_path=db_path)
-        out_path = Path(args.out_path).expanduser().resolve() if args.out_path else (runtime_paths.tmp_dir / REFERENCES_EXPORT_FILENAME)
+        out_path = out_path.expanduser().resolve() if out_path is not None else (runtime_paths.tmp_dir / REFERENCES_EXPORT_FILENAME)
         review_path = out_path.with_name(
             REFERENCES_REVIEW_EXPORT_FILENAME if out_path.name == REFERENCES_EXPORT_FILENAME else f"{out_path.stem}_review{out_path.suffix or '.json'}"
         )
-        source_doc = fetch_source_document(connection, "normalized_source")
+        source_lines = fetch_source_lines(connection, "normalized_source")
         scope_row = fetch_section_scope(connection, "references_scope")
-        if source_doc is None:
+        if source_lines is None:
             set_runtime_error(connection, "references_stage_failed", "normalized source missing", "stage_5_references")
             connection.commit()
-            print(json.dumps({"workset_path": "", "review_path": "", "error": {"code": "references_stage_failed", "message": "normalized source missing"}}, ensure_ascii=False))
-            return 2
+            return {"workset_path": "", "review_path": "", "error": {"code": "references_stage_failed", "message": "normalized source missing"}}, 2
         if scope_row is None:
             set_runtime_error(connection, "references_stage_failed", "references_scope missing", "stage_5_references")
             connection.commit()
-            print(json.dumps({"workset_path": "", "review_path": "", "error": {"code": "references_stage_failed", "message": "references_scope missing"}}, ensure_ascii=False))
-            return 2
+            return {"workset_path": "", "review_path": "", "error": {"code": "references_stage_failed", "message": "references_scope missing"}}, 2
         scope = _db_scope_to_scope(scope_row)
-        lines = str(source_doc["content"]).splitlines()
+        lines = source_lines
         if scope.line_start < 1 or scope.line_end < scope.line_start or scope.line_end > len(lines):
             message = "references_scope is out of bounds for normalized source"
             set_runtime_error(connection, "references_stage_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"workset_path": "", "review_path": "", "error": {"code": "references_stage_failed", "message": message}}, ensure_ascii=False))
-            return 2
-        prepared = _prepare_reference_workset_state(lines=lines, scope=scope)
+            return {"workset_path": "", "review_path": "", "error": {"code": "references_stage_failed", "message": message}}, 2
+        prepared = _prepare_reference_workset_state(
+            lines=lines,
+            scope=scope,
+            candidate_memo=candidate_cache.cache_from_runtime_inputs(inputs),
+        )
         normalized_entries = list(prepared["entries"])
         candidates = list(prepared["candidates"])
         batches = list(prepared["batches"])
@@ -5598,9 +5847,9 @@ def _handle_prepare_references_workset(args: argparse.Namespace) -> int:
         store_reference_preprocess_quality(connection, file_quality)
         for warning in warnings:
             add_runtime_warning_once(connection, warning)
-        metadata = dict(source_doc.get("metadata", {}))
+        metadata = dict(fetch_source_document_metadata(connection, "normalized_source") or {})
         metadata["reference_numbering_reliability"] = "low" if prepared["has_numbering_anomaly"] else "high"
-        store_source_document(connection, doc_key="normalized_source", content=str(source_doc["content"]), metadata=metadata)
+        update_source_document_metadata(connection, doc_key="normalized_source", metadata=metadata)
         next_action = "decide_reference_extraction" if file_quality_low else ("persist_reference_entry_splits" if requires_split_review else "persist_references")
         _set_success_state(
             connection,
@@ -5637,46 +5886,51 @@ def _handle_prepare_references_workset(args: argparse.Namespace) -> int:
         suspect_blocks=suspect_blocks,
         requires_split_review=requires_split_review,
         file_quality=file_quality,
+        candidate_cache_stats=dict(prepared["candidate_cache"]),
     )
     review_payload = _build_reference_review_view(workset_payload)
-    if not args.persist_db_only:
+    if not persist_db_only:
         _write_json(out_path, workset_payload)
         _write_json(review_path, review_payload)
-    print(
-        json.dumps(
+    return {
+        "stored_reference_entries": len(normalized_entries),
+        "stored_reference_candidates": len(candidates),
+        "numbering_warnings": numbering_warnings,
+        "warnings": warnings,
+        "workset_path": str(out_path) if not persist_db_only else "",
+        "review_path": str(review_path) if not persist_db_only else "",
+        "entry_style": str(prepared["entry_style"]),
+        "split_mode": "line-first",
+        "grouping_suspect_count": len(suspect_blocks),
+        "requires_split_review": requires_split_review,
+        "file_quality": _public_reference_preprocess_quality(file_quality),
+        "file_quality_low": file_quality_low,
+        "review_generation_id": review_generation_id,
+        "suspect_blocks": [
             {
-                "stored_reference_entries": len(normalized_entries),
-                "stored_reference_candidates": len(candidates),
-                "numbering_warnings": numbering_warnings,
-                "warnings": warnings,
-                "workset_path": str(out_path) if not args.persist_db_only else "",
-                "review_path": str(review_path) if not args.persist_db_only else "",
-                "entry_style": str(prepared["entry_style"]),
-                "split_mode": "line-first",
-                "grouping_suspect_count": len(suspect_blocks),
-                "requires_split_review": requires_split_review,
-                "file_quality": _public_reference_preprocess_quality(file_quality),
-                "file_quality_low": file_quality_low,
-                "review_generation_id": review_generation_id,
-                "suspect_blocks": [
-                    {
-                        "block_index": block["block_index"],
-                        "source_text": block["source_text"],
-                        "line_start": block["line_start"],
-                        "line_end": block["line_end"],
-                        "reasons": block["reasons"],
-                        "proposed_entries": block["proposed_entries"],
-                        "suspicion_kind": block["suspicion_kind"],
-                        "entry_indexes": [int(item) for item in block.get("entry_indexes", [])],
-                    }
-                    for block in suspect_blocks
-                ],
-                "error": None,
-            },
-            ensure_ascii=False,
+                "block_index": block["block_index"],
+                "source_text": block["source_text"],
+                "line_start": block["line_start"],
+                "line_end": block["line_end"],
+                "reasons": block["reasons"],
+                "proposed_entries": block["proposed_entries"],
+                "suspicion_kind": block["suspicion_kind"],
+                "entry_indexes": [int(item) for item in block.get("entry_indexes", [])],
+            }
+            for block in suspect_blocks
+        ],
+        "error": None,
+    }, 0
+
+
+def _handle_prepare_references_workset(args: argparse.Namespace) -> int:
+    return _emit(
+        prepare_references_workset(
+            _cli_db_path(args),
+            out_path=_resolve_cli_path(args.out_path),
+            persist_db_only=args.persist_db_only,
         )
     )
-    return 0
 
 
 def _canonical_reference_scope_text(lines: list[str], scope: Scope) -> str:
@@ -5701,42 +5955,38 @@ def _reference_review_generation_id(suspect_blocks: list[dict[str, Any]]) -> str
     return f"review-{zlib.crc32(basis.encode('utf-8')) & 0xFFFFFFFF:08x}"
 
 
-def _handle_persist_reference_entry_splits(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
-    payload = _read_json_payload(args.payload_file)
+def persist_reference_entry_splits(db_path: Path, payload: dict[str, Any], *, out_path: Path | None = None, persist_db_only: bool = False) -> tuple[dict[str, Any], int]:
     blocks_payload = payload.get("blocks", [])
     with connect_db(db_path) as connection:
         inputs = fetch_runtime_inputs(connection)
         runtime_paths = _runtime_paths_from_inputs(inputs, fallback_db_path=db_path)
-        out_path = Path(args.out_path).expanduser().resolve() if args.out_path else (runtime_paths.tmp_dir / REFERENCES_EXPORT_FILENAME)
+        out_path = out_path.expanduser().resolve() if out_path is not None else (runtime_paths.tmp_dir / REFERENCES_EXPORT_FILENAME)
         review_path = out_path.with_name(
             REFERENCES_REVIEW_EXPORT_FILENAME if out_path.name == REFERENCES_EXPORT_FILENAME else f"{out_path.stem}_review{out_path.suffix or '.json'}"
         )
-        source_doc = fetch_source_document(connection, "normalized_source")
+        source_lines = fetch_source_lines(connection, "normalized_source")
         scope_row = fetch_section_scope(connection, "references_scope")
-        if source_doc is None or scope_row is None:
+        if source_lines is None or scope_row is None:
             message = "reference split review requires normalized_source and references_scope"
             set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_entry_splitting_failed", "message": message}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_entry_splitting_failed", "message": message}}, 2
         if not isinstance(blocks_payload, list) or not blocks_payload:
             message = "blocks must be a non-empty array of reviewed suspect blocks"
             set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_entry_splitting_failed", "message": message}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_entry_splitting_failed", "message": message}}, 2
         scope = _db_scope_to_scope(scope_row)
-        lines = str(source_doc["content"]).splitlines()
-        prepared_before_review = _prepare_reference_workset_state(lines=lines, scope=scope)
+        lines = source_lines
+        candidate_memo = candidate_cache.cache_from_runtime_inputs(inputs)
+        prepared_before_review = _prepare_reference_workset_state(lines=lines, scope=scope, candidate_memo=candidate_memo)
         current_blocks = list(prepared_before_review["blocks"])
         suspect_blocks = list(prepared_before_review["suspect_blocks"])
         if not suspect_blocks:
             message = "reference split review is only valid when prepare_references_workset reported suspect_blocks"
             set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_entry_splitting_failed", "message": message}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_entry_splitting_failed", "message": message}}, 2
 
         review_generation_id = _reference_review_generation_id(suspect_blocks)
         submitted_generation_id = str(payload.get("review_generation_id", "")).strip()
@@ -5744,17 +5994,11 @@ def _handle_persist_reference_entry_splits(args: argparse.Namespace) -> int:
             message = "review_generation_id is stale; reload the current suspect_blocks and resubmit"
             set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
             connection.commit()
-            print(
-                json.dumps(
-                    {
-                        "error": {"code": "reference_entry_splitting_failed", "message": message},
-                        "review_generation_id": review_generation_id,
-                        "suspect_blocks": suspect_blocks,
-                    },
-                    ensure_ascii=False,
-                )
-            )
-            return 2
+            return {
+                "error": {"code": "reference_entry_splitting_failed", "message": message},
+                "review_generation_id": review_generation_id,
+                "suspect_blocks": suspect_blocks,
+            }, 2
 
         suspect_by_index = {int(block["block_index"]): block for block in suspect_blocks}
         if {int(block["block_index"]) for block in suspect_blocks} != {
@@ -5763,8 +6007,7 @@ def _handle_persist_reference_entry_splits(args: argparse.Namespace) -> int:
             message = "blocks must cover every suspect block exactly once"
             set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_entry_splitting_failed", "message": message}, "review_generation_id": review_generation_id, "suspect_blocks": suspect_blocks}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_entry_splitting_failed", "message": message}, "review_generation_id": review_generation_id, "suspect_blocks": suspect_blocks}, 2
 
         reviewed_blocks: dict[int, dict[str, Any]] = {}
         force_kept_sources: set[str] = set()
@@ -5774,30 +6017,26 @@ def _handle_persist_reference_entry_splits(args: argparse.Namespace) -> int:
                 message = f"blocks[{index}] must be object"
                 set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_entry_splitting_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_entry_splitting_failed", "message": message}}, 2
             block_index = block.get("block_index")
             normalized_block_index = block_index if isinstance(block_index, int) else -1
             if normalized_block_index not in suspect_by_index:
                 message = f"blocks[{index}].block_index must refer to a current suspect block"
                 set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_entry_splitting_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_entry_splitting_failed", "message": message}}, 2
             resolution = str(block.get("resolution", "")).strip()
             if resolution not in {"split", "keep", "merge", "force_keep"}:
                 message = f"blocks[{index}].resolution must be split, keep, merge, or force_keep"
                 set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_entry_splitting_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_entry_splitting_failed", "message": message}}, 2
             entries = block.get("entries", [])
             if not isinstance(entries, list) or not entries:
                 message = f"blocks[{index}].entries must be a non-empty array"
                 set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_entry_splitting_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_entry_splitting_failed", "message": message}}, 2
             reviewed_entries: list[str] = []
             for entry_pos, entry_text in enumerate(entries):
                 normalized = _normalize_reference_entry_text(str(entry_text))
@@ -5805,39 +6044,30 @@ def _handle_persist_reference_entry_splits(args: argparse.Namespace) -> int:
                     message = f"blocks[{index}].entries[{entry_pos}] must be non-empty"
                     set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
                     connection.commit()
-                    print(json.dumps({"error": {"code": "reference_entry_splitting_failed", "message": message}}, ensure_ascii=False))
-                    return 2
+                    return {"error": {"code": "reference_entry_splitting_failed", "message": message}}, 2
                 reviewed_entries.append(normalized)
             if resolution in {"merge", "force_keep"} and len(reviewed_entries) != 1:
                 message = f"blocks[{index}].resolution={resolution} requires exactly one entry"
                 set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_entry_splitting_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_entry_splitting_failed", "message": message}}, 2
             if resolution == "split" and len(reviewed_entries) < 2:
                 message = f"blocks[{index}].resolution=split requires at least two entries"
                 set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_entry_splitting_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_entry_splitting_failed", "message": message}}, 2
             suspect_block = suspect_by_index[normalized_block_index]
             if suspect_block.get("suspicion_kind") == "grouped_entries_in_single_line" and len(reviewed_entries) < 2:
                 message = "grouped reference block must be split into multiple reviewed entries"
                 set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
                 connection.commit()
-                print(
-                    json.dumps(
-                        {
-                            "error": {
-                                "code": "reference_entry_splitting_failed",
-                                "message": message,
-                                "block_index": normalized_block_index,
-                            }
-                        },
-                        ensure_ascii=False,
-                    )
-                )
-                return 2
+                return {
+                    "error": {
+                        "code": "reference_entry_splitting_failed",
+                        "message": message,
+                        "block_index": normalized_block_index,
+                    }
+                }, 2
             reviewed_joined_text = " ".join(reviewed_entries)
             conservation_report = _reference_split_conservation_report(str(suspect_block["source_text"]), reviewed_joined_text)
             conservation_reports.append(
@@ -5853,20 +6083,14 @@ def _handle_persist_reference_entry_splits(args: argparse.Namespace) -> int:
                 message = "reviewed entries do not preserve the suspect block's source tokens"
                 set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
                 connection.commit()
-                print(
-                    json.dumps(
-                        {
-                            "error": {
-                                "code": "reference_entry_splitting_failed",
-                                "message": message,
-                                "block_index": normalized_block_index,
-                                "diagnostics": conservation_report,
-                            }
-                        },
-                        ensure_ascii=False,
-                    )
-                )
-                return 2
+                return {
+                    "error": {
+                        "code": "reference_entry_splitting_failed",
+                        "message": message,
+                        "block_index": normalized_block_index,
+                        "diagnostics": conservation_report,
+                    }
+                }, 2
             reviewed_blocks[normalized_block_index] = {
                 "resolution": resolution,
                 "entries": reviewed_entries,
@@ -5900,10 +6124,15 @@ def _handle_persist_reference_entry_splits(args: argparse.Namespace) -> int:
             message = "reviewed entries must produce at least one reference entry"
             set_runtime_error(connection, "reference_entry_splitting_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_entry_splitting_failed", "message": message}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_entry_splitting_failed", "message": message}}, 2
 
-        prepared = _prepare_reference_workset_state(lines=lines, scope=scope, reviewed_raw_entries=reviewed_raw_entries)
+        prepared = _prepare_reference_workset_state(
+            lines=lines,
+            scope=scope,
+            reviewed_raw_entries=reviewed_raw_entries,
+            candidate_memo=candidate_memo,
+            previous=prepared_before_review,
+        )
         suspect_blocks = list(prepared["suspect_blocks"])
         if force_kept_sources:
             suspect_blocks = [
@@ -5971,7 +6200,7 @@ def _handle_persist_reference_entry_splits(args: argparse.Namespace) -> int:
         batches = list(prepared["batches"])
         file_quality = dict(prepared["file_quality"])
         file_quality_low = bool(prepared["file_quality_low"])
-        _replace_reference_workset(connection, entries=normalized_entries, candidates=candidates, batches=batches)
+        _replace_reference_workset(connection, entries=normalized_entries, candidates=candidates, batches=batches, strategy="diff")
         store_reference_preprocess_quality(connection, file_quality)
         for warning in prepared["warnings"]:
             add_runtime_warning_once(connection, warning)
@@ -5994,6 +6223,7 @@ def _handle_persist_reference_entry_splits(args: argparse.Namespace) -> int:
             stage="stage_5_references",
             metadata={
                 "stored_reference_entries": len(normalized_entries),
+                "reused_candidate_entries": int(prepared["reused_candidate_entries"]),
                 "file_quality_low": file_quality_low,
                 "triggered_signals": list(file_quality.get("triggered_signals", [])),
             },
@@ -6009,37 +6239,42 @@ def _handle_persist_reference_entry_splits(args: argparse.Namespace) -> int:
         suspect_blocks=[],
         requires_split_review=False,
         file_quality=file_quality,
+        candidate_cache_stats=dict(prepared["candidate_cache"]),
     )
     review_payload = _build_reference_review_view(workset_payload)
-    if not args.persist_db_only:
+    if not persist_db_only:
         _write_json(out_path, workset_payload)
         _write_json(review_path, review_payload)
-    print(
-        json.dumps(
-            {
-                "stored_reference_entries": len(normalized_entries),
-                "stored_reference_candidates": len(candidates),
-                "warnings": list(prepared["warnings"]),
-                "workset_path": str(out_path) if not args.persist_db_only else "",
-                "review_path": str(review_path) if not args.persist_db_only else "",
-                "entry_style": str(prepared["entry_style"]),
-                "split_mode": "line-first",
-                "grouping_suspect_count": 0,
-                "requires_split_review": False,
-                "file_quality": _public_reference_preprocess_quality(file_quality),
-                "file_quality_low": file_quality_low,
-                "review_generation_id": "",
-                "error": None,
-            },
-            ensure_ascii=False,
+    return {
+        "stored_reference_entries": len(normalized_entries),
+        "stored_reference_candidates": len(candidates),
+        "reused_candidate_entries": int(prepared["reused_candidate_entries"]),
+        "warnings": list(prepared["warnings"]),
+        "workset_path": str(out_path) if not persist_db_only else "",
+        "review_path": str(review_path) if not persist_db_only else "",
+        "entry_style": str(prepared["entry_style"]),
+        "split_mode": "line-first",
+        "grouping_suspect_count": 0,
+        "requires_split_review": False,
+        "file_quality": _public_reference_preprocess_quality(file_quality),
+        "file_quality_low": file_quality_low,
+        "review_generation_id": "",
+        "error": None,
+    }, 0
+
+
+def _handle_persist_reference_entry_splits(args: argparse.Namespace) -> int:
+    return _emit(
+        persist_reference_entry_splits(
+            _cli_db_path(args),
+            _read_json_payload(args.payload_file),
+            out_path=_resolve_cli_path(args.out_path),
+            persist_db_only=args.persist_db_only,
         )
     )
-    return 0
 
 
-def _handle_decide_reference_extraction(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
-    payload = _read_json_payload(args.payload_file)
+def decide_reference_extraction(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
     decision = str(payload.get("decision", "")).strip()
     reason = str(payload.get("reason", "")).strip()
     acknowledged = payload.get("acknowledged_file_quality_low")
@@ -6050,8 +6285,7 @@ def _handle_decide_reference_extraction(args: argparse.Namespace) -> int:
             message = "reference preprocess quality missing; run prepare_references_workset first"
             set_runtime_error(connection, "reference_extraction_decision_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_extraction_decision_failed", "message": message}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_extraction_decision_failed", "message": message}}, 2
         if (
             quality.get("schema") != REFERENCE_PREPROCESS_QUALITY_SCHEMA
             or quality.get("preprocess_version") != REFERENCE_PREPROCESS_VERSION
@@ -6059,32 +6293,27 @@ def _handle_decide_reference_extraction(args: argparse.Namespace) -> int:
             message = "reference preprocess quality was not produced by the deterministic preprocess"
             set_runtime_error(connection, "reference_extraction_decision_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_extraction_decision_failed", "message": message}, "file_quality": _public_reference_preprocess_quality(quality)}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_extraction_decision_failed", "message": message}, "file_quality": _public_reference_preprocess_quality(quality)}, 2
         if decision not in {"continue", "abandon"}:
             message = "decision must be continue or abandon"
             set_runtime_error(connection, "reference_extraction_decision_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_extraction_decision_failed", "message": message}, "file_quality": _public_reference_preprocess_quality(quality)}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_extraction_decision_failed", "message": message}, "file_quality": _public_reference_preprocess_quality(quality)}, 2
         if acknowledged is not True:
             message = "acknowledged_file_quality_low must be true"
             set_runtime_error(connection, "reference_extraction_decision_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_extraction_decision_failed", "message": message}, "file_quality": _public_reference_preprocess_quality(quality)}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_extraction_decision_failed", "message": message}, "file_quality": _public_reference_preprocess_quality(quality)}, 2
         if not reason:
             message = "reason must be a non-empty string"
             set_runtime_error(connection, "reference_extraction_decision_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_extraction_decision_failed", "message": message}, "file_quality": _public_reference_preprocess_quality(quality)}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_extraction_decision_failed", "message": message}, "file_quality": _public_reference_preprocess_quality(quality)}, 2
         if not bool(quality.get("file_quality_low")):
             message = "reference extraction can only be decided here when deterministic file_quality_low is true"
             set_runtime_error(connection, "reference_extraction_decision_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_extraction_decision_failed", "message": message}, "file_quality": _public_reference_preprocess_quality(quality)}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_extraction_decision_failed", "message": message}, "file_quality": _public_reference_preprocess_quality(quality)}, 2
 
         receipts = fetch_action_receipts(connection)
         prepare_receipt = receipts.get("prepare_references_workset", {})
@@ -6130,36 +6359,30 @@ def _handle_decide_reference_extraction(args: argparse.Namespace) -> int:
             },
         )
         connection.commit()
-    print(
-        json.dumps(
-            {
-                "decision": decision,
-                "file_quality": _public_reference_preprocess_quality(quality),
-                "next_action": "prepare_citation_workset" if decision == "abandon" else ("persist_reference_entry_splits" if requires_split_review else "persist_references"),
-                "error": None,
-            },
-            ensure_ascii=False,
-        )
-    )
-    return 0
+    return {
+        "decision": decision,
+        "file_quality": _public_reference_preprocess_quality(quality),
+        "next_action": "prepare_citation_workset" if decision == "abandon" else ("persist_reference_entry_splits" if requires_split_review else "persist_references"),
+        "error": None,
+    }, 0
 
 
-def _handle_persist_references(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
-    payload = _read_json_payload(args.payload_file)
+def _handle_decide_reference_extraction(args: argparse.Namespace) -> int:
+    return _emit(decide_reference_extraction(_cli_db_path(args), _read_json_payload(args.payload_file)))
+
+
+def persist_references(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
     items = payload.get("items", [])
     with connect_db(db_path) as connection:
         if "entries" in payload or "batches" in payload:
             message = "persist_references now accepts only items[] keyed by entry_index + selected_pattern"
             set_runtime_error(connection, "references_stage_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "references_stage_failed", "message": message}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "references_stage_failed", "message": message}}, 2
         if not isinstance(items, list):
             set_runtime_error(connection, "references_stage_failed", "items must be array", "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "references_stage_failed", "message": "items must be array"}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "references_stage_failed", "message": "items must be array"}}, 2
 
         entries = fetch_reference_entries(connection)
         candidates = fetch_reference_parse_candidates(connection)
@@ -6167,8 +6390,7 @@ def _handle_persist_references(args: argparse.Namespace) -> int:
             message = "reference workset missing; prepare_references_workset must run first"
             set_runtime_error(connection, "references_stage_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "references_stage_failed", "message": message}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "references_stage_failed", "message": message}}, 2
 
         entry_metadata = {int(entry["entry_index"]): dict(entry.get("metadata", {})) for entry in entries}
         candidates_by_entry: dict[int, dict[str, dict[str, Any]]] = {}
@@ -6182,42 +6404,36 @@ def _handle_persist_references(args: argparse.Namespace) -> int:
                 message = f"items[{index}] must be object"
                 set_runtime_error(connection, "references_stage_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "references_stage_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "references_stage_failed", "message": message}}, 2
             required_keys = ("entry_index", "selected_pattern", "author", "title", "year", "raw", "confidence")
             missing = [key for key in required_keys if key not in item]
             if missing:
                 message = f"items[{index}] missing required keys: {missing}"
                 set_runtime_error(connection, "references_stage_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "references_stage_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "references_stage_failed", "message": message}}, 2
             entry_index = item.get("entry_index")
             selected_pattern = str(item.get("selected_pattern"))
             if not isinstance(entry_index, int):
                 message = f"items[{index}].entry_index must be integer"
                 set_runtime_error(connection, "references_stage_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "references_stage_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "references_stage_failed", "message": message}}, 2
             if entry_index not in candidates_by_entry:
                 message = f"items[{index}].entry_index has no prepared candidates"
                 set_runtime_error(connection, "references_stage_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "references_stage_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "references_stage_failed", "message": message}}, 2
             if not selected_pattern:
                 message = f"items[{index}].selected_pattern must be non-empty"
                 set_runtime_error(connection, "references_stage_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "references_stage_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "references_stage_failed", "message": message}}, 2
             if selected_pattern not in candidates_by_entry[entry_index]:
                 message = f"items[{index}].selected_pattern does not match prepared candidates"
                 set_runtime_error(connection, "references_stage_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "references_stage_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "references_stage_failed", "message": message}}, 2
 
             title_value = item.get("title", "")
             title = "" if title_value is None else str(title_value).strip()
@@ -6225,8 +6441,7 @@ def _handle_persist_references(args: argparse.Namespace) -> int:
                 message = f"items[{index}].title has suspicious leading punctuation"
                 set_runtime_error(connection, "references_stage_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "references_stage_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "references_stage_failed", "message": message}}, 2
 
             candidate_obj = candidates_by_entry[entry_index][selected_pattern]
             author = _as_str_list(item.get("author"))
@@ -6245,18 +6460,12 @@ def _handle_persist_references(args: argparse.Namespace) -> int:
                 message = f"items[{index}].author invalid: {oversplit_message}"
                 set_runtime_error(connection, "reference_author_refinement_invalid", message, "stage_5_references")
                 connection.commit()
-                print(
-                    json.dumps(
-                        {
-                            "error": {
-                                "code": "reference_author_refinement_invalid",
-                                "message": message,
-                            }
-                        },
-                        ensure_ascii=False,
-                    )
-                )
-                return 2
+                return {
+                    "error": {
+                        "code": "reference_author_refinement_invalid",
+                        "message": message,
+                    }
+                }, 2
             year = _as_int_or_none(item.get("year"))
             raw = str(item.get("raw", ""))
             confidence = _as_confidence(item.get("confidence"), 0.1)
@@ -6344,21 +6553,15 @@ def _handle_persist_references(args: argparse.Namespace) -> int:
                 last_error_code="reference_quality_hard_block",
             )
             connection.commit()
-            print(
-                json.dumps(
-                    {
-                        "stored_reference_items": 0,
-                        "quality_issues": active_issues,
-                        "warnings": list(dict.fromkeys(warnings)),
-                        "error": {
-                            "code": "reference_quality_hard_block",
-                            "message": "Repair the listed reference rows before continuing.",
-                        },
-                    },
-                    ensure_ascii=False,
-                )
-            )
-            return 2
+            return {
+                "stored_reference_items": 0,
+                "quality_issues": active_issues,
+                "warnings": list(dict.fromkeys(warnings)),
+                "error": {
+                    "code": "reference_quality_hard_block",
+                    "message": "Repair the listed reference rows before continuing.",
+                },
+            }, 2
 
         store_reference_items(connection, normalized_items)
         if quality_issues:
@@ -6380,18 +6583,12 @@ def _handle_persist_references(args: argparse.Namespace) -> int:
                 metadata={"stored_reference_items": len(normalized_items), "quality_issue_count": len(active_issues)},
             )
             connection.commit()
-            print(
-                json.dumps(
-                    {
-                        "stored_reference_items": len(normalized_items),
-                        "quality_issues": active_issues,
-                        "warnings": list(dict.fromkeys(warnings)),
-                        "error": None,
-                    },
-                    ensure_ascii=False,
-                )
-            )
-            return 0
+            return {
+                "stored_reference_items": len(normalized_items),
+                "quality_issues": active_issues,
+                "warnings": list(dict.fromkeys(warnings)),
+                "error": None,
+            }, 0
 
         resolve_reference_quality_issues(connection)
         for warning in list(dict.fromkeys(warnings)):
@@ -6410,13 +6607,14 @@ def _handle_persist_references(args: argparse.Namespace) -> int:
             metadata={"stored_reference_items": len(normalized_items)},
         )
         connection.commit()
-    print(json.dumps({"stored_reference_items": len(normalized_items), "warnings": list(dict.fromkeys(warnings)), "error": None}, ensure_ascii=False))
-    return 0
+    return {"stored_reference_items": len(normalized_items), "warnings": list(dict.fromkeys(warnings)), "error": None}, 0
 
 
-def _handle_review_reference_quality(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
-    payload = _read_json_payload(args.payload_file)
+def _handle_persist_references(args: argparse.Namespace) -> int:
+    return _emit(persist_references(_cli_db_path(args), _read_json_payload(args.payload_file)))
+
+
+def review_reference_quality(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
     resolutions = payload.get("resolutions", [])
     with connect_db(db_path) as connection:
         active_issues = fetch_active_reference_quality_issues(connection)
@@ -6430,14 +6628,12 @@ def _handle_review_reference_quality(args: argparse.Namespace) -> int:
             )
             _record_action_receipt(connection, action_name="review_reference_quality", stage="stage_5_references")
             connection.commit()
-            print(json.dumps({"resolved_issue_ids": [], "remaining_quality_issues": [], "error": None}, ensure_ascii=False))
-            return 0
+            return {"resolved_issue_ids": [], "remaining_quality_issues": [], "error": None}, 0
         if not isinstance(resolutions, list) or not resolutions:
             message = "resolutions must be a non-empty array"
             set_runtime_error(connection, "reference_quality_review_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, 2
 
         issue_by_id = {int(issue["issue_id"]): issue for issue in active_issues}
         submitted_ids: set[int] = set()
@@ -6452,21 +6648,18 @@ def _handle_review_reference_quality(args: argparse.Namespace) -> int:
                 message = f"resolutions[{index}] must be object"
                 set_runtime_error(connection, "reference_quality_review_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, 2
             issue_id = resolution_obj.get("issue_id")
             if not isinstance(issue_id, int) or issue_id not in issue_by_id:
                 message = f"resolutions[{index}].issue_id must refer to an active quality issue"
                 set_runtime_error(connection, "reference_quality_review_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, 2
             if issue_id in submitted_ids:
                 message = f"resolutions[{index}].issue_id is duplicated"
                 set_runtime_error(connection, "reference_quality_review_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, 2
             submitted_ids.add(issue_id)
             issue = issue_by_id[issue_id]
             resolution = str(resolution_obj.get("resolution", "")).strip()
@@ -6475,8 +6668,7 @@ def _handle_review_reference_quality(args: argparse.Namespace) -> int:
                     message = f"issue_id {issue_id} is hard_block and cannot be accept_warning"
                     set_runtime_error(connection, "reference_quality_review_failed", message, "stage_5_references")
                     connection.commit()
-                    print(json.dumps({"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, ensure_ascii=False))
-                    return 2
+                    return {"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, 2
                 accepted_issue_ids.append(issue_id)
                 continue
 
@@ -6485,8 +6677,7 @@ def _handle_review_reference_quality(args: argparse.Namespace) -> int:
                     message = f"issue_id {issue_id} is warning and cannot be omit"
                     set_runtime_error(connection, "reference_quality_review_failed", message, "stage_5_references")
                     connection.commit()
-                    print(json.dumps({"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, ensure_ascii=False))
-                    return 2
+                    return {"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, 2
                 ref_index = issue.get("ref_index")
                 if ref_index is not None and int(ref_index) in reference_by_index:
                     reference_items = [item for item in reference_items if int(item["ref_index"]) != int(ref_index)]
@@ -6499,8 +6690,7 @@ def _handle_review_reference_quality(args: argparse.Namespace) -> int:
                 message = f"resolutions[{index}].resolution must be corrected, accept_warning, or omit"
                 set_runtime_error(connection, "reference_quality_review_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, 2
 
             corrected = resolution_obj.get("reference")
             if corrected is None:
@@ -6509,15 +6699,13 @@ def _handle_review_reference_quality(args: argparse.Namespace) -> int:
                 message = f"resolutions[{index}].reference must be object for corrected"
                 set_runtime_error(connection, "reference_quality_review_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, 2
             ref_index = issue.get("ref_index")
             if ref_index is None or int(ref_index) not in reference_by_index:
                 message = f"issue_id {issue_id} has no persisted reference item to correct; resubmit persist_references instead"
                 set_runtime_error(connection, "reference_quality_review_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, 2
             current_item = dict(reference_by_index[int(ref_index)])
             metadata = dict(current_item.get("metadata", {}))
             corrected_item = dict(current_item)
@@ -6553,8 +6741,7 @@ def _handle_review_reference_quality(args: argparse.Namespace) -> int:
                 message = f"corrected reference for issue_id {issue_id} still has hard quality issues: {[issue['reason_code'] for issue in remaining_hard_issues]}"
                 set_runtime_error(connection, "reference_quality_review_failed", message, "stage_5_references")
                 connection.commit()
-                print(json.dumps({"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, ensure_ascii=False))
-                return 2
+                return {"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, 2
             remaining_warning_flags = [item["reason_code"] for item in remaining_issues if item["severity"] == REFERENCE_QUALITY_WARNING]
             if remaining_warning_flags:
                 normalized_metadata = dict(normalized.get("metadata", {}))
@@ -6573,8 +6760,7 @@ def _handle_review_reference_quality(args: argparse.Namespace) -> int:
             message = f"resolutions must cover every active quality issue exactly once; missing issue_ids: {missing_issue_ids}"
             set_runtime_error(connection, "reference_quality_review_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "reference_quality_review_failed", "message": message}, "quality_issues": active_issues}, 2
 
         if resolved_issue_ids:
             resolve_reference_quality_issues(connection, issue_ids=resolved_issue_ids, status="resolved")
@@ -6593,19 +6779,13 @@ def _handle_review_reference_quality(args: argparse.Namespace) -> int:
                 status="reference quality warnings remain active",
             )
             connection.commit()
-            print(
-                json.dumps(
-                    {
-                        "resolved_issue_ids": resolved_issue_ids,
-                        "accepted_issue_ids": accepted_issue_ids,
-                        "omitted_issue_ids": omitted_issue_ids,
-                        "remaining_quality_issues": remaining_issues,
-                        "error": {"code": "reference_quality_review_incomplete", "message": "Resolve every active quality issue before continuing."},
-                    },
-                    ensure_ascii=False,
-                )
-            )
-            return 2
+            return {
+                "resolved_issue_ids": resolved_issue_ids,
+                "accepted_issue_ids": accepted_issue_ids,
+                "omitted_issue_ids": omitted_issue_ids,
+                "remaining_quality_issues": remaining_issues,
+                "error": {"code": "reference_quality_review_incomplete", "message": "Resolve every active quality issue before continuing."},
+            }, 2
 
         if not fetch_reference_items(connection):
             set_workflow_state(
@@ -6618,19 +6798,13 @@ def _handle_review_reference_quality(args: argparse.Namespace) -> int:
                 last_error_code="reference_quality_review_failed",
             )
             connection.commit()
-            print(
-                json.dumps(
-                    {
-                        "resolved_issue_ids": resolved_issue_ids,
-                        "accepted_issue_ids": accepted_issue_ids,
-                        "omitted_issue_ids": omitted_issue_ids,
-                        "remaining_quality_issues": [],
-                        "error": {"code": "reference_quality_review_failed", "message": "No reference_items remain; resubmit persist_references with at least one recoverable reference."},
-                    },
-                    ensure_ascii=False,
-                )
-            )
-            return 2
+            return {
+                "resolved_issue_ids": resolved_issue_ids,
+                "accepted_issue_ids": accepted_issue_ids,
+                "omitted_issue_ids": omitted_issue_ids,
+                "remaining_quality_issues": [],
+                "error": {"code": "reference_quality_review_failed", "message": "No reference_items remain; resubmit persist_references with at least one recoverable reference."},
+            }, 2
 
         _set_success_state(
             connection,
@@ -6650,23 +6824,20 @@ def _handle_review_reference_quality(args: argparse.Namespace) -> int:
             },
         )
         connection.commit()
-    print(
-        json.dumps(
-            {
-                "resolved_issue_ids": resolved_issue_ids,
-                "accepted_issue_ids": accepted_issue_ids,
-                "omitted_issue_ids": omitted_issue_ids,
-                "remaining_quality_issues": [],
-                "error": None,
-            },
-            ensure_ascii=False,
-        )
-    )
-    return 0
+    return {
+        "resolved_issue_ids": resolved_issue_ids,
+        "accepted_issue_ids": accepted_issue_ids,
+        "omitted_issue_ids": omitted_issue_ids,
+        "remaining_quality_issues": [],
+        "error": None,
+    }, 0
 
 
-def _handle_prepare_reference_metadata_enrichment(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
+def _handle_review_reference_quality(args: argparse.Namespace) -> int:
+    return _emit(review_reference_quality(_cli_db_path(args), _read_json_payload(args.payload_file)))
+
+
+def prepare_reference_metadata_enrichment(db_path: Path, *, out_path: Path | None = None) -> tuple[dict[str, Any], int]:
     with connect_db(db_path) as connection:
         if is_reference_extraction_abandoned(connection):
             _set_success_state(
@@ -6684,16 +6855,14 @@ def _handle_prepare_reference_metadata_enrichment(args: argparse.Namespace) -> i
                 metadata={"reason": "reference_extraction_abandoned"},
             )
             connection.commit()
-            print(json.dumps({"workset_path": "", "item_count": 0, "skipped": True, "error": None}, ensure_ascii=False))
-            return 0
+            return {"workset_path": "", "item_count": 0, "skipped": True, "error": None}, 0
 
         all_reference_items = fetch_reference_items(connection)
         if not all_reference_items:
             message = "reference_items missing; persist_references must run before metadata evidence review"
             set_runtime_error(connection, "references_stage_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"workset_path": "", "error": {"code": "references_stage_failed", "message": message}}, ensure_ascii=False))
-            return 2
+            return {"workset_path": "", "error": {"code": "references_stage_failed", "message": message}}, 2
         reference_items = [
             item
             for item in all_reference_items
@@ -6723,12 +6892,11 @@ def _handle_prepare_reference_metadata_enrichment(args: argparse.Namespace) -> i
                 metadata={"reason": "all_references_api_resolved", "item_count": 0},
             )
             connection.commit()
-            print(json.dumps({"workset_path": "", "item_count": 0, "skipped": True, "error": None}, ensure_ascii=False))
-            return 0
+            return {"workset_path": "", "item_count": 0, "skipped": True, "error": None}, 0
 
         inputs = fetch_runtime_inputs(connection)
         runtime_paths = _runtime_paths_from_inputs(inputs, fallback_db_path=db_path)
-        out_path = Path(args.out_path).expanduser().resolve() if args.out_path else (runtime_paths.tmp_dir / REFERENCE_METADATA_ENRICHMENT_EXPORT_FILENAME)
+        out_path = out_path.expanduser().resolve() if out_path is not None else (runtime_paths.tmp_dir / REFERENCE_METADATA_ENRICHMENT_EXPORT_FILENAME)
         rows = _build_reference_metadata_enrichment_rows(reference_items)
         store_reference_metadata_enrichment_workset(connection, rows)
         workset_payload = {
@@ -6755,33 +6923,28 @@ def _handle_prepare_reference_metadata_enrichment(args: argparse.Namespace) -> i
             metadata={"item_count": len(rows), "batch_count": len({int(row["batch_index"]) for row in rows})},
         )
         connection.commit()
-    print(
-        json.dumps(
-            {
-                "workset_path": str(out_path),
-                "item_count": len(rows),
-                "batch_count": len({int(row["batch_index"]) for row in rows}),
-                "error": None,
-            },
-            ensure_ascii=False,
-        )
-    )
-    return 0
+    return {
+        "workset_path": str(out_path),
+        "item_count": len(rows),
+        "batch_count": len({int(row["batch_index"]) for row in rows}),
+        "error": None,
+    }, 0
 
 
-def _handle_persist_reference_metadata_enrichment(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
-    payload = _read_json_payload(args.payload_file)
+def _handle_prepare_reference_metadata_enrichment(args: argparse.Namespace) -> int:
+    return _emit(prepare_reference_metadata_enrichment(_cli_db_path(args), out_path=_resolve_cli_path(args.out_path)))
+
+
+def persist_reference_metadata_enrichment(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
     items = payload.get("items")
     with connect_db(db_path) as connection:
         workset_rows = fetch_reference_metadata_enrichment_workset(connection)
         reference_items = fetch_reference_items(connection)
 
-        def fail(message: str) -> int:
+        def fail(message: str) -> tuple[dict[str, Any], int]:
             set_runtime_error(connection, "references_stage_failed", message, "stage_5_references")
             connection.commit()
-            print(json.dumps({"error": {"code": "references_stage_failed", "message": message}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "references_stage_failed", "message": message}}, 2
 
         if not workset_rows:
             return fail("reference metadata evidence workset missing; run prepare_reference_metadata_enrichment first")
@@ -6868,32 +7031,29 @@ def _handle_persist_reference_metadata_enrichment(args: argparse.Namespace) -> i
             },
         )
         connection.commit()
-    print(
-        json.dumps(
-            {
-                "stored_reference_items": len(reference_items),
-                "enriched_count": enriched_count,
-                "confirmed_existing_count": confirmed_existing_count,
-                "no_metadata_found_count": no_metadata_count,
-                "error": None,
-            },
-            ensure_ascii=False,
-        )
-    )
-    return 0
+    return {
+        "stored_reference_items": len(reference_items),
+        "enriched_count": enriched_count,
+        "confirmed_existing_count": confirmed_existing_count,
+        "no_metadata_found_count": no_metadata_count,
+        "error": None,
+    }, 0
 
 
-def _handle_prepare_citation_workset(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
-    payload = _read_json_payload(args.payload_file)
+def _handle_persist_reference_metadata_enrichment(args: argparse.Namespace) -> int:
+    return _emit(persist_reference_metadata_enrichment(_cli_db_path(args), _read_json_payload(args.payload_file)))
+
+
+def prepare_citation_workset(db_path: Path, payload: dict[str, Any], *, out_path: Path | None = None, persist_db_only: bool = False) -> tuple[dict[str, Any], int]:
 
     with connect_db(db_path) as connection:
         inputs = fetch_runtime_inputs(connection)
         runtime_paths = _runtime_paths_from_inputs(inputs, fallback_db_path=db_path)
-        out_path = Path(args.out_path).expanduser().resolve() if args.out_path else (runtime_paths.tmp_dir / CITATION_EXPORT_FILENAME)
+        out_path = out_path.expanduser().resolve() if out_path is not None else (runtime_paths.tmp_dir / CITATION_EXPORT_FILENAME)
         review_path = out_path.with_name(CITATION_REVIEW_EXPORT_FILENAME if out_path.name == CITATION_EXPORT_FILENAME else f"{out_path.stem}_review{out_path.suffix or '.json'}")
-        source_doc = fetch_source_document(connection, "normalized_source")
+        source_lines = fetch_source_lines(connection, "normalized_source")
         scope_row = fetch_section_scope(connection, "citation_scope")
+        references_scope_row = fetch_section_scope(connection, "references_scope")
         reference_items = fetch_reference_items(connection)
         reference_free_mode = is_reference_extraction_abandoned(connection)
         if not reference_free_mode and not has_action_receipt(connection, "persist_reference_metadata_enrichment"):
@@ -6901,26 +7061,24 @@ def _handle_prepare_citation_workset(args: argparse.Namespace) -> int:
                 message = "reference metadata evidence review missing; run persist_references core submit and Reference Metadata Evidence Review before citation workset"
                 set_runtime_error(connection, "citation_scope_failed", message, "stage_6_citation")
                 connection.commit()
-                print(json.dumps({"workset_path": "", "error": {"code": "citation_scope_failed", "message": message}}, ensure_ascii=False))
-                return 2
+                return {"workset_path": "", "error": {"code": "citation_scope_failed", "message": message}}, 2
             add_runtime_warning_once(connection, WARNING_CITATION_METADATA_EVIDENCE_MISSING)
             connection.commit()
-        if source_doc is None:
+        if source_lines is None:
             set_runtime_error(connection, "citation_scope_failed", "normalized source missing", "stage_6_citation")
             connection.commit()
-            print(json.dumps({"workset_path": "", "error": {"code": "citation_scope_failed", "message": "normalized source missing"}}, ensure_ascii=False))
-            return 2
+            return {"workset_path": "", "error": {"code": "citation_scope_failed", "message": "normalized source missing"}}, 2
         if "scope" in payload:
             message = "prepare_citation_workset no longer accepts scope override payload; use section_scopes.citation_scope from DB"
             set_runtime_error(connection, "citation_scope_failed", message, "stage_6_citation")
             connection.commit()
-            print(json.dumps({"workset_path": "", "error": {"code": "citation_scope_failed", "message": message}}, ensure_ascii=False))
-            return 2
-        text = str(source_doc["content"])
+            return {"workset_path": "", "error": {"code": "citation_scope_failed", "message": message}}, 2
         md_path = Path(inputs.get("source_path", "")) if inputs.get("source_path", "") else None
 
-    lines = text.splitlines()
+    lines = source_lines
     scope, scope_metadata, scope_error = _resolve_db_citation_scope(scope_row=scope_row, lines=lines)
+    if scope is not None and inputs.get("citation_full_document", "").strip().lower() in {"1", "true", "yes"}:
+        scope, scope_metadata = _full_document_citation_scope(lines, scope, references_scope_row=references_scope_row)
     workset_payload: dict[str, Any] = {
         "meta": {
             "generated_at": utc_now_iso(),
@@ -7001,7 +7159,7 @@ def _handle_prepare_citation_workset(args: argparse.Namespace) -> int:
             elif not workset_payload["workset_items"]:
                 workset_payload.setdefault("warnings", []).append(WARNING_CITATION_MENTIONS_UNRESOLVED)
 
-    if not args.persist_db_only:
+    if not persist_db_only:
         _write_json(out_path, workset_payload)
         _write_json(review_path, _build_citation_review_view(workset_payload))
 
@@ -7010,17 +7168,11 @@ def _handle_prepare_citation_workset(args: argparse.Namespace) -> int:
             error = dict(workset_payload["error"])
             set_runtime_error(connection, str(error["code"]), str(error["message"]), "stage_6_citation")
             connection.commit()
-            print(
-                json.dumps(
-                    {
-                        "workset_path": str(out_path) if not args.persist_db_only else "",
-                        "review_path": str(review_path) if not args.persist_db_only else "",
-                        "error": error,
-                    },
-                    ensure_ascii=False,
-                )
-            )
-            return 2
+            return {
+                "workset_path": str(out_path) if not persist_db_only else "",
+                "review_path": str(review_path) if not persist_db_only else "",
+                "error": error,
+            }, 2
         scope_payload = dict(workset_payload["meta"]["scope"])
         store_section_scope(
             connection,
@@ -7083,41 +7235,43 @@ def _handle_prepare_citation_workset(args: argparse.Namespace) -> int:
             },
         )
         connection.commit()
-    print(
-        json.dumps(
-            {
-                "workset_path": str(out_path) if not args.persist_db_only else "",
-                "review_path": str(review_path) if not args.persist_db_only else "",
-                "scope": workset_payload["meta"]["scope"],
-                "scope_source": workset_payload["meta"]["scope_source"],
-                "scope_decision": workset_payload["meta"]["scope_decision"],
-                "resolved_items": workset_payload["stats"]["resolved_items"],
-                "unresolved_mentions": workset_payload["stats"]["unresolved_mentions"],
-                "filtered_false_positive_mentions": workset_payload["stats"].get("filtered_false_positive_mentions", 0),
-                "reference_free_mode": reference_free_mode,
-                "error": None,
-            },
-            ensure_ascii=False,
+    return {
+        "workset_path": str(out_path) if not persist_db_only else "",
+        "review_path": str(review_path) if not persist_db_only else "",
+        "scope": workset_payload["meta"]["scope"],
+        "scope_source": workset_payload["meta"]["scope_source"],
+        "scope_decision": workset_payload["meta"]["scope_decision"],
+        "resolved_items": workset_payload["stats"]["resolved_items"],
+        "unresolved_mentions": workset_payload["stats"]["unresolved_mentions"],
+        "filtered_false_positive_mentions": workset_payload["stats"].get("filtered_false_positive_mentions", 0),
+        "reference_free_mode": reference_free_mode,
+        "error": None,
+    }, 0
+
+
+def _handle_prepare_citation_workset(args: argparse.Namespace) -> int:
+    return _emit(
+        prepare_citation_workset(
+            _cli_db_path(args),
+            _read_json_payload(args.payload_file),
+            out_path=_resolve_cli_path(args.out_path),
+            persist_db_only=args.persist_db_only,
         )
     )
-    return 0
 
 
-def _handle_export_citation_workset(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
+def export_citation_workset(db_path: Path, *, out_path: Path | None = None) -> tuple[dict[str, Any], int]:
     with connect_db(db_path) as connection:
         scope_row = fetch_section_scope(connection, "citation_scope")
         if scope_row is None:
             error = {"code": "citation_scope_failed", "message": "citation_scope missing"}
-            print(json.dumps({"error": error}, ensure_ascii=False))
-            return 2
+            return {"error": error}, 2
         mentions = fetch_citation_mentions(connection)
         workset_items = fetch_citation_workset_items(connection)
         reference_free_mode = is_reference_extraction_abandoned(connection)
         if not has_action_receipt(connection, "prepare_citation_workset") and not reference_free_mode:
             error = {"code": "citation_scope_failed", "message": "citation workset missing; prepare_citation_workset must run first"}
-            print(json.dumps({"error": error}, ensure_ascii=False))
-            return 2
+            return {"error": error}, 2
         scope = _db_scope_to_scope(scope_row)
         workset = {
             "meta": {
@@ -7149,18 +7303,19 @@ def _handle_export_citation_workset(args: argparse.Namespace) -> int:
             ],
         }
         review_view = _build_citation_review_view(workset)
-    if args.out_path:
-        _write_json(Path(args.out_path), workset)
-        review_out = Path(args.out_path).with_name(f"{Path(args.out_path).stem}_review{Path(args.out_path).suffix or '.json'}")
+    if out_path is not None:
+        _write_json(out_path, workset)
+        review_out = out_path.with_name(f"{out_path.stem}_review{out_path.suffix or '.json'}")
         _write_json(review_out, review_view)
     workset["review_items"] = review_view["items"]
-    print(json.dumps(workset, ensure_ascii=False))
-    return 0
+    return workset, 0
 
 
-def _handle_persist_citation_semantics(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
-    payload = _read_json_payload(args.payload_file)
+def _handle_export_citation_workset(args: argparse.Namespace) -> int:
+    return _emit(export_citation_workset(_cli_db_path(args), out_path=_resolve_cli_path(args.out_path)))
+
+
+def persist_citation_semantics(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
 
     with connect_db(db_path) as connection:
         workset_items = fetch_citation_workset_items(connection)
@@ -7168,14 +7323,12 @@ def _handle_persist_citation_semantics(args: argparse.Namespace) -> int:
         if not has_action_receipt(connection, "prepare_citation_workset") and not reference_free_mode:
             set_runtime_error(connection, "citation_semantics_failed", "citation workset missing; prepare_citation_workset must run first", "stage_6_citation")
             connection.commit()
-            print(json.dumps({"error": {"code": "citation_semantics_failed", "message": "citation workset missing; prepare_citation_workset must run first"}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "citation_semantics_failed", "message": "citation workset missing; prepare_citation_workset must run first"}}, 2
         normalized_items, error = _validate_citation_semantics_payload(payload, workset_items, reference_free_mode=reference_free_mode)
         if error is not None or normalized_items is None:
             set_runtime_error(connection, "citation_semantics_failed", error or "invalid citation semantics payload", "stage_6_citation")
             connection.commit()
-            print(json.dumps({"error": {"code": "citation_semantics_failed", "message": error or "invalid citation semantics payload"}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "citation_semantics_failed", "message": error or "invalid citation semantics payload"}}, 2
         final_items: list[dict[str, Any]] = []
         for item in normalized_items:
             item_obj = dict(item)
@@ -7196,13 +7349,14 @@ def _handle_persist_citation_semantics(args: argparse.Namespace) -> int:
             metadata={"stored_citation_items": len(final_items)},
         )
         connection.commit()
-    print(json.dumps({"stored_citation_items": len(final_items), "error": None}, ensure_ascii=False))
-    return 0
+    return {"stored_citation_items": len(final_items), "error": None}, 0
 
 
-def _handle_persist_citation_timeline(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
-    payload = _read_json_payload(args.payload_file)
+def _handle_persist_citation_semantics(args: argparse.Namespace) -> int:
+    return _emit(persist_citation_semantics(_cli_db_path(args), _read_json_payload(args.payload_file)))
+
+
+def persist_citation_timeline(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
 
     with connect_db(db_path) as connection:
         citation_items = fetch_citation_items(connection)
@@ -7210,28 +7364,27 @@ def _handle_persist_citation_timeline(args: argparse.Namespace) -> int:
         if not has_action_receipt(connection, "persist_citation_semantics") and not reference_free_mode:
             set_runtime_error(connection, "citation_semantics_failed", "citation semantics missing; persist_citation_semantics must run first", "stage_6_citation")
             connection.commit()
-            print(json.dumps({"error": {"code": "citation_semantics_failed", "message": "citation semantics missing; persist_citation_semantics must run first"}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "citation_semantics_failed", "message": "citation semantics missing; persist_citation_semantics must run first"}}, 2
         workset_items = fetch_citation_workset_items(connection)
         normalized_timeline, warnings, error = _validate_citation_timeline_payload(payload, workset_items, citation_items)
         if error is not None or normalized_timeline is None:
             set_runtime_error(connection, "citation_timeline_failed", error or "invalid citation timeline payload", "stage_6_citation")
             connection.commit()
-            print(json.dumps({"error": {"code": "citation_timeline_failed", "message": error or "invalid citation timeline payload"}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "citation_timeline_failed", "message": error or "invalid citation timeline payload"}}, 2
         store_citation_timeline(connection, normalized_timeline)
         for warning in warnings:
             add_runtime_warning_once(connection, warning)
         _set_success_state(connection, stage="stage_6_citation", substep="persist_citation_summary", next_action="persist_citation_summary", status="citation timeline persisted")
         _record_action_receipt(connection, action_name="persist_citation_timeline", stage="stage_6_citation")
         connection.commit()
-    print(json.dumps({"stored_citation_timeline": True, "warnings": warnings, "error": None}, ensure_ascii=False))
-    return 0
+    return {"stored_citation_timeline": True, "warnings": warnings, "error": None}, 0
 
 
-def _handle_persist_citation_summary(args: argparse.Namespace) -> int:
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
-    payload = _read_json_payload(args.payload_file)
+def _handle_persist_citation_timeline(args: argparse.Namespace) -> int:
+    return _emit(persist_citation_timeline(_cli_db_path(args), _read_json_payload(args.payload_file)))
+
+
+def persist_citation_summary(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
     summary = payload.get("summary")
     basis = payload.get("basis")
 
@@ -7241,33 +7394,32 @@ def _handle_persist_citation_summary(args: argparse.Namespace) -> int:
         if not has_action_receipt(connection, "persist_citation_timeline") and not reference_free_mode:
             set_runtime_error(connection, "citation_timeline_failed", "citation timeline missing; persist_citation_timeline must run first", "stage_6_citation")
             connection.commit()
-            print(json.dumps({"error": {"code": "citation_timeline_failed", "message": "citation timeline missing; persist_citation_timeline must run first"}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "citation_timeline_failed", "message": "citation timeline missing; persist_citation_timeline must run first"}}, 2
         citation_timeline = fetch_citation_timeline(connection)
         if citation_timeline is None:
             set_runtime_error(connection, "citation_timeline_failed", "citation timeline missing; persist_citation_timeline must run first", "stage_6_citation")
             connection.commit()
-            print(json.dumps({"error": {"code": "citation_timeline_failed", "message": "citation timeline missing; persist_citation_timeline must run first"}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "citation_timeline_failed", "message": "citation timeline missing; persist_citation_timeline must run first"}}, 2
         if summary is None:
             summary = ""
         if not isinstance(summary, str):
             set_runtime_error(connection, "citation_semantics_failed", "summary must be string", "stage_6_citation")
             connection.commit()
-            print(json.dumps({"error": {"code": "citation_semantics_failed", "message": "summary must be string"}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "citation_semantics_failed", "message": "summary must be string"}}, 2
         normalized_basis, error = _validate_citation_summary_basis(basis, citation_items, reference_free_mode=reference_free_mode)
         if error is not None or normalized_basis is None:
             set_runtime_error(connection, "citation_semantics_failed", error or "invalid citation summary basis", "stage_6_citation")
             connection.commit()
-            print(json.dumps({"error": {"code": "citation_semantics_failed", "message": error or "invalid citation summary basis"}}, ensure_ascii=False))
-            return 2
+            return {"error": {"code": "citation_semantics_failed", "message": error or "invalid citation summary basis"}}, 2
         store_citation_summary(connection, summary.strip(), normalized_basis)
         _set_success_state(connection, stage="stage_7_render_and_validate", substep="render_and_validate", next_action="render_and_validate", status="citation summary persisted")
         _record_action_receipt(connection, action_name="persist_citation_summary", stage="stage_6_citation")
         connection.commit()
-    print(json.dumps({"stored_citation_summary": True, "error": None}, ensure_ascii=False))
-    return 0
+    return {"stored_citation_summary": True, "error": None}, 0
+
+
+def _handle_persist_citation_summary(args: argparse.Namespace) -> int:
+    return _emit(persist_citation_summary(_cli_db_path(args), _read_json_payload(args.payload_file)))
 
 
 def _validate_render_prerequisites(connection) -> str | None:  # type: ignore[no-untyped-def]
@@ -7324,6 +7476,7 @@ def _render_public_artifacts(db_path: Path) -> dict[str, Any]:
         if not source_path:
             raise RuntimeError("runtime_inputs.source_path missing")
         output_root = runtime_paths.output_dir.resolve()
+        bytecode_cache_dir = inputs.get("template_bytecode_cache_dir", "")
 
         digest_context = build_digest_render_context(connection)
         references_context = build_references_render_context(connection)
@@ -7336,8 +7489,14 @@ def _render_public_artifacts(db_path: Path) -> dict[str, Any]:
             "digest.schema.json",
             ensure_trailing_newline=True,
             template_root=runtime_template_paths.digest_template_path.parent,
+            bytecode_cache_dir=bytecode_cache_dir,
+        )
+        references_json = _render_json(
+            "references.json.j2",
+            references_context,
+            "references.schema.json",
+            bytecode_cache_dir=bytecode_cache_dir,
         )
-        references_json = _render_json("references.json.j2", references_context, "references.schema.json")
         reference_parse_audit_json = json.dumps(build_reference_parse_audit_context(connection), ensure_ascii=False, indent=2)
         report_md = _render_markdown(
             runtime_template_paths.citation_analysis_template_path.name,
@@ -7345,13 +7504,20 @@ def _render_public_artifacts(db_path: Path) -> dict[str, Any]:
             "citation_analysis_report.schema.json",
             ensure_trailing_newline=False,
             template_root=runtime_template_paths.citation_analysis_template_path.parent,
+            bytecode_cache_dir=bytecode_cache_dir,
         )
         citation_context = build_citation_render_context(connection, report_md)
-        citation_analysis_json = _render_json("citation_analysis.json.j2", citation_context, "citation_analysis.schema.json")
+        citation_analysis_json = _render_json(
+            "citation_analysis.json.j2",
+            citation_context,
+            "citation_analysis.schema.json",
+            bytecode_cache_dir=bytecode_cache_dir,
+        )
         matching_metadata_json = _render_json(
             "literature_matching_metadata.json.j2",
             matching_metadata_context,
             "literature_matching_metadata.schema.json",
+            bytecode_cache_dir=bytecode_cache_dir,
         )
 
         digest_path = (output_root / DIGEST_FILENAME).resolve()
@@ -7388,82 +7554,61 @@ def _render_public_artifacts(db_path: Path) -> dict[str, Any]:
         return build_public_output_payload(connection)
 
 
+def _render_failure_payload(message: str) -> dict[str, Any]:
+    return {
+        "digest_path": "",
+        "references_path": "",
+        "citation_analysis_path": "",
+        "literature_matching_metadata_path": "",
+        "literature_score_path": "",
+        "provenance": {"generated_at": "", "input_hash": "", "model": ""},
+        "warnings": [],
+        "error": {"code": "citation_report_failed", "message": message},
+    }
+
+
+def render_outputs(db_path: Path) -> tuple[dict[str, Any], int]:
+    result_json_path = _resolve_result_json_path(db_path)
+    with connect_db(db_path) as connection:
+        prereq_error = _validate_render_prerequisites(connection)
+    if prereq_error is not None:
+        payload = _render_failure_payload(f"render mode failed before validation: {prereq_error}")
+        _write_render_result_json(payload, result_json_path=result_json_path)
+        return payload, 2
+    try:
+        payload = _render_public_artifacts(db_path)
+        errors = _validate_public_output(payload, preprocess_artifact=None, db_path=db_path)
+    except Exception as exc:  # noqa: BLE001
+        payload = _render_failure_payload(f"render mode failed before validation: {exc}")
+        _write_render_result_json(payload, result_json_path=result_json_path)
+        return payload, 2
+    with connect_db(db_path) as connection:
+        if errors:
+            set_runtime_error(connection, "citation_merge_failed", "; ".join(errors), "stage_7_render_and_validate")
+            connection.commit()
+            _write_render_result_json(payload, result_json_path=result_json_path)
+            return payload, 2
+        _set_success_state(connection, stage="stage_8_completed", substep="render_and_validate", next_action="render_and_validate", status="artifacts rendered and validated")
+        _record_action_receipt(connection, action_name="render_and_validate", stage="stage_7_render_and_validate")
+        connection.commit()
+        payload = build_public_output_payload(connection)
+    _write_render_result_json(payload, result_json_path=result_json_path)
+    return payload, 0 if not payload.get("error") else 2
+
+
 def _handle_render_and_validate(args: argparse.Namespace) -> int:
     mode = args.mode
-    db_path = Path(args.db_path).expanduser().resolve() if args.db_path else default_db_path().resolve()
-    result_json_path = _resolve_result_json_path(db_path if mode == "render" else (db_path if args.db_path else None))
+    db_path = _cli_db_path(args)
 
     if mode == "render":
         if args.source_path or args.preprocess_artifact or args.in_path or args.out_dir:
-            payload = {
-                "digest_path": "",
-                "references_path": "",
-                "citation_analysis_path": "",
-                "literature_matching_metadata_path": "",
-                "literature_score_path": "",
-                "provenance": {"generated_at": "", "input_hash": "", "model": ""},
-                "warnings": [],
-                "error": {
-                    "code": "citation_report_failed",
-                    "message": "render mode does not accept explicit source/preprocess/stdin/output-dir inputs; render output location is DB-authoritative",
-                },
-            }
-            _write_render_result_json(payload, result_json_path=result_json_path)
-            print(json.dumps(payload, ensure_ascii=False))
-            return 2
-        with connect_db(db_path) as connection:
-            prereq_error = _validate_render_prerequisites(connection)
-        if prereq_error is not None:
-            payload = {
-                "digest_path": "",
-                "references_path": "",
-                "citation_analysis_path": "",
-                "literature_matching_metadata_path": "",
-                "literature_score_path": "",
-                "provenance": {"generated_at": "", "input_hash": "", "model": ""},
-                "warnings": [],
-                "error": {
-                    "code": "citation_report_failed",
-                    "message": f"render mode failed before validation: {prereq_error}",
-                },
-            }
-            _write_render_result_json(payload, result_json_path=result_json_path)
-            print(json.dumps(payload, ensure_ascii=False))
-            return 2
-        try:
-            payload = _render_public_artifacts(db_path)
-            errors = _validate_public_output(payload, preprocess_artifact=None, db_path=db_path)
-        except Exception as exc:  # noqa: BLE001
-            payload = {
-            "digest_path": "",
-            "references_path": "",
-            "citation_analysis_path": "",
-            "literature_matching_metadata_path": "",
-            "literature_score_path": "",
-            "provenance": {"generated_at": "", "input_hash": "", "model": ""},
-            "warnings": [],
-                "error": {
-                    "code": "citation_report_failed",
-                    "message": f"render mode failed before validation: {exc}",
-                },
-            }
-            _write_render_result_json(payload, result_json_path=result_json_path)
+            payload = _render_failure_payload(
+                "render mode does not accept explicit source/preprocess/stdin/output-dir inputs; render output location is DB-authoritative"
+            )
+            _write_render_result_json(payload, result_json_path=_resolve_result_json_path(db_path))
             print(json.dumps(payload, ensure_ascii=False))
             return 2
-        with connect_db(db_path) as connection:
-            if errors:
-                set_runtime_error(connection, "citation_merge_failed", "; ".join(errors), "stage_7_render_and_validate")
-                connection.commit()
-                _write_render_result_json(payload, result_json_path=result_json_path)
-                print(json.dumps(payload, ensure_ascii=False))
-                return 2
-            _set_success_state(connection, stage="stage_8_completed", substep="render_and_validate", next_action="render_and_validate", status="artifacts rendered and validated")
-            _record_action_receipt(connection, action_name="render_and_validate", stage="stage_7_render_and_validate")
-            connection.commit()
-            payload = build_public_output_payload(connection)
-        _write_render_result_json(payload, result_json_path=result_json_path)
-        print(json.dumps(payload, ensure_ascii=False))
-        return 0 if not payload.get("error") else 2
+        return _emit(render_outputs(db_path))
 
     in_path = Path(args.in_path) if args.in_path else None
     if in_path is not None:
@@ -7622,7 +7767,11 @@ def build_parser() -> argparse.ArgumentParser:
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
-    return int(args.handler(args))
+    db_path = _resolve_cli_path(getattr(args, "db_path", "") or "")
+    with profiling.stage_timer(f"deterministic_core.{args.command}", db_path=db_path, category="deterministic_core") as detail:
+        code = int(args.handler(args))
+        detail["exit_code"] = code
+    return code
 
 
 if __name__ == "__main__":
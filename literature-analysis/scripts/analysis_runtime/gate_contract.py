@@ -4,7 +4,6 @@ from pathlib import Path
 from typing import Any
 
 from . import runtime_db
-from . import scoring
 from .payload_normalization import CANONICAL_METADATA_FIELDS
 
 
@@ -19,7 +18,7 @@ INSTRUCTION_REF_BY_ACTION = {
 }
 
 
-def _local_next_action(raw_next_action: str) -> str:
+def local_next_action(raw_next_action: str) -> str:
     mapping = {
         "confirm_runtime_paths": "init_runtime",
         "bootstrap_runtime_db": "init_runtime",
@@ -143,37 +142,33 @@ def _field_guidance(next_action: str, connection: Any) -> dict[str, str] | None:
     return None
 
 
-def _missing_prerequisites(connection: Any, next_action: str) -> list[str]:
+def _missing_prerequisites(connection: Any, next_action: str, counts: dict[str, int], state: dict[str, Any]) -> list[str]:
     missing: list[str] = []
-    source_doc = runtime_db.fetch_source_document(connection, "normalized_source")
-    state = runtime_db.fetch_workflow_state(connection) or {}
-    if next_action != "init_runtime" and not source_doc:
+    if next_action != "init_runtime" and not counts.get("source_document:normalized_source"):
         missing.append("source_documents.normalized_source")
     score_only = runtime_db.is_score_only(connection)
     if not score_only and next_action == "persist_literature_score":
-        if not runtime_db.has_action_receipt(connection, "persist_digest"):
+        if not counts.get("receipt:persist_digest"):
             missing.append("action_receipts.persist_digest")
     if not score_only and next_action in {"persist_digest", "persist_references", "persist_citation_analysis", "finalize_outputs"}:
-        if not runtime_db.has_outline_nodes(connection):
+        if not counts.get("rows:outline_nodes"):
             missing.append("outline_nodes")
-        if not runtime_db.fetch_section_scope(connection, "references_scope"):
+        if not counts.get("section_scope:references_scope"):
             missing.append("section_scopes.references_scope")
-        if not runtime_db.fetch_section_scope(connection, "citation_scope"):
+        if not counts.get("section_scope:citation_scope"):
             missing.append("section_scopes.citation_scope")
     if not score_only and next_action in {"persist_references", "persist_citation_analysis", "finalize_outputs"}:
-        if runtime_db.fetch_literature_score(connection) is None:
+        if not counts.get("rows:literature_score"):
             missing.append("literature_score")
-    if not score_only and next_action in {"persist_citation_analysis", "finalize_outputs"} and not runtime_db.fetch_reference_items(connection):
+    if not score_only and next_action in {"persist_citation_analysis", "finalize_outputs"} and not counts.get("rows:reference_items"):
         if not runtime_db.is_reference_extraction_abandoned(connection):
             missing.append("reference_items")
     if not score_only and next_action == "finalize_outputs":
-        if not runtime_db.fetch_digest_slots(connection):
-            missing.append("digest_slots")
-        if not runtime_db.fetch_digest_section_summaries(connection):
+        if not counts.get("rows:digest_section_summaries"):
             missing.append("digest_section_summaries")
-        if not runtime_db.fetch_citation_timeline(connection):
+        if not counts.get("rows:citation_timeline"):
             missing.append("citation_timeline")
-        if not runtime_db.fetch_citation_summary(connection):
+        if not counts.get("rows:citation_summary"):
             missing.append("citation_summary")
     if not state:
         missing.append("workflow_state")
@@ -200,24 +195,33 @@ def _quality_directives(connection: Any) -> dict[str, Any] | None:
 def status_payload(db_path: Path) -> dict[str, Any]:
     with runtime_db.connect_db(db_path) as connection:
         state = runtime_db.fetch_workflow_state(connection) or {}
+        progress = runtime_db.fetch_runtime_progress(connection)
+        if progress is None:
+            receipts = sorted(runtime_db.fetch_action_receipts(connection))
+            counts = runtime_db.count_runtime_progress(connection)
+            warnings = runtime_db.fetch_runtime_warnings(connection)
+        else:
+            receipts, counts, warnings = progress["receipts"], progress["counts"], progress["warnings"]
         raw_next_action = str(state.get("next_action") or "")
-        next_action = _local_next_action(raw_next_action)
+        next_action = local_next_action(raw_next_action)
         payload = {
             "db_path": str(db_path),
             "workflow_state": state,
             "next_action": next_action,
             "raw_next_action": raw_next_action,
-            "missing_prerequisites": _missing_prerequisites(connection, next_action),
+            "missing_prerequisites": _missing_prerequisites(connection, next_action, counts, state),
             "execution_note": _execution_note(next_action),
             "instruction_refs": _instruction_refs(next_action),
             "allowed_payload_shape": _allowed_payload_shape(next_action, connection),
             "field_guidance": _field_guidance(next_action, connection),
-            "quality_directives": _quality_directives(connection),
-            "warnings": runtime_db.fetch_runtime_warnings(connection),
+            "quality_directives": _quality_directives(connection) if counts.get("rows:active_reference_quality_issues") else None,
+            "warnings": warnings,
             "error": runtime_db.fetch_latest_error(connection),
-            "receipts": sorted(runtime_db.fetch_action_receipts(connection)),
+            "receipts": receipts,
             "runtime_backend": "analysis_runtime.gate_contract",
         }
         if next_action == "persist_literature_score":
+            from . import scoring  # noqa: PLC0415
+
             payload.update(scoring.scoring_contract(connection, db_path))
     return payload
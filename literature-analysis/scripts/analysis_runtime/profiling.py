@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import functools
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, TypeVar
+
+from . import runtime_db
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _TimingRun:
+    def __init__(self, db_path: Path, *, enabled: bool = True, rows_before: dict[str, int] | None = None) -> None:
+        self.db_path = db_path
+        self.enabled = enabled
+        self.rows_before = dict(rows_before or {})
+        self.run_id = uuid.uuid4().hex
+        self.spans: list[dict[str, Any] | None] = []
+        self._lock = threading.Lock()
+
+    def reserve(self) -> int:
+        with self._lock:
+            self.spans.append(None)
+            return len(self.spans) - 1
+
+
+_ACTIVE_RUN: ContextVar[_TimingRun | None] = ContextVar("analysis_runtime_timing_run", default=None)
+_ACTIVE_SPAN: ContextVar[int | None] = ContextVar("analysis_runtime_timing_span", default=None)
+
+
+def _peak_rss_kb() -> int | None:
+    try:
+        import resource  # noqa: PLC0415
+    except ImportError:
+        return None
+    peak = int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _recording_enabled(connection: sqlite3.Connection) -> bool:
+    return runtime_db.fetch_runtime_inputs(connection).get("stage_timings", "").strip().lower() in {"1", "true", "yes"}
+
+
+def _progress_counts(connection: sqlite3.Connection) -> dict[str, int]:
+    progress = runtime_db.fetch_runtime_progress(connection)
+    if progress is None:
+        return {}
+    return {key: count for key, count in progress["counts"].items() if not key.startswith("receipt:")}
+
+
+def _row_deltas(before: dict[str, int], after: dict[str, int]) -> dict[str, int]:
+    deltas = {key: after.get(key, 0) - before.get(key, 0) for key in sorted({*before, *after})}
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def _start_run(db_path: Path) -> _TimingRun:
+    if not db_path.exists():
+        return _TimingRun(db_path)
+    connection = runtime_db.connect_db(db_path)
+    try:
+        if not _recording_enabled(connection):
+            return _TimingRun(db_path, enabled=False)
+        return _TimingRun(db_path, rows_before=_progress_counts(connection))
+    except sqlite3.Error:
+        return _TimingRun(db_path, enabled=False)
+    finally:
+        connection.close()
+
+
+@contextmanager
+def stage_timer(name: str, *, db_path: Path | None = None, category: str = "stage") -> Iterator[dict[str, Any]]:
+    detail: dict[str, Any] = {}
+    run = _ACTIVE_RUN.get()
+    if run is None and db_path is None:
+        yield detail
+        return
+    root = run is None
+    if run is None:
+        run = _start_run(Path(db_path))  # type: ignore[arg-type]
+    run_token = _ACTIVE_RUN.set(run) if root else None
+    if not run.enabled:
+        try:
+            yield detail
+        finally:
+            if run_token is not None:
+                _ACTIVE_RUN.reset(run_token)
+        return
+    parent_index = _ACTIVE_SPAN.get()
+    index = run.reserve()
+    span_token = _ACTIVE_SPAN.set(index)
+    rss_before = _peak_rss_kb()
+    started_unix = time.time()
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    status = "error"
+    try:
+        yield detail
+        status = "ok"
+    finally:
+        wall_ms = (time.perf_counter() - started) * 1000.0
+        cpu_ms = (time.process_time() - cpu_started) * 1000.0
+        rss_after = _peak_rss_kb()
+        run.spans[index] = {
+            "span_index": index,
+            "parent_index": parent_index,
+            "name": name,
+            "category": category,
+            "thread_id": threading.get_native_id(),
+            "start_unix_ms": started_unix * 1000.0,
+            "wall_ms": wall_ms,
+            "cpu_ms": cpu_ms,
+            "peak_rss_delta_kb": rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+            "row_deltas": {},
+            "detail": detail,
+            "status": status,
+        }
+        _ACTIVE_SPAN.reset(span_token)
+        if run_token is not None:
+            _ACTIVE_RUN.reset(run_token)
+            _store_run(run, root_index=index)
+
+
+def _store_run(run: _TimingRun, *, root_index: int) -> None:
+    spans = [span for span in run.spans if span is not None]
+    if not spans or not run.db_path.exists():
+        return
+    root_span = run.spans[root_index]
+    try:
+        connection = runtime_db.connect_db(run.db_path)
+    except sqlite3.Error:
+        return
+    try:
+        if not _recording_enabled(connection):
+            return
+        # Committing here would also commit a failed stage's pending writes on a shared connection.
+        if root_span is not None and root_span["status"] != "ok" and connection.in_transaction:
+            return
+        if root_span is not None:
+            root_span["row_deltas"] = _row_deltas(run.rows_before, _progress_counts(connection))
+        with connection:
+            runtime_db.store_stage_timings(connection, run_id=run.run_id, spans=spans)
+    except sqlite3.Error:
+        return
+    finally:
+        connection.close()
+
+
+def _db_path_argument(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Path | None:
+    value = kwargs.get("db_path", args[0] if args else None)
+    return value if isinstance(value, Path) else None
+
+
+def timed(name: str, *, category: str = "stage") -> Callable[[F], F]:
+    def decorate(function: F) -> F:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with stage_timer(name, db_path=_db_path_argument(args, kwargs), category=category) as detail:
+                result = function(*args, **kwargs)
+                if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], int):
+                    detail["exit_code"] = result[1]
+                return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def _iso_from_unix_ms(value: float) -> str:
+    return datetime.fromtimestamp(value / 1000.0, UTC).isoformat().replace("+00:00", "Z")
+
+
+def profile_report(timings: list[dict[str, Any]]) -> dict[str, Any]:
+    children_wall: dict[tuple[str, int], float] = {}
+    for span in timings:
+        if span["parent_index"] is not None:
+            key = (span["run_id"], int(span["parent_index"]))
+            children_wall[key] = children_wall.get(key, 0.0) + float(span["wall_ms"])
+
+    runs: dict[str, dict[str, Any]] = {}
+    stages: dict[tuple[str, str], dict[str, Any]] = {}
+    for span in timings:
+        if span["parent_index"] is None:
+            runs[span["run_id"]] = {
+                "run_id": span["run_id"],
+                "name": span["name"],
+                "started_at": _iso_from_unix_ms(float(span["start_unix_ms"])),
+                "wall_ms": round(float(span["wall_ms"]), 3),
+                "cpu_ms": round(float(span["cpu_ms"]), 3),
+                "exit_code": span["detail"].get("exit_code"),
+                "span_count": 0,
+            }
+        stage = stages.setdefault(
+            (span["category"], span["name"]),
+            {
+                "name": span["name"],
+                "category": span["category"],
+                "calls": 0,
+                "wall_ms": 0.0,
+                "self_ms": 0.0,
+                "cpu_ms": 0.0,
+                "max_peak_rss_delta_kb": None,
+                "row_deltas": {},
+            },
+        )
+        stage["calls"] += 1
+        stage["wall_ms"] += float(span["wall_ms"])
+        stage["self_ms"] += max(float(span["wall_ms"]) - children_wall.get((span["run_id"], int(span["span_index"])), 0.0), 0.0)
+        stage["cpu_ms"] += float(span["cpu_ms"])
+        if span["peak_rss_delta_kb"] is not None:
+            stage["max_peak_rss_delta_kb"] = max(stage["max_peak_rss_delta_kb"] or 0, int(span["peak_rss_delta_kb"]))
+        for key, delta in span["row_deltas"].items():
+            stage["row_deltas"][key] = stage["row_deltas"].get(key, 0) + int(delta)
+    for span in timings:
+        if span["run_id"] in runs:
+            runs[span["run_id"]]["span_count"] += 1
+
+    ordered_stages = sorted(stages.values(), key=lambda stage: (-stage["self_ms"], stage["name"]))
+    for stage in ordered_stages:
+        for key in ("wall_ms", "self_ms", "cpu_ms"):
+            stage[key] = round(stage[key], 3)
+    return {
+        "runs": sorted(runs.values(), key=lambda run: run["started_at"]),
+        "stages": ordered_stages,
+        "total_wall_ms": round(sum(run["wall_ms"] for run in runs.values()), 3),
+    }
+
+
+def chrome_trace(timings: list[dict[str, Any]]) -> dict[str, Any]:
+    run_pids = {run_id: position for position, run_id in enumerate(dict.fromkeys(span["run_id"] for span in timings), start=1)}
+    events: list[dict[str, Any]] = []
+    for span in timings:
+        events.append(
+            {
+                "name": span["name"],
+                "cat": span["category"],
+                "ph": "X",
+                "ts": round(float(span["start_unix_ms"]) * 1000.0),
+                "dur": round(float(span["wall_ms"]) * 1000.0),
+                "pid": run_pids[span["run_id"]],
+                "tid": int(span["thread_id"]),
+                "args": {
+                    "run_id": span["run_id"],
+                    "cpu_ms": round(float(span["cpu_ms"]), 3),
+                    "peak_rss_delta_kb": span["peak_rss_delta_kb"],
+                    "row_deltas": span["row_deltas"],
+                    "status": span["status"],
+                    **span["detail"],
+                },
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def pstats_summary(path: Path, *, limit: int) -> list[dict[str, Any]]:
+    import pstats  # noqa: PLC0415
+
+    stats = pstats.Stats(str(path)).stats  # type: ignore[attr-defined]
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[: max(limit, 0)]
+    return [
+        {
+            "function": f"{file_name}:{line}({function_name})",
+            "calls": int(calls),
+            "total_ms": round(total * 1000.0, 3),
+            "cumulative_ms": round(cumulative * 1000.0, 3),
+        }
+        for (file_name, line, function_name), (_primitive_calls, calls, total, cumulative, _callers) in rows
+    ]
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import base64
+import contextvars
 import json
 import re
+import threading
 import time
 import unicodedata
-from dataclasses import dataclass
-from typing import Any, Callable
-from urllib.error import HTTPError, URLError
-from urllib.parse import quote, unquote, urlparse
-from urllib.request import Request, urlopen
+import zlib
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable
+from urllib.parse import quote, unquote, urljoin, urlparse
+
+from . import profiling
+
+if TYPE_CHECKING:
+    import http.client
 
 
 DOI_RE = re.compile(r"^10\.\d{4,9}/\S+$", re.IGNORECASE)
@@ -24,9 +32,14 @@ ARXIV_IN_TEXT_RE = re.compile(
 HTTP_TIMEOUT_SECONDS = 10.0
 HTTP_MAX_ATTEMPTS = 2
 HTTP_MAX_RESPONSE_BYTES = 16 * 1024 * 1024
+HTTP_ACCEPT_ENCODING = "gzip, deflate"
+HTTP_POOL_IDLE_SECONDS = 30.0
+HTTP_MAX_REDIRECTS = 10
+HTTP_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
 RETRY_AFTER_CAP_SECONDS = 5.0
 SEMANTIC_SCHOLAR_PAGE_SIZE = 100
 SEMANTIC_SCHOLAR_MAX_RECORDS = 2000
+PROVIDER_DEADLINE_SECONDS = 60.0
 TITLE_MATCH_THRESHOLD = 0.90
 SEMANTIC_SCHOLAR_ARXIV_TITLE_MATCH_THRESHOLD = 0.95
 MUTUAL_BEST_MARGIN = 0.05
@@ -49,6 +62,7 @@ class HttpResponse:
     status: int
     headers: dict[str, str]
     body: bytes
+    connection_reused: bool = False
 
 
 @dataclass(frozen=True)
@@ -59,6 +73,7 @@ class ProviderFetch:
     response: Any
     candidates: list[dict[str, Any]]
     error: dict[str, Any] | None
+    requests: list[dict[str, Any]] = field(default_factory=list)
 
 
 def normalize_identifier(value: object) -> Identifier | None:
@@ -113,23 +128,139 @@ def extract_identifiers(text: str) -> set[str]:
     return found
 
 
-def default_http_get(url: str, headers: dict[str, str], timeout: float) -> HttpResponse:
-    request = Request(url, headers=headers, method="GET")
+def _decode_body(body: bytes, content_encoding: str) -> bytes:
+    encoding = content_encoding.strip().casefold()
+    if encoding in {"", "identity"}:
+        return body
+    if encoding not in {"gzip", "x-gzip", "deflate"}:
+        raise ValueError(f"unsupported content-encoding: {content_encoding}")
+    limit = HTTP_MAX_RESPONSE_BYTES + 1
+    if encoding != "deflate":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(body, limit)
     try:
-        with urlopen(request, timeout=timeout) as response:  # noqa: S310 - fixed public providers only
-            return HttpResponse(
-                status=int(response.status),
-                headers={str(key).casefold(): str(value) for key, value in response.headers.items()},
-                body=response.read(HTTP_MAX_RESPONSE_BYTES + 1),
-            )
-    except HTTPError as exc:
-        return HttpResponse(
-            status=int(exc.code),
-            headers={str(key).casefold(): str(value) for key, value in exc.headers.items()},
-            body=exc.read(),
-        )
-    except URLError as exc:
-        raise RuntimeError(str(exc.reason)) from exc
+        return zlib.decompressobj(zlib.MAX_WBITS).decompress(body, limit)
+    except zlib.error:
+        return zlib.decompressobj(-zlib.MAX_WBITS).decompress(body, limit)
+
+
+@dataclass(frozen=True)
+class _PooledConnection:
+    connection: http.client.HTTPConnection
+    absolute_form: bool
+    proxy_headers: dict[str, str]
+
+
+class PooledHttpTransport:
+    def __init__(self, *, proxies: dict[str, str] | None = None, idle_seconds: float = HTTP_POOL_IDLE_SECONDS) -> None:
+        self.proxies = proxies
+        self.idle_seconds = idle_seconds
+        self.stats = {"connections_opened": 0, "connections_reused": 0}
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, str, int], list[tuple[_PooledConnection, float]]] = {}
+
+    def _proxy(self, scheme: str, host: str) -> str:
+        if self.proxies is not None:
+            return self.proxies.get(scheme, "")
+        from urllib.request import getproxies, proxy_bypass  # noqa: PLC0415
+
+        return "" if proxy_bypass(host) else getproxies().get(scheme, "")
+
+    def _open(self, scheme: str, host: str, port: int, timeout: float) -> _PooledConnection:
+        import http.client  # noqa: PLC0415
+
+        proxy = self._proxy(scheme, host)
+        if not proxy:
+            connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            return _PooledConnection(connection_class(host, port, timeout=timeout), False, {})
+        parsed = urlparse(proxy if "://" in proxy else f"http://{proxy}")
+        proxy_headers: dict[str, str] = {}
+        if parsed.username:
+            credentials = f"{unquote(parsed.username)}:{unquote(parsed.password or '')}".encode("utf-8")
+            proxy_headers["Proxy-Authorization"] = f"Basic {base64.b64encode(credentials).decode('ascii')}"
+        if scheme == "https":
+            connection = http.client.HTTPSConnection(parsed.hostname or "", parsed.port or 80, timeout=timeout)
+            connection.set_tunnel(host, port, headers=proxy_headers)
+            return _PooledConnection(connection, False, {})
+        return _PooledConnection(http.client.HTTPConnection(parsed.hostname or "", parsed.port or 80, timeout=timeout), True, proxy_headers)
+
+    def _acquire(self, key: tuple[str, str, int], timeout: float) -> tuple[_PooledConnection, bool]:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                pooled, released_at = idle.pop()
+                if now - released_at <= self.idle_seconds and pooled.connection.sock is not None:
+                    self.stats["connections_reused"] += 1
+                    pooled.connection.timeout = timeout
+                    pooled.connection.sock.settimeout(timeout)
+                    return pooled, True
+                pooled.connection.close()
+            self.stats["connections_opened"] += 1
+        return self._open(*key, timeout), False
+
+    def _release(self, key: tuple[str, str, int], pooled: _PooledConnection) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append((pooled, time.monotonic()))
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for pooled, _ in connections:
+                pooled.connection.close()
+
+    def __call__(self, url: str, headers: dict[str, str], timeout: float) -> HttpResponse:
+        response = self._get(url, headers, timeout)
+        for _ in range(HTTP_MAX_REDIRECTS):
+            location = response.headers.get("location", "").strip()
+            if response.status not in HTTP_REDIRECT_STATUSES or not location:
+                return response
+            url = urljoin(url, location)
+            if urlparse(url).scheme.casefold() not in {"http", "https"}:
+                return response
+            response = self._get(url, headers, timeout)
+        return response
+
+    def _get(self, url: str, headers: dict[str, str], timeout: float) -> HttpResponse:
+        import http.client  # noqa: PLC0415
+
+        parsed = urlparse(url)
+        scheme = parsed.scheme.casefold()
+        if scheme not in {"http", "https"} or not parsed.hostname:
+            raise ValueError(f"unsupported URL: {url}")
+        key = (scheme, parsed.hostname, parsed.port or (443 if scheme == "https" else 80))
+        target = f"{parsed.path or '/'}?{parsed.query}" if parsed.query else parsed.path or "/"
+        while True:
+            pooled, reused = self._acquire(key, timeout)
+            try:
+                pooled.connection.request(
+                    "GET",
+                    url if pooled.absolute_form else target,
+                    headers={"Accept-Encoding": HTTP_ACCEPT_ENCODING, **headers, **pooled.proxy_headers},
+                )
+                response = pooled.connection.getresponse()
+                body = response.read(HTTP_MAX_RESPONSE_BYTES + 1)
+            except (http.client.HTTPException, OSError):
+                pooled.connection.close()
+                if reused:
+                    continue
+                raise
+            response_headers = {str(name).casefold(): str(value) for name, value in response.getheaders()}
+            complete = response.isclosed()
+            if complete and not response.will_close:
+                self._release(key, pooled)
+            else:
+                pooled.connection.close()
+            if complete:
+                body = _decode_body(body, response_headers.get("content-encoding", ""))
+            return HttpResponse(status=int(response.status), headers=response_headers, body=body, connection_reused=reused)
+
+
+_DEFAULT_TRANSPORT = PooledHttpTransport()
+
+
+def default_http_get(url: str, headers: dict[str, str], timeout: float) -> HttpResponse:
+    return _DEFAULT_TRANSPORT(url, headers, timeout)
 
 
 def _retry_delay(headers: dict[str, str], attempt: int) -> float:
@@ -140,22 +271,41 @@ def _retry_delay(headers: dict[str, str], attempt: int) -> float:
         return min(float(2**attempt), RETRY_AFTER_CAP_SECONDS)
 
 
+@profiling.timed("reference_api.request", category="reference_api")
 def _request_json(
     url: str,
     *,
     http_get: HttpGet,
     sleeper: Sleeper,
+    requests: list[dict[str, Any]] | None = None,
+    stop: threading.Event | None = None,
 ) -> tuple[Any | None, int | None, dict[str, Any] | None]:
     headers = {"Accept": "application/json", "User-Agent": USER_AGENT}
     last_error: dict[str, Any] | None = None
     for attempt in range(HTTP_MAX_ATTEMPTS):
+        if stop is not None and stop.is_set():
+            return None, None, {"kind": "stopped", "message": "provider fetch stopped before the request was sent"}
+        started = time.perf_counter()
         try:
             response = http_get(url, headers, HTTP_TIMEOUT_SECONDS)
         except Exception as exc:  # noqa: BLE001 - provider failures are data, not workflow errors
+            if requests is not None:
+                requests.append({"url": url, "http_status": None, "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3)})
             last_error = {"kind": "network_error", "message": str(exc)}
             if attempt + 1 < HTTP_MAX_ATTEMPTS:
                 sleeper(min(float(2**attempt), RETRY_AFTER_CAP_SECONDS))
             continue
+        if requests is not None:
+            requests.append(
+                {
+                    "url": url,
+                    "http_status": response.status,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+                    "body_bytes": len(response.body),
+                    "content_encoding": response.headers.get("content-encoding", ""),
+                    "connection_reused": response.connection_reused,
+                }
+            )
         if response.status == 200:
             if len(response.body) > HTTP_MAX_RESPONSE_BYTES:
                 return None, response.status, {
@@ -286,15 +436,17 @@ def fetch_crossref(
     *,
     http_get: HttpGet = default_http_get,
     sleeper: Sleeper = time.sleep,
+    stop: threading.Event | None = None,
 ) -> ProviderFetch:
     if identifier.kind != "doi":
         return ProviderFetch("crossref", "not_applicable", None, None, [], None)
     encoded = quote(identifier.value, safe="")
     url = f"https://api.crossref.org/works/{encoded}/transform/application/vnd.citationstyles.csl+json"
-    payload, status, error = _request_json(url, http_get=http_get, sleeper=sleeper)
+    requests: list[dict[str, Any]] = []
+    payload, status, error = _request_json(url, http_get=http_get, sleeper=sleeper, requests=requests, stop=stop)
     candidates = crossref_candidates(payload)
     outcome = "succeeded" if candidates else ("failed" if error else "empty")
-    return ProviderFetch("crossref", outcome, status, payload, candidates, error)
+    return ProviderFetch("crossref", outcome, status, payload, candidates, error, requests)
 
 
 def fetch_semantic_scholar(
@@ -302,6 +454,7 @@ def fetch_semantic_scholar(
     *,
     http_get: HttpGet = default_http_get,
     sleeper: Sleeper = time.sleep,
+    stop: threading.Event | None = None,
 ) -> ProviderFetch:
     paper_id = f"DOI:{identifier.value}" if identifier.kind == "doi" else f"ARXIV:{identifier.value}"
     fields = "title,authors,year,externalIds,venue,publicationDate,url"
@@ -309,15 +462,24 @@ def fetch_semantic_scholar(
     all_rows: list[dict[str, Any]] = []
     pages: list[Any] = []
     last_status: int | None = None
+    requests: list[dict[str, Any]] = []
     while len(all_rows) < SEMANTIC_SCHOLAR_MAX_RECORDS:
         encoded = quote(paper_id, safe="")
         url = (
             f"https://api.semanticscholar.org/graph/v1/paper/{encoded}/references"
             f"?offset={offset}&limit={SEMANTIC_SCHOLAR_PAGE_SIZE}&fields={quote(fields, safe=',')}"
         )
-        payload, last_status, error = _request_json(url, http_get=http_get, sleeper=sleeper)
+        payload, last_status, error = _request_json(url, http_get=http_get, sleeper=sleeper, requests=requests, stop=stop)
         if error is not None:
-            return ProviderFetch("semantic_scholar", "failed", last_status, pages or payload, semantic_scholar_candidates(all_rows), error)
+            return ProviderFetch(
+                "semantic_scholar",
+                "failed",
+                last_status,
+                pages or payload,
+                semantic_scholar_candidates(all_rows),
+                error,
+                requests,
+            )
         if not isinstance(payload, dict) or not isinstance(payload.get("data"), list):
             return ProviderFetch(
                 "semantic_scholar",
@@ -326,6 +488,7 @@ def fetch_semantic_scholar(
                 pages or payload,
                 semantic_scholar_candidates(all_rows),
                 {"kind": "invalid_shape", "message": "response.data must be an array"},
+                requests,
             )
         pages.append(payload)
         all_rows.extend(row for row in payload["data"] if isinstance(row, dict))
@@ -341,9 +504,66 @@ def fetch_semantic_scholar(
         pages,
         candidates,
         None,
+        requests,
     )
 
 
+def fetch_provider(
+    identifier: Identifier,
+    provider: str,
+    *,
+    http_get: HttpGet = default_http_get,
+    stop: threading.Event | None = None,
+) -> ProviderFetch:
+    if provider == "crossref":
+        return fetch_crossref(identifier, http_get=http_get, stop=stop)
+    return fetch_semantic_scholar(identifier, http_get=http_get, stop=stop)
+
+
+def start_provider_fetch(
+    identifier: Identifier,
+    provider: str,
+    *,
+    http_get: HttpGet = default_http_get,
+    stop: threading.Event | None = None,
+) -> Future[ProviderFetch]:
+    future: Future[ProviderFetch] = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fetch_provider(identifier, provider, http_get=http_get, stop=stop))
+        except BaseException as exc:  # noqa: BLE001 - re-raised by the waiting caller
+            future.set_exception(exc)
+
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(run,), name=f"reference-api-{provider}", daemon=True).start()
+    return future
+
+
+def wait_provider_fetch(
+    provider: str,
+    future: Future[ProviderFetch],
+    *,
+    deadline: float,
+    stop: threading.Event | None = None,
+) -> ProviderFetch:
+    try:
+        return future.result(timeout=max(deadline - time.monotonic(), 0.0))
+    except FutureTimeoutError:
+        if stop is not None:
+            stop.set()
+        return ProviderFetch(
+            provider,
+            "failed",
+            None,
+            None,
+            [],
+            {"kind": "deadline_exceeded", "message": "provider request exceeded the shared reference API deadline"},
+        )
+
+
 def _normalized_title(title: object) -> str:
     text = unicodedata.normalize("NFKC", str(title or "")).casefold()
     normalized = "".join(" " if unicodedata.category(char).startswith(("P", "S")) else char for char in text)
@@ -384,11 +604,26 @@ def _same_work(left: dict[str, Any], right: dict[str, Any]) -> bool:
 
 def merge_provider_candidates(candidates: list[dict[str, Any]]) -> list[dict[str, Any]]:
     merged: list[dict[str, Any]] = []
+    positions_by_id: dict[str, list[int]] = {}
+    positions_by_title: dict[str, set[int]] = {}
+    merged_titles: list[str] = []
     for candidate in candidates:
-        target = next((item for item in merged if _same_work(item, candidate)), None)
-        if target is None:
+        candidate_title = _compact_title(candidate.get("title"))
+        possible: set[int] = set(positions_by_title.get(candidate_title, ())) if candidate_title else set()
+        for stable_id in _stable_id_set(candidate):
+            possible.update(positions_by_id.get(stable_id, ()))
+        target_position = next((position for position in sorted(possible) if _same_work(merged[position], candidate)), None)
+        if target_position is None:
             merged.append(json.loads(json.dumps(candidate, ensure_ascii=False)))
+            position = len(merged) - 1
+            for stable_id in _stable_id_set(merged[position]):
+                positions_by_id.setdefault(stable_id, []).append(position)
+            merged_titles.append(_compact_title(merged[position].get("title")))
+            if merged_titles[position]:
+                positions_by_title.setdefault(merged_titles[position], set()).add(position)
             continue
+        target = merged[target_position]
+        known_ids = _stable_id_set(target)
         prefer_candidate_title = (
             "crossref" in candidate.get("providers", [])
             and "crossref" not in target.get("providers", [])
@@ -411,23 +646,17 @@ def merge_provider_candidates(candidates: list[dict[str, Any]]) -> list[dict[str
         for key, value in candidate.get("metadata", {}).items():
             if key not in target_metadata or target_metadata[key] in (None, "", []):
                 target_metadata[key] = value
+        for stable_id in _stable_id_set(target) - known_ids:
+            positions_by_id.setdefault(stable_id, []).append(target_position)
+        target_title = _compact_title(target.get("title"))
+        if target_title != merged_titles[target_position]:
+            positions_by_title.get(merged_titles[target_position], set()).discard(target_position)
+            if target_title:
+                positions_by_title.setdefault(target_title, set()).add(target_position)
+            merged_titles[target_position] = target_title
     return merged
 
 
-def _title_score(local_title: str, api_title: str) -> float:
-    local_compact = _compact_title(local_title)
-    api_compact = _compact_title(api_title)
-    if not local_compact or not api_compact:
-        return 0.0
-    if local_compact == api_compact:
-        return 0.99
-    local_tokens = set(_title_tokens(local_title))
-    api_tokens = set(_title_tokens(api_title))
-    if min(len(local_tokens), len(api_tokens)) < 3:
-        return 0.0
-    return len(local_tokens & api_tokens) / min(len(local_tokens), len(api_tokens))
-
-
 def _candidate_complete(candidate: dict[str, Any]) -> bool:
     return bool(
         str(candidate.get("title", "")).strip()
@@ -450,6 +679,20 @@ def _title_match_threshold(candidate: dict[str, Any]) -> float:
     return TITLE_MATCH_THRESHOLD
 
 
+def _title_features(title: str) -> tuple[str, frozenset[str]]:
+    return _compact_title(title), frozenset(_title_tokens(title))
+
+
+def _title_score_from_features(local: tuple[str, frozenset[str]], api: tuple[str, frozenset[str]], overlap: int) -> float:
+    if not local[0] or not api[0]:
+        return 0.0
+    if local[0] == api[0]:
+        return 0.99
+    if min(len(local[1]), len(api[1])) < 3:
+        return 0.0
+    return overlap / min(len(local[1]), len(api[1]))
+
+
 def resolve_candidates(
     entries: list[dict[str, Any]],
     parse_candidates: list[dict[str, Any]],
@@ -459,31 +702,64 @@ def resolve_candidates(
     for candidate in parse_candidates:
         parsed_by_entry.setdefault(int(candidate["entry_index"]), []).append(candidate)
     api_candidates = merge_provider_candidates(provider_candidates)
+    api_features: dict[int, tuple[str, frozenset[str]]] = {}
+    api_ids: dict[int, set[str]] = {}
+    api_thresholds: dict[int, float] = {}
+    api_by_id: dict[str, list[int]] = {}
+    api_by_title: dict[str, list[int]] = {}
+    api_by_token: dict[str, list[int]] = {}
+    for api_index, api_candidate in enumerate(api_candidates):
+        if not _candidate_complete(api_candidate):
+            continue
+        api_features[api_index] = _title_features(str(api_candidate.get("title", "")))
+        api_ids[api_index] = _stable_id_set(api_candidate)
+        api_thresholds[api_index] = _title_match_threshold(api_candidate)
+        for stable_id in api_ids[api_index]:
+            api_by_id.setdefault(stable_id, []).append(api_index)
+        if api_features[api_index][0]:
+            api_by_title.setdefault(api_features[api_index][0], []).append(api_index)
+        for token in api_features[api_index][1]:
+            api_by_token.setdefault(token, []).append(api_index)
     score_rows: list[dict[str, Any]] = []
     for entry in entries:
         entry_index = int(entry["entry_index"])
         local_ids = extract_identifiers(str(entry.get("raw", "")))
         local_candidates = parsed_by_entry.get(entry_index, [])
-        for api_index, api_candidate in enumerate(api_candidates):
-            if not _candidate_complete(api_candidate):
-                continue
-            api_ids = _stable_id_set(api_candidate)
-            identifier_match = bool(local_ids & api_ids)
+        local_features = [_title_features(str(parsed.get("title_candidate", ""))) for parsed in local_candidates]
+        overlaps: list[dict[int, int]] = []
+        blocked: set[int] = set()
+        for stable_id in local_ids:
+            blocked.update(api_by_id.get(stable_id, ()))
+        for compact, tokens in local_features:
+            counts: dict[int, int] = {}
+            for token in tokens:
+                for api_index in api_by_token.get(token, ()):
+                    counts[api_index] = counts.get(api_index, 0) + 1
+            overlaps.append(counts)
+            blocked.update(counts)
+            if compact:
+                blocked.update(api_by_title.get(compact, ()))
+        for api_index in sorted(blocked):
+            api_candidate = api_candidates[api_index]
+            identifier_match = bool(local_ids & api_ids[api_index])
             best_pattern: dict[str, Any] | None = None
             score = 1.0 if identifier_match else 0.0
-            for parsed in local_candidates:
+            for parsed_position, parsed in enumerate(local_candidates):
                 parsed_year = parsed.get("year_candidate")
                 api_year = api_candidate.get("year")
                 if not identifier_match and parsed_year is not None and api_year is not None and parsed_year != api_year:
                     continue
-                candidate_score = _title_score(str(parsed.get("title_candidate", "")), str(api_candidate.get("title", "")))
+                candidate_score = _title_score_from_features(
+                    local_features[parsed_position],
+                    api_features[api_index],
+                    overlaps[parsed_position].get(api_index, 0),
+                )
                 if candidate_score > score or (identifier_match and best_pattern is None):
                     score = 1.0 if identifier_match else candidate_score
                     best_pattern = parsed
             if best_pattern is None and identifier_match and local_candidates:
                 best_pattern = max(local_candidates, key=lambda item: float(item.get("confidence", 0.0)))
-            threshold = _title_match_threshold(api_candidate)
-            if best_pattern is not None and (identifier_match or score >= threshold):
+            if best_pattern is not None and (identifier_match or score >= api_thresholds[api_index]):
                 score_rows.append(
                     {
                         "entry_index": entry_index,
@@ -494,11 +770,16 @@ def resolve_candidates(
                     }
                 )
 
+    rows_by_entry: dict[int, list[dict[str, Any]]] = {}
+    rows_by_api: dict[int, list[dict[str, Any]]] = {}
+    for row in score_rows:
+        rows_by_entry.setdefault(int(row["entry_index"]), []).append(row)
+        rows_by_api.setdefault(int(row["api_index"]), []).append(row)
     decisions: list[dict[str, Any]] = []
     for entry in entries:
         entry_index = int(entry["entry_index"])
         local_scores = sorted(
-            (row for row in score_rows if row["entry_index"] == entry_index),
+            rows_by_entry.get(entry_index, []),
             key=lambda row: (-float(row["score"]), int(row["api_index"])),
         )
         if not local_scores:
@@ -507,7 +788,7 @@ def resolve_candidates(
         best = local_scores[0]
         runner_up = float(local_scores[1]["score"]) if len(local_scores) > 1 else 0.0
         api_scores = sorted(
-            (row for row in score_rows if row["api_index"] == best["api_index"]),
+            rows_by_api.get(int(best["api_index"]), []),
             key=lambda row: (-float(row["score"]), int(row["entry_index"])),
         )
         api_runner_up = float(api_scores[1]["score"]) if len(api_scores) > 1 else 0.0
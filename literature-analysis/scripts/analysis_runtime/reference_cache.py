@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+CACHE_INDEX_FILENAME = "index.db"
+CACHE_OBJECTS_DIRNAME = "objects"
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHEABLE_STATUSES = {"succeeded", "empty"}
+SQLITE_TIMEOUT_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class ReferenceApiCache:
+    root: Path
+    ttl_seconds: float = DEFAULT_TTL_SECONDS
+    max_bytes: int = DEFAULT_MAX_BYTES
+
+
+def canonical_response_bytes(response: object) -> bytes:
+    return json.dumps(response, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+
+def response_sha256(response: object) -> str:
+    return hashlib.sha256(canonical_response_bytes(response)).hexdigest()
+
+
+def _connect(cache: ReferenceApiCache) -> sqlite3.Connection:
+    cache.root.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(cache.root / CACHE_INDEX_FILENAME, timeout=SQLITE_TIMEOUT_SECONDS)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS provider_responses (
+            provider TEXT NOT NULL,
+            canonical_identifier TEXT NOT NULL,
+            status TEXT NOT NULL,
+            http_status INTEGER,
+            response_sha256 TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            stored_at REAL NOT NULL,
+            last_access_at REAL NOT NULL,
+            PRIMARY KEY (provider, canonical_identifier)
+        );
+
+        CREATE INDEX IF NOT EXISTS provider_responses_last_access
+            ON provider_responses(last_access_at);
+        """
+    )
+    return connection
+
+
+def _object_path(cache: ReferenceApiCache, sha256: str) -> Path:
+    return cache.root / CACHE_OBJECTS_DIRNAME / sha256[:2] / f"{sha256}.json"
+
+
+def _write_object(path: Path, data: bytes) -> None:
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _drop_unreferenced_object(connection: sqlite3.Connection, cache: ReferenceApiCache, sha256: str) -> None:
+    row = connection.execute(
+        "SELECT COUNT(*) AS refs FROM provider_responses WHERE response_sha256 = ?",
+        (sha256,),
+    ).fetchone()
+    if int(row["refs"]) == 0:
+        _object_path(cache, sha256).unlink(missing_ok=True)
+
+
+def _delete_entry(connection: sqlite3.Connection, cache: ReferenceApiCache, provider: str, canonical_identifier: str, sha256: str) -> None:
+    connection.execute(
+        "DELETE FROM provider_responses WHERE provider = ? AND canonical_identifier = ?",
+        (provider, canonical_identifier),
+    )
+    _drop_unreferenced_object(connection, cache, sha256)
+
+
+def cache_from_runtime_inputs(inputs: dict[str, str]) -> ReferenceApiCache | None:
+    root = inputs.get("reference_api_cache_dir", "").strip()
+    if not root:
+        return None
+    try:
+        ttl_seconds = float(inputs.get("reference_api_cache_ttl_seconds", "") or DEFAULT_TTL_SECONDS)
+    except ValueError:
+        ttl_seconds = DEFAULT_TTL_SECONDS
+    try:
+        max_bytes = int(inputs.get("reference_api_cache_max_bytes", "") or DEFAULT_MAX_BYTES)
+    except ValueError:
+        max_bytes = DEFAULT_MAX_BYTES
+    return ReferenceApiCache(root=Path(root).expanduser().resolve(), ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+
+
+def lookup(
+    cache: ReferenceApiCache,
+    *,
+    provider: str,
+    canonical_identifier: str,
+    now: float | None = None,
+) -> dict[str, Any] | None:
+    current = time.time() if now is None else now
+    try:
+        with closing(_connect(cache)) as connection:
+            row = connection.execute(
+                """
+                SELECT status, http_status, response_sha256, stored_at
+                FROM provider_responses
+                WHERE provider = ? AND canonical_identifier = ?
+                """,
+                (provider, canonical_identifier),
+            ).fetchone()
+            if row is None:
+                return None
+            sha256 = str(row["response_sha256"])
+            if current - float(row["stored_at"]) > cache.ttl_seconds:
+                _delete_entry(connection, cache, provider, canonical_identifier, sha256)
+                connection.commit()
+                return None
+            try:
+                data = _object_path(cache, sha256).read_bytes()
+            except FileNotFoundError:
+                data = b""
+            if hashlib.sha256(data).hexdigest() != sha256:
+                _delete_entry(connection, cache, provider, canonical_identifier, sha256)
+                connection.commit()
+                return None
+            connection.execute(
+                "UPDATE provider_responses SET last_access_at = ? WHERE provider = ? AND canonical_identifier = ?",
+                (current, provider, canonical_identifier),
+            )
+            connection.commit()
+    except (OSError, sqlite3.Error):
+        return None
+    return {
+        "provider": provider,
+        "canonical_identifier": canonical_identifier,
+        "status": str(row["status"]),
+        "http_status": int(row["http_status"]) if row["http_status"] is not None else None,
+        "response": json.loads(data.decode("utf-8")),
+        "response_sha256": sha256,
+    }
+
+
+def store(
+    cache: ReferenceApiCache,
+    *,
+    provider: str,
+    canonical_identifier: str,
+    status: str,
+    http_status: int | None,
+    response: object,
+    response_bytes: bytes | None = None,
+    now: float | None = None,
+) -> str | None:
+    if status not in CACHEABLE_STATUSES:
+        return None
+    current = time.time() if now is None else now
+    data = response_bytes if response_bytes is not None else canonical_response_bytes(response)
+    sha256 = hashlib.sha256(data).hexdigest()
+    try:
+        _write_object(_object_path(cache, sha256), data)
+        with closing(_connect(cache)) as connection:
+            previous = connection.execute(
+                "SELECT response_sha256 FROM provider_responses WHERE provider = ? AND canonical_identifier = ?",
+                (provider, canonical_identifier),
+            ).fetchone()
+            connection.execute(
+                """
+                INSERT INTO provider_responses (
+                    provider, canonical_identifier, status, http_status,
+                    response_sha256, size_bytes, stored_at, last_access_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(provider, canonical_identifier) DO UPDATE SET
+                    status = excluded.status,
+                    http_status = excluded.http_status,
+                    response_sha256 = excluded.response_sha256,
+                    size_bytes = excluded.size_bytes,
+                    stored_at = excluded.stored_at,
+                    last_access_at = excluded.last_access_at
+                """,
+                (provider, canonical_identifier, status, http_status, sha256, len(data), current, current),
+            )
+            if previous is not None and str(previous["response_sha256"]) != sha256:
+                _drop_unreferenced_object(connection, cache, str(previous["response_sha256"]))
+            _evict(connection, cache, now=current)
+            connection.commit()
+    except (OSError, sqlite3.Error):
+        return None
+    return sha256
+
+
+def _total_bytes(connection: sqlite3.Connection) -> int:
+    row = connection.execute(
+        "SELECT COALESCE(SUM(size_bytes), 0) AS total FROM (SELECT DISTINCT response_sha256, size_bytes FROM provider_responses)"
+    ).fetchone()
+    return int(row["total"])
+
+
+def _evict(connection: sqlite3.Connection, cache: ReferenceApiCache, *, now: float) -> int:
+    evicted = 0
+    expired = connection.execute(
+        "SELECT provider, canonical_identifier, response_sha256 FROM provider_responses WHERE stored_at < ?",
+        (now - cache.ttl_seconds,),
+    ).fetchall()
+    for row in expired:
+        _delete_entry(connection, cache, str(row["provider"]), str(row["canonical_identifier"]), str(row["response_sha256"]))
+        evicted += 1
+    while _total_bytes(connection) > cache.max_bytes:
+        row = connection.execute(
+            """
+            SELECT provider, canonical_identifier, response_sha256
+            FROM provider_responses
+            ORDER BY last_access_at ASC, stored_at ASC
+            LIMIT 1
+            """
+        ).fetchone()
+        if row is None:
+            break
+        _delete_entry(connection, cache, str(row["provider"]), str(row["canonical_identifier"]), str(row["response_sha256"]))
+        evicted += 1
+    return evicted
+
+
+def evict(cache: ReferenceApiCache, *, now: float | None = None) -> int:
+    try:
+        with closing(_connect(cache)) as connection:
+            evicted = _evict(connection, cache, now=time.time() if now is None else now)
+            connection.commit()
+    except (OSError, sqlite3.Error):
+        return 0
+    return evicted
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+from . import reference_api
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+
+FIXTURE_FORMAT_VERSION = 1
+RECORDED_STATUSES = {200, 404}
+DECODED_BODY_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+@dataclass(frozen=True)
+class FaultPlan:
+    latency_seconds: float = 0.0
+    burst_length: int = 0
+    burst_status: int = 429
+    retry_after: str = "0"
+
+
+def fixture_path(root: Path, url: str) -> Path:
+    return root / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+
+def record_response(root: Path, url: str, response: reference_api.HttpResponse) -> Path:
+    path = fixture_path(root, url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(
+        json.dumps(
+            {
+                "format_version": FIXTURE_FORMAT_VERSION,
+                "url": url,
+                "status": response.status,
+                "headers": {key: value for key, value in response.headers.items() if key not in DECODED_BODY_HEADERS},
+                "body_base64": base64.b64encode(response.body).decode("ascii"),
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        ),
+        encoding="utf-8",
+    )
+    tmp_path.replace(path)
+    return path
+
+
+def load_response(root: Path, url: str) -> reference_api.HttpResponse | None:
+    try:
+        fixture = json.loads(fixture_path(root, url).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if fixture.get("format_version") != FIXTURE_FORMAT_VERSION or fixture.get("url") != url:
+        return None
+    return reference_api.HttpResponse(
+        status=int(fixture["status"]),
+        headers=dict(fixture.get("headers", {})),
+        body=base64.b64decode(str(fixture.get("body_base64", ""))),
+    )
+
+
+class RecordingHttpGet:
+    def __init__(self, root: Path, http_get: reference_api.HttpGet = reference_api.default_http_get) -> None:
+        self.root = root
+        self.http_get = http_get
+        self.stats = {"requests": 0, "recorded": 0}
+
+    def __call__(self, url: str, headers: dict[str, str], timeout: float) -> reference_api.HttpResponse:
+        response = self.http_get(url, headers, timeout)
+        self.stats["requests"] += 1
+        if response.status in RECORDED_STATUSES and len(response.body) <= reference_api.HTTP_MAX_RESPONSE_BYTES:
+            record_response(self.root, url, response)
+            self.stats["recorded"] += 1
+        return response
+
+
+class ReplayHttpGet:
+    def __init__(self, root: Path, *, faults: FaultPlan = FaultPlan(), sleeper: reference_api.Sleeper = time.sleep) -> None:
+        self.root = root
+        self.faults = faults
+        self.sleeper = sleeper
+        self.stats = {"requests": 0, "replayed": 0, "injected_faults": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._attempts: dict[str, int] = {}
+
+    def __call__(self, url: str, headers: dict[str, str], timeout: float) -> reference_api.HttpResponse:
+        if self.faults.latency_seconds > 0:
+            self.sleeper(min(self.faults.latency_seconds, timeout))
+        with self._lock:
+            attempt = self._attempts.get(url, 0)
+            self._attempts[url] = attempt + 1
+            self.stats["requests"] += 1
+            if attempt < self.faults.burst_length:
+                self.stats["injected_faults"] += 1
+                return reference_api.HttpResponse(
+                    status=self.faults.burst_status,
+                    headers={"retry-after": self.faults.retry_after, "content-type": "text/plain"},
+                    body=b"injected replay fault",
+                )
+        response = load_response(self.root, url)
+        with self._lock:
+            self.stats["replayed" if response is not None else "misses"] += 1
+        if response is None:
+            return reference_api.HttpResponse(status=404, headers={"content-type": "text/plain"}, body=b"no recorded response")
+        return response
+
+
+class RebasedHttpGet:
+    def __init__(self, base_url: str, http_get: reference_api.HttpGet | None = None) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.http_get = http_get or reference_api.PooledHttpTransport(proxies={})
+
+    def __call__(self, url: str, headers: dict[str, str], timeout: float) -> reference_api.HttpResponse:
+        parsed = urlparse(url)
+        query = f"?{parsed.query}" if parsed.query else ""
+        return self.http_get(f"{self.base_url}/{parsed.scheme}/{parsed.netloc}{parsed.path}{query}", headers, timeout)
+
+
+def original_url(path: str) -> str | None:
+    scheme, _, rest = path.lstrip("/").partition("/")
+    if scheme not in {"http", "https"} or not rest:
+        return None
+    return f"{scheme}://{rest}"
+
+
+def replay_server(replay: ReplayHttpGet, *, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    import gzip  # noqa: PLC0415
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # noqa: PLC0415
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server hook name
+            url = original_url(self.path)
+            if url is None:
+                response = reference_api.HttpResponse(status=400, headers={}, body=b"expected /<scheme>/<host>/<path>")
+            else:
+                response = replay(url, {key.casefold(): value for key, value in self.headers.items()}, reference_api.HTTP_TIMEOUT_SECONDS)
+            body = response.body
+            compressed = "gzip" in self.headers.get("Accept-Encoding", "") and len(body) > 0
+            if compressed:
+                body = gzip.compress(body)
+            self.send_response(response.status)
+            for key, value in response.headers.items():
+                self.send_header(key, value)
+            if compressed:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def http_get_from_runtime_inputs(inputs: dict[str, str]) -> reference_api.HttpGet:
+    replay = inputs.get("reference_api_replay", "").strip()
+    if replay.startswith(("http://", "https://")):
+        return RebasedHttpGet(replay)
+    if replay:
+        return ReplayHttpGet(Path(replay))
+    record = inputs.get("reference_api_record_dir", "").strip()
+    if record:
+        return RecordingHttpGet(Path(record))
+    return reference_api.default_http_get
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve recorded reference API responses over local HTTP")
+    parser.add_argument("fixtures", help="Fixture directory written by --reference-api-record")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--burst-length", type=int, default=0, help="Injected failures before each URL is served")
+    parser.add_argument("--burst-status", type=int, default=429, choices=[429, 503])
+    parser.add_argument("--retry-after", default="0")
+    args = parser.parse_args()
+    faults = FaultPlan(
+        latency_seconds=max(args.latency_ms, 0.0) / 1000.0,
+        burst_length=max(args.burst_length, 0),
+        burst_status=args.burst_status,
+        retry_after=args.retry_after,
+    )
+    server = replay_server(ReplayHttpGet(Path(args.fixtures).expanduser().resolve(), faults=faults), host=args.host, port=args.port)
+    print(json.dumps({"replay_url": f"http://{server.server_address[0]}:{server.server_address[1]}"}), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
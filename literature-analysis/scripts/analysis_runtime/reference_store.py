@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from . import reference_api
+
+
+SQLITE_TIMEOUT_SECONDS = 30.0
+MIN_TITLE_FINGERPRINT_CHARS = 12
+STORE_MATCH_CONFIDENCE = 0.95
+WORK_METADATA_FIELDS = ("DOI", "archiveID", "publicationTitle", "volume", "issue", "pages", "publisher", "url", "date")
+CONTROL_OR_SPACE_RE = re.compile(r"[\s\x00-\x1f]+")
+LEADING_LABEL_RE = re.compile(r"^\s*(?:\[[^\]]{1,24}\]|\(\d{1,4}\)|\d{1,4}[.)])\s*")
+
+
+@dataclass(frozen=True)
+class ReferenceStore:
+    path: Path
+
+
+def store_from_runtime_inputs(inputs: dict[str, str]) -> ReferenceStore | None:
+    path = inputs.get("reference_store_path", "").strip()
+    return ReferenceStore(path=Path(path).expanduser().resolve()) if path else None
+
+
+def raw_fingerprint(raw: str) -> str:
+    compact = reference_api._compact_title(LEADING_LABEL_RE.sub("", raw, count=1))
+    return f"RAW:{hashlib.sha256(compact.encode('utf-8')).hexdigest()}" if compact else ""
+
+
+def title_fingerprint(title: object, year: object) -> str:
+    compact = reference_api._compact_title(title)
+    if len(compact) < MIN_TITLE_FINGERPRINT_CHARS or not isinstance(year, int):
+        return ""
+    return f"TITLE:{hashlib.sha256(compact.encode('utf-8')).hexdigest()}:{year}"
+
+
+def _identifier_keys(item: dict[str, Any]) -> set[str]:
+    keys = reference_api.extract_identifiers(str(item.get("raw", "")))
+    for value in (item.get("DOI"), f"arXiv:{item['archiveID']}" if item.get("archiveID") else None):
+        identifier = reference_api.normalize_identifier(value)
+        if identifier is not None:
+            keys.add(identifier.canonical)
+    return keys
+
+
+def _connect(store: ReferenceStore, *, readonly: bool) -> sqlite3.Connection | None:
+    if readonly:
+        if not store.path.exists():
+            return None
+        connection = sqlite3.connect(f"{store.path.as_uri()}?mode=ro", uri=True, timeout=SQLITE_TIMEOUT_SECONDS)
+    else:
+        store.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(store.path, timeout=SQLITE_TIMEOUT_SECONDS)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS works (
+                work_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                author_json TEXT NOT NULL,
+                title TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                metadata_json TEXT NOT NULL,
+                source_count INTEGER NOT NULL,
+                first_seen_at REAL NOT NULL,
+                last_seen_at REAL NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS work_keys (
+                work_key TEXT PRIMARY KEY,
+                work_id INTEGER
+            );
+            """
+        )
+    connection.row_factory = sqlite3.Row
+    return connection
+
+
+def _work_ids(connection: sqlite3.Connection, keys: list[str]) -> set[int | None]:
+    if not keys:
+        return set()
+    placeholders = ", ".join("?" for _ in keys)
+    rows = connection.execute(f"SELECT work_id FROM work_keys WHERE work_key IN ({placeholders})", keys).fetchall()
+    return {int(row["work_id"]) if row["work_id"] is not None else None for row in rows}
+
+
+def _fetch_work(connection: sqlite3.Connection, work_id: int) -> dict[str, Any] | None:
+    row = connection.execute(
+        "SELECT work_id, author_json, title, year, metadata_json FROM works WHERE work_id = ?",
+        (work_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    return {
+        "work_id": int(row["work_id"]),
+        "author": json.loads(str(row["author_json"])),
+        "title": str(row["title"]),
+        "year": int(row["year"]),
+        "metadata": json.loads(str(row["metadata_json"])),
+    }
+
+
+def _first_author_surname(authors: list[str]) -> str:
+    name = str(authors[0]).strip() if authors else ""
+    surname = name.split(",", 1)[0] if "," in name else (name.split() or [""])[-1]
+    return reference_api._compact_title(surname)
+
+
+def _authors_agree(work: dict[str, Any], raw: str) -> bool:
+    surname = _first_author_surname(list(work["author"]))
+    return bool(surname) and surname in reference_api._compact_title(LEADING_LABEL_RE.sub("", raw, count=1))
+
+
+def _match_entry(
+    connection: sqlite3.Connection,
+    entry: dict[str, Any],
+    parse_candidates: list[dict[str, Any]],
+) -> tuple[dict[str, Any], str, dict[str, Any]] | None:
+    raw = str(entry.get("raw", ""))
+    for basis, keys in (
+        ("identifier", sorted(reference_api.extract_identifiers(raw))),
+        ("raw", [key for key in [raw_fingerprint(raw)] if key]),
+    ):
+        work_ids = _work_ids(connection, keys)
+        if len(work_ids) == 1 and None not in work_ids:
+            work = _fetch_work(connection, next(iter(work_ids)))  # type: ignore[arg-type]
+            if work is None:
+                return None
+            work_title = reference_api._compact_title(work["title"])
+            selected = next(
+                (candidate for candidate in parse_candidates if reference_api._compact_title(candidate.get("title_candidate")) == work_title),
+                None,
+            )
+            if selected is None and parse_candidates:
+                selected = max(parse_candidates, key=lambda item: float(item.get("confidence", 0.0)))
+            return (work, basis, selected) if selected is not None else None
+        if work_ids:
+            return None
+    matches: dict[int, dict[str, Any]] = {}
+    for candidate in parse_candidates:
+        key = title_fingerprint(candidate.get("title_candidate"), candidate.get("year_candidate"))
+        for work_id in _work_ids(connection, [key] if key else []):
+            if work_id is None:
+                return None
+            matches.setdefault(work_id, candidate)
+    if len(matches) != 1:
+        return None
+    work_id, selected = next(iter(matches.items()))
+    work = _fetch_work(connection, work_id)
+    if work is None or not _authors_agree(work, str(entry.get("raw", ""))):
+        return None
+    return work, "title", selected
+
+
+def _entry_authors(work: dict[str, Any], basis: str, selected: dict[str, Any]) -> list[str]:
+    parsed = [CONTROL_OR_SPACE_RE.sub(" ", str(author)).strip() for author in selected.get("author_candidates", [])]
+    parsed = [author for author in parsed if author]
+    return parsed if basis == "title" and parsed else list(work["author"])
+
+
+def resolve_entries(
+    store: ReferenceStore,
+    entries: list[dict[str, Any]],
+    parse_candidates: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    try:
+        connection = _connect(store, readonly=True)
+    except sqlite3.Error:
+        return []
+    if connection is None:
+        return []
+    parsed_by_entry: dict[int, list[dict[str, Any]]] = {}
+    for candidate in parse_candidates:
+        parsed_by_entry.setdefault(int(candidate["entry_index"]), []).append(candidate)
+    matched: list[tuple[dict[str, Any], dict[str, Any], str, dict[str, Any]]] = []
+    try:
+        for entry in entries:
+            match = _match_entry(connection, entry, parsed_by_entry.get(int(entry["entry_index"]), []))
+            if match is not None:
+                matched.append((entry, *match))
+    except sqlite3.Error:
+        return []
+    finally:
+        connection.close()
+    work_counts: dict[int, int] = {}
+    for _, work, _, _ in matched:
+        work_counts[work["work_id"]] = work_counts.get(work["work_id"], 0) + 1
+    decisions: list[dict[str, Any]] = []
+    for entry, work, basis, selected in matched:
+        entry_index = int(entry["entry_index"])
+        if work_counts[work["work_id"]] > 1:
+            decisions.append({"entry_index": entry_index, "status": "unresolved", "reason": "ambiguous_reference_store_match"})
+            continue
+        entry_metadata = dict(entry.get("metadata", {}))
+        selected_metadata = dict(selected.get("metadata", {}))
+        metadata = dict(work["metadata"])
+        metadata.update(
+            {
+                "entry_index": entry_index,
+                "selected_pattern": str(selected.get("pattern", "")),
+                "pattern_candidate": dict(selected),
+                "resolution_source": "reference_store",
+                "reference_store_work_id": work["work_id"],
+                "reference_store_match_basis": basis,
+            }
+        )
+        for key in ("citekey", "bibitem_key"):
+            value = selected_metadata.get(key)
+            if isinstance(value, str) and value.strip():
+                metadata.setdefault(key, value.strip())
+        for key in ("detected_ref_label", "normalized_ref_label", "citation_label_aliases"):
+            value = entry_metadata.get(key, selected_metadata.get(key))
+            if value not in (None, "", []):
+                metadata.setdefault(key, value)
+        numbering = entry_metadata.get("numbering")
+        if isinstance(numbering, dict) and numbering:
+            metadata["numbering"] = numbering
+            metadata["detected_ref_number"] = numbering.get("detected_ref_number")
+        decisions.append(
+            {
+                "entry_index": entry_index,
+                "status": "accepted",
+                "reason": "matched",
+                "providers": ["reference_store"],
+                "provider_record_ids": [f"work:{work['work_id']}"],
+                "match_basis": basis,
+                "match_score": 1.0,
+                "item": {
+                    "ref_index": entry_index,
+                    "author": _entry_authors(work, basis, selected),
+                    "title": work["title"],
+                    "year": work["year"],
+                    "raw": str(entry.get("raw", "")),
+                    "confidence": STORE_MATCH_CONFIDENCE,
+                    "metadata": metadata,
+                },
+            }
+        )
+    return decisions
+
+
+def _bind_key(connection: sqlite3.Connection, key: str, work_id: int) -> None:
+    row = connection.execute("SELECT work_id FROM work_keys WHERE work_key = ?", (key,)).fetchone()
+    if row is None:
+        connection.execute("INSERT INTO work_keys (work_key, work_id) VALUES (?, ?)", (key, work_id))
+    elif row["work_id"] is not None and int(row["work_id"]) != work_id:
+        connection.execute("UPDATE work_keys SET work_id = NULL WHERE work_key = ?", (key,))
+
+
+def record_items(store: ReferenceStore, items: list[dict[str, Any]], *, now: float | None = None) -> int:
+    current = time.time() if now is None else now
+    recorded = 0
+    try:
+        connection = _connect(store, readonly=False)
+    except (OSError, sqlite3.Error):
+        return 0
+    if connection is None:
+        return 0
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        for item in items:
+            title = str(item.get("title", "")).strip()
+            authors = [str(author) for author in item.get("author", []) if str(author).strip()]
+            year = item.get("year")
+            if not title or not authors or not isinstance(year, int):
+                continue
+            identifier_keys = sorted(_identifier_keys(item))
+            title_key = title_fingerprint(title, year)
+            existing = {work_id for work_id in _work_ids(connection, identifier_keys) if work_id is not None}
+            if not existing and title_key:
+                existing = {work_id for work_id in _work_ids(connection, [title_key]) if work_id is not None}
+            metadata = {key: item[key] for key in WORK_METADATA_FIELDS if item.get(key) not in (None, "", [])}
+            if len(existing) == 1:
+                work_id = next(iter(existing))
+                connection.execute(
+                    "UPDATE works SET source_count = source_count + 1, last_seen_at = ? WHERE work_id = ?",
+                    (current, work_id),
+                )
+            else:
+                cursor = connection.execute(
+                    """
+                    INSERT INTO works (author_json, title, year, metadata_json, source_count, first_seen_at, last_seen_at)
+                    VALUES (?, ?, ?, ?, 1, ?, ?)
+                    """,
+                    (
+                        json.dumps(authors, ensure_ascii=False),
+                        title,
+                        year,
+                        json.dumps(metadata, ensure_ascii=False, sort_keys=True),
+                        current,
+                        current,
+                    ),
+                )
+                work_id = int(cursor.lastrowid or 0)
+            for key in [*identifier_keys, raw_fingerprint(str(item.get("raw", ""))), title_key]:
+                if key:
+                    _bind_key(connection, key, work_id)
+            recorded += 1
+        connection.commit()
+    except sqlite3.Error:
+        connection.rollback()
+        recorded = 0
+    finally:
+        connection.close()
+    return recorded
@@ -3,13 +3,20 @@ from __future__ import annotations
 import json
 import hashlib
 import re
+import threading
+import time
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Any
 
 from .algorithm_adapter import call_algorithm_handler, reference_hard_quality_reason_codes
 from . import agent_work
+from . import profiling
 from . import runtime_db
 from . import reference_api
+from . import reference_cache
+from . import reference_replay
+from . import reference_store
 from .payload_normalization import CANONICAL_METADATA_FIELDS, merge_warnings, normalize_reference_metadata
 
 
@@ -526,30 +533,67 @@ def _provider_fetch(
     connection,  # type: ignore[no-untyped-def]
     identifier: reference_api.Identifier,
     provider: str,
+    shared_cache: reference_cache.ReferenceApiCache | None = None,
+    pending: Future[reference_api.ProviderFetch] | None = None,
+    deadline: float = 0.0,
+    http_get: reference_api.HttpGet = reference_api.default_http_get,
+    shared: dict[str, Any] | None = None,
+    stop: threading.Event | None = None,
 ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
     cached = runtime_db.fetch_reference_api_fetch(
         connection,
         canonical_identifier=identifier.canonical,
         provider=provider,
+        include_response=False,
     )
     if cached is not None:
-        candidates = _candidates_from_cached_fetch(provider, cached.get("response"))
+        candidates = cached["candidates"]
+        if candidates is None:
+            candidates = _candidates_from_cached_fetch(provider, cached.get("response"))
         return candidates, {
             "provider": provider,
             "status": cached["status"],
             "http_status": cached["http_status"],
             "candidate_count": len(candidates),
             "cached": True,
+            "cache_layer": "runtime_db",
             "response_sha256": cached["response_sha256"],
             "error": cached["error"],
+            "http_requests": [],
+        }
+    if shared is None and pending is None and shared_cache is not None:
+        shared = reference_cache.lookup(shared_cache, provider=provider, canonical_identifier=identifier.canonical)
+    if shared is not None:
+        candidates = _candidates_from_cached_fetch(provider, shared["response"])
+        runtime_db.store_reference_api_fetch(
+            connection,
+            canonical_identifier=identifier.canonical,
+            provider=provider,
+            status=shared["status"],
+            http_status=shared["http_status"],
+            response=shared["response"],
+            response_sha256=shared["response_sha256"],
+            error=None,
+            candidates=candidates,
+        )
+        return candidates, {
+            "provider": provider,
+            "status": shared["status"],
+            "http_status": shared["http_status"],
+            "candidate_count": len(candidates),
+            "cached": True,
+            "cache_layer": "shared",
+            "response_sha256": shared["response_sha256"],
+            "error": {},
+            "http_requests": [],
         }
     fetched = (
-        reference_api.fetch_crossref(identifier)
-        if provider == "crossref"
-        else reference_api.fetch_semantic_scholar(identifier)
+        reference_api.wait_provider_fetch(provider, pending, deadline=deadline, stop=stop)
+        if pending is not None
+        else reference_api.fetch_provider(identifier, provider, http_get=http_get)
     )
-    response_text = json.dumps(fetched.response, ensure_ascii=False, sort_keys=True)
-    response_sha256 = hashlib.sha256(response_text.encode("utf-8")).hexdigest()
+    response_bytes = reference_cache.canonical_response_bytes(fetched.response)
+    response_sha256 = hashlib.sha256(response_bytes).hexdigest()
     runtime_db.store_reference_api_fetch(
         connection,
         canonical_identifier=identifier.canonical,
@@ -559,18 +603,71 @@ def _provider_fetch(
         response=fetched.response,
         response_sha256=response_sha256,
         error=fetched.error,
+        response_bytes=response_bytes,
+        candidates=list(fetched.candidates),
     )
+    if shared_cache is not None:
+        reference_cache.store(
+            shared_cache,
+            provider=provider,
+            canonical_identifier=identifier.canonical,
+            status=fetched.status,
+            http_status=fetched.http_status,
+            response=fetched.response,
+            response_bytes=response_bytes,
+        )
     return list(fetched.candidates), {
         "provider": provider,
         "status": fetched.status,
         "http_status": fetched.http_status,
         "candidate_count": len(fetched.candidates),
         "cached": False,
+        "cache_layer": "",
         "response_sha256": response_sha256,
         "error": fetched.error or {},
+        "http_requests": list(fetched.requests),
     }
 
 
+def _start_concurrent_provider_fetches(
+    connection,  # type: ignore[no-untyped-def]
+    identifier: reference_api.Identifier,
+    providers: list[str],
+    shared_cache: reference_cache.ReferenceApiCache | None,
+    http_get: reference_api.HttpGet = reference_api.default_http_get,
+    stop: threading.Event | None = None,
+) -> tuple[dict[str, Future[reference_api.ProviderFetch]], dict[str, dict[str, Any]]]:
+    pending: dict[str, Future[reference_api.ProviderFetch]] = {}
+    shared_hits: dict[str, dict[str, Any]] = {}
+    for provider in providers:
+        if runtime_db.fetch_reference_api_fetch(
+            connection,
+            canonical_identifier=identifier.canonical,
+            provider=provider,
+            include_response=False,
+        ) is not None:
+            continue
+        shared = (
+            reference_cache.lookup(shared_cache, provider=provider, canonical_identifier=identifier.canonical)
+            if shared_cache is not None
+            else None
+        )
+        if shared is not None:
+            shared_hits[provider] = shared
+            continue
+        pending[provider] = reference_api.start_provider_fetch(identifier, provider, http_get=http_get, stop=stop)
+    return pending, shared_hits
+
+
+def _reference_api_concurrency(inputs: dict[str, str]) -> tuple[bool, float]:
+    concurrent = inputs.get("reference_api_concurrent", "").strip().lower() in {"1", "true", "yes"}
+    try:
+        deadline_seconds = float(inputs.get("reference_api_deadline_seconds", "") or reference_api.PROVIDER_DEADLINE_SECONDS)
+    except ValueError:
+        deadline_seconds = reference_api.PROVIDER_DEADLINE_SECONDS
+    return concurrent, deadline_seconds
+
+
 def _write_reference_api_audit(
     db_path: Path,
     *,
@@ -630,11 +727,16 @@ def _algorithm_items_from_api_items(items: list[dict[str, Any]]) -> list[dict[st
     return normalized
 
 
+@profiling.timed("references.resolve_reference_api", category="references")
 def _resolve_reference_api(db_path: Path) -> dict[str, Any]:
     with runtime_db.connect_db(db_path) as connection:
         entries = runtime_db.fetch_reference_entries(connection)
         parse_candidates = runtime_db.fetch_reference_parse_candidates(connection)
         identifier, identifier_source = _effective_identifier(connection)
+        inputs = runtime_db.fetch_runtime_inputs(connection)
+        shared_cache = reference_cache.cache_from_runtime_inputs(inputs)
+        concurrent, deadline_seconds = _reference_api_concurrency(inputs)
+        http_get = reference_replay.http_get_from_runtime_inputs(inputs)
         provider_summaries: list[dict[str, Any]] = []
         provider_candidates: list[dict[str, Any]] = []
         if identifier is None:
@@ -645,8 +747,25 @@ def _resolve_reference_api(db_path: Path) -> dict[str, Any]:
         else:
             providers = ["semantic_scholar"] if identifier.kind == "arxiv" else ["crossref", "semantic_scholar"]
             resolutions = []
+            deadline = time.monotonic() + deadline_seconds
+            stop = threading.Event()
+            pending, shared_hits = (
+                _start_concurrent_provider_fetches(connection, identifier, providers, shared_cache, http_get, stop)
+                if concurrent and len(providers) > 1
+                else ({}, {})
+            )
             for provider in providers:
-                candidates, summary = _provider_fetch(connection, identifier, provider)
+                candidates, summary = _provider_fetch(
+                    connection,
+                    identifier,
+                    provider,
+                    shared_cache,
+                    pending=pending.pop(provider, None),
+                    deadline=deadline,
+                    http_get=http_get,
+                    shared=shared_hits.pop(provider, None),
+                    stop=stop,
+                )
                 provider_candidates.extend(candidates)
                 provider_summaries.append(summary)
                 if summary["status"] == "failed":
@@ -657,8 +776,27 @@ def _resolve_reference_api(db_path: Path) -> dict[str, Any]:
                 resolutions = reference_api.resolve_candidates(entries, parse_candidates, provider_candidates)
                 if resolutions and all(item.get("status") == "accepted" for item in resolutions):
                     break
+            if pending:
+                stop.set()
         if not resolutions:
             resolutions = reference_api.resolve_candidates(entries, parse_candidates, provider_candidates)
+        corpus_store = reference_store.store_from_runtime_inputs(inputs)
+        store_accepted_count = 0
+        if corpus_store is not None:
+            unresolved_entry_indexes = {
+                int(resolution["entry_index"]) for resolution in resolutions if resolution.get("status") != "accepted"
+            }
+            store_resolutions = {
+                int(resolution["entry_index"]): resolution
+                for resolution in reference_store.resolve_entries(
+                    corpus_store,
+                    [entry for entry in entries if int(entry["entry_index"]) in unresolved_entry_indexes],
+                    [candidate for candidate in parse_candidates if int(candidate["entry_index"]) in unresolved_entry_indexes],
+                )
+                if resolution.get("status") == "accepted"
+            }
+            store_accepted_count = len(store_resolutions)
+            resolutions = [store_resolutions.get(int(resolution["entry_index"]), resolution) for resolution in resolutions]
         for resolution in resolutions:
             if resolution.get("status") != "accepted" or not isinstance(resolution.get("item"), dict):
                 continue
@@ -683,6 +821,7 @@ def _resolve_reference_api(db_path: Path) -> dict[str, Any]:
                 "identifier_source": identifier_source,
                 "accepted_count": accepted_count,
                 "unresolved_count": unresolved_count,
+                "reference_store_accepted_count": store_accepted_count,
                 "providers": provider_summaries,
             },
         )
@@ -700,11 +839,21 @@ def _resolve_reference_api(db_path: Path) -> dict[str, Any]:
         "provider_summaries": provider_summaries,
         "accepted_count": accepted_count,
         "unresolved_count": unresolved_count,
+        "reference_store_accepted_count": store_accepted_count,
         "audit_path": audit_path,
         "complete": bool(entries) and unresolved_count == 0,
     }
 
 
+def _record_reference_store(db_path: Path) -> int:
+    with runtime_db.connect_db(db_path) as connection:
+        corpus_store = reference_store.store_from_runtime_inputs(runtime_db.fetch_runtime_inputs(connection))
+        items = runtime_db.fetch_reference_items(connection) if corpus_store is not None else []
+    if corpus_store is None:
+        return 0
+    return reference_store.record_items(corpus_store, items)
+
+
 def _persist_complete_api_resolution(
     db_path: Path,
     api_summary: dict[str, Any],
@@ -714,7 +863,7 @@ def _persist_complete_api_resolution(
     with runtime_db.connect_db(db_path) as connection:
         api_items = runtime_db.fetch_reference_items(connection)
     persisted, persist_code = call_algorithm_handler(
-        "_handle_persist_references",
+        "persist_references",
         db_path,
         payload={"items": _algorithm_items_from_api_items(api_items)},
     )
@@ -726,6 +875,7 @@ def _persist_complete_api_resolution(
             runtime_db.clear_reference_api_resolutions(connection)
             connection.commit()
         return None, ["reference_api_quality_gate_failed: API items returned to local review"]
+    _record_reference_store(db_path)
 
     metadata_result, metadata_code = prepare_reference_metadata_enrichment(db_path)
     if metadata_code != 0 or not metadata_result.get("skipped"):
@@ -803,8 +953,9 @@ def _sync_api_aware_split_state(db_path: Path, prepared: dict[str, Any]) -> None
         connection.commit()
 
 
+@profiling.timed("references.prepare_reference_workset", category="references")
 def prepare_reference_workset(db_path: Path) -> tuple[dict[str, Any], int]:
-    prepared, code = call_algorithm_handler("_handle_prepare_references_workset", db_path)
+    prepared, code = call_algorithm_handler("prepare_references_workset", db_path)
     if code != 0 or prepared.get("file_quality_low"):
         return prepared, code
     api_summary = _resolve_reference_api(db_path)
@@ -992,7 +1143,7 @@ def _run_split_reviews(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str
         )
     blocks.sort(key=lambda block: int(block["block_index"]))
     result, code = call_algorithm_handler(
-        "_handle_persist_reference_entry_splits",
+        "persist_reference_entry_splits",
         db_path,
         payload={"blocks": blocks},
     )
@@ -1124,8 +1275,9 @@ def enrich_metadata_workset_payload(payload: dict[str, Any]) -> dict[str, Any]:
     return payload
 
 
+@profiling.timed("references.prepare_reference_metadata_enrichment", category="references")
 def prepare_reference_metadata_enrichment(db_path: Path) -> tuple[dict[str, Any], int]:
-    prepared, code = call_algorithm_handler("_handle_prepare_reference_metadata_enrichment", db_path)
+    prepared, code = call_algorithm_handler("prepare_reference_metadata_enrichment", db_path)
     if code == 0:
         prepared.update(
             {
@@ -1262,6 +1414,7 @@ def _metadata_payload_errors(payload: dict[str, Any], workset: dict[str, Any]) -
     return errors, {"items": internal_items}, warnings
 
 
+@profiling.timed("references.persist_reference_metadata_reviews", category="references")
 def persist_reference_metadata_reviews(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
     prepared, prepare_code = prepare_reference_metadata_enrichment(db_path)
     if prepare_code != 0:
@@ -1283,7 +1436,7 @@ def persist_reference_metadata_reviews(db_path: Path, payload: dict[str, Any]) -
             "warnings": normalization_warnings,
         }, 2
     persisted, code = call_algorithm_handler(
-        "_handle_persist_reference_metadata_enrichment",
+        "persist_reference_metadata_enrichment",
         db_path,
         payload=internal_payload,
     )
@@ -1375,6 +1528,7 @@ def _persist_runtime_warnings(db_path: Path, warnings: list[str]) -> None:
             runtime_db.add_runtime_warning_once(connection, warning)
 
 
+@profiling.timed("references.persist_references", category="references")
 def persist_references(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
     if "metadata_reviews" in payload:
         return {
@@ -1435,9 +1589,10 @@ def persist_references(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str
             key=lambda item: int(item["entry_index"]),
         )
     }
-    result, code = call_algorithm_handler("_handle_persist_references", db_path, payload=reference_payload)
+    result, code = call_algorithm_handler("persist_references", db_path, payload=reference_payload)
     if code != 0:
         return result, code
+    _record_reference_store(db_path)
     metadata_workset, metadata_code = prepare_reference_metadata_enrichment(db_path)
     all_warnings = merge_warnings(
         normalization_warnings,
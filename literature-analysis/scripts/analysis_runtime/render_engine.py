@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+
+_LOCK = threading.Lock()
+_ENVIRONMENTS: dict[tuple[str, str], Environment] = {}
+_VALIDATORS: dict[str, tuple[int, int, Any]] = {}
+
+
+def _to_pretty_json(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False, indent=2)
+
+
+def template_environment(template_root: Path, *, bytecode_cache_dir: str = "") -> Environment:
+    key = (str(template_root.resolve()), bytecode_cache_dir.strip())
+    env = _ENVIRONMENTS.get(key)
+    if env is not None:
+        return env
+    with _LOCK:
+        env = _ENVIRONMENTS.get(key)
+        if env is None:
+            from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined  # noqa: PLC0415
+
+            bytecode_cache = None
+            if key[1]:
+                cache_dir = Path(key[1]).expanduser()
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+            env = Environment(
+                loader=FileSystemLoader(key[0]),
+                autoescape=False,
+                trim_blocks=False,
+                lstrip_blocks=False,
+                keep_trailing_newline=False,
+                undefined=StrictUndefined,
+                bytecode_cache=bytecode_cache,
+            )
+            env.filters["to_pretty_json"] = _to_pretty_json
+            _ENVIRONMENTS[key] = env
+    return env
+
+
+def render(template_path: Path, context: dict[str, Any], *, bytecode_cache_dir: str = "") -> str:
+    env = template_environment(template_path.parent, bytecode_cache_dir=bytecode_cache_dir)
+    return env.get_template(template_path.name).render(**context)
+
+
+def schema_validator(schema_path: Path) -> Any:
+    resolved = schema_path.resolve()
+    stat = resolved.stat()
+    cached = _VALIDATORS.get(str(resolved))
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    from jsonschema import validators  # type: ignore[import-untyped]  # noqa: PLC0415
+
+    schema = json.loads(resolved.read_text(encoding="utf-8"))
+    validator_class = validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    validator = validator_class(schema)
+    with _LOCK:
+        _VALIDATORS[str(resolved)] = (stat.st_mtime_ns, stat.st_size, validator)
+    return validator
+
+
+def validate(instance: object, schema_path: Path) -> None:
+    from jsonschema.exceptions import best_match  # type: ignore[import-untyped]  # noqa: PLC0415
+
+    error = best_match(schema_validator(schema_path).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+def clear() -> None:
+    with _LOCK:
+        _ENVIRONMENTS.clear()
+        _VALIDATORS.clear()
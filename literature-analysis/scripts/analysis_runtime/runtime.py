@@ -45,6 +45,25 @@ def initialize_runtime(
     model: str,
     score_only: bool = False,
     identifier: str = "",
+    reference_api_cache_dir: str = "",
+    reference_api_cache_ttl_seconds: float | None = None,
+    reference_api_cache_max_bytes: int | None = None,
+    reference_api_concurrent: bool = False,
+    reference_api_deadline_seconds: float | None = None,
+    reference_api_replay: str = "",
+    reference_api_record_dir: str = "",
+    sqlite_profile: str = "default",
+    db_write_strategy: str = "replace",
+    citation_full_document: bool = False,
+    conversion_cache: bool = True,
+    conversion_cache_dir: str = "",
+    conversion_cache_max_bytes: int | None = None,
+    pdf_extract_workers: int = 1,
+    template_bytecode_cache_dir: str = "",
+    reference_candidate_cache: bool = True,
+    reference_candidate_cache_dir: str = "",
+    reference_store_path: str = "",
+    stage_timings: bool = False,
 ) -> AnalysisRuntimePaths:
     runtime_paths = AnalysisRuntimePaths(
         working_dir=working_dir.resolve(),
@@ -83,6 +102,66 @@ def initialize_runtime(
             "identifier_value",
             normalized_identifier.value if normalized_identifier is not None else "",
         )
+        runtime_db.set_runtime_input(
+            connection,
+            "reference_api_cache_dir",
+            str(Path(reference_api_cache_dir).expanduser().resolve()) if reference_api_cache_dir.strip() else "",
+        )
+        if reference_api_cache_ttl_seconds is not None:
+            runtime_db.set_runtime_input(connection, "reference_api_cache_ttl_seconds", str(reference_api_cache_ttl_seconds))
+        if reference_api_cache_max_bytes is not None:
+            runtime_db.set_runtime_input(connection, "reference_api_cache_max_bytes", str(reference_api_cache_max_bytes))
+        runtime_db.set_runtime_input(connection, "reference_api_concurrent", "true" if reference_api_concurrent else "false")
+        if reference_api_deadline_seconds is not None:
+            runtime_db.set_runtime_input(connection, "reference_api_deadline_seconds", str(reference_api_deadline_seconds))
+        replay = reference_api_replay.strip()
+        runtime_db.set_runtime_input(
+            connection,
+            "reference_api_replay",
+            replay if not replay or replay.startswith(("http://", "https://")) else str(Path(replay).expanduser().resolve()),
+        )
+        runtime_db.set_runtime_input(
+            connection,
+            "reference_api_record_dir",
+            str(Path(reference_api_record_dir).expanduser().resolve()) if reference_api_record_dir.strip() else "",
+        )
+        runtime_db.set_runtime_input(
+            connection,
+            "sqlite_profile",
+            sqlite_profile if sqlite_profile in runtime_db.SQLITE_PROFILES else "default",
+        )
+        runtime_db.set_runtime_input(
+            connection,
+            "db_write_strategy",
+            db_write_strategy if db_write_strategy in runtime_db.DB_WRITE_STRATEGIES else "replace",
+        )
+        runtime_db.set_runtime_input(connection, "citation_full_document", "true" if citation_full_document else "false")
+        runtime_db.set_runtime_input(connection, "conversion_cache", "true" if conversion_cache else "false")
+        runtime_db.set_runtime_input(
+            connection,
+            "conversion_cache_dir",
+            str(Path(conversion_cache_dir).expanduser().resolve()) if conversion_cache_dir.strip() else "",
+        )
+        if conversion_cache_max_bytes is not None:
+            runtime_db.set_runtime_input(connection, "conversion_cache_max_bytes", str(conversion_cache_max_bytes))
+        runtime_db.set_runtime_input(connection, "pdf_extract_workers", str(max(1, pdf_extract_workers)))
+        runtime_db.set_runtime_input(
+            connection,
+            "template_bytecode_cache_dir",
+            str(Path(template_bytecode_cache_dir).expanduser().resolve()) if template_bytecode_cache_dir.strip() else "",
+        )
+        runtime_db.set_runtime_input(connection, "reference_candidate_cache", "true" if reference_candidate_cache else "false")
+        runtime_db.set_runtime_input(
+            connection,
+            "reference_candidate_cache_dir",
+            str(Path(reference_candidate_cache_dir).expanduser().resolve()) if reference_candidate_cache_dir.strip() else "",
+        )
+        runtime_db.set_runtime_input(
+            connection,
+            "reference_store_path",
+            str(Path(reference_store_path).expanduser().resolve()) if reference_store_path.strip() else "",
+        )
+        runtime_db.set_runtime_input(connection, "stage_timings", "true" if stage_timings else "false")
         if identifier.strip() and normalized_identifier is None:
             runtime_db.add_runtime_warning_once(connection, "invalid_identifier: falling back to analysis-plan source identity")
         runtime_db.set_runtime_input(connection, "input_hash", deterministic_core.sha256_path(source_path.resolve()) if source_path.exists() else "")
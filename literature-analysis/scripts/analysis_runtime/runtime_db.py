@@ -1,15 +1,36 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import re
 import sqlite3
+import sys
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, overload
 
 
 DB_FILENAME = "literature_analysis.db"
 TMP_DIRNAME = ".literature_analysis_tmp"
+SOURCE_LINES_MEMO_SIZE = 8
+STAGE_TIMINGS_MAX_RUNS = 200
+REFERENCE_API_RESPONSE_ZLIB_LEVEL = 6
+REFERENCE_API_RESPONSE_COLUMNS = "response_json, response_blob"
+# Rows stored with parsed candidates only need the response body when audited.
+REFERENCE_API_UNPARSED_RESPONSE_COLUMNS = (
+    "CASE WHEN candidates_json IS NULL THEN response_json END AS response_json, "
+    "CASE WHEN candidates_json IS NULL THEN response_blob END AS response_blob"
+)
+WARNING_ENTRY_INDEX_RE = re.compile(r"\bentry_index=(\d+)\b")
+WARNING_BLOCK_INDEX_RE = re.compile(r"\bblock_index=(\d+)\b")
+LINE_BREAK_RE = re.compile("\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+LINE_INDEX_TYPECODE = "q"
 
 REQUIRED_ARTIFACT_KEYS = {
     "digest_path",
@@ -40,6 +61,93 @@ ALLOWED_STAGES = {
     "stage_8_completed",
 }
 ALLOWED_STAGE_GATES = {"blocked", "ready"}
+CITATION_MENTION_COLUMN_KEYS = {
+    "mention_id", "marker", "style", "line_start", "line_end", "snippet",
+    "ref_number_hint", "year_hint", "surname_hint", "batch_index", "consumed_status",
+}
+# progress_key expression and row filter per table counted in runtime_progress;
+# {row} is NEW/OLD inside triggers and the table name when recounting.
+RUNTIME_PROGRESS_COUNTERS = (
+    ("source_documents", "'source_document:' || {row}.doc_key", ""),
+    ("section_scopes", "'section_scope:' || {row}.scope_key", ""),
+    ("action_receipts", "'receipt:' || {row}.action_name", ""),
+    ("outline_nodes", "'rows:outline_nodes'", ""),
+    ("digest_slots", "'rows:digest_slots'", ""),
+    ("digest_section_summaries", "'rows:digest_section_summaries'", ""),
+    ("literature_score", "'rows:literature_score'", ""),
+    ("reference_items", "'rows:reference_items'", ""),
+    ("citation_timeline", "'rows:citation_timeline'", ""),
+    ("citation_summary", "'rows:citation_summary'", ""),
+    ("reference_quality_issues", "'rows:active_reference_quality_issues'", "{row}.status = 'active'"),
+)
+SQLITE_PROFILES = {"default", "wal"}
+DB_WRITE_STRATEGIES = {"replace", "diff"}
+
+
+def _content_sha256(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _line_spans(content: str) -> array:
+    spans = array(LINE_INDEX_TYPECODE)
+    start = 0
+    for match in LINE_BREAK_RE.finditer(content):
+        spans.append(start)
+        spans.append(match.start())
+        start = match.end()
+    if start < len(content):
+        spans.append(start)
+        spans.append(len(content))
+    return spans
+
+
+def _encode_line_index(spans: array) -> bytes:
+    if sys.byteorder == "little":
+        return spans.tobytes()
+    swapped = array(LINE_INDEX_TYPECODE, spans)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def _decode_line_index(data: bytes) -> array:
+    spans = array(LINE_INDEX_TYPECODE)
+    spans.frombytes(data)
+    if sys.byteorder != "little":
+        spans.byteswap()
+    return spans
+
+
+class SourceLines(Sequence[str]):
+    __slots__ = ("content", "sha256", "_spans")
+
+    def __init__(self, content: str, spans: array | None = None, sha256: str = "") -> None:
+        self.content = content
+        self.sha256 = sha256 or _content_sha256(content)
+        self._spans = spans if spans is not None else _line_spans(content)
+
+    def __len__(self) -> int:
+        return len(self._spans) // 2
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self._line(position) for position in range(*index.indices(len(self)))]
+        position = index + len(self) if index < 0 else index
+        if position < 0 or position >= len(self):
+            raise IndexError("source line index out of range")
+        return self._line(position)
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(len(self)):
+            yield self._line(position)
+
+    def _line(self, position: int) -> str:
+        return self.content[self._spans[2 * position] : self._spans[2 * position + 1]]
 
 
 def utc_now_iso() -> str:
@@ -50,13 +158,123 @@ def default_db_path() -> Path:
     return Path.cwd() / TMP_DIRNAME / DB_FILENAME
 
 
+_CONNECTION_SCOPE = threading.local()
+
+
+class RuntimeConnection(sqlite3.Connection):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._depth = 0
+        self._savepoints: list[str] = []
+
+    def commit(self) -> None:
+        if self._savepoints:
+            return
+        stats = _scope_stats()
+        if stats is not None and self.in_transaction:
+            stats["commits"] += 1
+        super().commit()
+
+    def rollback(self) -> None:
+        if self._savepoints:
+            self.execute(f"ROLLBACK TO SAVEPOINT {self._savepoints[-1]}")
+            return
+        super().rollback()
+
+    def __enter__(self) -> RuntimeConnection:
+        self._depth += 1
+        if self._depth > 1:
+            if not self.in_transaction:
+                self.execute("BEGIN")
+            name = f"runtime_scope_{self._depth}"
+            self.execute(f"SAVEPOINT {name}")
+            self._savepoints.append(name)
+        return self
+
+    def __exit__(self, exc_type: object, exc_value: object, traceback: object) -> bool:
+        self._depth -= 1
+        if self._depth > 0 and self._savepoints:
+            name = self._savepoints.pop()
+            if exc_type is not None:
+                self.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            self.execute(f"RELEASE SAVEPOINT {name}")
+            return False
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def close(self) -> None:
+        if any(connection is self for connection in _scope_connections().values()):
+            return
+        super().close()
+
+
+def _scope_connections() -> dict[str, sqlite3.Connection]:
+    return getattr(_CONNECTION_SCOPE, "connections", {})
+
+
+def _scope_stats() -> dict[str, int] | None:
+    return getattr(_CONNECTION_SCOPE, "stats", None)
+
+
+@contextmanager
+def connection_scope() -> Iterator[dict[str, int]]:
+    outer_stats = _scope_stats()
+    if outer_stats is not None:
+        yield outer_stats
+        return
+    stats = {"opens": 0, "reuses": 0, "commits": 0}
+    _CONNECTION_SCOPE.connections = {}
+    _CONNECTION_SCOPE.stats = stats
+    failed = False
+    try:
+        yield stats
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        connections = _CONNECTION_SCOPE.connections
+        _CONNECTION_SCOPE.connections = {}
+        _CONNECTION_SCOPE.stats = None
+        for connection in connections.values():
+            try:
+                if failed:
+                    connection.rollback()
+                elif connection.in_transaction:
+                    stats["commits"] += 1
+                    connection.commit()
+            finally:
+                connection.close()
+
+
 def connect_db(db_path: Path) -> sqlite3.Connection:
-    connection = sqlite3.connect(db_path)
+    stats = _scope_stats()
+    scope_key = str(Path(db_path).resolve()) if stats is not None else ""
+    if stats is not None and scope_key in _CONNECTION_SCOPE.connections:
+        stats["reuses"] += 1
+        return _CONNECTION_SCOPE.connections[scope_key]
+    connection = sqlite3.connect(db_path, factory=RuntimeConnection)
+    if stats is not None:
+        stats["opens"] += 1
+        _CONNECTION_SCOPE.connections[scope_key] = connection
     connection.row_factory = sqlite3.Row
     connection.execute("PRAGMA foreign_keys = ON")
+    if _runtime_input_value(connection, "sqlite_profile") == "wal":
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
     return connection
 
 
+def _runtime_input_value(connection: sqlite3.Connection, key: str) -> str:
+    try:
+        row = connection.execute("SELECT value FROM runtime_inputs WHERE key = ?", (key,)).fetchone()
+    except sqlite3.OperationalError:
+        return ""
+    return str(row["value"]) if row is not None else ""
+
+
 def initialize_database(db_path: Path) -> None:
     db_path.parent.mkdir(parents=True, exist_ok=True)
     with connect_db(db_path) as connection:
@@ -134,6 +352,8 @@ def _create_schema(connection: sqlite3.Connection) -> None:
             doc_key TEXT PRIMARY KEY,
             content TEXT NOT NULL,
             metadata_json TEXT NOT NULL,
+            content_sha256 TEXT NOT NULL DEFAULT '',
+            line_index BLOB,
             updated_at TEXT NOT NULL
         );
 
@@ -396,6 +616,23 @@ def _create_schema(connection: sqlite3.Connection) -> None:
             source_table TEXT NOT NULL,
             updated_at TEXT NOT NULL
         );
+
+        CREATE TABLE IF NOT EXISTS stage_timings (
+            run_id TEXT NOT NULL,
+            span_index INTEGER NOT NULL,
+            parent_index INTEGER,
+            name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            thread_id INTEGER NOT NULL,
+            start_unix_ms REAL NOT NULL,
+            wall_ms REAL NOT NULL,
+            cpu_ms REAL NOT NULL,
+            peak_rss_delta_kb INTEGER,
+            row_deltas_json TEXT NOT NULL,
+            detail_json TEXT NOT NULL,
+            status TEXT NOT NULL,
+            PRIMARY KEY (run_id, span_index)
+        );
         """
     )
     _migrate_schema(connection)
@@ -417,6 +654,68 @@ def _migrate_schema(connection: sqlite3.Connection) -> None:
     _ensure_column(connection, "runtime_warnings", "resolved_at TEXT")
     _ensure_column(connection, "runtime_errors", "status TEXT NOT NULL DEFAULT 'active'")
     _ensure_column(connection, "runtime_errors", "resolved_at TEXT")
+    _ensure_column(connection, "source_documents", "content_sha256 TEXT NOT NULL DEFAULT ''")
+    _ensure_column(connection, "source_documents", "line_index BLOB")
+    _ensure_column(connection, "reference_api_fetches", "response_blob BLOB")
+    _ensure_column(connection, "reference_api_fetches", "candidates_json TEXT")
+    _ensure_runtime_progress(connection)
+
+
+def _ensure_runtime_progress(connection: sqlite3.Connection) -> None:
+    if connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'runtime_progress'").fetchone():
+        return
+    connection.execute(
+        """
+        CREATE TABLE runtime_progress (
+            progress_key TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            first_id INTEGER,
+            detail_json TEXT NOT NULL DEFAULT '{}'
+        )
+        """
+    )
+    connection.execute("CREATE INDEX IF NOT EXISTS runtime_warnings_active_text ON runtime_warnings (warning, status)")
+    for table_name, key_sql, condition in RUNTIME_PROGRESS_COUNTERS:
+        new_key, old_key = key_sql.format(row="NEW"), key_sql.format(row="OLD")
+        new_when = f"WHEN {condition.format(row='NEW')}" if condition else ""
+        old_when = f"WHEN {condition.format(row='OLD')}" if condition else ""
+        increment = (
+            f"INSERT INTO runtime_progress (progress_key, row_count) VALUES ({new_key}, 1) "
+            "ON CONFLICT(progress_key) DO UPDATE SET row_count = row_count + 1;"
+        )
+        decrement = f"UPDATE runtime_progress SET row_count = row_count - 1 WHERE progress_key = {old_key};"
+        connection.execute(f"CREATE TRIGGER {table_name}_progress_insert AFTER INSERT ON {table_name} {new_when} BEGIN {increment} END")
+        connection.execute(f"CREATE TRIGGER {table_name}_progress_delete AFTER DELETE ON {table_name} {old_when} BEGIN {decrement} END")
+        if condition:
+            connection.execute(
+                f"CREATE TRIGGER {table_name}_progress_leave AFTER UPDATE ON {table_name} "
+                f"WHEN ({condition.format(row='OLD')}) AND NOT ({condition.format(row='NEW')}) BEGIN {decrement} END"
+            )
+            connection.execute(
+                f"CREATE TRIGGER {table_name}_progress_enter AFTER UPDATE ON {table_name} "
+                f"WHEN ({condition.format(row='NEW')}) AND NOT ({condition.format(row='OLD')}) BEGIN {increment} END"
+            )
+    rebuild_runtime_progress(connection)
+
+
+def count_runtime_progress(connection: sqlite3.Connection) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for table_name, key_sql, condition in RUNTIME_PROGRESS_COUNTERS:
+        where = f"WHERE {condition.format(row=table_name)}" if condition else ""
+        rows = connection.execute(
+            f"SELECT {key_sql.format(row=table_name)} AS progress_key, COUNT(*) AS row_count FROM {table_name} {where} GROUP BY 1"
+        ).fetchall()
+        counts.update((str(row["progress_key"]), int(row["row_count"])) for row in rows)
+    return counts
+
+
+def rebuild_runtime_progress(connection: sqlite3.Connection) -> None:
+    connection.execute("DELETE FROM runtime_progress")
+    connection.executemany(
+        "INSERT INTO runtime_progress (progress_key, row_count) VALUES (?, ?)",
+        sorted(count_runtime_progress(connection).items()),
+    )
+    _rebuild_warning_progress(connection)
 
 
 def _seed_runtime_run(connection: sqlite3.Connection) -> None:
@@ -449,6 +748,52 @@ def _json_dump(data: object) -> str:
     return json.dumps(data, ensure_ascii=False, sort_keys=True)
 
 
+def _replace_table_rows(
+    connection: sqlite3.Connection,
+    table_name: str,
+    columns: tuple[str, ...],
+    rows: list[tuple[Any, ...]],
+    *,
+    key_columns: tuple[str, ...] = (),
+    strategy: str | None = None,
+) -> None:
+    placeholders = ", ".join("?" for _ in columns)
+    column_sql = ", ".join(columns)
+    key_positions = [columns.index(column) for column in key_columns]
+    keys = [tuple(row[position] for position in key_positions) for row in rows]
+    if (
+        not key_columns
+        or (strategy or _runtime_input_value(connection, "db_write_strategy")) != "diff"
+        or len(set(keys)) != len(keys)
+    ):
+        connection.execute(f"DELETE FROM {table_name}")
+        connection.executemany(f"INSERT INTO {table_name} ({column_sql}) VALUES ({placeholders})", rows)
+        return
+    compared_positions = [position for position, column in enumerate(columns) if column != "updated_at"]
+    compared_sql = ", ".join(columns[position] for position in compared_positions)
+    existing = {
+        tuple(row[:len(key_columns)]): tuple(row[len(key_columns):])
+        for row in connection.execute(f"SELECT {', '.join(key_columns)}, {compared_sql} FROM {table_name}").fetchall()
+    }
+    wanted = set(keys)
+    stale = [key for key in existing if key not in wanted]
+    if stale:
+        key_sql = " AND ".join(f"{column} = ?" for column in key_columns)
+        connection.executemany(f"DELETE FROM {table_name} WHERE {key_sql}", stale)
+    changed = [
+        row
+        for key, row in zip(keys, rows)
+        if existing.get(key) != tuple(row[position] for position in compared_positions)
+    ]
+    if changed:
+        update_sql = ", ".join(f"{column} = excluded.{column}" for column in columns if column not in key_columns)
+        connection.executemany(
+            f"INSERT INTO {table_name} ({column_sql}) VALUES ({placeholders}) "
+            f"ON CONFLICT({', '.join(key_columns)}) DO UPDATE SET {update_sql}",
+            changed,
+        )
+
+
 def set_runtime_input(connection: sqlite3.Connection, key: str, value: str) -> None:
     now = utc_now_iso()
     connection.execute(
@@ -473,10 +818,19 @@ def is_score_only(connection: sqlite3.Connection) -> bool:
 
 
 def add_runtime_warning(connection: sqlite3.Connection, warning: str) -> None:
-    connection.execute(
+    repeated = connection.execute(
+        "SELECT 1 FROM runtime_warnings WHERE warning = ? AND status = 'active' LIMIT 1",
+        (warning,),
+    ).fetchone()
+    cursor = connection.execute(
         "INSERT INTO runtime_warnings (warning, created_at, status) VALUES (?, ?, 'active')",
         (warning, utc_now_iso()),
     )
+    if repeated is None:
+        try:
+            _add_warning_progress(connection, warning, int(cursor.lastrowid or 0))
+        except sqlite3.OperationalError:
+            pass
     touch_runtime(connection)
 
 
@@ -519,8 +873,8 @@ def _aggregate_runtime_warnings(warnings: list[str]) -> list[str]:
         entry_indexes: list[str] = []
         block_indexes: list[str] = []
         for detail in deduped:
-            entry_match = re.search(r"\bentry_index=(\d+)\b", detail)
-            block_match = re.search(r"\bblock_index=(\d+)\b", detail)
+            entry_match = WARNING_ENTRY_INDEX_RE.search(detail)
+            block_match = WARNING_BLOCK_INDEX_RE.search(detail)
             if entry_match is not None:
                 entry_indexes.append(entry_match.group(1))
             if block_match is not None:
@@ -535,6 +889,84 @@ def _aggregate_runtime_warnings(warnings: list[str]) -> list[str]:
     return list(dict.fromkeys([*passthrough, *aggregated]))
 
 
+def _add_warning_progress(connection: sqlite3.Connection, warning: str, warning_id: int) -> None:
+    detail = _warning_detail(warning)
+    progress_key = f"warning:{_warning_category(warning)}" if detail else f"warning_passthrough:{warning}"
+    row = connection.execute(
+        "SELECT row_count, detail_json FROM runtime_progress WHERE progress_key = ?",
+        (progress_key,),
+    ).fetchone()
+    entry_count = int(WARNING_ENTRY_INDEX_RE.search(detail) is not None)
+    block_count = int(WARNING_BLOCK_INDEX_RE.search(detail) is not None)
+    if row is None or int(row["row_count"]) <= 0:
+        connection.execute(
+            """
+            INSERT INTO runtime_progress (progress_key, row_count, first_id, detail_json)
+            VALUES (?, 1, ?, ?)
+            ON CONFLICT(progress_key) DO UPDATE SET
+                row_count = excluded.row_count,
+                first_id = excluded.first_id,
+                detail_json = excluded.detail_json
+            """,
+            (progress_key, warning_id, _json_dump({"first_detail": detail, "entry_count": entry_count, "block_count": block_count})),
+        )
+        return
+    aggregate = json.loads(str(row["detail_json"]))
+    aggregate["entry_count"] = int(aggregate.get("entry_count", 0)) + entry_count
+    aggregate["block_count"] = int(aggregate.get("block_count", 0)) + block_count
+    connection.execute(
+        "UPDATE runtime_progress SET row_count = row_count + 1, detail_json = ? WHERE progress_key = ?",
+        (_json_dump(aggregate), progress_key),
+    )
+
+
+def _rebuild_warning_progress(connection: sqlite3.Connection) -> None:
+    connection.execute("DELETE FROM runtime_progress WHERE progress_key LIKE 'warning%'")
+    rows = connection.execute(
+        "SELECT MIN(id) AS id, warning FROM runtime_warnings WHERE status = 'active' GROUP BY warning ORDER BY MIN(id) ASC"
+    ).fetchall()
+    for row in rows:
+        _add_warning_progress(connection, str(row["warning"]), int(row["id"]))
+
+
+def _aggregate_warning_progress(rows: list[sqlite3.Row]) -> list[str]:
+    passthrough: list[str] = []
+    aggregated: list[str] = []
+    for row in rows:
+        progress_key = str(row["progress_key"])
+        if progress_key.startswith("warning_passthrough:"):
+            passthrough.append(progress_key.removeprefix("warning_passthrough:"))
+            continue
+        category = progress_key.removeprefix("warning:")
+        count = int(row["row_count"])
+        aggregate = json.loads(str(row["detail_json"]))
+        if count == 1:
+            aggregated.append(f"{category}: {aggregate['first_detail']}")
+        elif int(aggregate["entry_count"]) == count:
+            aggregated.append(f"{category}: {count} entries")
+        elif int(aggregate["block_count"]) == count:
+            aggregated.append(f"{category}: {count} blocks")
+        else:
+            aggregated.append(f"{category}: {count} occurrences")
+    return list(dict.fromkeys([*passthrough, *aggregated]))
+
+
+def fetch_runtime_progress(connection: sqlite3.Connection) -> dict[str, Any] | None:
+    try:
+        rows = connection.execute(
+            "SELECT progress_key, row_count, first_id, detail_json FROM runtime_progress WHERE row_count > 0 ORDER BY first_id ASC, progress_key ASC"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    warning_rows = [row for row in rows if str(row["progress_key"]).startswith("warning")]
+    counts = {str(row["progress_key"]): int(row["row_count"]) for row in rows if not str(row["progress_key"]).startswith("warning")}
+    return {
+        "counts": counts,
+        "receipts": sorted(key.removeprefix("receipt:") for key in counts if key.startswith("receipt:")),
+        "warnings": _aggregate_warning_progress(warning_rows),
+    }
+
+
 def fetch_runtime_warnings(connection: sqlite3.Connection) -> list[str]:
     rows = connection.execute(
         "SELECT warning FROM runtime_warnings WHERE status = 'active' ORDER BY id ASC"
@@ -598,6 +1030,10 @@ def resolve_runtime_warnings(
             (utc_now_iso(), f"{warning_prefix}%"),
         )
     if cursor.rowcount:
+        try:
+            _rebuild_warning_progress(connection)
+        except sqlite3.OperationalError:
+            pass
         touch_runtime(connection)
     return int(cursor.rowcount or 0)
 
@@ -767,20 +1203,48 @@ def store_source_document(
     metadata: dict[str, Any],
 ) -> None:
     now = utc_now_iso()
+    spans = _line_spans(content)
+    sha256 = _content_sha256(content)
     connection.execute(
         """
-        INSERT INTO source_documents (doc_key, content, metadata_json, updated_at)
-        VALUES (?, ?, ?, ?)
+        INSERT INTO source_documents (doc_key, content, metadata_json, content_sha256, line_index, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?)
         ON CONFLICT(doc_key) DO UPDATE SET
             content = excluded.content,
             metadata_json = excluded.metadata_json,
+            content_sha256 = excluded.content_sha256,
+            line_index = excluded.line_index,
             updated_at = excluded.updated_at
         """,
-        (doc_key, content, _json_dump(metadata), now),
+        (doc_key, content, _json_dump(metadata), sha256, _encode_line_index(spans), now),
     )
+    _remember_source_lines(connection, doc_key, SourceLines(content, spans, sha256))
     touch_runtime(connection)
 
 
+def update_source_document_metadata(
+    connection: sqlite3.Connection,
+    *,
+    doc_key: str,
+    metadata: dict[str, Any],
+) -> None:
+    connection.execute(
+        "UPDATE source_documents SET metadata_json = ?, updated_at = ? WHERE doc_key = ?",
+        (_json_dump(metadata), utc_now_iso(), doc_key),
+    )
+    touch_runtime(connection)
+
+
+def fetch_source_document_metadata(connection: sqlite3.Connection, doc_key: str) -> dict[str, Any] | None:
+    row = connection.execute(
+        "SELECT metadata_json FROM source_documents WHERE doc_key = ?",
+        (doc_key,),
+    ).fetchone()
+    if row is None:
+        return None
+    return json.loads(str(row["metadata_json"]))
+
+
 def fetch_source_document(connection: sqlite3.Connection, doc_key: str) -> dict[str, Any] | None:
     row = connection.execute(
         "SELECT doc_key, content, metadata_json FROM source_documents WHERE doc_key = ?",
@@ -795,6 +1259,54 @@ def fetch_source_document(connection: sqlite3.Connection, doc_key: str) -> dict[
     }
 
 
+_SOURCE_LINES_MEMO: OrderedDict[tuple[str, str, str], SourceLines] = OrderedDict()
+
+
+def _database_file(connection: sqlite3.Connection) -> str:
+    for row in connection.execute("PRAGMA database_list").fetchall():
+        if str(row[1]) == "main":
+            return str(row[2] or "")
+    return ""
+
+
+def _remember_source_lines(connection: sqlite3.Connection, doc_key: str, source_lines: SourceLines) -> None:
+    database_file = _database_file(connection)
+    if not database_file:
+        return
+    key = (database_file, doc_key, source_lines.sha256)
+    _SOURCE_LINES_MEMO[key] = source_lines
+    _SOURCE_LINES_MEMO.move_to_end(key)
+    while len(_SOURCE_LINES_MEMO) > SOURCE_LINES_MEMO_SIZE:
+        _SOURCE_LINES_MEMO.popitem(last=False)
+
+
+def fetch_source_lines(connection: sqlite3.Connection, doc_key: str) -> SourceLines | None:
+    if "line_index" not in _table_columns(connection, "source_documents"):
+        source_doc = fetch_source_document(connection, doc_key)
+        return SourceLines(str(source_doc["content"])) if source_doc is not None else None
+    row = connection.execute(
+        "SELECT content_sha256 FROM source_documents WHERE doc_key = ?",
+        (doc_key,),
+    ).fetchone()
+    if row is None:
+        return None
+    database_file = _database_file(connection)
+    sha256 = str(row["content_sha256"] or "")
+    memoized = _SOURCE_LINES_MEMO.get((database_file, doc_key, sha256)) if sha256 else None
+    if memoized is not None:
+        _SOURCE_LINES_MEMO.move_to_end((database_file, doc_key, sha256))
+        return memoized
+    row = connection.execute(
+        "SELECT content, line_index FROM source_documents WHERE doc_key = ?",
+        (doc_key,),
+    ).fetchone()
+    content = str(row["content"])
+    spans = _decode_line_index(bytes(row["line_index"])) if row["line_index"] is not None and sha256 else None
+    source_lines = SourceLines(content, spans, sha256)
+    _remember_source_lines(connection, doc_key, source_lines)
+    return source_lines
+
+
 def store_source_identity(connection: sqlite3.Connection, identity: dict[str, Any] | None) -> None:
     connection.execute("DELETE FROM source_identity")
     if identity is not None:
@@ -839,15 +1351,12 @@ def fetch_source_identity(connection: sqlite3.Connection) -> dict[str, Any] | No
 
 
 def store_outline_nodes(connection: sqlite3.Connection, nodes: list[dict[str, Any]]) -> None:
-    connection.execute("DELETE FROM outline_nodes")
     now = utc_now_iso()
-    for position, node in enumerate(nodes, start=1):
-        connection.execute(
-            """
-            INSERT INTO outline_nodes (
-                node_id, heading_level, title, line_start, line_end, parent_node_id, position, metadata_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    _replace_table_rows(
+        connection,
+        "outline_nodes",
+        ("node_id", "heading_level", "title", "line_start", "line_end", "parent_node_id", "position", "metadata_json"),
+        [
             (
                 str(node["node_id"]),
                 int(node["heading_level"]),
@@ -857,8 +1366,10 @@ def store_outline_nodes(connection: sqlite3.Connection, nodes: list[dict[str, An
                 str(node["parent_node_id"]) if node.get("parent_node_id") is not None else None,
                 position,
                 _json_dump(dict(node.get("metadata", {}), updated_at=now)),
-            ),
-        )
+            )
+            for position, node in enumerate(nodes, start=1)
+        ],
+    )
     touch_runtime(connection)
 
 
@@ -941,17 +1452,16 @@ def fetch_digest_slots(connection: sqlite3.Connection) -> dict[str, dict[str, An
 
 
 def store_digest_section_summaries(connection: sqlite3.Connection, summaries: list[dict[str, Any]]) -> None:
-    connection.execute("DELETE FROM digest_section_summaries")
     now = utc_now_iso()
-    for index, summary in enumerate(summaries, start=1):
-        position = int(summary.get("position", index))
-        connection.execute(
-            """
-            INSERT INTO digest_section_summaries (position, source_heading, items_json, updated_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            (position, str(summary["source_heading"]), _json_dump(summary.get("items", [])), now),
-        )
+    _replace_table_rows(
+        connection,
+        "digest_section_summaries",
+        ("position", "source_heading", "items_json", "updated_at"),
+        [
+            (int(summary.get("position", index)), str(summary["source_heading"]), _json_dump(summary.get("items", [])), now)
+            for index, summary in enumerate(summaries, start=1)
+        ],
+    )
     touch_runtime(connection)
 
 
@@ -1015,23 +1525,30 @@ def fetch_literature_matching_metadata(connection: sqlite3.Connection) -> dict[s
     return obj if isinstance(obj, dict) else None
 
 
-def store_reference_entries(connection: sqlite3.Connection, entries: list[dict[str, Any]]) -> None:
-    connection.execute("DELETE FROM reference_entries")
+def store_reference_entries(
+    connection: sqlite3.Connection,
+    entries: list[dict[str, Any]],
+    *,
+    strategy: str | None = None,
+) -> None:
     now = utc_now_iso()
-    for entry in entries:
-        connection.execute(
-            """
-            INSERT INTO reference_entries (entry_index, raw, year, metadata_json, updated_at)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+    _replace_table_rows(
+        connection,
+        "reference_entries",
+        ("entry_index", "raw", "year", "metadata_json", "updated_at"),
+        [
             (
                 int(entry["entry_index"]),
                 str(entry["raw"]),
                 int(entry["year"]) if entry.get("year") is not None else None,
                 _json_dump(entry.get("metadata", {})),
                 now,
-            ),
-        )
+            )
+            for entry in entries
+        ],
+        key_columns=("entry_index",),
+        strategy=strategy,
+    )
     touch_runtime(connection)
 
 
@@ -1053,44 +1570,50 @@ def fetch_reference_entries(connection: sqlite3.Connection) -> list[dict[str, An
     return entries
 
 
-def store_reference_batch(
+def store_reference_batches(
     connection: sqlite3.Connection,
+    batches: list[dict[str, Any]],
     *,
-    batch_kind: str,
-    batch_index: int,
-    status: str,
-    entry_start: int,
-    entry_end: int,
-    metadata: dict[str, Any] | None = None,
+    strategy: str | None = None,
 ) -> None:
     now = utc_now_iso()
-    connection.execute(
-        """
-        INSERT INTO reference_batches (batch_kind, batch_index, status, entry_start, entry_end, metadata_json, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(batch_kind, batch_index) DO UPDATE SET
-            status = excluded.status,
-            entry_start = excluded.entry_start,
-            entry_end = excluded.entry_end,
-            metadata_json = excluded.metadata_json,
-            updated_at = excluded.updated_at
-        """,
-        (batch_kind, batch_index, status, entry_start, entry_end, _json_dump(metadata or {}), now),
+    _replace_table_rows(
+        connection,
+        "reference_batches",
+        ("batch_kind", "batch_index", "status", "entry_start", "entry_end", "metadata_json", "updated_at"),
+        [
+            (
+                str(batch["batch_kind"]),
+                int(batch["batch_index"]),
+                str(batch["status"]),
+                int(batch["entry_start"]),
+                int(batch["entry_end"]),
+                _json_dump(batch.get("metadata", {})),
+                now,
+            )
+            for batch in batches
+        ],
+        key_columns=("batch_kind", "batch_index"),
+        strategy=strategy,
     )
     touch_runtime(connection)
 
 
-def store_reference_parse_candidates(connection: sqlite3.Connection, candidates: list[dict[str, Any]]) -> None:
-    connection.execute("DELETE FROM reference_parse_candidates")
+def store_reference_parse_candidates(
+    connection: sqlite3.Connection,
+    candidates: list[dict[str, Any]],
+    *,
+    strategy: str | None = None,
+) -> None:
     now = utc_now_iso()
-    for candidate in candidates:
-        connection.execute(
-            """
-            INSERT INTO reference_parse_candidates (
-                entry_index, candidate_index, pattern, author_text, author_candidates_json,
-                title_candidate, container_candidate, year_candidate, confidence, metadata_json, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    _replace_table_rows(
+        connection,
+        "reference_parse_candidates",
+        (
+            "entry_index", "candidate_index", "pattern", "author_text", "author_candidates_json",
+            "title_candidate", "container_candidate", "year_candidate", "confidence", "metadata_json", "updated_at",
+        ),
+        [
             (
                 int(candidate["entry_index"]),
                 int(candidate["candidate_index"]),
@@ -1103,8 +1626,12 @@ def store_reference_parse_candidates(connection: sqlite3.Connection, candidates:
                 float(candidate.get("confidence", 0.0)),
                 _json_dump(candidate.get("metadata", {})),
                 now,
-            ),
-        )
+            )
+            for candidate in candidates
+        ],
+        key_columns=("entry_index", "candidate_index"),
+        strategy=strategy,
+    )
     touch_runtime(connection)
 
 
@@ -1149,86 +1676,91 @@ def store_reference_api_fetch(
     response: object,
     response_sha256: str,
     error: dict[str, Any] | None,
+    response_bytes: bytes | None = None,
+    candidates: list[dict[str, Any]] | None = None,
 ) -> None:
+    if response_bytes is None:
+        response_bytes = _json_dump(response).encode("utf-8")
     connection.execute(
         """
         INSERT INTO reference_api_fetches (
             canonical_identifier, provider, status, http_status, response_json,
-            response_sha256, error_json, fetched_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            response_sha256, error_json, fetched_at, response_blob, candidates_json
+        ) VALUES (?, ?, ?, ?, '', ?, ?, ?, ?, ?)
         ON CONFLICT(canonical_identifier, provider) DO UPDATE SET
             status = excluded.status,
             http_status = excluded.http_status,
             response_json = excluded.response_json,
             response_sha256 = excluded.response_sha256,
             error_json = excluded.error_json,
-            fetched_at = excluded.fetched_at
+            fetched_at = excluded.fetched_at,
+            response_blob = excluded.response_blob,
+            candidates_json = excluded.candidates_json
         """,
         (
             canonical_identifier,
             provider,
             status,
             http_status,
-            _json_dump(response),
             response_sha256,
             _json_dump(error or {}),
             utc_now_iso(),
+            zlib.compress(response_bytes, REFERENCE_API_RESPONSE_ZLIB_LEVEL),
+            json.dumps(candidates, ensure_ascii=False, separators=(",", ":")) if candidates is not None else None,
         ),
     )
     touch_runtime(connection)
 
 
+def _reference_api_fetch_from_row(row: sqlite3.Row, *, include_response: bool) -> dict[str, Any]:
+    candidates = json.loads(str(row["candidates_json"])) if row["candidates_json"] is not None else None
+    fetch: dict[str, Any] = {
+        "canonical_identifier": str(row["canonical_identifier"]),
+        "provider": str(row["provider"]),
+        "status": str(row["status"]),
+        "http_status": int(row["http_status"]) if row["http_status"] is not None else None,
+        "candidates": candidates,
+        "response_sha256": str(row["response_sha256"]),
+        "error": json.loads(str(row["error_json"])),
+        "fetched_at": str(row["fetched_at"]),
+    }
+    if include_response or candidates is None:
+        if row["response_blob"] is not None:
+            fetch["response"] = json.loads(zlib.decompress(bytes(row["response_blob"])).decode("utf-8"))
+        else:
+            fetch["response"] = json.loads(str(row["response_json"]))
+    return fetch
+
+
 def fetch_reference_api_fetch(
     connection: sqlite3.Connection,
     *,
     canonical_identifier: str,
     provider: str,
+    include_response: bool = True,
 ) -> dict[str, Any] | None:
     row = connection.execute(
-        """
-        SELECT canonical_identifier, provider, status, http_status, response_json,
-               response_sha256, error_json, fetched_at
+        f"""
+        SELECT canonical_identifier, provider, status, http_status, response_sha256, error_json, fetched_at,
+               candidates_json, {REFERENCE_API_RESPONSE_COLUMNS if include_response else REFERENCE_API_UNPARSED_RESPONSE_COLUMNS}
         FROM reference_api_fetches
         WHERE canonical_identifier = ? AND provider = ?
         """,
         (canonical_identifier, provider),
     ).fetchone()
-    if row is None:
-        return None
-    return {
-        "canonical_identifier": str(row["canonical_identifier"]),
-        "provider": str(row["provider"]),
-        "status": str(row["status"]),
-        "http_status": int(row["http_status"]) if row["http_status"] is not None else None,
-        "response": json.loads(str(row["response_json"])),
-        "response_sha256": str(row["response_sha256"]),
-        "error": json.loads(str(row["error_json"])),
-        "fetched_at": str(row["fetched_at"]),
-    }
+    return _reference_api_fetch_from_row(row, include_response=include_response) if row is not None else None
 
 
 def fetch_reference_api_fetches(connection: sqlite3.Connection) -> list[dict[str, Any]]:
     rows = connection.execute(
         """
-        SELECT canonical_identifier, provider, status, http_status, response_json,
-               response_sha256, error_json, fetched_at
+        SELECT canonical_identifier, provider, status, http_status, response_json, response_blob,
+               response_sha256, error_json, fetched_at, candidates_json
         FROM reference_api_fetches
         ORDER BY canonical_identifier, provider
         """
     ).fetchall()
-    return [
-        {
-            "canonical_identifier": str(row["canonical_identifier"]),
-            "provider": str(row["provider"]),
-            "status": str(row["status"]),
-            "http_status": int(row["http_status"]) if row["http_status"] is not None else None,
-            "response": json.loads(str(row["response_json"])),
-            "response_sha256": str(row["response_sha256"]),
-            "error": json.loads(str(row["error_json"])),
-            "fetched_at": str(row["fetched_at"]),
-        }
-        for row in rows
-    ]
+    return [_reference_api_fetch_from_row(row, include_response=True) for row in rows]
 
 
 def clear_reference_api_fetches(connection: sqlite3.Connection) -> None:
@@ -1237,16 +1769,15 @@ def clear_reference_api_fetches(connection: sqlite3.Connection) -> None:
 
 
 def store_reference_api_resolutions(connection: sqlite3.Connection, resolutions: list[dict[str, Any]]) -> None:
-    connection.execute("DELETE FROM reference_api_resolutions")
     now = utc_now_iso()
-    for resolution in resolutions:
-        connection.execute(
-            """
-            INSERT INTO reference_api_resolutions (
-                entry_index, status, reason, providers_json, provider_record_ids_json,
-                match_basis, match_score, item_json, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    _replace_table_rows(
+        connection,
+        "reference_api_resolutions",
+        (
+            "entry_index", "status", "reason", "providers_json", "provider_record_ids_json",
+            "match_basis", "match_score", "item_json", "updated_at",
+        ),
+        [
             (
                 int(resolution["entry_index"]),
                 str(resolution.get("status", "unresolved")),
@@ -1257,8 +1788,11 @@ def store_reference_api_resolutions(connection: sqlite3.Connection, resolutions:
                 float(resolution["match_score"]) if resolution.get("match_score") is not None else None,
                 _json_dump(resolution.get("item", {})),
                 now,
-            ),
-        )
+            )
+            for resolution in resolutions
+        ],
+        key_columns=("entry_index",),
+    )
     touch_runtime(connection)
 
 
@@ -1401,20 +1935,21 @@ def is_reference_extraction_abandoned(connection: sqlite3.Connection) -> bool:
     )
 
 
+def _reference_item_metadata(item: dict[str, Any]) -> dict[str, Any]:
+    metadata = dict(item.get("metadata", {})) if isinstance(item.get("metadata"), dict) else {}
+    for key, value in item.items():
+        if key not in {"ref_index", "author", "title", "year", "raw", "confidence", "metadata"}:
+            metadata[key] = value
+    return metadata
+
+
 def store_reference_items(connection: sqlite3.Connection, items: list[dict[str, Any]]) -> None:
-    connection.execute("DELETE FROM reference_items")
     now = utc_now_iso()
-    for item in items:
-        metadata = dict(item.get("metadata", {})) if isinstance(item.get("metadata"), dict) else {}
-        for key, value in item.items():
-            if key not in {"ref_index", "author", "title", "year", "raw", "confidence", "metadata"}:
-                metadata[key] = value
-        connection.execute(
-            """
-            INSERT INTO reference_items (
-                ref_index, author_json, title, year, raw, confidence, metadata_json, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    _replace_table_rows(
+        connection,
+        "reference_items",
+        ("ref_index", "author_json", "title", "year", "raw", "confidence", "metadata_json", "updated_at"),
+        [
             (
                 int(item["ref_index"]),
                 _json_dump(item.get("author", [])),
@@ -1422,10 +1957,13 @@ def store_reference_items(connection: sqlite3.Connection, items: list[dict[str,
                 int(item["year"]) if item.get("year") is not None else None,
                 str(item["raw"]),
                 float(item["confidence"]),
-                _json_dump(metadata),
+                _json_dump(_reference_item_metadata(item)),
                 now,
-            ),
-        )
+            )
+            for item in items
+        ],
+        key_columns=("ref_index",),
+    )
     touch_runtime(connection)
 
 
@@ -1451,16 +1989,15 @@ def fetch_reference_items(connection: sqlite3.Connection) -> list[dict[str, Any]
 
 
 def store_reference_metadata_enrichment_workset(connection: sqlite3.Connection, rows: list[dict[str, Any]]) -> None:
-    connection.execute("DELETE FROM reference_metadata_enrichment_workset")
     now = utc_now_iso()
-    for row in rows:
-        connection.execute(
-            """
-            INSERT INTO reference_metadata_enrichment_workset (
-                ref_index, locked_reference_json, existing_metadata_json, metadata_context_text,
-                allowed_fields_json, batch_index, status, evidence_note, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    _replace_table_rows(
+        connection,
+        "reference_metadata_enrichment_workset",
+        (
+            "ref_index", "locked_reference_json", "existing_metadata_json", "metadata_context_text",
+            "allowed_fields_json", "batch_index", "status", "evidence_note", "updated_at",
+        ),
+        [
             (
                 int(row["ref_index"]),
                 _json_dump(row.get("locked_reference", {})),
@@ -1471,8 +2008,11 @@ def store_reference_metadata_enrichment_workset(connection: sqlite3.Connection,
                 str(row.get("status", "pending")),
                 str(row.get("evidence_note", "")),
                 now,
-            ),
-        )
+            )
+            for row in rows
+        ],
+        key_columns=("ref_index",),
+    )
     touch_runtime(connection)
 
 
@@ -1524,16 +2064,15 @@ def update_reference_metadata_enrichment_statuses(connection: sqlite3.Connection
 
 
 def store_citation_mentions(connection: sqlite3.Connection, mentions: list[dict[str, Any]]) -> None:
-    connection.execute("DELETE FROM citation_mentions")
     now = utc_now_iso()
-    for mention in mentions:
-        connection.execute(
-            """
-            INSERT INTO citation_mentions (
-                mention_id, marker, style, line_start, line_end, snippet, ref_number_hint,
-                year_hint, surname_hint, batch_index, consumed_status, metadata_json, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    _replace_table_rows(
+        connection,
+        "citation_mentions",
+        (
+            "mention_id", "marker", "style", "line_start", "line_end", "snippet", "ref_number_hint",
+            "year_hint", "surname_hint", "batch_index", "consumed_status", "metadata_json", "updated_at",
+        ),
+        [
             (
                 str(mention["mention_id"]),
                 str(mention["marker"]),
@@ -1546,13 +2085,13 @@ def store_citation_mentions(connection: sqlite3.Connection, mentions: list[dict[
                 str(mention["surname_hint"]) if mention.get("surname_hint") is not None else None,
                 int(mention["batch_index"]) if mention.get("batch_index") is not None else None,
                 str(mention.get("consumed_status", "pending")),
-                _json_dump({k: v for k, v in mention.items() if k not in {
-                    "mention_id", "marker", "style", "line_start", "line_end", "snippet",
-                    "ref_number_hint", "year_hint", "surname_hint", "batch_index", "consumed_status"
-                }}),
+                _json_dump({k: v for k, v in mention.items() if k not in CITATION_MENTION_COLUMN_KEYS}),
                 now,
-            ),
-        )
+            )
+            for mention in mentions
+        ],
+        key_columns=("mention_id",),
+    )
     touch_runtime(connection)
 
 
@@ -1620,15 +2159,12 @@ def store_citation_batch(
 
 
 def store_citation_mention_links(connection: sqlite3.Connection, links: list[dict[str, Any]]) -> None:
-    connection.execute("DELETE FROM citation_mention_links")
     now = utc_now_iso()
-    for link in links:
-        connection.execute(
-            """
-            INSERT INTO citation_mention_links (
-                mention_id, ref_index, status, resolution_method, resolution_confidence, evidence_json, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+    _replace_table_rows(
+        connection,
+        "citation_mention_links",
+        ("mention_id", "ref_index", "status", "resolution_method", "resolution_confidence", "evidence_json", "updated_at"),
+        [
             (
                 str(link["mention_id"]),
                 int(link["ref_index"]) if link.get("ref_index") is not None else None,
@@ -1637,8 +2173,11 @@ def store_citation_mention_links(connection: sqlite3.Connection, links: list[dic
                 float(link["resolution_confidence"]) if link.get("resolution_confidence") is not None else None,
                 _json_dump(dict(link.get("evidence", {}))),
                 now,
-            ),
-        )
+            )
+            for link in links
+        ],
+        key_columns=("mention_id",),
+    )
     touch_runtime(connection)
 
 
@@ -1666,14 +2205,14 @@ def fetch_citation_mention_links(connection: sqlite3.Connection) -> list[dict[st
 def replace_reference_quality_issues(connection: sqlite3.Connection, issues: list[dict[str, Any]]) -> None:
     resolve_reference_quality_issues(connection)
     now = utc_now_iso()
-    for issue in issues:
-        connection.execute(
-            """
-            INSERT INTO reference_quality_issues (
-                entry_index, ref_index, severity, reason_code, field, current_value,
-                raw_excerpt, recommendation, status, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'active', ?)
-            """,
+    connection.executemany(
+        """
+        INSERT INTO reference_quality_issues (
+            entry_index, ref_index, severity, reason_code, field, current_value,
+            raw_excerpt, recommendation, status, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'active', ?)
+        """,
+        [
             (
                 int(issue["entry_index"]),
                 int(issue["ref_index"]) if issue.get("ref_index") is not None else None,
@@ -1684,8 +2223,10 @@ def replace_reference_quality_issues(connection: sqlite3.Connection, issues: lis
                 str(issue.get("raw_excerpt", "")),
                 str(issue.get("recommendation", "")),
                 now,
-            ),
-        )
+            )
+            for issue in issues
+        ],
+    )
     touch_runtime(connection)
 
 
@@ -1751,16 +2292,15 @@ def resolve_reference_quality_issues(
 
 
 def store_citation_workset_items(connection: sqlite3.Connection, items: list[dict[str, Any]]) -> None:
-    connection.execute("DELETE FROM citation_workset_items")
     now = utc_now_iso()
-    for item in items:
-        connection.execute(
-            """
-            INSERT INTO citation_workset_items (
-                ref_index, ref_number, mention_count, mentions_json, reference_snapshot_json,
-                batch_hint, workset_metadata_json, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    _replace_table_rows(
+        connection,
+        "citation_workset_items",
+        (
+            "ref_index", "ref_number", "mention_count", "mentions_json", "reference_snapshot_json",
+            "batch_hint", "workset_metadata_json", "updated_at",
+        ),
+        [
             (
                 int(item["ref_index"]),
                 int(item["ref_number"]) if item.get("ref_number") is not None else None,
@@ -1770,8 +2310,11 @@ def store_citation_workset_items(connection: sqlite3.Connection, items: list[dic
                 int(item["batch_hint"]) if item.get("batch_hint") is not None else None,
                 _json_dump(dict(item.get("metadata", {}))),
                 now,
-            ),
-        )
+            )
+            for item in items
+        ],
+        key_columns=("ref_index",),
+    )
     touch_runtime(connection)
 
 
@@ -1801,26 +2344,24 @@ def fetch_citation_workset_items(connection: sqlite3.Connection) -> list[dict[st
 
 
 def store_citation_items(connection: sqlite3.Connection, items: list[dict[str, Any]]) -> None:
-    connection.execute("DELETE FROM citation_items")
     now = utc_now_iso()
-    for item in items:
-        connection.execute(
-            """
-            INSERT INTO citation_items (
-                ref_index, function, summary, confidence, metadata_json, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?)
-            """,
+    _replace_table_rows(
+        connection,
+        "citation_items",
+        ("ref_index", "function", "summary", "confidence", "metadata_json", "updated_at"),
+        [
             (
                 int(item["ref_index"]),
                 str(item["function"]),
                 str(item["summary"]),
                 float(item["confidence"]),
-                _json_dump({k: v for k, v in item.items() if k not in {
-                    "ref_index", "function", "summary", "confidence"
-                }}),
+                _json_dump({k: v for k, v in item.items() if k not in {"ref_index", "function", "summary", "confidence"}}),
                 now,
-            ),
-        )
+            )
+            for item in items
+        ],
+        key_columns=("ref_index",),
+    )
     touch_runtime(connection)
 
 
@@ -1844,22 +2385,23 @@ def fetch_citation_items(connection: sqlite3.Connection) -> list[dict[str, Any]]
 
 
 def store_citation_unmapped_mentions(connection: sqlite3.Connection, mentions: list[dict[str, Any]]) -> None:
-    connection.execute("DELETE FROM citation_unmapped_mentions")
     now = utc_now_iso()
-    for mention in mentions:
-        connection.execute(
-            """
-            INSERT INTO citation_unmapped_mentions (mention_id, mention_json, reason, batch_index, updated_at)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+    _replace_table_rows(
+        connection,
+        "citation_unmapped_mentions",
+        ("mention_id", "mention_json", "reason", "batch_index", "updated_at"),
+        [
             (
                 str(mention["mention_id"]),
                 _json_dump(mention),
                 str(mention.get("reason", "")),
                 int(mention["batch_index"]) if mention.get("batch_index") is not None else None,
                 now,
-            ),
-        )
+            )
+            for mention in mentions
+        ],
+        key_columns=("mention_id",),
+    )
     touch_runtime(connection)
 
 
@@ -2375,5 +2917,83 @@ def build_public_output_payload(connection: sqlite3.Connection) -> dict[str, Any
     return payload
 
 
+def store_stage_timings(
+    connection: sqlite3.Connection,
+    *,
+    run_id: str,
+    spans: list[dict[str, Any]],
+    max_runs: int = STAGE_TIMINGS_MAX_RUNS,
+) -> None:
+    connection.executemany(
+        """
+        INSERT INTO stage_timings (
+            run_id, span_index, parent_index, name, category, thread_id, start_unix_ms, wall_ms, cpu_ms,
+            peak_rss_delta_kb, row_deltas_json, detail_json, status
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                run_id,
+                int(span["span_index"]),
+                int(span["parent_index"]) if span.get("parent_index") is not None else None,
+                str(span["name"]),
+                str(span["category"]),
+                int(span["thread_id"]),
+                float(span["start_unix_ms"]),
+                float(span["wall_ms"]),
+                float(span["cpu_ms"]),
+                int(span["peak_rss_delta_kb"]) if span.get("peak_rss_delta_kb") is not None else None,
+                _json_dump(span.get("row_deltas", {})),
+                _json_dump(span.get("detail", {})),
+                str(span["status"]),
+            )
+            for span in spans
+        ],
+    )
+    connection.execute(
+        """
+        DELETE FROM stage_timings
+        WHERE run_id NOT IN (
+            SELECT run_id FROM stage_timings
+            WHERE parent_index IS NULL
+            ORDER BY start_unix_ms DESC, run_id DESC
+            LIMIT ?
+        )
+        """,
+        (max(max_runs, 1),),
+    )
+
+
+def fetch_stage_timings(connection: sqlite3.Connection, run_id: str | None = None) -> list[dict[str, Any]]:
+    sql = """
+        SELECT run_id, span_index, parent_index, name, category, thread_id, start_unix_ms, wall_ms, cpu_ms,
+               peak_rss_delta_kb, row_deltas_json, detail_json, status
+        FROM stage_timings
+    """
+    params: list[str] = []
+    if run_id is not None:
+        sql += " WHERE run_id = ?"
+        params.append(run_id)
+    sql += " ORDER BY start_unix_ms ASC, run_id ASC, span_index ASC"
+    return [
+        {
+            "run_id": str(row["run_id"]),
+            "span_index": int(row["span_index"]),
+            "parent_index": int(row["parent_index"]) if row["parent_index"] is not None else None,
+            "name": str(row["name"]),
+            "category": str(row["category"]),
+            "thread_id": int(row["thread_id"]),
+            "start_unix_ms": float(row["start_unix_ms"]),
+            "wall_ms": float(row["wall_ms"]),
+            "cpu_ms": float(row["cpu_ms"]),
+            "peak_rss_delta_kb": int(row["peak_rss_delta_kb"]) if row["peak_rss_delta_kb"] is not None else None,
+            "row_deltas": json.loads(str(row["row_deltas_json"])),
+            "detail": json.loads(str(row["detail_json"])),
+            "status": str(row["status"]),
+        }
+        for row in connection.execute(sql, params).fetchall()
+    ]
+
+
 def touch_runtime(connection: sqlite3.Connection) -> None:
     connection.execute("UPDATE runtime_run SET updated_at = ? WHERE id = 1", (utc_now_iso(),))
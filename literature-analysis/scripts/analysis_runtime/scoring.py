@@ -4,14 +4,16 @@ import hashlib
 import json
 import re
 import unicodedata
+from bisect import bisect_right
 from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from decimal import Decimal, ROUND_HALF_UP
 from pathlib import Path
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader, StrictUndefined
-from jsonschema import validate
-
+from . import profiling
+from . import render_engine
 from . import runtime_db
 
 
@@ -228,6 +230,7 @@ def scoring_contract(connection: Any, db_path: Path) -> dict[str, Any]:
     }
 
 
+@profiling.timed("scoring.prepare_scoring_context", category="scoring")
 def prepare_scoring_context(db_path: Path) -> tuple[dict[str, Any], int]:
     try:
         with runtime_db.connect_db(db_path) as connection:
@@ -298,40 +301,145 @@ def _ngram_similarity(left: str, right: str, size: int) -> float:
     return (2.0 * overlap) / denominator
 
 
-def _source_windows(source_lines: list[str]) -> list[tuple[int, int, str]]:
-    windows: list[tuple[int, int, str]] = []
-    for start in range(len(source_lines)):
-        for width in range(1, min(5, len(source_lines) - start) + 1):
-            normalized = _normalize_match_text("\n".join(source_lines[start : start + width]))
-            if normalized:
-                windows.append((start + 1, start + width, normalized))
-    return windows
+@dataclass
+class EvidenceQuoteIndex:
+    line_count: int
+    normalized_lines: list[str]
+    joined_text: str
+    joined_line_starts: list[int]
+    joined_line_numbers: list[int]
+    char_prefix: list[int]
+    nonempty_prefix: list[int]
+    windows: list[tuple[int, int]]
+    line_grams: dict[int, list[Counter[str]]] = field(default_factory=dict)
+    postings: dict[int, dict[str, list[tuple[int, int]]]] = field(default_factory=dict)
+    gram_prefix: dict[int, list[int]] = field(default_factory=dict)
+
+
+def build_evidence_quote_index(source_lines: Sequence[str]) -> EvidenceQuoteIndex:
+    normalized_lines = [_normalize_match_text(line) for line in source_lines]
+    joined_parts: list[str] = []
+    joined_line_starts: list[int] = []
+    joined_line_numbers: list[int] = []
+    char_prefix = [0]
+    nonempty_prefix = [0]
+    offset = 0
+    for line_number, normalized in enumerate(normalized_lines, start=1):
+        if normalized:
+            if joined_parts:
+                offset += 1
+            joined_line_starts.append(offset)
+            joined_line_numbers.append(line_number)
+            joined_parts.append(normalized)
+            offset += len(normalized)
+        char_prefix.append(char_prefix[-1] + len(normalized))
+        nonempty_prefix.append(nonempty_prefix[-1] + (1 if normalized else 0))
+    line_count = len(source_lines)
+    windows = [
+        (start, start + width - 1)
+        for start in range(1, line_count + 1)
+        for width in range(1, min(5, line_count - start + 1) + 1)
+        if nonempty_prefix[start + width - 1] > nonempty_prefix[start - 1]
+    ]
+    return EvidenceQuoteIndex(
+        line_count=line_count,
+        normalized_lines=normalized_lines,
+        joined_text=" ".join(joined_parts),
+        joined_line_starts=joined_line_starts,
+        joined_line_numbers=joined_line_numbers,
+        char_prefix=char_prefix,
+        nonempty_prefix=nonempty_prefix,
+        windows=windows,
+    )
+
+
+def _index_ngrams(index: EvidenceQuoteIndex, size: int) -> None:
+    if size in index.line_grams:
+        return
+    line_grams = [_ngrams(line, size) for line in index.normalized_lines]
+    postings: dict[str, list[tuple[int, int]]] = {}
+    gram_prefix = [0]
+    for line_index, grams in enumerate(line_grams):
+        for gram, count in grams.items():
+            postings.setdefault(gram, []).append((line_index, count))
+        gram_prefix.append(gram_prefix[-1] + sum(grams.values()))
+    index.line_grams[size] = line_grams
+    index.postings[size] = postings
+    index.gram_prefix[size] = gram_prefix
+
+
+def _window_text(index: EvidenceQuoteIndex, line_start: int, line_end: int) -> str:
+    return " ".join(line for line in index.normalized_lines[line_start - 1 : line_end] if line)
 
 
-def _locate_evidence_quote(quote: str, source_lines: list[str]) -> tuple[dict[str, Any] | None, dict[str, Any]]:
+def _exact_quote_range(normalized_quote: str, index: EvidenceQuoteIndex) -> tuple[int, int] | None:
+    if not normalized_quote:
+        return None
+    best: tuple[int, int] | None = None
+    position = index.joined_text.find(normalized_quote)
+    while position >= 0:
+        first = bisect_right(index.joined_line_starts, position) - 1
+        last = bisect_right(index.joined_line_starts, position + len(normalized_quote) - 1) - 1
+        line_start = index.joined_line_numbers[first]
+        line_end = index.joined_line_numbers[last]
+        if line_end - line_start < 5 and (
+            best is None or (line_end - line_start, line_start, line_end) < (best[1] - best[0], best[0], best[1])
+        ):
+            best = (line_start, line_end)
+        position = index.joined_text.find(normalized_quote, position + 1)
+    return best
+
+
+def _locate_evidence_quote(quote: str, index: EvidenceQuoteIndex) -> tuple[dict[str, Any] | None, dict[str, Any]]:
     normalized_quote = _normalize_match_text(quote)
-    windows = _source_windows(source_lines)
-    exact_matches = [
-        (line_start, line_end)
-        for line_start, line_end, normalized_window in windows
-        if normalized_quote and normalized_quote in normalized_window
-    ]
-    if exact_matches:
-        line_start, line_end = min(exact_matches, key=lambda item: (item[1] - item[0], item[0], item[1]))
+    exact_range = _exact_quote_range(normalized_quote, index)
+    if exact_range is not None:
+        line_start, line_end = exact_range
         return {"line_start": line_start, "line_end": line_end, "quote": quote.strip()}, {
             "best_similarity": 1.0,
             "candidate_line_start": line_start,
             "candidate_line_end": line_end,
         }
-    if len(normalized_quote) < 8 or not windows:
+    if len(normalized_quote) < 8 or not index.windows:
         return None, {"best_similarity": 0.0, "candidate_line_start": None, "candidate_line_end": None}
     ngram_size = 2 if len(normalized_quote) <= 11 else 3
+    _index_ngrams(index, ngram_size)
+    quote_grams = _ngrams(normalized_quote, ngram_size)
+    quote_total = sum(quote_grams.values())
+    line_overlap = [0] * (index.line_count + 1)
+    postings = index.postings[ngram_size]
+    for gram, quote_count in quote_grams.items():
+        for line_index, line_count in postings.get(gram, ()):
+            line_overlap[line_index + 1] += min(quote_count, line_count)
+    overlap_prefix = [0]
+    for value in line_overlap[1:]:
+        overlap_prefix.append(overlap_prefix[-1] + value)
+    gram_prefix = index.gram_prefix[ngram_size]
+
+    bounded: list[tuple[float, int, int, int]] = []
+    for order, (line_start, line_end) in enumerate(index.windows):
+        nonempty = index.nonempty_prefix[line_end] - index.nonempty_prefix[line_start - 1]
+        window_chars = index.char_prefix[line_end] - index.char_prefix[line_start - 1] + nonempty - 1
+        window_total = max(window_chars - ngram_size + 1, 0)
+        line_total = gram_prefix[line_end] - gram_prefix[line_start - 1]
+        overlap_bound = min(
+            overlap_prefix[line_end] - overlap_prefix[line_start - 1] + window_total - line_total,
+            quote_total,
+            window_total,
+        )
+        bounded.append(((2.0 * overlap_bound) / (quote_total + window_total), order, line_start, line_end))
+    bounded.sort(key=lambda item: (-item[0], item[1]))
+
     best_similarity = -1.0
+    best_order = -1
     best_range: tuple[int, int] | None = None
-    for line_start, line_end, normalized_window in windows:
-        similarity = _ngram_similarity(normalized_quote, normalized_window, ngram_size)
-        if similarity > best_similarity:
+    for bound, order, line_start, line_end in bounded:
+        if bound < best_similarity:
+            break
+        similarity = _ngram_similarity(normalized_quote, _window_text(index, line_start, line_end), ngram_size)
+        if similarity > best_similarity or (similarity == best_similarity and order < best_order):
             best_similarity = similarity
+            best_order = order
             best_range = (line_start, line_end)
     assert best_range is not None
     match_details = {
@@ -347,7 +455,7 @@ def _locate_evidence_quote(quote: str, source_lines: list[str]) -> tuple[dict[st
 def _validate_derived_evidence(
     evidence: object,
     *,
-    source_lines: list[str],
+    source_lines: Sequence[str],
     context: str,
     errors: list[dict[str, Any]],
 ) -> list[dict[str, Any]]:
@@ -429,7 +537,7 @@ def _review_to_score_payload(
     payload: dict[str, Any],
     *,
     original: dict[str, Any],
-    source_text: str,
+    source_lines: Sequence[str],
 ) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
     errors: list[dict[str, Any]] = []
     top_fields = {"form_id", "paper_type_choices", "paper_type_reason", "dimension_reviews", "criterion_reviews"}
@@ -495,7 +603,7 @@ def _review_to_score_payload(
         str(item["dimension_key"]): [] for item in original["dimension_reviews"]
     }
     applicable_by_dimension = {key: False for key in converted_by_dimension}
-    source_lines = source_text.splitlines()
+    quote_index = build_evidence_quote_index(source_lines)
     if not isinstance(criteria_value, list):
         errors.append(_review_error("incomplete_answer", "criterion_reviews", "must be an array"))
     elif len(criteria_value) != len(original_criteria):
@@ -581,7 +689,7 @@ def _review_to_score_payload(
                             )
                         )
                         continue
-                    located, match_details = _locate_evidence_quote(quote, source_lines)
+                    located, match_details = _locate_evidence_quote(quote, quote_index)
                     if located is None:
                         errors.append(
                             _review_error(
@@ -687,7 +795,7 @@ def _normalize_score_payload(
     payload: dict[str, Any],
     *,
     rubric: dict[str, Any],
-    source_text: str,
+    source_lines: Sequence[str],
 ) -> tuple[dict[str, Any] | None, list[dict[str, Any]], list[str]]:
     errors: list[dict[str, Any]] = []
     warnings: list[str] = []
@@ -733,7 +841,6 @@ def _normalize_score_payload(
     if missing_dimensions:
         errors.append({"field": "dimension_reviews", "message": f"missing dimension keys: {missing_dimensions}"})
 
-    source_lines = source_text.splitlines()
     normalized_dimensions: list[dict[str, Any]] = []
     for dimension_spec in rubric.get("dimensions", []):
         dimension_key = str(dimension_spec["dimension_key"])
@@ -914,20 +1021,14 @@ def _render_score_with_connection(connection: Any) -> Path:
     if score is None:
         raise ValueError("literature score state is missing")
     context = {"literature_score": score}
-    schema = _json_read(RENDER_SCHEMA_PATH)
-    validate(instance=context, schema=schema)
-    template_path = _template_path(inputs)
-    env = Environment(
-        loader=FileSystemLoader(str(template_path.parent)),
-        autoescape=False,
-        trim_blocks=False,
-        lstrip_blocks=False,
-        undefined=StrictUndefined,
+    render_engine.validate(context, RENDER_SCHEMA_PATH)
+    rendered = render_engine.render(
+        _template_path(inputs),
+        context,
+        bytecode_cache_dir=inputs.get("template_bytecode_cache_dir", ""),
     )
-    env.filters["to_pretty_json"] = lambda value: json.dumps(value, ensure_ascii=False, indent=2)
-    rendered = env.get_template(template_path.name).render(**context)
     rendered_value = json.loads(rendered)
-    validate(instance={"literature_score": rendered_value}, schema=schema)
+    render_engine.validate({"literature_score": rendered_value}, RENDER_SCHEMA_PATH)
     output_dir = Path(inputs.get("output_dir", ".")).expanduser().resolve()
     output_path = (output_dir / SCORE_FILENAME).resolve()
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -953,6 +1054,7 @@ def render_score_artifact(db_path: Path) -> tuple[dict[str, Any], int]:
         return {"literature_score_path": "", "error": {"code": "score_render_failed", "message": str(exc)}}, 2
 
 
+@profiling.timed("scoring.render_score_only_outputs", category="scoring")
 def render_score_only_outputs(db_path: Path) -> tuple[dict[str, Any], int]:
     try:
         with runtime_db.connect_db(db_path) as connection:
@@ -1013,11 +1115,12 @@ def render_score_only_outputs(db_path: Path) -> tuple[dict[str, Any], int]:
         return payload, 2
 
 
+@profiling.timed("scoring.persist_literature_score", category="scoring")
 def persist_literature_score(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
     with runtime_db.connect_db(db_path) as connection:
         inputs = runtime_db.fetch_runtime_inputs(connection)
-        source_doc = runtime_db.fetch_source_document(connection, "normalized_source")
-        if source_doc is None:
+        source_lines = runtime_db.fetch_source_lines(connection, "normalized_source")
+        if source_lines is None:
             return {
                 "next_action": "persist_literature_score",
                 "error": {"code": "score_prerequisite_missing", "message": "normalized source is missing"},
@@ -1031,7 +1134,7 @@ def persist_literature_score(db_path: Path, payload: dict[str, Any]) -> tuple[di
                 }, 2
         try:
             rubric = _json_read(_rubric_path(inputs))
-            expected_form = _review_form(str(source_doc["content"]), rubric)
+            expected_form = _review_form(source_lines.content, rubric)
         except (OSError, ValueError, json.JSONDecodeError) as exc:
             return {
                 "next_action": "persist_literature_score",
@@ -1084,7 +1187,7 @@ def persist_literature_score(db_path: Path, payload: dict[str, Any]) -> tuple[di
                     converted_payload, conversion_errors = _review_to_score_payload(
                         payload,
                         original=original_form,
-                        source_text=str(source_doc["content"]),
+                        source_lines=source_lines,
                     )
                     review_errors.extend(conversion_errors)
         if review_errors:
@@ -1102,7 +1205,7 @@ def persist_literature_score(db_path: Path, payload: dict[str, Any]) -> tuple[di
         score, errors, warnings = _normalize_score_payload(
             converted_payload,
             rubric=rubric,
-            source_text=str(source_doc["content"]),
+            source_lines=source_lines,
         )
         if errors or score is None:
             runtime_db.set_runtime_error(connection, "score_review_invalid", "scoring review form failed normalization", "stage_4_scoring")
@@ -1165,7 +1268,7 @@ def persist_literature_score(db_path: Path, payload: dict[str, Any]) -> tuple[di
 def validate_public_score(path: Path) -> list[str]:
     try:
         payload = json.loads(path.read_text(encoding="utf-8"))
-        validate(instance={"literature_score": payload}, schema=_json_read(RENDER_SCHEMA_PATH))
+        render_engine.validate({"literature_score": payload}, RENDER_SCHEMA_PATH)
     except Exception as exc:  # noqa: BLE001
         return [f"literature_score_path unreadable or invalid: {exc}"]
     return []
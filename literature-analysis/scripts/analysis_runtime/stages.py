@@ -4,12 +4,15 @@ from pathlib import Path
 from typing import Any
 
 from . import deterministic_core
+from . import profiling
+from . import runtime
 from . import runtime_db
 from . import scoring
 from .algorithm_adapter import call_algorithm_handler
 from .runtime import AnalysisRuntimePaths
 
 
+@profiling.timed("stages.normalize_source")
 def normalize_source(
     *,
     source_path: Path,
@@ -33,15 +36,114 @@ def normalize_source(
     )
 
 
+@profiling.timed("stages.init_runtime")
+def init_runtime(
+    *,
+    working_dir: Path,
+    db_path: Path,
+    output_dir: Path,
+    source_path: Path,
+    language: str,
+    model: str,
+    score_only: bool = False,
+    identifier: str = "",
+    reference_api_cache_dir: str = "",
+    reference_api_cache_ttl_seconds: float | None = None,
+    reference_api_cache_max_bytes: int | None = None,
+    reference_api_concurrent: bool = False,
+    reference_api_deadline_seconds: float | None = None,
+    reference_api_replay: str = "",
+    reference_api_record_dir: str = "",
+    sqlite_profile: str = "default",
+    db_write_strategy: str = "replace",
+    citation_full_document: bool = False,
+    conversion_cache: bool = True,
+    conversion_cache_dir: str = "",
+    conversion_cache_max_bytes: int | None = None,
+    pdf_extract_workers: int = 1,
+    template_bytecode_cache_dir: str = "",
+    reference_candidate_cache: bool = True,
+    reference_candidate_cache_dir: str = "",
+    reference_store_path: str = "",
+    stage_timings: bool = False,
+) -> tuple[dict[str, Any], int]:
+    runtime_paths = runtime.initialize_runtime(
+        working_dir=working_dir,
+        db_path=db_path,
+        output_dir=output_dir,
+        source_path=source_path,
+        language=language or "zh-CN",
+        model=model or "",
+        score_only=score_only,
+        identifier=identifier,
+        reference_api_cache_dir=reference_api_cache_dir,
+        reference_api_cache_ttl_seconds=reference_api_cache_ttl_seconds,
+        reference_api_cache_max_bytes=reference_api_cache_max_bytes,
+        reference_api_concurrent=reference_api_concurrent,
+        reference_api_deadline_seconds=reference_api_deadline_seconds,
+        reference_api_replay=reference_api_replay,
+        reference_api_record_dir=reference_api_record_dir,
+        sqlite_profile=sqlite_profile,
+        db_write_strategy=db_write_strategy,
+        citation_full_document=citation_full_document,
+        conversion_cache=conversion_cache,
+        conversion_cache_dir=conversion_cache_dir,
+        conversion_cache_max_bytes=conversion_cache_max_bytes,
+        pdf_extract_workers=pdf_extract_workers,
+        template_bytecode_cache_dir=template_bytecode_cache_dir,
+        reference_candidate_cache=reference_candidate_cache,
+        reference_candidate_cache_dir=reference_candidate_cache_dir,
+        reference_store_path=reference_store_path,
+        stage_timings=stage_timings,
+    )
+    runtime.persist_default_templates(db_path=db_path, runtime_paths=runtime_paths, language=language or "zh-CN")
+    normalize_payload, code = normalize_source(
+        source_path=source_path,
+        db_path=db_path,
+        runtime_paths=runtime_paths,
+        language=language or "zh-CN",
+        model=model or "",
+    )
+    if code != 0:
+        return {
+            "db_path": str(db_path),
+            "next_action": "init_runtime",
+            "runtime_backend": "analysis_runtime.stages",
+            "error": normalize_payload.get("error") or {"code": "init_runtime_failed", "message": "source normalization failed"},
+        }, code
+
+    next_action = "persist_literature_score" if score_only else "persist_analysis_plan"
+    if score_only:
+        with runtime_db.connect_db(db_path) as connection:
+            runtime_db.set_workflow_state(
+                connection,
+                current_stage="stage_4_scoring",
+                current_substep="persist_literature_score",
+                stage_gate="ready",
+                next_action="persist_literature_score",
+                status_summary="normalized source ready for score-only analysis",
+            )
+            connection.commit()
+    return {
+        "db_path": str(db_path),
+        "working_dir": str(working_dir),
+        "output_dir": str(output_dir),
+        "source_profile": runtime.source_profile(db_path),
+        "runtime_backend": "analysis_runtime.stages",
+        "next_action": next_action,
+        "error": None,
+    }, 0
+
+
 def persist_analysis_plan(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
-    result, code = call_algorithm_handler("_handle_persist_outline_and_scopes", db_path, payload=payload)
+    result, code = call_algorithm_handler("persist_outline_and_scopes", db_path, payload=payload)
     if code == 0:
         result.update({"db_path": str(db_path), "runtime_backend": "analysis_runtime.stages", "next_action": "persist_digest"})
     return result, code
 
 
 def persist_digest(db_path: Path, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
-    result, code = call_algorithm_handler("_handle_persist_digest", db_path, payload=payload)
+    result, code = call_algorithm_handler("persist_digest", db_path, payload=payload)
     if code == 0:
         result.update({"db_path": str(db_path), "runtime_backend": "analysis_runtime.stages", "next_action": "persist_literature_score"})
     return result, code
@@ -62,12 +164,4 @@ def render_public_outputs(db_path: Path) -> tuple[dict[str, Any], int]:
         score_only = runtime_db.is_score_only(connection)
     if score_only:
         return scoring.render_score_only_outputs(db_path)
-    return call_algorithm_handler(
-        "_handle_render_and_validate",
-        db_path,
-        mode="render",
-        source_path="",
-        preprocess_artifact="",
-        in_path="",
-        out_dir="",
-    )
+    return call_algorithm_handler("render_outputs", db_path)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sqlite3
 import sys
 from pathlib import Path
@@ -11,12 +12,7 @@ SCRIPT_DIR = Path(__file__).resolve().parent
 if str(SCRIPT_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPT_DIR))
 
-from analysis_runtime import citations
-from analysis_runtime import gate_contract
-from analysis_runtime import references
-from analysis_runtime import runtime
 from analysis_runtime import runtime_db
-from analysis_runtime import stages
 
 if hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(encoding="utf-8")
@@ -113,11 +109,12 @@ def _reject_score_only(db_path: Path, requested_action: str) -> tuple[dict[str,
 
 
 def handle_init_runtime(args: argparse.Namespace) -> int:
+    from analysis_runtime import runtime, stages  # noqa: PLC0415
     working_dir = Path(args.working_dir).expanduser().resolve() if args.working_dir else Path.cwd().resolve()
     db_path = Path(args.db_path).expanduser().resolve() if args.db_path else runtime.default_db_path(working_dir)
     output_dir = Path(args.output_dir).expanduser().resolve() if args.output_dir else working_dir
     source_path = Path(args.source_path).expanduser().resolve()
-    runtime_paths = runtime.initialize_runtime(
+    result, code = stages.init_runtime(
         working_dir=working_dir,
         db_path=db_path,
         output_dir=output_dir,
@@ -126,53 +123,38 @@ def handle_init_runtime(args: argparse.Namespace) -> int:
         model=args.model or "",
         score_only=bool(args.score_only),
         identifier=args.identifier or "",
+        reference_api_cache_dir=args.reference_api_cache_dir or "",
+        reference_api_cache_ttl_seconds=(
+            args.reference_api_cache_ttl_hours * 3600 if args.reference_api_cache_ttl_hours is not None else None
+        ),
+        reference_api_cache_max_bytes=(
+            int(args.reference_api_cache_max_mb * 1024 * 1024) if args.reference_api_cache_max_mb is not None else None
+        ),
+        reference_api_concurrent=bool(args.reference_api_concurrent),
+        reference_api_deadline_seconds=args.reference_api_deadline_seconds,
+        reference_api_replay=args.reference_api_replay or "",
+        reference_api_record_dir=args.reference_api_record or "",
+        sqlite_profile=args.sqlite_profile,
+        db_write_strategy=args.db_write_strategy,
+        citation_full_document=bool(args.citation_full_document),
+        conversion_cache=not args.no_conversion_cache,
+        conversion_cache_dir=args.conversion_cache_dir or "",
+        conversion_cache_max_bytes=(
+            int(args.conversion_cache_max_mb * 1024 * 1024) if args.conversion_cache_max_mb is not None else None
+        ),
+        pdf_extract_workers=args.pdf_extract_workers,
+        template_bytecode_cache_dir=args.template_bytecode_cache_dir or "",
+        reference_candidate_cache=not args.no_reference_candidate_cache,
+        reference_candidate_cache_dir=args.reference_candidate_cache_dir or "",
+        reference_store_path=args.reference_store or "",
+        stage_timings=bool(args.stage_timings),
     )
-    runtime.persist_default_templates(db_path=db_path, runtime_paths=runtime_paths, language=args.language or "zh-CN")
-    normalize_payload, code = stages.normalize_source(
-        source_path=source_path,
-        db_path=db_path,
-        runtime_paths=runtime_paths,
-        language=args.language or "zh-CN",
-        model=args.model or "",
-    )
-    if code != 0:
-        _print(
-            {
-                "db_path": str(db_path),
-                "next_action": "init_runtime",
-                "runtime_backend": "analysis_runtime.stages",
-                "error": normalize_payload.get("error") or {"code": "init_runtime_failed", "message": "source normalization failed"},
-            }
-        )
-        return code
-
-    next_action = "persist_literature_score" if args.score_only else "persist_analysis_plan"
-    if args.score_only:
-        with runtime_db.connect_db(db_path) as connection:
-            runtime_db.set_workflow_state(
-                connection,
-                current_stage="stage_4_scoring",
-                current_substep="persist_literature_score",
-                stage_gate="ready",
-                next_action="persist_literature_score",
-                status_summary="normalized source ready for score-only analysis",
-            )
-            connection.commit()
-    _print(
-        {
-            "db_path": str(db_path),
-            "working_dir": str(working_dir),
-            "output_dir": str(output_dir),
-            "source_profile": runtime.source_profile(db_path),
-            "runtime_backend": "analysis_runtime.stages",
-            "next_action": next_action,
-            "error": None,
-        }
-    )
-    return 0
+    _print(result)
+    return code
 
 
 def handle_persist_analysis_plan(args: argparse.Namespace) -> int:
+    from analysis_runtime import stages  # noqa: PLC0415
     db_path = Path(args.db_path).expanduser().resolve()
     rejection, code = _reject_score_only(db_path, "persist_analysis_plan")
     if rejection is not None:
@@ -189,6 +171,7 @@ def handle_persist_analysis_plan(args: argparse.Namespace) -> int:
 
 
 def handle_persist_digest(args: argparse.Namespace) -> int:
+    from analysis_runtime import stages  # noqa: PLC0415
     db_path = Path(args.db_path).expanduser().resolve()
     rejection, code = _reject_score_only(db_path, "persist_digest")
     if rejection is not None:
@@ -205,6 +188,7 @@ def handle_persist_digest(args: argparse.Namespace) -> int:
 
 
 def handle_persist_literature_score(args: argparse.Namespace) -> int:
+    from analysis_runtime import stages  # noqa: PLC0415
     db_path = Path(args.db_path).expanduser().resolve()
     if not args.payload_file:
         result, code = stages.prepare_literature_score(db_path)
@@ -220,6 +204,7 @@ def handle_persist_literature_score(args: argparse.Namespace) -> int:
 
 
 def handle_persist_references(args: argparse.Namespace) -> int:
+    from analysis_runtime import references  # noqa: PLC0415
     db_path = Path(args.db_path).expanduser().resolve()
     rejection, code = _reject_score_only(db_path, "persist_references")
     if rejection is not None:
@@ -246,6 +231,7 @@ def handle_persist_references(args: argparse.Namespace) -> int:
 
 
 def handle_persist_citation_analysis(args: argparse.Namespace) -> int:
+    from analysis_runtime import citations  # noqa: PLC0415
     db_path = Path(args.db_path).expanduser().resolve()
     rejection, code = _reject_score_only(db_path, "persist_citation_analysis")
     if rejection is not None:
@@ -270,6 +256,7 @@ def handle_persist_citation_analysis(args: argparse.Namespace) -> int:
 
 
 def handle_finalize_outputs(args: argparse.Namespace) -> int:
+    from analysis_runtime import stages  # noqa: PLC0415
     db_path = Path(args.db_path).expanduser().resolve()
     payload, code = stages.render_public_outputs(db_path)
     _print(payload)
@@ -277,12 +264,86 @@ def handle_finalize_outputs(args: argparse.Namespace) -> int:
 
 
 def handle_status(args: argparse.Namespace) -> int:
+    from analysis_runtime import gate_contract  # noqa: PLC0415
     _print(gate_contract.status_payload(Path(args.db_path).expanduser().resolve()))
     return 0
 
 
+def handle_profile(args: argparse.Namespace) -> int:
+    from analysis_runtime import profiling  # noqa: PLC0415
+    db_path = Path(args.db_path).expanduser().resolve()
+    if not db_path.exists():
+        _print(_json_error("runtime_db_missing", "runtime DB does not exist", db_path=str(db_path)))
+        return 2
+    try:
+        with runtime_db.connect_db(db_path) as connection:
+            timings = runtime_db.fetch_stage_timings(connection, args.run_id or None)
+    except sqlite3.OperationalError as exc:
+        _print(_json_error("stage_timings_unavailable", str(exc), db_path=str(db_path)))
+        return 2
+    payload: dict[str, Any] = {"db_path": str(db_path), **profiling.profile_report(timings)}
+    if args.chrome_trace:
+        trace_path = Path(args.chrome_trace).expanduser().resolve()
+        trace_path.write_text(json.dumps(profiling.chrome_trace(timings), ensure_ascii=False), encoding="utf-8")
+        payload["chrome_trace_path"] = str(trace_path)
+    if args.pstats:
+        payload["pstats"] = profiling.pstats_summary(Path(args.pstats).expanduser().resolve(), limit=args.pstats_limit)
+    _print(payload)
+    return 0
+
+
+def handle_batch(args: argparse.Namespace) -> int:
+    from analysis_runtime import batch  # noqa: PLC0415
+    output_root = Path(args.output_root).expanduser().resolve()
+    try:
+        items = batch.discover_sources(args.manifest, output_root, language=args.language or "zh-CN")
+    except (OSError, ValueError) as exc:
+        _print(_json_error("batch_manifest_invalid", str(exc), manifest=args.manifest))
+        return 2
+    if not items:
+        _print(_json_error("batch_manifest_empty", "manifest matched no source files", manifest=args.manifest))
+        return 2
+    summary = batch.run_batch(
+        items,
+        batch.BatchOptions(
+            model=args.model or "",
+            reference_api_cache_dir=args.reference_api_cache_dir or "",
+            reference_api_cache_ttl_seconds=(
+                args.reference_api_cache_ttl_hours * 3600 if args.reference_api_cache_ttl_hours is not None else None
+            ),
+            reference_api_cache_max_bytes=(
+                int(args.reference_api_cache_max_mb * 1024 * 1024) if args.reference_api_cache_max_mb is not None else None
+            ),
+            reference_api_concurrent=bool(args.reference_api_concurrent),
+            reference_api_deadline_seconds=args.reference_api_deadline_seconds,
+            reference_api_replay=args.reference_api_replay or "",
+            reference_api_record_dir=args.reference_api_record or "",
+            sqlite_profile=args.sqlite_profile,
+            db_write_strategy=args.db_write_strategy,
+            citation_full_document=bool(args.citation_full_document),
+            conversion_cache=not args.no_conversion_cache,
+            conversion_cache_dir=args.conversion_cache_dir or "",
+            conversion_cache_max_bytes=(
+                int(args.conversion_cache_max_mb * 1024 * 1024) if args.conversion_cache_max_mb is not None else None
+            ),
+            pdf_extract_workers=args.pdf_extract_workers,
+            template_bytecode_cache_dir=args.template_bytecode_cache_dir or "",
+            reference_candidate_cache=not args.no_reference_candidate_cache,
+            reference_candidate_cache_dir=args.reference_candidate_cache_dir or "",
+            reference_store_path=args.reference_store or "",
+            stage_timings=bool(args.stage_timings),
+        ),
+        output_root=output_root,
+        workers=args.workers if args.workers is not None else (os.cpu_count() or 1),
+    )
+    _print(summary)
+    return 1 if summary["status_counts"].get("failed") else 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Decision-oriented runtime wrapper for literature-analysis.")
+    parser.add_argument("--db-stats", action="store_true", help="Report runtime DB connection opens/commits on stderr.")
+    parser.add_argument("--cprofile", default="", help="Write cProfile stats for this command to the given path.")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     init = subparsers.add_parser("init_runtime")
@@ -294,6 +355,25 @@ def build_parser() -> argparse.ArgumentParser:
     init.add_argument("--model", default="")
     init.add_argument("--score-only", action="store_true")
     init.add_argument("--identifier", default="")
+    init.add_argument("--reference-api-cache-dir", default="")
+    init.add_argument("--reference-api-cache-ttl-hours", type=float, default=None)
+    init.add_argument("--reference-api-cache-max-mb", type=float, default=None)
+    init.add_argument("--reference-api-concurrent", action="store_true")
+    init.add_argument("--reference-api-deadline-seconds", type=float, default=None)
+    init.add_argument("--reference-api-replay", default="")
+    init.add_argument("--reference-api-record", default="")
+    init.add_argument("--sqlite-profile", choices=("default", "wal"), default="default")
+    init.add_argument("--db-write-strategy", choices=("replace", "diff"), default="replace")
+    init.add_argument("--citation-full-document", action="store_true")
+    init.add_argument("--no-conversion-cache", action="store_true")
+    init.add_argument("--conversion-cache-dir", default="")
+    init.add_argument("--conversion-cache-max-mb", type=float, default=None)
+    init.add_argument("--pdf-extract-workers", type=int, default=1)
+    init.add_argument("--template-bytecode-cache-dir", default="")
+    init.add_argument("--no-reference-candidate-cache", action="store_true")
+    init.add_argument("--reference-candidate-cache-dir", default="")
+    init.add_argument("--reference-store", default="")
+    init.add_argument("--stage-timings", action="store_true")
     init.set_defaults(handler=handle_init_runtime)
 
     plan = subparsers.add_parser("persist_analysis_plan")
@@ -325,17 +405,65 @@ def build_parser() -> argparse.ArgumentParser:
     finalize.add_argument("--db-path", required=True)
     finalize.set_defaults(handler=handle_finalize_outputs)
 
+    batch_parser = subparsers.add_parser("batch")
+    batch_parser.add_argument("--manifest", required=True)
+    batch_parser.add_argument("--output-root", required=True)
+    batch_parser.add_argument("--workers", type=int, default=None)
+    batch_parser.add_argument("--language", default="zh-CN")
+    batch_parser.add_argument("--model", default="")
+    batch_parser.add_argument("--reference-api-cache-dir", default="")
+    batch_parser.add_argument("--reference-api-cache-ttl-hours", type=float, default=None)
+    batch_parser.add_argument("--reference-api-cache-max-mb", type=float, default=None)
+    batch_parser.add_argument("--reference-api-concurrent", action="store_true")
+    batch_parser.add_argument("--reference-api-deadline-seconds", type=float, default=None)
+    batch_parser.add_argument("--reference-api-replay", default="")
+    batch_parser.add_argument("--reference-api-record", default="")
+    batch_parser.add_argument("--sqlite-profile", choices=("default", "wal"), default="default")
+    batch_parser.add_argument("--db-write-strategy", choices=("replace", "diff"), default="replace")
+    batch_parser.add_argument("--citation-full-document", action="store_true")
+    batch_parser.add_argument("--no-conversion-cache", action="store_true")
+    batch_parser.add_argument("--conversion-cache-dir", default="")
+    batch_parser.add_argument("--conversion-cache-max-mb", type=float, default=None)
+    batch_parser.add_argument("--pdf-extract-workers", type=int, default=1)
+    batch_parser.add_argument("--template-bytecode-cache-dir", default="")
+    batch_parser.add_argument("--no-reference-candidate-cache", action="store_true")
+    batch_parser.add_argument("--reference-candidate-cache-dir", default="")
+    batch_parser.add_argument("--reference-store", default="")
+    batch_parser.add_argument("--stage-timings", action="store_true")
+    batch_parser.set_defaults(handler=handle_batch)
+
     status = subparsers.add_parser("status")
     status.add_argument("--db-path", required=True)
     status.set_defaults(handler=handle_status)
 
+    profile = subparsers.add_parser("profile")
+    profile.add_argument("--db-path", required=True)
+    profile.add_argument("--run-id", default="")
+    profile.add_argument("--chrome-trace", default="")
+    profile.add_argument("--pstats", default="")
+    profile.add_argument("--pstats-limit", type=int, default=25)
+    profile.set_defaults(handler=handle_profile)
+
     return parser
 
 
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
-    return int(args.handler(args))
+    profiler = None
+    if args.cprofile:
+        import cProfile  # noqa: PLC0415
+
+        profiler = cProfile.Profile()
+    with runtime_db.connection_scope() as stats:
+        if profiler is None:
+            code = int(args.handler(args))
+        else:
+            code = int(profiler.runcall(args.handler, args))
+            profiler.dump_stats(str(Path(args.cprofile).expanduser().resolve()))
+    if args.db_stats:
+        print(json.dumps({"command": args.command, "db_stats": stats}, ensure_ascii=False), file=sys.stderr)
+    return code
 
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from experiments import benchmark_plugins  # noqa: E402
+from experiments import evaluate_all  # noqa: E402
+from experiments.ref_preprocess import evaluation  # noqa: E402
+
+
+def benchmark_result(plugin_name: str, seconds: float) -> dict:
+    sample = {
+        "sample": "29IBKEUR",
+        "bytes": 100,
+        "entries": 10,
+        "seconds_median": seconds,
+        "seconds_min": seconds,
+        "entries_per_second": 10 / seconds,
+        "peak_memory_bytes": 1024,
+        "stage_seconds": {stage: 0.0 for stage in benchmark_plugins.STAGES},
+    }
+    return {
+        "schema": benchmark_plugins.SCHEMA,
+        "plugin": plugin_name,
+        "summary": {
+            "total_seconds": seconds,
+            "entries_per_second": 10 / seconds,
+            "max_peak_memory_bytes": 1024,
+            "stage_share": {stage: 0.25 for stage in benchmark_plugins.STAGES},
+        },
+        "per_sample": [sample],
+    }
+
+
+class BenchmarkPluginsTests(unittest.TestCase):
+    def run_main(self, output_dir: Path, seconds: float) -> int:
+        argv = ["benchmark_plugins.py", "--plugin", "demo", "--samples", "29IBKEUR", "--check-regression"]
+        with (
+            mock.patch.object(benchmark_plugins, "_OUTPUT_DIR", output_dir),
+            mock.patch.object(benchmark_plugins, "benchmark_plugin", lambda name, samples, repeat: benchmark_result(name, seconds)),
+            mock.patch.object(sys, "argv", argv),
+            contextlib.redirect_stdout(io.StringIO()),
+        ):
+            try:
+                benchmark_plugins.main()
+            except SystemExit as exc:
+                return int(exc.code or 0)
+        return 0
+
+    def test_check_regression_keeps_baseline_when_run_regresses(self):
+        with tempfile.TemporaryDirectory() as td:
+            output_dir = Path(td)
+            baseline_path = output_dir / "benchmark_results_demo.json"
+            baseline_path.write_text(json.dumps(benchmark_result("demo", 0.1)), encoding="utf-8")
+            baseline_text = baseline_path.read_text(encoding="utf-8")
+
+            self.assertEqual(self.run_main(output_dir, 1.0), 1)
+            self.assertEqual(baseline_path.read_text(encoding="utf-8"), baseline_text)
+            candidate = json.loads((output_dir / "benchmark_results_demo-candidate.json").read_text(encoding="utf-8"))
+            self.assertEqual(candidate["baseline"]["regressions"]["total"][0].split(":")[0], "total_seconds_min")
+
+            self.assertEqual(self.run_main(output_dir, 0.1), 0)
+            refreshed = json.loads(baseline_path.read_text(encoding="utf-8"))
+            self.assertEqual(refreshed["baseline"]["regressions"], {"total": [], "samples": []})
+
+
+class EvaluationTests(unittest.TestCase):
+    def test_hungarian_assignment_beats_greedy_on_crossed_similarities(self):
+        self.assertEqual(evaluation._hungarian([[0.9, 0.8], [0.85, 0.1]]), [1, 0])
+        self.assertEqual(evaluation._hungarian([[0.1, 0.5, 0.3]]), [1])
+
+        rows = [{0: 0.9, 1: 0.8}, {0: 0.85, 1: 0.1}]
+        self.assertEqual(evaluation._greedy_assignment(rows, 0.25), {0: {"pp_index": 0, "similarity": 0.9}})
+        self.assertEqual(
+            evaluation._optimal_assignment(rows, 0.25),
+            {0: {"pp_index": 1, "similarity": 0.8}, 1: {"pp_index": 0, "similarity": 0.85}},
+        )
+        self.assertEqual(evaluation._optimal_assignment([{0: 0.5}, {0: 0.9}, {}], 0.25), {1: {"pp_index": 0, "similarity": 0.9}})
+
+    def test_compare_with_history_reports_deltas_over_shared_files(self):
+        aggregate = {
+            "composite": {"mean": 0.65},
+            "per_file": [{"_file_id": "AAAA0001", "composite_score": 0.8}, {"_file_id": "BBBB0002", "composite_score": 0.5}],
+        }
+        with tempfile.TemporaryDirectory() as td:
+            history = Path(td) / "evaluation_results_v1.json"
+            history.write_text(
+                json.dumps(
+                    {
+                        "plugin": "line-first-v1",
+                        "composite": {"mean": 0.6},
+                        "per_file": [
+                            {"_file_id": "AAAA0001", "composite_score": 0.7},
+                            {"_file_id": "BBBB0002", "composite_score": 0.6},
+                            {"_file_id": "CCCC0003", "composite_score": 0.1},
+                        ],
+                    }
+                ),
+                encoding="utf-8",
+            )
+            broken = Path(td) / "evaluation_results_broken.json"
+            broken.write_text("{", encoding="utf-8")
+            rows = evaluate_all.compare_with_history(aggregate, [history, broken, Path(td) / "missing.json"])
+
+        self.assertEqual(len(rows), 1)
+        self.assertAlmostEqual(rows[0].pop("delta_mean"), 0.05)
+        self.assertEqual(
+            rows[0],
+            {
+                "results": "evaluation_results_v1.json",
+                "plugin": "line-first-v1",
+                "composite_mean": 0.6,
+                "shared_files": 2,
+                "improved": 1,
+                "regressed": 1,
+            },
+        )
+
+    def test_parallel_workers_match_serial_evaluation(self):
+        gt_files = sorted(evaluate_all.GT_DIR.glob("*.json"))[:4]
+        with contextlib.redirect_stdout(io.StringIO()) as serial_output:
+            serial = evaluate_all.evaluate_from_precomputed(gt_files, workers=1, assignment="hungarian")
+        with contextlib.redirect_stdout(io.StringIO()) as parallel_output:
+            parallel = evaluate_all.evaluate_from_precomputed(gt_files, workers=2, assignment="hungarian")
+
+        self.assertEqual(len(serial[0]), len(gt_files))
+        self.assertEqual(parallel, serial)
+        self.assertEqual(parallel_output.getvalue(), serial_output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
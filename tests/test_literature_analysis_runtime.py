@@ -7,9 +7,11 @@ import sqlite3
 import subprocess
 import sys
 import tempfile
+import time
 import unittest
 from argparse import Namespace
 from pathlib import Path
+from unittest import mock
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -36,6 +38,22 @@ def load_deterministic_core_module():
     return deterministic_core
 
 
+_CACHE_HOME = tempfile.TemporaryDirectory()
+_ORIGINAL_CACHE_HOME = os.environ.get("XDG_CACHE_HOME")
+
+
+def setUpModule():
+    os.environ["XDG_CACHE_HOME"] = _CACHE_HOME.name
+
+
+def tearDownModule():
+    if _ORIGINAL_CACHE_HOME is None:
+        os.environ.pop("XDG_CACHE_HOME", None)
+    else:
+        os.environ["XDG_CACHE_HOME"] = _ORIGINAL_CACHE_HOME
+    _CACHE_HOME.cleanup()
+
+
 class LiteratureAnalysisRuntimeTests(unittest.TestCase):
     def run_cmd(self, args: list[str]) -> subprocess.CompletedProcess:
         return subprocess.run(
@@ -662,6 +680,205 @@ class LiteratureAnalysisRuntimeTests(unittest.TestCase):
             self.assertNotIn("resolution_source", public_refs[0])
             self.assertFalse(any(key.startswith("reference_api_") for key in public_refs[0]))
 
+    def test_conversion_cache_reuses_latex_normalization_until_inputs_change(self):
+        with tempfile.TemporaryDirectory() as td:
+            project = Path(td) / "project"
+            (project / "sections").mkdir(parents=True)
+            main_tex = project / "main.tex"
+            main_tex.write_text(
+                "\\documentclass{article}\n\\begin{document}\n\\input{sections/intro}\n\\end{document}\n",
+                encoding="utf-8",
+            )
+            intro_tex = project / "sections" / "intro.tex"
+            intro_tex.write_text("\\section{Introduction}\nFirst draft.\n", encoding="utf-8")
+            cache_dir = Path(td) / "conversions"
+
+            def normalize(run_name: str, *extra: str) -> tuple[dict, str]:
+                working_dir = Path(td) / run_name
+                working_dir.mkdir()
+                result = self.run_cmd(
+                    [
+                        "init_runtime",
+                        "--source-path",
+                        str(project),
+                        "--working-dir",
+                        str(working_dir),
+                        "--conversion-cache-dir",
+                        str(cache_dir),
+                        *extra,
+                    ]
+                )
+                self.assertEqual(result.returncode, 0, result.stderr.decode("utf-8"))
+                tmp_dir = working_dir / ".literature_analysis_tmp"
+                meta = json.loads((tmp_dir / "source_meta.json").read_text(encoding="utf-8"))
+                return meta, (tmp_dir / "source.md").read_text(encoding="utf-8")
+
+            first_meta, first_md = normalize("first")
+            second_meta, second_md = normalize("second")
+            self.assertEqual(first_meta["conversion_cache"], "miss")
+            self.assertEqual(second_meta["conversion_cache"], "hit")
+            self.assertEqual(second_md, first_md)
+            self.assertEqual(second_meta["included_tex_files"], [str(intro_tex.resolve())])
+
+            intro_tex.write_text("\\section{Introduction}\nSecond draft.\n", encoding="utf-8")
+            changed_meta, changed_md = normalize("changed")
+            self.assertEqual(changed_meta["conversion_cache"], "miss")
+            self.assertIn("Second draft.", changed_md)
+            disabled_meta, _ = normalize("disabled", "--no-conversion-cache")
+            self.assertEqual(disabled_meta["conversion_cache"], "disabled")
+
+        load_deterministic_core_module()
+        from analysis_runtime import conversion_cache  # noqa: PLC0415
+
+        self.assertIsNone(conversion_cache.cache_from_runtime_inputs({}))
+        configured = conversion_cache.cache_from_runtime_inputs({"conversion_cache_dir": "/tmp/conversions", "conversion_cache_max_bytes": "2048"})
+        self.assertEqual(configured, conversion_cache.ConversionCache(root=Path("/tmp/conversions").resolve(), max_bytes=2048))
+        batch_args = load_run_analysis_module().build_parser().parse_args(
+            [
+                "batch",
+                "--manifest",
+                "papers.txt",
+                "--output-root",
+                "out",
+                "--conversion-cache-max-mb",
+                "0.5",
+                "--reference-api-cache-ttl-hours",
+                "2",
+                "--reference-api-cache-max-mb",
+                "8",
+            ]
+        )
+        self.assertEqual(batch_args.conversion_cache_max_mb, 0.5)
+        self.assertEqual(batch_args.reference_api_cache_ttl_hours, 2.0)
+        self.assertEqual(batch_args.reference_api_cache_max_mb, 8.0)
+
+    def test_reference_api_shared_cache_is_reused_across_working_dirs(self):
+        scripts_path = str(ANALYSIS_SCRIPTS)
+        if scripts_path not in sys.path:
+            sys.path.insert(0, scripts_path)
+        from analysis_runtime import reference_cache  # noqa: PLC0415
+
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td) / "run"
+            root.mkdir()
+            cache_dir = Path(td) / "shared_cache"
+            response = {"reference": [{"key": "api-1", "article-title": "A Shared Cache Reference", "author": "Smith", "year": "2020"}]}
+            reference_cache.store(
+                reference_cache.ReferenceApiCache(root=cache_dir),
+                provider="crossref",
+                canonical_identifier="DOI:10.1000/source",
+                status="succeeded",
+                http_status=200,
+                response=response,
+            )
+            source = root / "paper.md"
+            lines = [
+                "# Introduction",
+                "No citation mentions are needed.",
+                "# References",
+                "[1] Smith. A Shared Cache Reference. 2020.",
+            ]
+            source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            init = json.loads(
+                self.run_cmd(
+                    [
+                        "init_runtime",
+                        "--source-path",
+                        str(source),
+                        "--working-dir",
+                        str(root),
+                        "--identifier",
+                        "10.1000/source",
+                        "--reference-api-cache-dir",
+                        str(cache_dir),
+                    ]
+                ).stdout.decode("utf-8")
+            )
+            db_path = init["db_path"]
+            plan_path = root / "plan.json"
+            self.write_json(plan_path, self.outline_payload(lines))
+            self.assertEqual(self.run_cmd(["persist_analysis_plan", "--db-path", db_path, "--payload-file", str(plan_path)]).returncode, 0)
+
+            prepared_result = self.run_cmd(["persist_references", "--db-path", db_path])
+            self.assertEqual(prepared_result.returncode, 0, prepared_result.stderr.decode("utf-8", errors="replace"))
+            prepared = json.loads(prepared_result.stdout.decode("utf-8"))
+            summary = prepared["reference_api"]["provider_summaries"][0]
+            self.assertEqual(summary["provider"], "crossref")
+            self.assertEqual(summary["cache_layer"], "shared")
+            self.assertEqual(summary["response_sha256"], reference_cache.response_sha256(response))
+            self.assertEqual(prepared["reference_api"]["unresolved_count"], 0)
+            with sqlite3.connect(db_path) as connection:
+                stored = connection.execute(
+                    "SELECT response_sha256 FROM reference_api_fetches WHERE provider = 'crossref'"
+                ).fetchone()
+            self.assertEqual(stored[0], summary["response_sha256"])
+
+    def test_reference_api_concurrent_mode_overlaps_providers_and_keeps_merge_order(self):
+        scripts_path = str(ANALYSIS_SCRIPTS)
+        if scripts_path not in sys.path:
+            sys.path.insert(0, scripts_path)
+        from unittest import mock  # noqa: PLC0415
+
+        from analysis_runtime import deterministic_core, reference_api, references  # noqa: PLC0415
+
+        crossref_response = {"reference": [{"key": "c-1", "article-title": "A Crossref Only Reference", "author": "Smith", "year": "2020"}]}
+        semantic_rows = [{"citedPaper": {"paperId": "s-1", "title": "A Semantic Scholar Only Reference", "authors": [{"name": "Jones"}], "year": 2021}}]
+        active: list[str] = []
+        overlapped: list[bool] = []
+
+        def slow_fetch(provider, response, candidates):
+            def fetch(identifier, **_kwargs):
+                active.append(provider)
+                time.sleep(0.2)
+                overlapped.append(len(active) > 1)
+                return reference_api.ProviderFetch(provider, "succeeded", 200, response, candidates, None)
+
+            return fetch
+
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            source = root / "paper.md"
+            lines = [
+                "# Introduction",
+                "No citation mentions are needed.",
+                "# References",
+                "[1] Smith. A Crossref Only Reference. 2020.",
+                "[2] Jones. A Semantic Scholar Only Reference. 2021.",
+            ]
+            source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            init = json.loads(
+                self.run_cmd(
+                    [
+                        "init_runtime",
+                        "--source-path",
+                        str(source),
+                        "--working-dir",
+                        str(root),
+                        "--identifier",
+                        "10.1000/source",
+                        "--reference-api-concurrent",
+                    ]
+                ).stdout.decode("utf-8")
+            )
+            db_path = Path(init["db_path"])
+            self.assertEqual(deterministic_core.persist_outline_and_scopes(db_path, self.outline_payload(lines))[1], 0)
+            self.assertEqual(deterministic_core.prepare_references_workset(db_path, persist_db_only=True)[1], 0)
+            with mock.patch.object(
+                reference_api,
+                "fetch_crossref",
+                slow_fetch("crossref", crossref_response, reference_api.crossref_candidates(crossref_response)),
+            ), mock.patch.object(
+                reference_api,
+                "fetch_semantic_scholar",
+                slow_fetch("semantic_scholar", [{"data": semantic_rows}], reference_api.semantic_scholar_candidates(semantic_rows)),
+            ):
+                summary = references._resolve_reference_api(db_path)
+
+        self.assertIn(True, overlapped)
+        self.assertEqual([item["provider"] for item in summary["provider_summaries"]], ["crossref", "semantic_scholar"])
+        self.assertEqual(summary["accepted_count"], 2)
+        self.assertTrue(summary["complete"])
+
     def test_reference_api_hard_quality_result_remains_in_local_review(self):
         with tempfile.TemporaryDirectory() as td:
             root = Path(td)
@@ -901,6 +1118,95 @@ class LiteratureAnalysisRuntimeTests(unittest.TestCase):
             citation_payload = json.loads(stdout.getvalue())
             self.assertEqual(citation_payload["runtime_backend"], "analysis_runtime.citations")
 
+    def test_batch_runner_initializes_papers_in_isolation_and_resumes(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            papers = root / "papers"
+            papers.mkdir()
+            for name in ("alpha", "beta"):
+                (papers / f"{name}.md").write_text(
+                    f"# Introduction\nPrior work [1] is relevant.\n# References\n[1] Smith. {name.title()} Paper. 2020.\n",
+                    encoding="utf-8",
+                )
+            manifest = root / "manifest.jsonl"
+            manifest.write_text(
+                "\n".join(
+                    json.dumps(record)
+                    for record in (
+                        {"source_path": "papers/alpha.md"},
+                        {"source_path": "papers/beta.md", "identifier": "10.1000/beta"},
+                        {"source_path": "papers/missing.md"},
+                    )
+                )
+                + "\n",
+                encoding="utf-8",
+            )
+            output_root = root / "out"
+            command = ["batch", "--manifest", str(manifest), "--output-root", str(output_root), "--workers", "2"]
+
+            first_result = self.run_cmd(command)
+            first = json.loads(first_result.stdout.decode("utf-8"))
+            second = json.loads(self.run_cmd(command).stdout.decode("utf-8"))
+            saved = json.loads((output_root / "batch_summary.json").read_text(encoding="utf-8"))
+
+        self.assertEqual(first_result.returncode, 1)
+        self.assertEqual(first["paper_count"], 3)
+        self.assertEqual(first["status_counts"], {"failed": 1, "waiting_for_agent": 2})
+        by_name = {Path(paper["source_path"]).name: paper for paper in first["papers"]}
+        self.assertEqual(by_name["alpha.md"]["steps"], ["init_runtime"])
+        self.assertEqual(by_name["alpha.md"]["next_action"], "persist_analysis_plan")
+        self.assertNotEqual(by_name["alpha.md"]["working_dir"], by_name["beta.md"]["working_dir"])
+        self.assertEqual(by_name["missing.md"]["status"], "failed")
+        resumed = {Path(paper["source_path"]).name: paper for paper in second["papers"]}
+        self.assertTrue(resumed["alpha.md"]["resumed"])
+        self.assertEqual(resumed["alpha.md"]["steps"], [])
+        self.assertEqual(resumed["beta.md"]["next_action"], "persist_analysis_plan")
+        self.assertEqual(saved["paper_count"], 3)
+
+    def test_algorithm_handlers_run_in_process_without_stdout_capture(self):
+        deterministic_core = load_deterministic_core_module()
+        from analysis_runtime import algorithm_adapter  # noqa: PLC0415
+
+        def probe_handler(db_path: Path, payload: dict, **extra: object) -> tuple[dict, int]:
+            print("handler output")
+            return {"pid": os.getpid(), "db_path": str(db_path), "payload": payload, "extra": extra}, 3
+
+        with tempfile.TemporaryDirectory() as td:
+            db_path = Path(td) / "runtime.db"
+            stdout = io.StringIO()
+            with mock.patch.object(deterministic_core, "probe_handler", probe_handler, create=True), mock.patch("sys.stdout", stdout):
+                result, code = algorithm_adapter.call_algorithm_handler("probe_handler", db_path, payload={"k": 1}, mode="x")
+            self.assertEqual(code, 3)
+            self.assertEqual(
+                result,
+                {"pid": os.getpid(), "db_path": str(db_path.resolve()), "payload": {"k": 1}, "extra": {"mode": "x"}},
+            )
+            self.assertEqual(stdout.getvalue(), "handler output\n")
+
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            source = root / "paper.md"
+            lines = [
+                "# Introduction",
+                "Prior work [1] is relevant.",
+                "# References",
+                "[1] Smith. Useful Runtime Paper. 2020.",
+            ]
+            source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            init = json.loads(
+                self.run_cmd(["init_runtime", "--source-path", str(source), "--working-dir", str(root)]).stdout.decode("utf-8")
+            )
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                result, code = deterministic_core.persist_outline_and_scopes(Path(init["db_path"]), self.outline_payload(lines))
+                prepared, prepared_code = deterministic_core.prepare_references_workset(Path(init["db_path"]), persist_db_only=True)
+            self.assertEqual(stdout.getvalue(), "")
+            self.assertEqual(code, 0)
+            self.assertEqual(result["stored_outline_nodes"], 2)
+            self.assertEqual(prepared_code, 0)
+            self.assertEqual(prepared["stored_reference_entries"], 1)
+            self.assertEqual(prepared["workset_path"], "")
+
     def test_reference_payload_rejects_old_fields_and_invalid_patterns_together(self):
         with tempfile.TemporaryDirectory() as td:
             root = Path(td)
@@ -1905,6 +2211,367 @@ class LiteratureAnalysisRuntimeTests(unittest.TestCase):
         self.assertEqual(len(workset["workset_items"]), 1)
         self.assertNotIn("citation_label", workset["workset_items"][0]["reference"])
 
+    def test_author_year_index_uses_year_suffix_and_fuzzy_surname_fallback(self):
+        runtime = load_deterministic_core_module()
+        lines = ["# Introduction", "Both (Smith, 2020b) and (Smith, 2020a) build on Schmidthuber (2015), unlike (Lee, 2019)."]
+        scope = runtime.Scope("Introduction", 2, 2, "fixture")
+        mentions, _ = runtime._extract_mentions(lines, scope)
+
+        def ref(ref_index, author, year, raw):
+            return {"ref_index": ref_index, "author": [author], "title": raw, "year": year, "raw": raw, "confidence": 0.9}
+
+        workset = runtime._build_citation_workset(
+            scope=scope,
+            mentions=mentions,
+            reference_items=[
+                ref(0, "Smith, J.", 2020, "Smith, J. (2020a). First paper."),
+                ref(1, "Smith, J.", 2020, "Smith, J. (2020b). Second paper."),
+                ref(2, "Schmidhuber, J.", 2015, "Schmidhuber, J. (2015). Deep learning."),
+                ref(3, "Li, K.", 2019, "Li, K. (2019). Short surname."),
+            ],
+        )
+        links = {mention["marker"]: link for mention, link in zip(mentions, workset["mention_links"])}
+        self.assertEqual(links["(Smith, 2020b)"]["ref_index"], 1)
+        self.assertEqual(links["(Smith, 2020b)"]["resolution_method"], "author_year_suffix_hint")
+        self.assertEqual(links["(Smith, 2020a)"]["ref_index"], 0)
+        self.assertEqual(links["Schmidthuber (2015)"]["ref_index"], 2)
+        self.assertEqual(links["Schmidthuber (2015)"]["resolution_method"], "author_year_fuzzy_hint")
+        self.assertEqual(links["(Lee, 2019)"]["status"], "unmapped")
+
+    def test_extract_mentions_candidate_scan_matches_per_line_extraction(self):
+        runtime = load_deterministic_core_module()
+        lines = [
+            "# Introduction",
+            "Plain prose without any citation markers at all.",
+            "Numeric [1, 3-4] and labels [RNSS18] with \\cite{key1, key2}.",
+            "Image ![fig](figs/a.png) inside [a ![x](y.png) b] and https://example.org/2020-01-02 links.",
+            "Narrative Smith et al. (2020a) and (Lee, 2019; Chen 2018) cited on May 5, 2021.",
+            "(foo ![a](b) 2020) only appears after sanitizing.",
+            "# References",
+        ]
+        scope = runtime.Scope("Introduction", 1, len(lines), "fixture")
+        expected: list[dict[str, object]] = []
+        expected_filtered = 0
+        counter = 1
+        for line_no in range(1, len(lines) + 1):
+            original = lines[line_no - 1]
+            expected_filtered += runtime._count_false_positive_noise(original)
+            line = runtime._sanitize_citation_line(original)
+            found = []
+            for extractor in (
+                runtime._extract_numeric_mentions,
+                runtime._extract_citation_label_mentions,
+                runtime._extract_author_year_mentions,
+                runtime._extract_latex_cite_mentions,
+            ):
+                extracted, counter = extractor(line, line_no, counter)
+                found.extend(extracted)
+            for mention in found:
+                mention["snippet"] = original.strip()
+                if runtime._is_false_positive_mention(mention):
+                    expected_filtered += 1
+                else:
+                    expected.append(mention)
+        self.assertEqual(runtime._citation_candidate_lines(lines, scope), [3, 4, 5, 6])
+        self.assertEqual(runtime._extract_mentions(lines, scope), (expected, expected_filtered))
+
+        full_scope, metadata = runtime._full_document_citation_scope(
+            lines,
+            runtime.Scope("Introduction", 1, 2, "db"),
+            references_scope_row={"line_start": 7},
+        )
+        self.assertEqual((full_scope.line_start, full_scope.line_end, full_scope.source), (1, 6, "full_document"))
+        self.assertEqual(metadata["fallback_from"]["line_end"], 2)
+
+    def test_stdlib_pdf_extraction_streams_over_mmap_with_parallel_workers(self):
+        import zlib  # noqa: PLC0415
+
+        runtime = load_deterministic_core_module()
+        streams = [
+            b"BT (Introduction \\(draft\\)) Tj ET",
+            zlib.compress(b"BT [(Related) -250 (Work)] TJ ET"),
+            b"BT (Octal \\101\\102 and \\9 and tab\\tend) Tj ET",
+            zlib.compress(b"BT (Introduction \\(draft\\)) Tj ET"),
+            zlib.compress(b"BT (Truncated) Tj ET")[:-4],
+        ]
+        pdf = b"%PDF-1.4\n" + b"".join(
+            f"{index} 0 obj\n<< /Length {len(stream)} >>\nstream{newline}".encode("latin-1") + stream + b"\r\nendstream\nendobj\n"
+            for index, (stream, newline) in enumerate(zip(streams, ["\n", "\r\n", "\n", "\n", "\r\n"]), start=1)
+        )
+        self.assertEqual(list(runtime._iter_pdf_streams(pdf)), streams)
+        with tempfile.TemporaryDirectory() as td:
+            source_path = Path(td) / "paper.pdf"
+            source_path.write_bytes(pdf)
+            serial = runtime._convert_pdf_with_stdlib(source_path)
+            parallel = runtime._convert_pdf_with_stdlib(source_path, workers=2)
+
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial.count("Introduction (draft)"), 1)
+        self.assertIn("Related Work", serial)
+        self.assertIn("Octal AB and 9 and tab\tend", serial)
+        self.assertNotIn("Truncated", serial)
+        self.assertIsNone(runtime._inflate_pdf_stream(zlib.compress(b"x" * 4096), max_bytes=1024))
+
+    def test_render_engine_reuses_environments_and_validators_until_files_change(self):
+        from jsonschema import ValidationError, validate  # noqa: PLC0415
+
+        load_deterministic_core_module()
+        from analysis_runtime import render_engine  # noqa: PLC0415
+
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            template_path = root / "note.md.j2"
+            template_path.write_text("Hello {{ name }}", encoding="utf-8")
+            schema_path = root / "note.schema.json"
+            schema = {"type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}}
+            schema_path.write_text(json.dumps(schema), encoding="utf-8")
+            bytecode_dir = root / "bytecode"
+
+            self.assertEqual(render_engine.render(template_path, {"name": "A"}, bytecode_cache_dir=str(bytecode_dir)), "Hello A")
+            env = render_engine.template_environment(root, bytecode_cache_dir=str(bytecode_dir))
+            self.assertIs(render_engine.template_environment(root, bytecode_cache_dir=str(bytecode_dir)), env)
+            self.assertTrue(any(bytecode_dir.iterdir()))
+            template_path.write_text("Bye {{ name }}", encoding="utf-8")
+            os.utime(template_path, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+            self.assertEqual(render_engine.render(template_path, {"name": "A"}, bytecode_cache_dir=str(bytecode_dir)), "Bye A")
+
+            validator = render_engine.schema_validator(schema_path)
+            self.assertIs(render_engine.schema_validator(schema_path), validator)
+            with self.assertRaises(ValidationError) as cached_error:
+                render_engine.validate({"name": 1}, schema_path)
+            with self.assertRaises(ValidationError) as reference_error:
+                validate(instance={"name": 1}, schema=schema)
+            self.assertEqual(cached_error.exception.message, reference_error.exception.message)
+            schema_path.write_text(json.dumps({**schema, "required": []}) + "\n", encoding="utf-8")
+            render_engine.validate({}, schema_path)
+
+    def test_reference_candidate_memo_matches_fresh_generation_and_counts_hits(self):
+        core = load_deterministic_core_module()
+        from analysis_runtime import candidate_cache  # noqa: PLC0415
+
+        lines = [
+            "[1] K. He, X. Zhang, S. Ren, and J. Sun. Deep residual learning for image recognition. In CVPR, 2016.",
+            "[2] A. Vaswani et al. Attention is all you need. In NeurIPS, 2017.",
+            "[3] K. He, X. Zhang, S. Ren, and J. Sun. Deep residual learning for image recognition. In CVPR, 2016.",
+        ]
+        scope = core.Scope("References", 1, len(lines), "test")
+        with tempfile.TemporaryDirectory() as td:
+            memo = candidate_cache.CandidateCache(root=Path(td))
+            candidate_cache.clear_memory()
+            fresh = core._prepare_reference_workset_state(lines=lines, scope=scope)
+            first = core._prepare_reference_workset_state(lines=lines, scope=scope, candidate_memo=memo)
+            candidate_cache.clear_memory()
+            second = core._prepare_reference_workset_state(lines=lines, scope=scope, candidate_memo=memo)
+
+        self.assertEqual(first["candidates"], fresh["candidates"])
+        self.assertEqual(second["candidates"], fresh["candidates"])
+        self.assertEqual(fresh["candidate_cache"], {"status": "disabled"})
+        self.assertEqual(first["candidate_cache"], {"memory_hits": 0, "persistent_hits": 0, "misses": 3})
+        self.assertEqual(second["candidate_cache"], {"memory_hits": 0, "persistent_hits": 3, "misses": 0})
+        self.assertEqual({candidate["entry_index"] for candidate in second["candidates"]}, {0, 1, 2})
+
+    def test_reference_candidate_memo_is_memory_only_unless_dir_given_and_keys_on_code(self):
+        core = load_deterministic_core_module()
+        from analysis_runtime import candidate_cache  # noqa: PLC0415
+
+        self.assertIsNone(candidate_cache.cache_from_runtime_inputs({"reference_candidate_cache": "false"}))
+        self.assertEqual(candidate_cache.cache_from_runtime_inputs({}), candidate_cache.CandidateCache(root=None))
+        with tempfile.TemporaryDirectory() as td:
+            memo = candidate_cache.cache_from_runtime_inputs({"reference_candidate_cache_dir": td})
+            self.assertEqual(memo, candidate_cache.CandidateCache(root=Path(td).resolve()))
+            builder = Path(td) / "builder.py"
+            builder.write_text("VERSION = 1\n", encoding="utf-8")
+            before = candidate_cache.code_fingerprint(builder)
+            builder.write_text("VERSION = 2\n", encoding="utf-8")
+            candidate_cache.code_fingerprint.cache_clear()
+            self.assertNotEqual(candidate_cache.code_fingerprint(builder), before)
+
+        key_fields = {"raw": "Adams, R. Paper Zero. 2018.", "source_format": "", "label_metadata": {}, "algorithm_version": "v"}
+        self.assertNotEqual(
+            candidate_cache.cache_key(**key_fields, code_version="a"),
+            candidate_cache.cache_key(**key_fields, code_version="b"),
+        )
+        entry = {"entry_index": 0, "raw": key_fields["raw"], "metadata": {}}
+        self.assertEqual(
+            core._reference_candidate_key(entry),
+            candidate_cache.cache_key(
+                **{**key_fields, "algorithm_version": core.REFERENCE_PREPROCESS_VERSION},
+                code_version=candidate_cache.code_fingerprint(Path(core.__file__).resolve()),
+            ),
+        )
+
+    def test_reference_split_review_reuses_unchanged_candidates_and_diffs_rows(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            source = root / "paper.md"
+            lines = [
+                "# Introduction",
+                "Prior work (Adams, 2018; Brown, 2019; Smith, 2020; Jones, 2021).",
+                "# References",
+                "Adams, R. Paper Zero. 2018.",
+                "Brown, T. Paper One. 2019.",
+                "Smith, J. Paper A. 2020 Jones, M. Paper B. 2021.",
+            ]
+            source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            init = json.loads(
+                self.run_cmd(
+                    ["init_runtime", "--source-path", str(source), "--working-dir", str(root), "--no-reference-candidate-cache"]
+                ).stdout.decode("utf-8")
+            )
+            db_path = Path(init["db_path"])
+            deterministic_core = load_deterministic_core_module()
+            self.assertEqual(deterministic_core.persist_outline_and_scopes(db_path, self.outline_payload(lines))[1], 0)
+            prepared, code = deterministic_core.prepare_references_workset(db_path, persist_db_only=True)
+            self.assertEqual(code, 0)
+            self.assertTrue(prepared["requires_split_review"])
+            suspect = prepared["suspect_blocks"][0]
+            with sqlite3.connect(db_path) as connection:
+                connection.execute("UPDATE reference_parse_candidates SET updated_at = 'before-review'")
+
+            reviewed, code = deterministic_core.persist_reference_entry_splits(
+                db_path,
+                {
+                    "review_generation_id": prepared["review_generation_id"],
+                    "blocks": [
+                        {
+                            "block_index": suspect["block_index"],
+                            "resolution": "split",
+                            "entries": ["Smith, J. Paper A. 2020", "Jones, M. Paper B. 2021."],
+                        }
+                    ],
+                },
+                persist_db_only=True,
+            )
+
+            self.assertEqual(code, 0, reviewed)
+            self.assertEqual(reviewed["stored_reference_entries"], 4)
+            self.assertEqual(reviewed["reused_candidate_entries"], 4)
+            with sqlite3.connect(db_path) as connection:
+                candidate_stamps = [
+                    row[0] for row in connection.execute("SELECT updated_at FROM reference_parse_candidates ORDER BY entry_index")
+                ]
+            self.assertEqual(len(candidate_stamps), reviewed["stored_reference_candidates"])
+            self.assertEqual(set(candidate_stamps), {"before-review"})
+
+    def test_reference_workset_regenerates_only_edited_block_and_renumbers_reused_candidates(self):
+        core = load_deterministic_core_module()
+        scope = core.Scope("References", 1, 4, "test")
+        original = [
+            "Adams, R. Paper Zero. 2018.",
+            "Brown, T. Paper One. 2019.",
+            "Smith, J. Paper A. 2020.",
+        ]
+        edited = ["Adams, R. Paper Zero Revised. 2018.", "Adams, R. Paper Zero Appendix. 2018.", *original[1:]]
+        previous = core._prepare_reference_workset_state(lines=[], scope=scope, reviewed_raw_entries=original)
+        fresh = core._prepare_reference_workset_state(lines=[], scope=scope, reviewed_raw_entries=edited)
+
+        generate = core._generate_reference_candidates_v171
+        with mock.patch.object(core, "_generate_reference_candidates_v171", side_effect=generate) as generated:
+            reused = core._prepare_reference_workset_state(
+                lines=[], scope=scope, reviewed_raw_entries=edited, previous=previous
+            )
+
+        self.assertEqual(reused["reused_candidate_entries"], 2)
+        self.assertEqual([call.args[0]["raw"] for call in generated.call_args_list], edited[:2])
+        self.assertEqual(reused["candidates"], fresh["candidates"])
+
+        def by_entry(state: dict) -> dict[int, list[dict]]:
+            grouped: dict[int, list[dict]] = {}
+            for candidate in state["candidates"]:
+                grouped.setdefault(candidate["entry_index"], []).append(candidate)
+            return grouped
+
+        before, after = by_entry(previous), by_entry(reused)
+        for old_index, new_index in ((1, 2), (2, 3)):
+            self.assertEqual(after[new_index], [{**candidate, "entry_index": new_index} for candidate in before[old_index]])
+
+    def test_reference_store_resolves_known_works_across_runs(self):
+        deterministic_core = load_deterministic_core_module()
+        from analysis_runtime import reference_store, references, runtime_db  # noqa: PLC0415
+
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            store = reference_store.ReferenceStore(path=root / "corpus" / "references.db")
+            self.assertEqual(
+                reference_store.record_items(
+                    store,
+                    [
+                        {
+                            "ref_index": 6,
+                            "author": ["J. Smith"],
+                            "title": "Corpus level reference stores for literature runs",
+                            "year": 2020,
+                            "raw": "[7] J. Smith. Corpus level reference stores for literature runs. 2020.",
+                            "DOI": "10.1000/store-a",
+                        },
+                        {
+                            "ref_index": 8,
+                            "author": ["M. Jones"],
+                            "title": "Deduplicated bibliographies at scale",
+                            "year": 2021,
+                            "raw": "[9] M. Jones. Deduplicated bibliographies at scale. 2021.",
+                        },
+                        {"ref_index": 9, "author": [], "title": "Incomplete", "year": 2021, "raw": "[10] Incomplete."},
+                    ],
+                ),
+                2,
+            )
+            source = root / "paper.md"
+            lines = [
+                "# Introduction",
+                "Prior work [1, 2, 3] is relevant.",
+                "# References",
+                "[1] J. Smith. Corpus level reference stores for literature runs. 2020.",
+                "[2] M. Jones and K. Lee. Deduplicated bibliographies at scale. In Proc. Workshop, 2021.",
+                "[3] A. Unknown. A reference nobody has resolved yet. 2019.",
+            ]
+            source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            init = json.loads(
+                self.run_cmd(
+                    ["init_runtime", "--source-path", str(source), "--working-dir", str(root), "--reference-store", str(store.path)]
+                ).stdout.decode("utf-8")
+            )
+            db_path = Path(init["db_path"])
+            self.assertEqual(deterministic_core.persist_outline_and_scopes(db_path, self.outline_payload(lines))[1], 0)
+            prepared, code = references.prepare_reference_workset(db_path)
+
+            self.assertEqual(code, 0)
+            self.assertEqual(prepared["reference_api"]["reference_store_accepted_count"], 2)
+            with runtime_db.connect_db(db_path) as connection:
+                resolutions = {row["entry_index"]: row for row in runtime_db.fetch_reference_api_resolutions(connection)}
+            self.assertEqual(resolutions[0]["match_basis"], "raw")
+            self.assertEqual(resolutions[0]["item"]["metadata"]["DOI"], "10.1000/store-a")
+            self.assertEqual(resolutions[1]["match_basis"], "title")
+            self.assertEqual(resolutions[1]["item"]["author"], ["M. Jones", "K. Lee"])
+            self.assertEqual(resolutions[1]["item"]["metadata"]["resolution_source"], "reference_store")
+            self.assertEqual(resolutions[2]["status"], "unresolved")
+
+            reference_store.record_items(
+                store,
+                [
+                    {
+                        "ref_index": 0,
+                        "author": ["K. Other"],
+                        "title": "A different work",
+                        "year": 2022,
+                        "raw": "[1] J. Smith. Corpus level reference stores for literature runs. 2020.",
+                    }
+                ],
+            )
+            entry = {"entry_index": 0, "raw": "[4] J. Smith. Corpus level reference stores for literature runs. 2020."}
+            self.assertEqual(reference_store.resolve_entries(store, [entry], []), [])
+
+            entry = {"entry_index": 0, "raw": "[5] P. Brown. Deduplicated bibliographies at scale. 2021."}
+            parsed = {
+                "entry_index": 0,
+                "pattern": "authors_period_title",
+                "author_candidates": ["P. Brown"],
+                "title_candidate": "Deduplicated bibliographies at scale",
+                "year_candidate": 2021,
+                "confidence": 0.9,
+            }
+            self.assertEqual(reference_store.resolve_entries(store, [entry], [parsed]), [])
+
     def test_prepare_citation_workset_maps_alpha_labels_through_cli(self):
         with tempfile.TemporaryDirectory() as td:
             root = Path(td)
@@ -2054,6 +2721,103 @@ class LiteratureAnalysisRuntimeTests(unittest.TestCase):
         self.assertIn("references.persist_references", text)
         self.assertIn("citations.persist_citation_analysis", text)
 
+    def test_status_startup_skips_heavy_runtime_imports(self):
+        probe = (
+            "import runpy, sys\n"
+            "sys.argv = ['run_analysis.py', 'status', '--db-path', sys.argv[1]]\n"
+            "try:\n"
+            f"    runpy.run_path({str(RUN_ANALYSIS)!r}, run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "heavy = ('analysis_runtime.deterministic_core', 'analysis_runtime.batch', 'jinja2', 'jsonschema', 'urllib.request')\n"
+            "print(' '.join(name for name in heavy if name in sys.modules), file=sys.stderr)\n"
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            source = root / "source.md"
+            source.write_text("# Title\n\nBody text.\n", encoding="utf-8")
+            init = json.loads(
+                self.run_cmd(["init_runtime", "--source-path", str(source), "--working-dir", str(root)]).stdout.decode("utf-8")
+            )
+            result = subprocess.run(
+                [sys.executable, "-c", probe, init["db_path"]],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=False,
+                env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+            )
+        self.assertEqual(json.loads(result.stdout.decode("utf-8"))["db_path"], init["db_path"])
+        self.assertEqual(result.stderr.decode("utf-8").strip(), "")
+
+    def test_profile_reports_stage_timings_chrome_trace_and_pstats(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            source = root / "paper.md"
+            lines = ["# Introduction", "Prior work [1] is relevant.", "# References", "[1] Smith. Useful Runtime Paper. 2020."]
+            source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            init = json.loads(
+                self.run_cmd(
+                    ["init_runtime", "--source-path", str(source), "--working-dir", str(root), "--stage-timings"]
+                ).stdout.decode("utf-8")
+            )
+            plan_path = root / "plan.json"
+            self.write_json(plan_path, self.outline_payload(lines))
+            stats_path = root / "plan.pstats"
+            plan = self.run_cmd(
+                ["--cprofile", str(stats_path), "persist_analysis_plan", "--db-path", init["db_path"], "--payload-file", str(plan_path)]
+            )
+            self.assertEqual(plan.returncode, 0, plan.stderr.decode("utf-8", errors="replace"))
+            self.assertTrue(stats_path.exists())
+
+            trace_path = root / "trace.json"
+            result = self.run_cmd(
+                ["profile", "--db-path", init["db_path"], "--chrome-trace", str(trace_path), "--pstats", str(stats_path), "--pstats-limit", "5"]
+            )
+            self.assertEqual(result.returncode, 0, result.stderr.decode("utf-8", errors="replace"))
+            report = json.loads(result.stdout.decode("utf-8"))
+
+            self.assertEqual([run["name"] for run in report["runs"]], ["stages.init_runtime", "deterministic_core.persist_outline_and_scopes"])
+            self.assertTrue(all(run["exit_code"] == 0 for run in report["runs"]))
+            stages = {stage["name"]: stage for stage in report["stages"]}
+            self.assertIn("stages.normalize_source", stages)
+            self.assertEqual(stages["deterministic_core.persist_outline_and_scopes"]["row_deltas"]["rows:outline_nodes"], 2)
+            self.assertEqual(stages["stages.init_runtime"]["row_deltas"]["source_document:normalized_source"], 1)
+            self.assertLessEqual(stages["stages.normalize_source"]["wall_ms"], stages["stages.init_runtime"]["wall_ms"])
+            self.assertEqual(len(report["pstats"]), 5)
+
+            trace = json.loads(trace_path.read_text(encoding="utf-8"))
+            self.assertEqual({event["ph"] for event in trace["traceEvents"]}, {"X"})
+            self.assertEqual(len(trace["traceEvents"]), sum(run["span_count"] for run in report["runs"]))
+
+    def test_stage_timings_are_opt_in_record_failures_and_keep_recent_runs(self):
+        load_deterministic_core_module()
+        from analysis_runtime import profiling, runtime_db  # noqa: PLC0415
+
+        with tempfile.TemporaryDirectory() as td:
+            db_path = Path(td) / "literature_analysis.db"
+            runtime_db.initialize_database(db_path)
+            with profiling.stage_timer("disabled", db_path=db_path):
+                with profiling.stage_timer("disabled.child", db_path=db_path):
+                    pass
+            with runtime_db.connect_db(db_path) as connection:
+                self.assertEqual(runtime_db.fetch_stage_timings(connection), [])
+                runtime_db.set_runtime_input(connection, "stage_timings", "true")
+
+            with self.assertRaises(RuntimeError):
+                with profiling.stage_timer("failing", db_path=db_path):
+                    with runtime_db.connect_db(db_path) as connection:
+                        runtime_db.set_runtime_input(connection, "language", "en-US")
+                    raise RuntimeError("stage failed")
+            with runtime_db.connect_db(db_path) as connection:
+                failed = runtime_db.fetch_stage_timings(connection)
+                self.assertEqual([(span["name"], span["status"]) for span in failed], [("failing", "error")])
+
+                spans = [dict(failed[0], span_index=0, status="ok")]
+                for position in range(3):
+                    spans[0]["start_unix_ms"] = failed[0]["start_unix_ms"] + position + 1
+                    runtime_db.store_stage_timings(connection, run_id=f"run-{position}", spans=spans, max_runs=2)
+                self.assertEqual([span["run_id"] for span in runtime_db.fetch_stage_timings(connection)], ["run-1", "run-2"])
+
     def test_analysis_runtime_package_shape_is_tidy(self):
         runtime_dir = ANALYSIS_SCRIPTS / "analysis_runtime"
         expected_files = {
@@ -298,6 +298,57 @@ class LiteratureScoringTests(unittest.TestCase):
             self.assertLess(detail["best_similarity"], 0.45)
             self.assertIsNotNone(detail["candidate_line_start"])
 
+    def test_evidence_quote_index_matches_exhaustive_window_scan(self):
+        def exhaustive(quote: str, source_lines: list[str]) -> tuple[float, int | None, int | None]:
+            normalized_quote = scoring._normalize_match_text(quote)
+            windows = [
+                (start + 1, start + width, scoring._normalize_match_text("\n".join(source_lines[start : start + width])))
+                for start in range(len(source_lines))
+                for width in range(1, min(5, len(source_lines) - start) + 1)
+            ]
+            windows = [window for window in windows if window[2]]
+            exact = [(start, end) for start, end, text in windows if normalized_quote and normalized_quote in text]
+            if exact:
+                start, end = min(exact, key=lambda item: (item[1] - item[0], item[0], item[1]))
+                return 1.0, start, end
+            if len(normalized_quote) < 8 or not windows:
+                return 0.0, None, None
+            size = 2 if len(normalized_quote) <= 11 else 3
+            best = max(
+                enumerate(windows),
+                key=lambda item: (scoring._ngram_similarity(normalized_quote, item[1][2], size), -item[0]),
+            )[1]
+            return round(scoring._ngram_similarity(normalized_quote, best[2], size), 4), best[0], best[1]
+
+        source_lines = [
+            "# Introduction",
+            "",
+            "We evaluate a method against three baselines.",
+            "The method improves accuracy on",
+            "---",
+            "two public benchmarks (Table 2).",
+            "# Results",
+            "Accuracy improves; the baselines remain weaker.",
+            "The method improves accuracy.",
+        ]
+        index = scoring.build_evidence_quote_index(source_lines)
+        quotes = [
+            "the method improves accuracy",
+            "accuracy on two public benchmarks",
+            "We evaluate a method—against THREE baselines!",
+            "improves accuracy on public benchmark tables",
+            "baselines remain weak",
+            "introducton",
+            "Unrelated discussion of marine biology taxonomy.",
+        ]
+        for quote in quotes:
+            with self.subTest(quote=quote):
+                _, details = scoring._locate_evidence_quote(quote, index)
+                self.assertEqual(
+                    (details["best_similarity"], details["candidate_line_start"], details["candidate_line_end"]),
+                    exhaustive(quote, source_lines),
+                )
+
     def test_score_only_cli_skips_non_scoring_actions(self):
         with tempfile.TemporaryDirectory() as td:
             root = Path(td)
@@ -1,5 +1,11 @@
+import gzip
+import json
 import sys
+import tempfile
+import threading
 import unittest
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 
@@ -9,6 +15,8 @@ if str(ANALYSIS_SCRIPTS) not in sys.path:
     sys.path.insert(0, str(ANALYSIS_SCRIPTS))
 
 from analysis_runtime import reference_api  # noqa: E402
+from analysis_runtime import reference_cache  # noqa: E402
+from analysis_runtime import reference_replay  # noqa: E402
 
 
 class ReferenceApiTests(unittest.TestCase):
@@ -266,6 +274,47 @@ class ReferenceApiTests(unittest.TestCase):
         self.assertEqual(identifier_decision["status"], "accepted")
         self.assertEqual(identifier_decision["match_basis"], "identifier")
 
+    def test_resolution_blocking_keeps_compact_title_and_merged_identifier_matches(self):
+        decision = self.resolution_fixture(
+            "Deep-Learning",
+            [
+                {
+                    "providers": ["crossref"],
+                    "provider_record_ids": ["compact"],
+                    "identifiers": {},
+                    "title": "DeepLearning",
+                    "authors": ["A"],
+                    "year": 2020,
+                    "metadata": {},
+                    "response_positions": {"crossref": 0},
+                }
+            ],
+        )
+        self.assertEqual(decision["status"], "accepted")
+        self.assertEqual(decision["match_score"], 0.99)
+
+        def record(provider: str, record_id: str, title: str, identifiers: dict[str, str]) -> dict[str, object]:
+            return {
+                "providers": [provider],
+                "provider_record_ids": [record_id],
+                "identifiers": identifiers,
+                "title": title,
+                "authors": ["A"],
+                "year": 2020,
+                "metadata": {},
+                "response_positions": {provider: 0},
+            }
+
+        merged = reference_api.merge_provider_candidates(
+            [
+                record("semantic_scholar", "s2", "Paper Title", {}),
+                record("crossref", "cr", "Paper Title", {"DOI": "10.1000/shared"}),
+                record("semantic_scholar", "s2-doi", "Renamed Upstream", {"DOI": "10.1000/SHARED"}),
+                record("crossref", "other", "Paper Title", {"DOI": "10.1000/other"}),
+            ]
+        )
+        self.assertEqual([item["provider_record_ids"] for item in merged], [["s2", "cr", "s2-doi"], ["other"]])
+
     def test_provider_merge_prefers_crossref_title_independent_of_input_order(self):
         merged = reference_api.merge_provider_candidates(
             [
@@ -334,6 +383,272 @@ class ReferenceApiTests(unittest.TestCase):
         self.assertEqual(len(result.candidates), 1)
         self.assertEqual(len(calls), 3)
         self.assertEqual(sleeps, [1.0])
+        self.assertEqual([request["http_status"] for request in result.requests], [429, 200, 200])
+
+    def test_pooled_transport_reuses_connection_and_decodes_gzip_within_size_limit(self):
+        client_ports: list[int] = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server hook name
+                client_ports.append(self.client_address[1])
+                size = 64 if "small" in self.path else 4096
+                body = json.dumps({"path": self.path, "padding": " " * size}).encode("utf-8")
+                compressed = "gzip" in self.headers.get("Accept-Encoding", "")
+                payload = gzip.compress(body) if compressed else body
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                if compressed:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *_args: object) -> None:
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        transport = reference_api.PooledHttpTransport(proxies={})
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        original_limit = reference_api.HTTP_MAX_RESPONSE_BYTES
+        try:
+            responses = [transport(f"{base}/small?page={page}", {}, 5.0) for page in range(3)]
+            reference_api.HTTP_MAX_RESPONSE_BYTES = 1024
+            oversized = transport(f"{base}/large", {}, 5.0)
+        finally:
+            reference_api.HTTP_MAX_RESPONSE_BYTES = original_limit
+            transport.close()
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual([json.loads(response.body)["path"] for response in responses], [f"/small?page={page}" for page in range(3)])
+        self.assertEqual([response.headers["content-encoding"] for response in responses], ["gzip"] * 3)
+        self.assertEqual([response.connection_reused for response in responses], [False, True, True])
+        self.assertEqual(len(set(client_ports)), 1)
+        self.assertEqual(transport.stats, {"connections_opened": 1, "connections_reused": 3})
+        self.assertEqual(len(oversized.body), 1025)
+
+    def test_pooled_transport_follows_bounded_redirects_across_hosts(self):
+        def serve(routes: dict[str, tuple[int, dict[str, str]]]) -> ThreadingHTTPServer:
+            class Handler(BaseHTTPRequestHandler):
+                protocol_version = "HTTP/1.1"
+
+                def do_GET(self) -> None:  # noqa: N802 - http.server hook name
+                    status, headers = routes.get(self.path.split("?", 1)[0], (404, {}))
+                    body = json.dumps({"path": self.path}).encode("utf-8")
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *_args: object) -> None:
+                    pass
+
+            server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            return server
+
+        target = serve({"/final": (200, {"Content-Type": "application/json"})})
+        target_base = f"http://127.0.0.1:{target.server_address[1]}"
+        origin = serve(
+            {
+                "/old": (301, {"Location": "/new?page=2"}),
+                "/new": (307, {"Location": f"{target_base}/final?page=2"}),
+                "/loop": (302, {"Location": "/loop"}),
+            }
+        )
+        base = f"http://127.0.0.1:{origin.server_address[1]}"
+        transport = reference_api.PooledHttpTransport(proxies={})
+        try:
+            redirected = transport(f"{base}/old", {}, 5.0)
+            looping = transport(f"{base}/loop", {}, 5.0)
+        finally:
+            transport.close()
+            for server in (origin, target):
+                server.shutdown()
+                server.server_close()
+
+        self.assertEqual(redirected.status, 200)
+        self.assertEqual(json.loads(redirected.body), {"path": "/final?page=2"})
+        self.assertEqual(looping.status, 302)
+        self.assertEqual(transport.stats["connections_opened"], 2)
+        self.assertEqual(transport.stats["connections_reused"], reference_api.HTTP_MAX_REDIRECTS + 2)
+
+    def test_recorded_responses_replay_with_injected_faults_directly_and_through_local_server(self):
+        pages = {
+            0: {"data": [{"citedPaper": {"paperId": "p1", "title": "Paper One", "authors": [{"name": "A"}], "year": 2020}}], "next": 1},
+            1: {"data": [{"citedPaper": {"paperId": "p2", "title": "Paper Two", "authors": [{"name": "B"}], "year": 2021}}]},
+        }
+
+        def live_get(url: str, _headers: dict[str, str], _timeout: float) -> reference_api.HttpResponse:
+            page = 1 if "offset=1" in url else 0
+            return reference_api.HttpResponse(200, {"content-type": "application/json"}, json.dumps(pages[page]).encode("utf-8"))
+
+        identifier = reference_api.normalize_identifier("10.1000/source")
+        with tempfile.TemporaryDirectory() as td:
+            fixtures = Path(td)
+            recorder = reference_replay.RecordingHttpGet(fixtures, live_get)
+            recorded = reference_api.fetch_semantic_scholar(identifier, http_get=recorder, sleeper=lambda _seconds: None)
+
+            sleeps: list[float] = []
+            faults = reference_replay.FaultPlan(burst_length=1, burst_status=503, retry_after="0.25")
+            replay = reference_replay.ReplayHttpGet(fixtures, faults=faults)
+            replayed = reference_api.fetch_semantic_scholar(identifier, http_get=replay, sleeper=sleeps.append)
+
+            server = reference_replay.replay_server(reference_replay.ReplayHttpGet(fixtures))
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                served = reference_api.fetch_semantic_scholar(
+                    identifier,
+                    http_get=reference_replay.RebasedHttpGet(f"http://127.0.0.1:{server.server_address[1]}"),
+                    sleeper=lambda _seconds: None,
+                )
+            finally:
+                server.shutdown()
+                server.server_close()
+            missing = reference_replay.ReplayHttpGet(fixtures)("https://api.crossref.org/works/unknown", {}, 1.0)
+
+        self.assertEqual(recorder.stats, {"requests": 2, "recorded": 2})
+        self.assertEqual(replayed.candidates, recorded.candidates)
+        self.assertEqual(served.candidates, recorded.candidates)
+        self.assertEqual(sleeps, [0.25, 0.25])
+        self.assertEqual([request["http_status"] for request in replayed.requests], [503, 200, 503, 200])
+        self.assertEqual([request["connection_reused"] for request in served.requests], [False, True])
+        self.assertEqual(missing.status, 404)
+        self.assertEqual(replay.stats, {"requests": 4, "replayed": 2, "injected_faults": 2, "misses": 0})
+
+    def test_wait_provider_fetch_reports_deadline_as_failed_fetch(self):
+        pending = Future()
+        stop = threading.Event()
+
+        fetched = reference_api.wait_provider_fetch("semantic_scholar", pending, deadline=0.0, stop=stop)
+
+        self.assertEqual(fetched.status, "failed")
+        self.assertEqual(fetched.error["kind"], "deadline_exceeded")
+        self.assertTrue(stop.is_set())
+
+    def test_stopped_provider_fetch_sends_no_further_pages(self):
+        urls: list[str] = []
+        first_request = threading.Event()
+        release = threading.Event()
+
+        def http_get(url: str, _headers: dict[str, str], _timeout: float) -> reference_api.HttpResponse:
+            urls.append(url)
+            first_request.set()
+            release.wait(5.0)
+            page = {"data": [{"citedPaper": {"paperId": f"p{len(urls)}", "title": "Paper"}}], "next": len(urls)}
+            return reference_api.HttpResponse(200, {}, json.dumps(page).encode("utf-8"))
+
+        identifier = reference_api.normalize_identifier("10.1000/source")
+        stop = threading.Event()
+        future = reference_api.start_provider_fetch(identifier, "semantic_scholar", http_get=http_get, stop=stop)
+        self.assertTrue(first_request.wait(5.0))
+
+        waited = reference_api.wait_provider_fetch("semantic_scholar", future, deadline=0.0, stop=stop)
+        release.set()
+        late = future.result(timeout=5.0)
+
+        self.assertEqual(waited.error["kind"], "deadline_exceeded")
+        self.assertEqual(late.status, "failed")
+        self.assertEqual(late.error["kind"], "stopped")
+        self.assertEqual(len(urls), 1)
+        self.assertEqual(len(late.candidates), 1)
+
+
+class ReferenceApiCacheTests(unittest.TestCase):
+    CROSSREF_RESPONSE = {"reference": [{"key": "api-1", "article-title": "Cached Paper", "author": "Smith", "year": "2020"}]}
+
+    def test_shared_cache_round_trips_response_by_provider_and_identifier(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache = reference_cache.ReferenceApiCache(root=Path(td))
+            sha256 = reference_cache.store(
+                cache,
+                provider="crossref",
+                canonical_identifier="DOI:10.1000/source",
+                status="succeeded",
+                http_status=200,
+                response=self.CROSSREF_RESPONSE,
+                now=100.0,
+            )
+            hit = reference_cache.lookup(cache, provider="crossref", canonical_identifier="DOI:10.1000/source", now=101.0)
+            miss = reference_cache.lookup(cache, provider="semantic_scholar", canonical_identifier="DOI:10.1000/source", now=101.0)
+
+        self.assertEqual(sha256, reference_cache.response_sha256(self.CROSSREF_RESPONSE))
+        self.assertIsNotNone(hit)
+        self.assertEqual(hit["response"], self.CROSSREF_RESPONSE)
+        self.assertEqual(hit["response_sha256"], sha256)
+        self.assertIsNone(miss)
+
+    def test_shared_cache_skips_failed_fetches_and_expires_by_ttl(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache = reference_cache.ReferenceApiCache(root=Path(td), ttl_seconds=10.0)
+            failed = reference_cache.store(
+                cache,
+                provider="crossref",
+                canonical_identifier="DOI:10.1000/failed",
+                status="failed",
+                http_status=503,
+                response=None,
+            )
+            reference_cache.store(
+                cache,
+                provider="crossref",
+                canonical_identifier="DOI:10.1000/source",
+                status="succeeded",
+                http_status=200,
+                response=self.CROSSREF_RESPONSE,
+                now=100.0,
+            )
+            fresh = reference_cache.lookup(cache, provider="crossref", canonical_identifier="DOI:10.1000/source", now=105.0)
+            expired = reference_cache.lookup(cache, provider="crossref", canonical_identifier="DOI:10.1000/source", now=111.0)
+            objects = list((Path(td) / reference_cache.CACHE_OBJECTS_DIRNAME).rglob("*.json"))
+
+        self.assertIsNone(failed)
+        self.assertIsNotNone(fresh)
+        self.assertIsNone(expired)
+        self.assertEqual(objects, [])
+
+    def test_shared_cache_evicts_least_recently_used_entries_over_size_cap(self):
+        responses = {
+            f"DOI:10.1000/{name}": {"reference": [{"key": name, "article-title": name * 40, "year": "2020"}]}
+            for name in ("a", "b", "c")
+        }
+        entry_size = max(len(reference_cache.canonical_response_bytes(response)) for response in responses.values())
+        with tempfile.TemporaryDirectory() as td:
+            cache = reference_cache.ReferenceApiCache(root=Path(td), max_bytes=entry_size * 2)
+            for offset, (identifier, response) in enumerate(list(responses.items())[:2]):
+                reference_cache.store(
+                    cache,
+                    provider="crossref",
+                    canonical_identifier=identifier,
+                    status="succeeded",
+                    http_status=200,
+                    response=response,
+                    now=100.0 + offset,
+                )
+            self.assertIsNotNone(reference_cache.lookup(cache, provider="crossref", canonical_identifier="DOI:10.1000/a", now=110.0))
+            reference_cache.store(
+                cache,
+                provider="crossref",
+                canonical_identifier="DOI:10.1000/c",
+                status="succeeded",
+                http_status=200,
+                response=responses["DOI:10.1000/c"],
+                now=120.0,
+            )
+            remaining = {
+                identifier
+                for identifier in responses
+                if reference_cache.lookup(cache, provider="crossref", canonical_identifier=identifier, now=121.0) is not None
+            }
+
+        self.assertEqual(remaining, {"DOI:10.1000/a", "DOI:10.1000/c"})
 
 
 if __name__ == "__main__":
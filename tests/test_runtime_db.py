@@ -1,4 +1,5 @@
 import importlib.util
+import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
@@ -29,6 +30,30 @@ class RuntimeDbTests(unittest.TestCase):
                 self.assertEqual(state["current_substep"], "confirm_runtime_paths")
                 self.assertEqual(state["next_action"], "confirm_runtime_paths")
 
+    def test_source_lines_are_line_indexed_and_memoized(self):
+        runtime_db = load_runtime_db_module()
+        content = "# Title\r\nfirst\rsecond\x0cthird\u2028fourth\n\nlast"
+        with tempfile.TemporaryDirectory() as td:
+            db_path = Path(td) / ".literature_analysis_tmp" / "literature_analysis.db"
+            runtime_db.initialize_database(db_path)
+            with runtime_db.connect_db(db_path) as connection:
+                runtime_db.store_source_document(connection, doc_key="normalized_source", content=content, metadata={"kind": "md"})
+                connection.commit()
+            runtime_db._SOURCE_LINES_MEMO.clear()
+            with runtime_db.connect_db(db_path) as connection:
+                source_lines = runtime_db.fetch_source_lines(connection, "normalized_source")
+                self.assertIs(runtime_db.fetch_source_lines(connection, "normalized_source"), source_lines)
+                runtime_db.update_source_document_metadata(connection, doc_key="normalized_source", metadata={"kind": "pdf"})
+                self.assertIs(runtime_db.fetch_source_lines(connection, "normalized_source"), source_lines)
+                self.assertEqual(runtime_db.fetch_source_document(connection, "normalized_source")["metadata"], {"kind": "pdf"})
+                self.assertIsNone(runtime_db.fetch_source_lines(connection, "missing"))
+
+        self.assertEqual(list(source_lines), content.splitlines())
+        self.assertEqual(len(source_lines), len(content.splitlines()))
+        self.assertEqual(source_lines[2:5], content.splitlines()[2:5])
+        self.assertEqual(source_lines[-1], "last")
+        self.assertEqual(source_lines.content, content)
+
     def test_source_identity_and_reference_api_audit_round_trip(self):
         runtime_db = load_runtime_db_module()
         with tempfile.TemporaryDirectory() as td:
@@ -95,6 +120,67 @@ class RuntimeDbTests(unittest.TestCase):
                     )
                 )
 
+    def test_reference_api_fetch_stores_compressed_response_and_parsed_candidates(self):
+        runtime_db = load_runtime_db_module()
+        response = {"reference": [{"key": f"r{index}", "article-title": "A repeated reference title"} for index in range(200)]}
+        candidates = [{"provider": "crossref", "record_id": "r0", "title": "A repeated reference title"}]
+        with tempfile.TemporaryDirectory() as td:
+            db_path = Path(td) / ".literature_analysis_tmp" / "literature_analysis.db"
+            runtime_db.initialize_database(db_path)
+            with runtime_db.connect_db(db_path) as connection:
+                runtime_db.store_reference_api_fetch(
+                    connection,
+                    canonical_identifier="DOI:10.1000/source",
+                    provider="crossref",
+                    status="ok",
+                    http_status=200,
+                    response=response,
+                    response_sha256="abc123",
+                    error=None,
+                    candidates=candidates,
+                )
+                connection.execute(
+                    """
+                    INSERT INTO reference_api_fetches (
+                        canonical_identifier, provider, status, http_status, response_json,
+                        response_sha256, error_json, fetched_at
+                    ) VALUES ('DOI:10.1000/legacy', 'crossref', 'ok', 200, ?, 'def456', '{}', '2024-01-01T00:00:00Z')
+                    """,
+                    ('{"reference": [{"key": "legacy"}]}',),
+                )
+                connection.commit()
+
+                row = connection.execute(
+                    "SELECT response_json, length(response_blob) AS blob_size FROM reference_api_fetches WHERE canonical_identifier = ?",
+                    ("DOI:10.1000/source",),
+                ).fetchone()
+                self.assertEqual(row["response_json"], "")
+                self.assertLess(row["blob_size"], len(runtime_db._json_dump(response)) // 10)
+
+                light = runtime_db.fetch_reference_api_fetch(
+                    connection,
+                    canonical_identifier="DOI:10.1000/source",
+                    provider="crossref",
+                    include_response=False,
+                )
+                self.assertEqual(light["candidates"], candidates)
+                self.assertNotIn("response", light)
+                full = runtime_db.fetch_reference_api_fetch(connection, canonical_identifier="DOI:10.1000/source", provider="crossref")
+                self.assertEqual(full["response"], response)
+
+                legacy = runtime_db.fetch_reference_api_fetch(
+                    connection,
+                    canonical_identifier="DOI:10.1000/legacy",
+                    provider="crossref",
+                    include_response=False,
+                )
+                self.assertIsNone(legacy["candidates"])
+                self.assertEqual(legacy["response"]["reference"][0]["key"], "legacy")
+                self.assertEqual(
+                    [fetch["response_sha256"] for fetch in runtime_db.fetch_reference_api_fetches(connection)],
+                    ["def456", "abc123"],
+                )
+
     def test_runtime_diagnostics_are_active_only_and_aggregated(self):
         runtime_db = load_runtime_db_module()
         with tempfile.TemporaryDirectory() as td:
@@ -120,6 +206,51 @@ class RuntimeDbTests(unittest.TestCase):
                 self.assertNotIn("reference_pattern_ambiguous: 2 entries", payload["warnings"])
                 self.assertIn("digest_undercoverage", payload["warnings"])
 
+    def test_runtime_progress_tracks_store_functions_and_direct_deletes(self):
+        runtime_db = load_runtime_db_module()
+        with tempfile.TemporaryDirectory() as td:
+            db_path = Path(td) / ".literature_analysis_tmp" / "literature_analysis.db"
+            runtime_db.initialize_database(db_path)
+            with runtime_db.connect_db(db_path) as connection:
+                runtime_db.store_source_document(connection, doc_key="normalized_source", content="# Title\nbody", metadata={})
+                runtime_db.store_action_receipt(connection, action_name="persist_digest", stage="stage_3_digest")
+                runtime_db.store_action_receipt(connection, action_name="persist_digest", stage="stage_3_digest")
+                runtime_db.store_section_scope(connection, scope_key="references_scope", section_title="References", line_start=1, line_end=2)
+                runtime_db.store_reference_items(
+                    connection,
+                    [{"ref_index": index, "author": [], "title": f"T{index}", "year": None, "raw": "raw", "confidence": 0.9} for index in range(3)],
+                )
+                runtime_db.store_citation_timeline(connection, {"early": []})
+                runtime_db.replace_reference_quality_issues(
+                    connection,
+                    [{"entry_index": 0, "severity": "warning", "reason_code": "title_short"}],
+                )
+                runtime_db.add_runtime_warning(connection, "digest_undercoverage")
+                runtime_db.add_runtime_warning(connection, "reference_pattern_ambiguous: entry_index=1")
+                runtime_db.add_runtime_warning(connection, "reference_pattern_ambiguous: entry_index=1")
+                runtime_db.add_runtime_warning(connection, "reference_pattern_ambiguous: entry_index=2")
+                runtime_db.add_runtime_warning(connection, "reference_split_suspect: block_index=4")
+                connection.execute("DELETE FROM citation_timeline")
+                runtime_db.resolve_reference_quality_issues(connection)
+                connection.commit()
+
+                progress = runtime_db.fetch_runtime_progress(connection)
+                self.assertEqual(progress["counts"], runtime_db.count_runtime_progress(connection))
+                self.assertEqual(progress["counts"]["rows:reference_items"], 3)
+                self.assertNotIn("rows:citation_timeline", progress["counts"])
+                self.assertNotIn("rows:active_reference_quality_issues", progress["counts"])
+                self.assertEqual(progress["receipts"], ["persist_digest"])
+                self.assertEqual(progress["warnings"], runtime_db.fetch_runtime_warnings(connection))
+                self.assertIn("reference_pattern_ambiguous: 2 entries", progress["warnings"])
+
+                runtime_db.resolve_runtime_warnings(connection, warning_prefix="reference_pattern_ambiguous")
+                runtime_db.store_reference_items(connection, [])
+                connection.commit()
+                progress = runtime_db.fetch_runtime_progress(connection)
+                self.assertEqual(progress["warnings"], ["digest_undercoverage", "reference_split_suspect: block_index=4"])
+                self.assertEqual(progress["warnings"], runtime_db.fetch_runtime_warnings(connection))
+                self.assertNotIn("rows:reference_items", progress["counts"])
+
     def test_reference_quality_issue_helpers_track_active_status(self):
         runtime_db = load_runtime_db_module()
         with tempfile.TemporaryDirectory() as td:
@@ -535,5 +666,93 @@ class RuntimeDbTests(unittest.TestCase):
                 self.assertNotIn("persist_citation_semantics", receipts)
 
 
+    def test_diff_write_strategy_keeps_unchanged_rows_and_wal_profile(self):
+        runtime_db = load_runtime_db_module()
+        entries = [
+            {"entry_index": 0, "raw": "A. First paper. 2020.", "year": 2020, "metadata": {}},
+            {"entry_index": 1, "raw": "B. Second paper. 2021.", "year": 2021, "metadata": {}},
+            {"entry_index": 2, "raw": "C. Third paper. 2022.", "year": 2022, "metadata": {}},
+        ]
+        with tempfile.TemporaryDirectory() as td:
+            replace_path = Path(td) / "replace" / "literature_analysis.db"
+            diff_path = Path(td) / "diff" / "literature_analysis.db"
+            for db_path in (replace_path, diff_path):
+                runtime_db.initialize_database(db_path)
+            with runtime_db.connect_db(diff_path) as connection:
+                runtime_db.set_runtime_input(connection, "db_write_strategy", "diff")
+                runtime_db.set_runtime_input(connection, "sqlite_profile", "wal")
+            updated = [dict(entries[0]), dict(entries[2], raw="C. Third paper, revised. 2022.")]
+            for db_path in (replace_path, diff_path):
+                with runtime_db.connect_db(db_path) as connection:
+                    runtime_db.store_reference_entries(connection, entries)
+                    connection.execute("UPDATE reference_entries SET updated_at = 'before'")
+                    runtime_db.store_reference_entries(connection, updated)
+            with runtime_db.connect_db(replace_path) as connection:
+                replaced = [dict(row) for row in connection.execute("SELECT * FROM reference_entries ORDER BY entry_index")]
+                self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+            with runtime_db.connect_db(diff_path) as connection:
+                diffed = [dict(row) for row in connection.execute("SELECT * FROM reference_entries ORDER BY entry_index")]
+                self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+                self.assertEqual(connection.execute("PRAGMA synchronous").fetchone()[0], 1)
+            self.assertEqual([row["entry_index"] for row in diffed], [0, 2])
+            self.assertEqual(diffed[0]["updated_at"], "before")
+            self.assertNotEqual(diffed[1]["updated_at"], "before")
+            strip = lambda rows: [{k: v for k, v in row.items() if k != "updated_at"} for row in rows]
+            self.assertEqual(strip(diffed), strip(replaced))
+
+    def test_connection_scope_reuses_one_connection_per_database(self):
+        runtime_db = load_runtime_db_module()
+        with tempfile.TemporaryDirectory() as td:
+            db_path = Path(td) / ".literature_analysis_tmp" / "literature_analysis.db"
+            runtime_db.initialize_database(db_path)
+            with runtime_db.connection_scope() as stats:
+                with runtime_db.connect_db(db_path) as first:
+                    runtime_db.set_runtime_input(first, "language", "en-US")
+                first.close()
+                with runtime_db.connect_db(db_path) as second:
+                    self.assertIs(second, first)
+                    self.assertEqual(runtime_db.fetch_runtime_inputs(second)["language"], "en-US")
+                with runtime_db.connection_scope() as nested_stats:
+                    self.assertIs(nested_stats, stats)
+                    runtime_db.connect_db(db_path)
+            self.assertEqual(stats, {"opens": 1, "reuses": 2, "commits": 1})
+            with self.assertRaises(sqlite3.ProgrammingError):
+                first.execute("SELECT 1")
+            with self.assertRaises(RuntimeError):
+                with runtime_db.connection_scope():
+                    connection = runtime_db.connect_db(db_path)
+                    runtime_db.set_runtime_input(connection, "language", "zh-CN")
+                    raise RuntimeError("abort")
+            with runtime_db.connect_db(db_path) as connection:
+                self.assertEqual(runtime_db.fetch_runtime_inputs(connection)["language"], "en-US")
+
+    def test_nested_connect_db_scopes_roll_back_without_touching_outer_writes(self):
+        runtime_db = load_runtime_db_module()
+        with tempfile.TemporaryDirectory() as td:
+            db_path = Path(td) / ".literature_analysis_tmp" / "literature_analysis.db"
+            runtime_db.initialize_database(db_path)
+            with runtime_db.connection_scope() as stats:
+                with runtime_db.connect_db(db_path) as outer:
+                    runtime_db.set_runtime_input(outer, "language", "en-US")
+                    with self.assertRaises(RuntimeError):
+                        with runtime_db.connect_db(db_path) as inner:
+                            runtime_db.set_runtime_input(inner, "model", "discarded")
+                            raise RuntimeError("abort inner")
+                    with runtime_db.connect_db(db_path) as inner:
+                        runtime_db.set_runtime_input(inner, "identifier", "discarded")
+                        inner.rollback()
+                    with runtime_db.connect_db(db_path) as inner:
+                        runtime_db.set_runtime_input(inner, "identifier", "10.1000/kept")
+                        inner.commit()
+                    self.assertTrue(outer.in_transaction)
+                    self.assertEqual(stats["commits"], 0)
+            self.assertEqual(stats["commits"], 1)
+            with runtime_db.connect_db(db_path) as connection:
+                inputs = runtime_db.fetch_runtime_inputs(connection)
+            self.assertEqual(inputs["language"], "en-US")
+            self.assertEqual(inputs["identifier"], "10.1000/kept")
+            self.assertNotEqual(inputs.get("model"), "discarded")
+
+
 if __name__ == "__main__":
     unittest.main()